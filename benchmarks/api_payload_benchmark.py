@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Alpha Vantage Payload Parsing Microbenchmark
+============================================
+
+Times turning one CSV response into standardized bars:
+
+- legacy: the pre-single-parse pipeline. The current-day validation reads
+  the CSV and parses its timestamps, the caller reads the CSV again, logs
+  today's rows before and after apply_timestamp_standardization_to_api_data
+  (each re-parsing the column), and the compact check parses it once more
+- single: utils.api_payload.parse_bar_payload once, with validation and
+  logging answered from the parsed arrays, then to_frame()
+
+Payloads are synthetic extended-hours 1-min bars (compact = 100 rows,
+full = one month slice) and full daily history. No network is involved.
+
+Usage:
+    python benchmarks/api_payload_benchmark.py --rounds 5
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.api_payload import parse_bar_payload  # noqa: E402
+from utils.timestamp_standardizer import (  # noqa: E402
+    apply_timestamp_standardization_to_api_data,
+)
+
+EXCHANGE_TZ = "America/New_York"
+TODAY = pd.Timestamp("2025-03-31").date()
+
+
+def _make_payload(kind):
+    """CSV text the way Alpha Vantage sends it (newest bar first)."""
+    rng = np.random.default_rng(11)
+    if kind == "daily":
+        index = pd.bdate_range(end=TODAY, periods=6000)
+        stamps = index.strftime("%Y-%m-%d")
+    else:
+        days = pd.bdate_range(end=TODAY, periods=1 if kind == "compact" else 21)
+        index = pd.DatetimeIndex(
+            np.concatenate(
+                [
+                    pd.date_range(
+                        day + pd.Timedelta("04:00:00"),
+                        day + pd.Timedelta("19:59:00"),
+                        freq="1min",
+                    )
+                    for day in days
+                ]
+            )
+        )
+        if kind == "compact":
+            index = index[-100:]
+        stamps = index.strftime("%Y-%m-%d %H:%M:%S")
+    close = 50 + rng.standard_normal(len(index)).cumsum() * 0.02
+    df = pd.DataFrame(
+        {
+            "timestamp": stamps,
+            "open": close.round(4),
+            "high": (close + 0.05).round(4),
+            "low": (close - 0.05).round(4),
+            "close": close.round(4),
+            "volume": rng.integers(100, 10_000, len(index)),
+        }
+    )
+    return df.iloc[::-1].to_csv(index=False)
+
+
+def _today_count(timestamps):
+    parsed = pd.to_datetime(timestamps, errors="coerce")
+    local = (
+        parsed.dt.tz_localize(EXCHANGE_TZ)
+        if parsed.dt.tz is None
+        else parsed.dt.tz_convert(EXCHANGE_TZ)
+    )
+    return int((local.dt.date == TODAY).sum())
+
+
+def legacy_pipeline(text, data_type):
+    """Parse steps of the old validate -> read -> standardize -> log flow."""
+    if data_type == "intraday":
+        _today_count(pd.read_csv(StringIO(text))["timestamp"])
+    df = pd.read_csv(StringIO(text))
+    if data_type == "intraday":
+        _today_count(df["timestamp"])
+    df = apply_timestamp_standardization_to_api_data(df, data_type=data_type)
+    if data_type == "intraday":
+        _today_count(df["timestamp"])
+        _today_count(df["timestamp"])
+    return df
+
+
+def single_pipeline(text, data_type):
+    """One parse; every check reads the parsed arrays."""
+    payload = parse_bar_payload(text, data_type)
+    if data_type == "intraday":
+        mask = payload.rows_on(TODAY)
+        int(mask.sum())
+        payload.wall_range(mask)
+    return payload.to_frame()
+
+
+def _best_of(fn, text, data_type, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(text, data_type)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(rounds=5):
+    """Print legacy vs single-parse timings per payload shape."""
+    # The standardizer logs every step at INFO
+    logging.disable(logging.INFO)
+    print(
+        f"{'payload':>10} {'rows':>7} {'legacy (ms)':>12} {'single (ms)':>12} "
+        f"{'speedup':>8}"
+    )
+    for kind, data_type in (
+        ("compact", "intraday"),
+        ("full", "intraday"),
+        ("daily", "daily"),
+    ):
+        text = _make_payload(kind)
+
+        # Sanity check: both paths store the same CSV
+        legacy = legacy_pipeline(text, data_type)
+        single = single_pipeline(text, data_type)
+        assert legacy.to_csv(index=False) == single.to_csv(index=False)
+
+        legacy_time = _best_of(legacy_pipeline, text, data_type, rounds)
+        single_time = _best_of(single_pipeline, text, data_type, rounds)
+        print(
+            f"{kind:>10} {len(single):>7} {legacy_time * 1000:>12.2f} "
+            f"{single_time * 1000:>12.2f} {legacy_time / single_time:>7.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark Alpha Vantage CSV payload parsing"
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    run_benchmark(args.rounds)
+
+
+if __name__ == "__main__":
+    main()
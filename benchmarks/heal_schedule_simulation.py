@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Heal Schedule Simulation
+========================
+
+Simulates one hour of the every-minute 1-min fetch job for a ticker universe
+and compares two heal schedules:
+
+- aligned: every ticker heals when minute % INTRADAY_1MIN_HEAL_EVERY_MINUTES == 0
+- staggered: utils.heal_scheduler.HealScheduler phases plus manifest skipping
+  (series whose last gap check came back clean are not re-read)
+
+Each cycle costs one compact call per ticker. A heal also reads the stored
+series (storage seconds) and, for a ticker with old gaps, makes one
+month-sliced call. Wall time per cycle is the time to spend its calls at
+the API budget plus the heal reads spread over the worker pool (a worker
+reads the stored series before it queues for its call). Nothing touches the
+network.
+
+Usage:
+    python benchmarks/heal_schedule_simulation.py --universes 60 120 --minutes 60
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.config import (  # noqa: E402
+    ALPHA_VANTAGE_CALLS_PER_MINUTE,
+    INTRADAY_1MIN_HEAL_EVERY_MINUTES,
+)
+from utils.heal_scheduler import HealScheduler, needs_heal  # noqa: E402
+
+START_MINUTE = 14 * 60 + 30
+
+
+def simulate(
+    num_tickers,
+    minutes,
+    staggered,
+    gap_rate=0.02,
+    compact_seconds=0.4,
+    heal_read_seconds=2.5,
+    workers=8,
+    calls_per_minute=ALPHA_VANTAGE_CALLS_PER_MINUTE,
+    every=INTRADAY_1MIN_HEAL_EVERY_MINUTES,
+    seed=7,
+):
+    """
+    Run the fetch job minute by minute.
+
+    Args:
+        num_tickers: Universe size
+        minutes: Simulated minutes
+        staggered: Use HealScheduler + manifest skipping instead of aligned heals
+        gap_rate: Chance per ticker per minute that an append leaves a gap
+        compact_seconds: Worker seconds of an API call + delta write
+        heal_read_seconds: Worker seconds of reading a stored series
+        workers: Fetch worker pool size
+        calls_per_minute: API budget
+        every: Heal interval in minutes
+
+    Returns:
+        Tuple of (calls per minute, wall seconds per minute, heals run)
+    """
+    rng = np.random.default_rng(seed)
+    tickers = [f"T{i:04d}" for i in range(num_tickers)]
+    scheduler = HealScheduler(every, tickers)
+    # Nothing has been checked yet: every series starts unknown (-1)
+    gap_count = {ticker: -1 for ticker in tickers}
+    has_old_gap = {ticker: rng.random() < 0.1 for ticker in tickers}
+
+    calls, walls, heals = [], [], 0
+    for minute in range(START_MINUTE, START_MINUTE + minutes):
+        if staggered:
+            healing = [
+                t
+                for t in scheduler.due(tickers, minute)
+                if needs_heal({"gap_count": gap_count[t]})
+            ]
+        else:
+            healing = tickers if minute % every == 0 else []
+
+        month_calls = sum(has_old_gap[t] for t in healing)
+        cycle_calls = num_tickers + month_calls
+        api_seconds = max(
+            cycle_calls / calls_per_minute * 60, cycle_calls * compact_seconds / workers
+        )
+        calls.append(cycle_calls)
+        walls.append(api_seconds + len(healing) * heal_read_seconds / workers)
+        heals += len(healing)
+
+        for ticker in healing:
+            gap_count[ticker] = 0
+            has_old_gap[ticker] = False
+        # Compact appends occasionally skip bars, which record_new_gaps flags
+        for ticker in tickers:
+            if rng.random() < gap_rate:
+                gap_count[ticker] = max(gap_count[ticker], 0) + 1
+    return np.array(calls), np.array(walls), heals
+
+
+def run_simulation(universes=(60, 120), minutes=60, workers=8):
+    """Print per-minute call and wall-time spread for each schedule."""
+    print(
+        f"{'tickers':>8} {'schedule':>10} {'peak calls':>11} {'mean calls':>11} "
+        f"{'peak wall (s)':>14} {'p50 wall (s)':>13} {'over 60s':>9} {'heals':>7}"
+    )
+    for num_tickers in universes:
+        for staggered in (False, True):
+            calls, walls, heals = simulate(
+                num_tickers, minutes, staggered, workers=workers
+            )
+            print(
+                f"{num_tickers:>8} {'staggered' if staggered else 'aligned':>10} "
+                f"{calls.max():>11} {calls.mean():>11.1f} {walls.max():>14.1f} "
+                f"{np.median(walls):>13.1f} {int((walls > 60).sum()):>9} {heals:>7}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Simulate aligned vs staggered heal schedules"
+    )
+    parser.add_argument("--universes", type=int, nargs="+", default=[60, 120])
+    parser.add_argument("--minutes", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    run_simulation(args.universes, args.minutes, args.workers)
+
+
+if __name__ == "__main__":
+    main()
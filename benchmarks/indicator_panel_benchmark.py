@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Indicator Engine Scaling Benchmark
+==================================
+
+Compares the daily screener indicator workload (EMA20, 20-bar Bollinger
+standard deviation, ATR14, lagged 20-day average volume, 5-bar high/low)
+computed two ways:
+
+- per-ticker: pandas rolling/ewm calls inside a Python loop over tickers
+- panel: utils.indicators.IndicatorPanel over the whole universe at once
+
+Frames are synthetic and built in memory, so only indicator CPU is measured.
+
+Usage:
+    python benchmarks/indicator_panel_benchmark.py --universes 100 500 1000 --bars 250
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.indicators import IndicatorPanel  # noqa: E402
+
+
+def _make_frames(num_tickers, bars):
+    rng = np.random.default_rng(42)
+    timestamps = pd.date_range("2024-01-02", periods=bars, freq="B")
+    frames = {}
+    for i in range(num_tickers):
+        close = 50 + rng.standard_normal(bars).cumsum()
+        frames[f"T{i:04d}"] = pd.DataFrame(
+            {
+                "timestamp": timestamps,
+                "open": close + rng.normal(0, 0.3, bars),
+                "high": close + 1,
+                "low": close - 1,
+                "close": close,
+                "volume": rng.integers(1_000, 100_000, bars),
+            }
+        )
+    return frames
+
+
+def per_ticker_indicators(frames):
+    """The pre-panel screener workload: one ticker at a time."""
+    latest = {}
+    for ticker, df in frames.items():
+        df = df.sort_values("timestamp")
+        ema20 = df["close"].ewm(span=20, adjust=False).mean()
+        std20 = df["close"].rolling(window=20).std()
+        prev_close = df["close"].shift(1)
+        tr = pd.concat(
+            [
+                df["high"] - df["low"],
+                (df["high"] - prev_close).abs(),
+                (df["low"] - prev_close).abs(),
+            ],
+            axis=1,
+        ).max(axis=1)
+        atr14 = tr.rolling(window=14).mean()
+        avg_vol = df["volume"].shift(1).rolling(window=20).mean()
+        high5 = df["high"].rolling(window=5).max()
+        low5 = df["low"].rolling(window=5).min()
+        latest[ticker] = (
+            ema20.iloc[-1],
+            std20.iloc[-1],
+            atr14.iloc[-1],
+            avg_vol.iloc[-1],
+            high5.iloc[-1],
+            low5.iloc[-1],
+        )
+    return latest
+
+
+def panel_indicators(frames):
+    """The same workload through the batched panel engine (build + compute)."""
+    return panel_compute(IndicatorPanel.from_frames(frames))
+
+
+def panel_compute(panel):
+    """Indicator compute only, over an already-built panel."""
+    return (
+        panel.latest(panel.ema(span=20)),
+        panel.latest(panel.rolling_std(window=20)),
+        panel.latest(panel.atr(period=14)),
+        panel.latest(panel.average_volume(window=20)),
+        panel.latest(panel.rolling_max(window=5)),
+        panel.latest(panel.rolling_min(window=5)),
+    )
+
+
+def _best_of(fn, frames, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(frames)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(universes=(100, 500, 1000), bars=250, rounds=3):
+    """Print per-ticker vs panel timings for each universe size."""
+    print(
+        f"{'tickers':>8} {'per-ticker (s)':>15} {'panel (s)':>10} "
+        f"{'compute (s)':>12} {'speedup':>8}"
+    )
+    for num_tickers in universes:
+        frames = _make_frames(num_tickers, bars)
+
+        # Sanity check: both paths agree on the latest values
+        legacy = per_ticker_indicators(frames)
+        panel = panel_indicators(frames)
+        ticker = next(iter(frames))
+        np.testing.assert_allclose(
+            legacy[ticker], [series[ticker] for series in panel], rtol=1e-9
+        )
+
+        legacy_time = _best_of(per_ticker_indicators, frames, rounds)
+        panel_time = _best_of(panel_indicators, frames, rounds)
+        compute_time = _best_of(
+            panel_compute, IndicatorPanel.from_frames(frames), rounds
+        )
+        print(
+            f"{num_tickers:>8} {legacy_time:>15.3f} {panel_time:>10.3f} "
+            f"{compute_time:>12.3f} {legacy_time / panel_time:>7.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the indicator panel engine")
+    parser.add_argument("--universes", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--bars", type=int, default=250)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.universes, args.bars, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
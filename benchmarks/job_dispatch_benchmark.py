@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Job Dispatch Microbenchmark
+===========================
+
+Measures per-job overhead of the two orchestrator execution modes on a job
+that does what every real job does first - import utils.helpers (pandas,
+numpy, pandas_market_calendars, requests) and the Spaces client (boto3) -
+and then exits:
+
+- subprocess: a fresh interpreter per job (JOB_EXECUTION_MODE=subprocess)
+- warm: a job dispatched to a WarmWorkerPool worker (JOB_EXECUTION_MODE=warm)
+
+Warm pool start-up is paid once per orchestrator run and reported separately.
+
+Usage:
+    python benchmarks/job_dispatch_benchmark.py --jobs 10
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from orchestrator.worker_pool import (  # noqa: E402
+    PROJECT_ROOT,
+    WarmWorkerPool,
+    run_script_subprocess,
+)
+
+JOB_SOURCE = """
+import os
+import sys
+sys.path.append({root!r})
+import utils.helpers  # noqa: F401
+import utils.spaces_manager  # noqa: F401
+print("done")
+"""
+
+
+def _time_jobs(run_one, jobs):
+    timings = []
+    for _ in range(jobs):
+        start = time.perf_counter()
+        result = run_one()
+        timings.append(time.perf_counter() - start)
+        assert result.returncode == 0, result.stderr
+    timings.sort()
+    return timings[len(timings) // 2], timings[0]
+
+
+def run_benchmark(jobs=10, workers=1):
+    """Print median and best per-job latency for both execution modes."""
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as handle:
+        handle.write(JOB_SOURCE.format(root=PROJECT_ROOT))
+        script = handle.name
+
+    try:
+        subprocess_median, subprocess_best = _time_jobs(
+            lambda: run_script_subprocess(script, env=dict(os.environ), timeout=300),
+            jobs,
+        )
+
+        start = time.perf_counter()
+        with WarmWorkerPool(size=workers) as pool:
+            startup = time.perf_counter() - start
+            warm_median, warm_best = _time_jobs(
+                lambda: pool.run(script, timeout=300), jobs
+            )
+    finally:
+        os.unlink(script)
+
+    print(f"{'mode':>11} {'median (ms)':>12} {'best (ms)':>10}")
+    print(
+        f"{'subprocess':>11} {subprocess_median * 1e3:>12.1f} "
+        f"{subprocess_best * 1e3:>10.1f}"
+    )
+    print(f"{'warm':>11} {warm_median * 1e3:>12.1f} {warm_best * 1e3:>10.1f}")
+    print(f"warm pool start-up ({workers} workers): {startup:.3f}s")
+    print(f"per-job speedup: {subprocess_median / warm_median:.0f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark orchestrator job dispatch")
+    parser.add_argument("--jobs", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    run_benchmark(args.jobs, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Bar Resampling Microbenchmark
+=============================
+
+Times deriving 30-minute bars from 8 days of extended-hours 1-minute bars:
+
+- pandas: per-ticker DataFrame.resample over the session-filtered bars
+- panel: one utils.resample.resample_bars call over the whole universe
+
+Frames are synthetic and built in memory, so only aggregation CPU is
+measured (the API call each derived ticker saves is ~100x more expensive).
+
+Usage:
+    python benchmarks/resample_benchmark.py --universes 50 200 --days 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.resample import resample_bars  # noqa: E402
+
+
+def _make_frames(num_tickers, days):
+    rng = np.random.default_rng(42)
+    index = pd.DatetimeIndex([], tz="America/New_York")
+    for day in pd.bdate_range(end="2025-03-31", periods=days):
+        index = index.append(
+            pd.date_range(
+                day + pd.Timedelta("04:00:00"),
+                day + pd.Timedelta("19:59:00"),
+                freq="1min",
+                tz="America/New_York",
+            )
+        )
+    utc = index.tz_convert("UTC")
+
+    frames = {}
+    for i in range(num_tickers):
+        close = 50 + rng.standard_normal(len(index)).cumsum() * 0.02
+        frames[f"T{i:04d}"] = pd.DataFrame(
+            {
+                "timestamp": utc,
+                "open": close,
+                "high": close + 0.05,
+                "low": close - 0.05,
+                "close": close,
+                "volume": rng.integers(100, 10_000, len(index)).astype(float),
+            }
+        )
+    return frames
+
+
+def pandas_resample(frames):
+    """Per-ticker pandas reference implementation."""
+    results = {}
+    for ticker, df in frames.items():
+        local = df.set_index(
+            pd.DatetimeIndex(df["timestamp"]).tz_convert("America/New_York")
+        )
+        local = local.between_time("04:00", "19:59")
+        bars = (
+            local.resample("30min")
+            .agg(
+                {
+                    "open": "first",
+                    "high": "max",
+                    "low": "min",
+                    "close": "last",
+                    "volume": "sum",
+                }
+            )
+            .dropna(subset=["open"])
+        )
+        results[ticker] = bars
+    return results
+
+
+def panel_resample(frames):
+    """One stacked call over the whole universe."""
+    return resample_bars(frames, "30min")
+
+
+def _best_of(fn, frames, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(frames)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(universes=(50, 200), days=8, rounds=3):
+    """Print pandas vs panel timings for each universe size."""
+    print(f"{'tickers':>8} {'pandas (s)':>11} {'panel (s)':>10} {'speedup':>8}")
+    for num_tickers in universes:
+        frames = _make_frames(num_tickers, days)
+
+        # Sanity check: both paths agree
+        reference = pandas_resample(frames)
+        panel = panel_resample(frames)
+        for ticker, bars in reference.items():
+            np.testing.assert_allclose(
+                bars[["open", "high", "low", "close", "volume"]].to_numpy(),
+                panel[ticker][["open", "high", "low", "close", "volume"]].to_numpy(),
+                rtol=1e-9,
+            )
+
+        pandas_time = _best_of(pandas_resample, frames, rounds)
+        panel_time = _best_of(panel_resample, frames, rounds)
+        print(
+            f"{num_tickers:>8} {pandas_time:>11.3f} {panel_time:>10.3f} "
+            f"{pandas_time / panel_time:>7.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark 1-min to 30-min bar resampling"
+    )
+    parser.add_argument("--universes", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--days", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.universes, args.days, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
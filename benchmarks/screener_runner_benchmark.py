@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Screener Scan Latency Benchmark
+===============================
+
+Times a full scan (every screener over every ticker) for growing numbers of
+screeners and tickers:
+
+- sequential: the previous PluginManager / BaseScreener.scan flow. Each
+  screener fetches the universe itself and screens its tickers one after
+  another on the event loop
+- concurrent: core.screener_runner.ScreenerRunner. One shared snapshot,
+  screeners side by side, evaluation chunked into a process pool
+
+Screeners are synthetic: evaluate_ticker computes rolling indicators over
+a day of 1-min bars. Fetches are simulated with a fixed per-request
+latency; nothing touches the network.
+
+Usage:
+    python benchmarks/screener_runner_benchmark.py --screeners 1 2 4 --tickers 50 200
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.base_screener import BaseScreener  # noqa: E402
+from core.screener_runner import ScreenerRunner  # noqa: E402
+
+
+class _SimulatedFetcher:
+    """fetch_multiple_tickers with a fixed latency per call."""
+
+    def __init__(self, frames, latency):
+        self.frames = frames
+        self.latency = latency
+
+    async def fetch_multiple_tickers(self, tickers, **kwargs):
+        await asyncio.sleep(self.latency)
+        return {ticker: (self.frames[ticker], True) for ticker in tickers}
+
+
+class BenchScreener(BaseScreener):
+    """Indicator-heavy evaluation, no I/O."""
+
+    def should_run_in_session(self, session):
+        return True
+
+    def evaluate_ticker(self, ticker, df, context, **kwargs):
+        close = df["close"]
+        fast = close.ewm(span=9).mean()
+        slow = close.ewm(span=21).mean()
+        band = close.rolling(20).std()
+        vwap = (close * df["volume"]).cumsum() / df["volume"].cumsum()
+        for window in (5, 10, 30, 60):
+            close.rolling(window).apply(np.max, raw=True)
+        if (
+            fast.iloc[-1] > slow.iloc[-1]
+            and close.iloc[-1] > vwap.iloc[-1] + band.iloc[-1]
+        ):
+            return self.create_signal(
+                ticker=ticker, signal_type="buy", entry_price=float(close.iloc[-1])
+            )
+        return None
+
+
+def _make_frames(num_tickers, bars=390):
+    rng = np.random.default_rng(3)
+    frames = {}
+    for i in range(num_tickers):
+        close = 50 + rng.standard_normal(bars).cumsum() * 0.05
+        frames[f"T{i:04d}"] = pd.DataFrame(
+            {"close": close, "volume": rng.integers(100, 10_000, bars)}
+        )
+    return frames
+
+
+async def sequential_scan(screeners, tickers):
+    """Previous flow: one screener, then one ticker, at a time."""
+    results = {}
+    for name, screener in screeners.items():
+        data = await screener.data_fetcher.fetch_multiple_tickers(tickers)
+        signals = []
+        for ticker, (df, success) in data.items():
+            signal = await screener.screen_ticker(ticker, df)
+            if signal and screener.validate_signal(signal):
+                signals.append(signal)
+        results[name] = signals
+    return results
+
+
+async def concurrent_scan(screeners, tickers, runner):
+    return await runner.run(screeners, tickers)
+
+
+def _best_of(fn, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = asyncio.run(fn())
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_benchmark(
+    screener_counts=(1, 2, 4), ticker_counts=(50, 200), workers=4, latency=0.5, rounds=3
+):
+    """Print sequential vs concurrent scan latency per (screeners, tickers)."""
+    # Scan start/finish messages are logged at INFO
+    logging.disable(logging.INFO)
+    runner = ScreenerRunner(process_workers=workers)
+    print(
+        f"{'screeners':>10} {'tickers':>8} {'sequential (s)':>15} "
+        f"{'concurrent (s)':>15} {'speedup':>8}"
+    )
+    try:
+        for num_tickers in ticker_counts:
+            frames = _make_frames(num_tickers)
+            tickers = list(frames)
+            for num_screeners in screener_counts:
+                fetcher = _SimulatedFetcher(frames, latency)
+                screeners = {
+                    f"s{i}": BenchScreener(data_fetcher=fetcher)
+                    for i in range(num_screeners)
+                }
+
+                # Warm the pool so its start-up is not timed
+                asyncio.run(concurrent_scan(screeners, tickers[:workers], runner))
+
+                slow_time, slow = _best_of(
+                    lambda: sequential_scan(screeners, tickers), rounds
+                )
+                fast_time, fast = _best_of(
+                    lambda: concurrent_scan(screeners, tickers, runner), rounds
+                )
+                # Sanity check: same signals either way
+                assert {k: [s["ticker"] for s in v] for k, v in slow.items()} == {
+                    k: [s["ticker"] for s in v] for k, v in fast.items()
+                }
+                print(
+                    f"{num_screeners:>10} {num_tickers:>8} {slow_time:>15.2f} "
+                    f"{fast_time:>15.2f} {slow_time / fast_time:>7.1f}x"
+                )
+    finally:
+        runner.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark sequential vs concurrent screener scans"
+    )
+    parser.add_argument("--screeners", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--tickers", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--latency", type=float, default=0.5, help="Simulated seconds per fetch"
+    )
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.screeners, args.tickers, args.workers, args.latency, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Session Kernels Microbenchmark
+==============================
+
+Times the intraday session analytics used by the Gap & Go and ORB screeners
+(pre-market slice, 5-day early volume, previous close, 10-day average daily
+volume) three ways:
+
+- pandas: per-ticker to_datetime / between_time / groupby reductions
+- kernels: utils.helpers wrappers over utils.session_kernels, one ticker at a time
+- panel: one stacked utils.session_kernels call over the whole universe
+
+Frames are synthetic and built in memory with their timestamps already parsed
+into a DatetimeIndex (as the screeners do once per ticker), so only the
+session analytics CPU is measured.
+
+Usage:
+    python benchmarks/session_kernels_benchmark.py --universes 50 200 --days 10
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.helpers import (  # noqa: E402
+    calculate_avg_daily_volume,
+    calculate_avg_early_volume,
+    get_premarket_data,
+    get_previous_day_close,
+)
+from utils.session_kernels import (  # noqa: E402
+    PREMARKET_START,
+    REGULAR_OPEN,
+    average_daily_volume,
+    average_early_volume,
+    previous_close,
+    stack_frames,
+    wall_clock,
+    window_mask,
+)
+
+AS_OF = date(2025, 4, 1)
+
+
+def _make_frames(num_tickers, days):
+    rng = np.random.default_rng(42)
+    index = pd.DatetimeIndex([], tz="America/New_York")
+    for day in pd.bdate_range(end="2025-03-31", periods=days):
+        index = index.append(
+            pd.date_range(
+                day + pd.Timedelta("04:00:00"),
+                day + pd.Timedelta("20:00:00"),
+                freq="1min",
+                tz="America/New_York",
+            )
+        )
+    timestamps = index.tz_convert("UTC").strftime("%Y-%m-%d %H:%M:%S%z")
+    daily_timestamps = pd.bdate_range(end="2025-03-31", periods=250).strftime(
+        "%Y-%m-%d"
+    )
+    intraday_index = pd.DatetimeIndex(pd.to_datetime(timestamps))
+    daily_index = pd.DatetimeIndex(pd.to_datetime(daily_timestamps))
+
+    intraday, daily = {}, {}
+    for i in range(num_tickers):
+        close = 50 + rng.standard_normal(len(index)).cumsum() * 0.02
+        intraday[f"T{i:04d}"] = pd.DataFrame(
+            {
+                "timestamp": timestamps,
+                "high": close + 0.05,
+                "low": close - 0.05,
+                "close": close,
+                "volume": rng.integers(100, 10_000, len(index)).astype(float),
+            },
+            index=intraday_index,
+        )
+        daily[f"T{i:04d}"] = pd.DataFrame(
+            {
+                "timestamp": daily_timestamps,
+                "close": 50 + rng.standard_normal(250).cumsum(),
+                "volume": rng.integers(100_000, 1_000_000, 250).astype(float),
+            },
+            index=daily_index,
+        )
+    return intraday, daily
+
+
+def pandas_session_stats(intraday, daily):
+    """Per-ticker pandas reference implementation."""
+    results = {}
+    for ticker, df in intraday.items():
+        df = df.tz_convert("America/New_York")
+        premarket = df.between_time("04:00", "09:29")
+        early = df.between_time("09:30", "09:44")
+        early_volume = early.groupby(early.index.date)["volume"].mean().tail(5).mean()
+
+        day_df = daily[ticker]
+        history = day_df[day_df.index.date < AS_OF]
+        results[ticker] = (
+            premarket["volume"].sum(),
+            early_volume,
+            history["close"].iloc[-1],
+            history["volume"].tail(10).mean(),
+        )
+    return results
+
+
+def kernel_session_stats(intraday, daily):
+    """The helpers wrappers, one ticker at a time."""
+    results = {}
+    for ticker, df in intraday.items():
+        results[ticker] = (
+            get_premarket_data(df)["volume"].sum(),
+            calculate_avg_early_volume(df, days=5),
+            get_previous_day_close(daily[ticker], as_of=AS_OF),
+            calculate_avg_daily_volume(daily[ticker], 10, as_of=AS_OF),
+        )
+    return results
+
+
+def panel_session_stats(intraday, daily):
+    """One stacked kernel call per statistic over the whole universe."""
+    tickers, ids, utc, fields = stack_frames(intraday, fields=("volume",))
+    wall = wall_clock(utc)
+    n = len(tickers)
+    premarket = window_mask(wall, PREMARKET_START, REGULAR_OPEN)
+    premarket_volume = np.bincount(
+        ids[premarket], fields["volume"][premarket], minlength=n
+    )
+
+    _, daily_ids, daily_utc, daily_fields = stack_frames(
+        daily, fields=("close", "volume")
+    )
+    daily_wall = wall_clock(daily_utc)
+    return (
+        premarket_volume,
+        average_early_volume(wall, fields["volume"], 5, ticker_ids=ids, n_tickers=n),
+        previous_close(daily_wall, daily_fields["close"], AS_OF, daily_ids, n),
+        average_daily_volume(
+            daily_wall, daily_fields["volume"], 10, AS_OF, daily_ids, n
+        ),
+    )
+
+
+def _best_of(fn, intraday, daily, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(intraday, daily)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(universes=(50, 200), days=10, rounds=3):
+    """Print pandas vs kernel vs panel timings for each universe size."""
+    print(
+        f"{'tickers':>8} {'pandas (s)':>11} {'kernels (s)':>12} {'panel (s)':>10} "
+        f"{'speedup':>8}"
+    )
+    for num_tickers in universes:
+        intraday, daily = _make_frames(num_tickers, days)
+
+        # Sanity check: all three paths agree
+        reference = pandas_session_stats(intraday, daily)
+        kernels = kernel_session_stats(intraday, daily)
+        panel = panel_session_stats(intraday, daily)
+        for i, ticker in enumerate(intraday):
+            np.testing.assert_allclose(reference[ticker], kernels[ticker], rtol=1e-9)
+            np.testing.assert_allclose(
+                reference[ticker], [stat[i] for stat in panel], rtol=1e-9
+            )
+
+        pandas_time = _best_of(pandas_session_stats, intraday, daily, rounds)
+        kernel_time = _best_of(kernel_session_stats, intraday, daily, rounds)
+        panel_time = _best_of(panel_session_stats, intraday, daily, rounds)
+        print(
+            f"{num_tickers:>8} {pandas_time:>11.3f} {kernel_time:>12.3f} "
+            f"{panel_time:>10.3f} {pandas_time / panel_time:>7.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the session analytics kernels"
+    )
+    parser.add_argument("--universes", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.universes, args.days, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
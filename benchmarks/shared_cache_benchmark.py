@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Shared Cache Benchmark
+======================
+
+Times repeated screener runs, each in a fresh process as the orchestrator
+launches them, reading the same 1-minute bar objects:
+
+- spaces: every run starts with an empty cache and reads each object from
+  Spaces (the previous behaviour of read_df_from_s3 in a new job)
+- shared: runs read through utils.cache.SharedCache as the L2 of a
+  TieredCache. The first run is cold and fills it; later runs map the
+  frames its Arrow files hold
+
+Spaces reads are simulated with a fixed per-object latency plus parsing the
+object's CSV; nothing touches the network.
+
+Usage:
+    python benchmarks/shared_cache_benchmark.py --objects 40 --runs 4 --latency 0.05
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.cache import SharedCache, TieredCache  # noqa: E402
+
+
+def _make_frame(seed, days=8):
+    """Extended-hours 1-min bars for `days` sessions."""
+    rng = np.random.default_rng(seed)
+    sessions = pd.bdate_range(end="2025-03-31", periods=days)
+    stamps = np.concatenate(
+        [
+            pd.date_range(
+                day + pd.Timedelta("08:00:00"),
+                day + pd.Timedelta("23:59:00"),
+                freq="1min",
+            )
+            for day in sessions
+        ]
+    )
+    close = 50 + rng.standard_normal(len(stamps)).cumsum() * 0.02
+    return pd.DataFrame(
+        {
+            "timestamp": pd.DatetimeIndex(stamps).strftime("%Y-%m-%d %H:%M:%S"),
+            "open": close,
+            "high": close + 0.05,
+            "low": close - 0.05,
+            "close": close,
+            "volume": rng.integers(100, 10_000, len(stamps)),
+        }
+    )
+
+
+def _read_from_spaces(spaces_dir, object_name, latency):
+    """Simulated Spaces GET: round-trip latency, then parse the CSV."""
+    time.sleep(latency)
+    return pd.read_csv(os.path.join(spaces_dir, object_name.replace("/", "__")))
+
+
+def _screener_run(mode, spaces_dir, shared_dir, names, latency, workers):
+    """
+    One screener job: read every object, touch its latest bar.
+
+    Runs in a fresh process.
+    """
+    start = time.perf_counter()
+    if mode == "shared":
+        cache = TieredCache(l2=SharedCache(shared_dir, sweep_interval_seconds=0))
+
+        def read(name):
+            return cache.get_or_refresh(
+                f"object_{name}",  # utils.data_storage.object_cache_key
+                lambda: _read_from_spaces(spaces_dir, name, latency),
+                ttl_seconds=3600,
+                cacheable=lambda df: not df.empty,
+                zero_copy=True,
+            )
+
+    else:
+
+        def read(name):
+            return _read_from_spaces(spaces_dir, name, latency)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        frames = list(executor.map(read, names))
+    for df in frames:
+        float(df["close"].iloc[-1])
+    return time.perf_counter() - start
+
+
+def run_benchmark(num_objects=40, runs=4, latency=0.05, workers=8):
+    """Print per-run read time with and without the shared cache."""
+    names = [f"data/intraday/T{i:03d}_1min.csv" for i in range(num_objects)]
+    # Every run is a new interpreter, as with orchestrator jobs
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as spaces_dir, tempfile.TemporaryDirectory(
+        dir="/dev/shm" if os.path.isdir("/dev/shm") else None
+    ) as shared_dir:
+        for i, name in enumerate(names):
+            _make_frame(i).to_csv(
+                os.path.join(spaces_dir, name.replace("/", "__")), index=False
+            )
+
+        print(
+            f"{num_objects} objects, {latency * 1000:.0f} ms simulated Spaces latency"
+        )
+        print(f"{'run':>4} {'spaces (s)':>11} {'shared (s)':>11} {'speedup':>8}")
+        for run in range(1, runs + 1):
+            timings = {}
+            for mode in ("spaces", "shared"):
+                with context.Pool(1) as pool:
+                    timings[mode] = pool.apply(
+                        _screener_run,
+                        (mode, spaces_dir, shared_dir, names, latency, workers),
+                    )
+            print(
+                f"{run:>4} {timings['spaces']:>11.3f} {timings['shared']:>11.3f} "
+                f"{timings['spaces'] / timings['shared']:>7.1f}x"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark repeated screener runs on the shared cache"
+    )
+    parser.add_argument("--objects", type=int, default=40)
+    parser.add_argument("--runs", type=int, default=4)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Simulated seconds per Spaces read"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=8, help="Concurrent reads per run"
+    )
+    args = parser.parse_args()
+    run_benchmark(args.objects, args.runs, args.latency, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Spaces Read Path Benchmark
+==========================
+
+Measures objects/sec for reading per-ticker CSV objects through
+utils.spaces_manager against a local S3 stand-in, comparing:
+
+- legacy: a new boto3 session + client per call and HEAD before every GET
+- pooled: the shared, keep-alive client and the single-GET read path
+
+The stand-in is a tiny threaded HTTP server that speaks just enough of the
+S3 protocol (path-style GET/HEAD/PUT) for boto3, so no network or moto
+install is needed.
+
+Usage:
+    python benchmarks/spaces_read_benchmark.py --objects 100 --rounds 3
+"""
+
+import argparse
+import io
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import boto3
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils import spaces_manager  # noqa: E402
+
+BUCKET = "benchmark-bucket"
+
+
+class _FakeS3Handler(BaseHTTPRequestHandler):
+    """Minimal path-style S3 handler backed by an in-memory dict."""
+
+    protocol_version = "HTTP/1.1"
+    objects = {}
+
+    def log_message(self, format, *args):  # noqa: A002 - stdlib signature
+        pass
+
+    def _key(self):
+        path = self.path.split("?", 1)[0]
+        return path.lstrip("/").split("/", 1)[-1]
+
+    def _send_missing(self, with_body):
+        body = (
+            b'<?xml version="1.0" encoding="UTF-8"?>'
+            b"<Error><Code>NoSuchKey</Code><Message>Not found</Message></Error>"
+        )
+        self.send_response(404)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(body) if with_body else 0))
+        self.end_headers()
+        if with_body:
+            self.wfile.write(body)
+
+    def _send_object(self, with_body):
+        data = self.objects.get(self._key())
+        if data is None:
+            self._send_missing(with_body)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", '"benchmark"')
+        self.end_headers()
+        if with_body:
+            self.wfile.write(data)
+
+    def do_HEAD(self):
+        self._send_object(with_body=False)
+
+    def do_GET(self):
+        self._send_object(with_body=True)
+
+    def do_PUT(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.objects[self._key()] = self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("ETag", '"benchmark"')
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+def _make_bar_csv(rows):
+    """Build a CSV payload shaped like a per-ticker 1-minute bar file."""
+    timestamps = pd.date_range("2024-01-02 14:30", periods=rows, freq="min", tz="UTC")
+    prices = 100 + np.random.default_rng(0).standard_normal(rows).cumsum()
+    df = pd.DataFrame(
+        {
+            "timestamp": timestamps.strftime("%Y-%m-%d %H:%M:%S+00:00"),
+            "open": prices,
+            "high": prices + 0.5,
+            "low": prices - 0.5,
+            "close": prices + 0.1,
+            "volume": np.full(rows, 1000),
+        }
+    )
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False)
+    return buffer.getvalue()
+
+
+def _legacy_download(object_name, endpoint_url):
+    """Reproduce the pre-pooling read path: fresh clients, HEAD then GET."""
+
+    def new_client():
+        return boto3.session.Session().client(
+            "s3",
+            region_name="nyc3",
+            endpoint_url=endpoint_url,
+            aws_access_key_id="benchmark",
+            aws_secret_access_key="benchmark",
+        )
+
+    new_client().head_object(Bucket=BUCKET, Key=object_name)
+    response = new_client().get_object(Bucket=BUCKET, Key=object_name)
+    return pd.read_csv(io.BytesIO(response["Body"].read()))
+
+
+def _time_reads(read_fn, keys, rounds):
+    """Return objects/sec for reading every key `rounds` times."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for key in keys:
+            read_fn(key)
+    elapsed = time.perf_counter() - start
+    return (len(keys) * rounds) / elapsed
+
+
+def run_benchmark(num_objects=100, rows=1000, rounds=3):
+    """
+    Run the legacy vs pooled read benchmark.
+
+    Args:
+        num_objects: Number of objects to seed in the stand-in bucket
+        rows: Rows per seeded CSV object
+        rounds: How many times each object is read per variant
+
+    Returns:
+        dict: objects/sec for each variant and the speedup
+    """
+    payload = _make_bar_csv(rows)
+    keys = [f"data/intraday/T{i:03d}_1min.csv" for i in range(num_objects)]
+    _FakeS3Handler.objects = {key: payload for key in keys}
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeS3Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        with patch.multiple(
+            spaces_manager,
+            SPACES_ACCESS_KEY_ID="benchmark",
+            SPACES_SECRET_ACCESS_KEY="benchmark",
+            SPACES_BUCKET_NAME=BUCKET,
+            SPACES_REGION="nyc3",
+            SPACES_ENDPOINT_URL=endpoint_url,
+            DEBUG_MODE=False,
+        ):
+            spaces_manager.reset_spaces_client()
+            legacy = _time_reads(
+                lambda key: _legacy_download(key, endpoint_url), keys, rounds
+            )
+            pooled = _time_reads(spaces_manager.download_dataframe, keys, rounds)
+            spaces_manager.reset_spaces_client()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return {
+        "legacy_objects_per_sec": legacy,
+        "pooled_objects_per_sec": pooled,
+        "speedup": pooled / legacy if legacy else float("inf"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Spaces read path")
+    parser.add_argument("--objects", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.objects, args.rows, args.rounds)
+    print(f"📦 {args.objects} objects x {args.rounds} rounds, {args.rows} rows each")
+    legacy = results["legacy_objects_per_sec"]
+    pooled = results["pooled_objects_per_sec"]
+    print(f"🐢 legacy (new client, HEAD+GET): {legacy:.1f} obj/s")
+    print(f"🚀 pooled (shared client, GET):   {pooled:.1f} obj/s")
+    print(f"📈 speedup: {results['speedup']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
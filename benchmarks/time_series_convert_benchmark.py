@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+JSON Time-Series Conversion Microbenchmark
+==========================================
+
+Times turning an Alpha Vantage JSON time series into a typed frame:
+
+- from_dict: DataFrame.from_dict(orient="index") (object columns), a
+  per-column pd.to_numeric and an unformatted pd.to_datetime of the index,
+  as the JSON clients used to do
+- vectorized: utils.api_payload.time_series_frame (preallocated float64
+  arrays, fixed-format timestamps, sorted DatetimeIndex)
+
+Payloads are synthetic: compact (100 bars) and full intraday (20 days of
+extended-hours 1-min bars), plus full daily history.
+
+Usage:
+    python benchmarks/time_series_convert_benchmark.py --rounds 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.api_payload import time_series_frame  # noqa: E402
+
+
+def _make_series(kind):
+    """JSON time series the way Alpha Vantage sends it (newest bar first)."""
+    rng = np.random.default_rng(5)
+    if kind == "daily":
+        index = pd.bdate_range(end="2025-03-31", periods=6000)
+        keys = index.strftime("%Y-%m-%d")
+    else:
+        days = pd.bdate_range(end="2025-03-31", periods=1 if kind == "compact" else 20)
+        index = pd.DatetimeIndex(
+            np.concatenate(
+                [
+                    pd.date_range(
+                        day + pd.Timedelta("04:00:00"),
+                        day + pd.Timedelta("19:59:00"),
+                        freq="1min",
+                    )
+                    for day in days
+                ]
+            )
+        )
+        if kind == "compact":
+            index = index[-100:]
+        keys = index.strftime("%Y-%m-%d %H:%M:%S")
+    close = 50 + rng.standard_normal(len(keys)).cumsum() * 0.02
+    volume = rng.integers(100, 10_000, len(keys))
+    return {
+        key: {
+            "1. open": f"{c:.4f}",
+            "2. high": f"{c + 0.05:.4f}",
+            "3. low": f"{c - 0.05:.4f}",
+            "4. close": f"{c:.4f}",
+            "5. volume": str(v),
+        }
+        for key, c, v in zip(keys[::-1], close[::-1], volume[::-1])
+    }
+
+
+def from_dict_convert(time_series, data_type):
+    """Previous object-dtype conversion."""
+    df = pd.DataFrame.from_dict(time_series, orient="index")
+    df.columns = [col.split(". ")[1] if ". " in col else col for col in df.columns]
+    for col in df.columns:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    df.index = pd.to_datetime(df.index)
+    return df.sort_index()
+
+
+def vectorized_convert(time_series, data_type):
+    """Shared converter."""
+    return time_series_frame(time_series, data_type)
+
+
+def _best_of(fn, time_series, data_type, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(time_series, data_type)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(rounds=5):
+    """Print from_dict vs vectorized timings per payload shape."""
+    print(
+        f"{'payload':>10} {'rows':>7} {'from_dict (ms)':>15} "
+        f"{'vectorized (ms)':>16} {'speedup':>8}"
+    )
+    for kind, data_type in (
+        ("compact", "intraday"),
+        ("full", "intraday"),
+        ("daily", "daily"),
+    ):
+        time_series = _make_series(kind)
+
+        # Sanity check: same values, same order
+        reference = from_dict_convert(time_series, data_type)
+        fast = vectorized_convert(time_series, data_type)
+        pd.testing.assert_frame_equal(
+            reference, fast, check_freq=False, check_index_type=False
+        )
+
+        slow_time = _best_of(from_dict_convert, time_series, data_type, rounds)
+        fast_time = _best_of(vectorized_convert, time_series, data_type, rounds)
+        print(
+            f"{kind:>10} {len(fast):>7} {slow_time * 1000:>15.2f} "
+            f"{fast_time * 1000:>16.2f} {slow_time / fast_time:>7.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark JSON time-series conversion"
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    run_benchmark(args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,13 @@ utilities and a standardized interface.
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 
 from core.di_container import inject, injectable
 from core.interfaces import DataFetcher, Screener
+from core.screener_runner import get_screener_runner
 from utils.market_time import detect_market_session, is_market_open
 
 logger = logging.getLogger(__name__)
@@ -22,6 +23,9 @@ logger = logging.getLogger(__name__)
 class BaseScreener(Screener):
     """Base implementation for trading screeners."""
 
+    # scan() accepts a prefetched snapshot shared across screeners
+    shares_snapshot = True
+
     def __init__(self, data_fetcher: Optional[DataFetcher] = None):
         self.data_fetcher = data_fetcher or inject(DataFetcher)
         self._last_scan_time: Optional[datetime] = None
@@ -37,12 +41,22 @@ class BaseScreener(Screener):
         """Default description."""
         return f"{self.name.title()} trading strategy screener"
 
-    async def scan(self, tickers: List[str], **kwargs) -> List[Dict[str, Any]]:
+    async def scan(
+        self,
+        tickers: List[str],
+        data: Optional[Dict[str, Tuple[Optional[pd.DataFrame], bool]]] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
         """
-        Default scan implementation that fetches data and calls screen_ticker.
+        Default scan implementation that fetches data and screens every ticker.
+
+        Tickers are screened concurrently by the shared ScreenerRunner, with
+        the per-ticker timeout applied (see core/screener_runner.py).
 
         Args:
             tickers: List of ticker symbols to scan
+            data: Prefetched {ticker: (df, success)} snapshot shared with other
+                screeners (fetched here when omitted)
             **kwargs: Additional parameters
 
         Returns:
@@ -62,29 +76,19 @@ class BaseScreener(Screener):
             return signals
 
         # Fetch data for all tickers
-        try:
-            data_results = await self.data_fetcher.fetch_multiple_tickers(
-                tickers=tickers,
-                data_type=self.get_data_type(),
-                interval=self.get_interval(),
-                max_concurrent=kwargs.get("max_concurrent", 5),
-            )
-        except Exception as e:
-            logger.error(f"Error fetching data for {self.name} scan: {e}")
-            return signals
-
-        # Screen each ticker
-        for ticker, (df, success) in data_results.items():
-            if not success or df is None or df.empty:
-                logger.debug(f"No data available for {ticker}")
-                continue
-
+        if data is None:
             try:
-                signal = await self.screen_ticker(ticker, df, **kwargs)
-                if signal and self.validate_signal(signal):
-                    signals.append(signal)
+                data = await self.data_fetcher.fetch_multiple_tickers(
+                    tickers=tickers,
+                    data_type=self.get_data_type(),
+                    interval=self.get_interval(),
+                    max_concurrent=kwargs.get("max_concurrent", 5),
+                )
             except Exception as e:
-                logger.error(f"Error screening {ticker}: {e}")
+                logger.error(f"Error fetching data for {self.name} scan: {e}")
+                return signals
+
+        signals = await get_screener_runner().screen(self, data, **kwargs)
 
         logger.info(f"{self.name} scan complete: {len(signals)} signals found")
         return signals
@@ -95,17 +99,78 @@ class BaseScreener(Screener):
         """
         Screen a single ticker for opportunities.
 
-        This method should be implemented by concrete screeners.
+        Concrete screeners implement either this method or the
+        prepare_ticker/evaluate_ticker pair, whose evaluation step can run
+        in a worker process.
+
+        Args:
+            ticker: Ticker symbol
+            df: Price data DataFrame
+            **kwargs: Additional parameters
+
+        Returns:
+            Signal dictionary if opportunity found, None otherwise
+        """
+        if not self.offloads_evaluation:
+            raise NotImplementedError("Subclasses must implement screen_ticker")
+
+        context = await self.prepare_ticker(ticker, df, **kwargs)
+        if context is None:
+            return None
+        return self.evaluate_ticker(ticker, df, context, **kwargs)
+
+    async def prepare_ticker(
+        self, ticker: str, df: pd.DataFrame, **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Gather what evaluate_ticker needs beyond the price data (I/O step).
+
+        Runs on the event loop; keep CPU work for evaluate_ticker.
 
         Args:
             ticker: Ticker symbol
             df: Price data DataFrame
             **kwargs: Additional parameters
 
+        Returns:
+            Context passed to evaluate_ticker (must be picklable), or None to
+            skip the ticker
+        """
+        return {}
+
+    def evaluate_ticker(
+        self, ticker: str, df: pd.DataFrame, context: Dict[str, Any], **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Evaluate a ticker synchronously (CPU step).
+
+        Implementing this lets the ScreenerRunner evaluate tickers in a
+        process pool. It runs on a copy of the screener without its data
+        fetcher, so it must not perform I/O.
+
+        Args:
+            ticker: Ticker symbol
+            df: Price data DataFrame
+            context: Result of prepare_ticker
+            **kwargs: Additional parameters
+
         Returns:
             Signal dictionary if opportunity found, None otherwise
         """
-        raise NotImplementedError("Subclasses must implement screen_ticker")
+        raise NotImplementedError("Subclasses may implement evaluate_ticker")
+
+    @property
+    def offloads_evaluation(self) -> bool:
+        """Whether this screener implements evaluate_ticker."""
+        return type(self).evaluate_ticker is not BaseScreener.evaluate_ticker
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes get the screener without its fetcher (sessions,
+        # locks) or cached frames; evaluate_ticker needs neither
+        state = self.__dict__.copy()
+        state["data_fetcher"] = None
+        state["_cached_data"] = {}
+        return state
 
     def validate_signal(self, signal: Dict[str, Any]) -> bool:
         """
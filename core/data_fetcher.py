@@ -17,7 +17,6 @@ Strategic Architecture Features:
 
 import json
 import logging
-import time
 from typing import Any, Dict, Optional, Tuple
 from urllib.parse import urlencode
 
@@ -25,7 +24,9 @@ import pandas as pd
 import requests
 
 # Configuration imports
+from utils.api_payload import time_series_frame
 from utils.config import ALPHA_VANTAGE_API_KEY
+from utils.rate_limiter import get_rate_limiter, is_throttled, request_cost
 from utils.timestamp_standardizer import apply_timestamp_standardization_to_api_data
 
 logger = logging.getLogger(__name__)
@@ -48,8 +49,7 @@ class UnifiedDataFetcher:
         """
         self.api_key = api_key or ALPHA_VANTAGE_API_KEY
         self.base_url = "https://www.alphavantage.co/query"
-        self.rate_limit_delay = 12.0  # 5 calls per minute for free tier
-        self.last_request_time = 0
+        self.rate_limiter = get_rate_limiter()
         
         if not self.api_key:
             logger.warning("Alpha Vantage API key not found - running in test mode")
@@ -82,19 +82,27 @@ class UnifiedDataFetcher:
             logger.warning(f"No API key available - returning test data for {ticker}")
             return self._generate_test_data(ticker, data_type, interval), True
         
-        # Rate limiting
-        self._apply_rate_limiting()
-        
         # Build API parameters dynamically
         params = self._build_api_params(ticker, data_type, interval, outputsize, **kwargs)
         
+        # Rate limiting
+        self._apply_rate_limiting(params)
+        
         try:
             # Make API request with comprehensive error handling
             response = requests.get(self.base_url, params=params, timeout=30)
+            if is_throttled(status_code=response.status_code):
+                self.rate_limiter.on_throttled()
+                logger.warning(f"Alpha Vantage rate limit hit for {ticker}: HTTP 429")
+                return None, False
             response.raise_for_status()
             data = response.json()
             
             # Validate API response
+            if is_throttled(data):
+                self.rate_limiter.on_throttled()
+            else:
+                self.rate_limiter.on_success()
             if not self._validate_api_response(data, ticker):
                 return None, False
             
@@ -286,20 +294,11 @@ class UnifiedDataFetcher:
         Returns:
             Standardized DataFrame
         """
-        # Convert to DataFrame
-        df = pd.DataFrame.from_dict(time_series, orient="index")
-        
-        # Rename columns (remove numeric prefixes)
-        df.columns = [col.split(". ")[1] if ". " in col else col for col in df.columns]
-        
-        # Convert values to float
-        for col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+        # Typed columns and a sorted DatetimeIndex in one pass (numeric prefixes removed)
+        df = time_series_frame(time_series, data_type=data_type)
         
         # Add timestamp and ticker columns
-        df.index = pd.to_datetime(df.index)
-        df = df.reset_index()
-        df.rename(columns={"index": "timestamp"}, inplace=True)
+        df = df.rename_axis("timestamp").reset_index()
         df["ticker"] = ticker
         
         # Apply timestamp standardization
@@ -307,17 +306,11 @@ class UnifiedDataFetcher:
         
         return df
     
-    def _apply_rate_limiting(self):
-        """Apply rate limiting to avoid API quota issues."""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        
-        if time_since_last_request < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last_request
-            logger.debug(f"Rate limiting: sleeping for {sleep_time:.1f} seconds")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+    def _apply_rate_limiting(self, params: Dict[str, Any]):
+        """Wait for the request's tokens in the shared Alpha Vantage bucket."""
+        waited = self.rate_limiter.acquire(request_cost(params))
+        if waited:
+            logger.debug(f"Rate limiting: waited {waited:.1f} seconds")
     
     def _generate_test_data(
         self, ticker: str, data_type: str, interval: str
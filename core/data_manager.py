@@ -37,7 +37,10 @@ from utils.config import (
     DEBUG_MODE
 )
 from utils.data_storage import save_df_to_s3, read_df_from_s3
+from utils.gap_healing import fill_gaps, find_gaps, heal_summary, plan_heal_requests
 from utils.helpers import apply_data_retention, is_today_present_enhanced
+from utils.manifest import get_manifest
+from utils.resample import interval_minutes
 
 logger = logging.getLogger(__name__)
 
@@ -176,14 +179,19 @@ class IntelligentDataManager:
         Intelligent decision logic for full vs compact fetch.
         
         Considers file size, data gaps, and update frequency to make
-        optimal fetch decisions.
+        optimal fetch decisions. The dataset manifest answers size and
+        coverage for the cloud object without downloading it; local files
+        are used when the object is not catalogued.
         """
         if force_full:
             return "full"
         
-        # Check current file size
-        file_path = self._get_data_file_path(ticker, interval, data_type)
-        file_size_mb = self._get_file_size_mb(file_path)
+        entry = self._get_manifest_entry(ticker, interval, data_type)
+        if entry is not None:
+            file_size_mb = int(entry.get('byte_size', 0)) / (1024 * 1024)
+        else:
+            file_path = self._get_data_file_path(ticker, interval, data_type)
+            file_size_mb = self._get_file_size_mb(file_path)
         
         logger.debug(f"Current file size for {ticker}: {file_size_mb:.2f} MB")
         
@@ -193,7 +201,10 @@ class IntelligentDataManager:
             return "compact"
         
         # Check data coverage and gaps
-        coverage_ratio = self._calculate_data_coverage(ticker, interval, data_type)
+        if entry is not None:
+            coverage_ratio = self._calculate_manifest_coverage(entry, data_type)
+        else:
+            coverage_ratio = self._calculate_data_coverage(ticker, interval, data_type)
         
         if coverage_ratio < self.required_data_coverage:
             logger.info(f"📈 Data coverage {coverage_ratio:.2%} below threshold - using full fetch")
@@ -270,22 +281,7 @@ class IntelligentDataManager:
                 logger.info(f"No existing data for gap analysis: {ticker}")
                 return False
             
-            # Sort by timestamp
-            df = df.sort_values('timestamp')
-            
-            # Calculate time differences
-            if data_type.upper() == "INTRADAY":
-                expected_freq = "1min" if interval == "1min" else "30min"
-                max_gap = timedelta(minutes=30)  # Allow for market gaps
-            else:
-                expected_freq = "D"
-                max_gap = timedelta(days=3)  # Allow for weekends
-            
-            # Find gaps larger than expected
-            time_diffs = df['timestamp'].diff()
-            large_gaps = time_diffs > max_gap
-            
-            gap_count = large_gaps.sum()
+            gap_count = len(self._find_gap_ranges(df, interval, data_type))
             
             if gap_count > 0:
                 logger.info(f"🔍 Detected {gap_count} data gaps for {ticker}")
@@ -297,6 +293,34 @@ class IntelligentDataManager:
             logger.error(f"Error detecting data gaps for {ticker}: {e}")
             return False
     
+    def _find_gap_ranges(
+        self,
+        df: pd.DataFrame,
+        interval: str,
+        data_type: str
+    ) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Missing-bar ranges of a stored series.
+        
+        Intraday series are checked against the NYSE session grid (gaps of
+        30+ minutes); daily series against a 3-day spacing that allows for
+        weekends.
+        
+        Returns:
+            List of (first missing, last missing) timestamp ranges
+        """
+        if data_type.upper() == "INTRADAY":
+            min_missing = max(1, 30 // interval_minutes(interval))
+            return find_gaps(df['timestamp'], interval, min_missing=min_missing)
+        
+        timestamps = pd.to_datetime(df['timestamp']).sort_values().reset_index(drop=True)
+        time_diffs = timestamps.diff()
+        large_gaps = time_diffs[time_diffs > timedelta(days=3)].index
+        return [
+            (timestamps[i - 1] + timedelta(seconds=1), timestamps[i] - timedelta(seconds=1))
+            for i in large_gaps
+        ]
+    
     def _heal_data_gaps(
         self,
         ticker: str,
@@ -306,6 +330,11 @@ class IntelligentDataManager:
         """
         Self-healing: Repair detected data gaps.
         
+        Only the missing ranges are requested: recent intraday gaps through a
+        compact fetch, older ones through one month-sliced request per month
+        (see utils.gap_healing). Daily gaps fall back to a single full fetch.
+        The fetched bars inside the gaps are spliced into the stored series.
+        
         Returns:
             True if healing was successful
         """
@@ -319,25 +348,34 @@ class IntelligentDataManager:
                 logger.warning(f"No current data to heal for {ticker}")
                 return False
             
-            # Fetch fresh full data to fill gaps
-            fresh_df, success = self.data_fetcher.fetch_data(
-                ticker=ticker,
-                data_type=data_type,
-                interval=interval,
-                outputsize="full"
-            )
+            gaps = self._find_gap_ranges(current_df, interval, data_type)
+            if data_type.upper() == "INTRADAY":
+                requests = plan_heal_requests(gaps, interval)
+            else:
+                requests = [{"outputsize": "full", "month": None, "gaps": gaps}] if gaps else []
             
-            if not success or fresh_df is None:
+            if not requests:
+                logger.info(f"No fillable gaps for {ticker}")
+                return True
+            logger.info(f"🎯 Heal plan for {ticker}: {heal_summary(gaps, requests)}")
+            
+            def fetch(outputsize, month):
+                extra = {"month": month} if month else {}
+                fresh_df, success = self.data_fetcher.fetch_data(
+                    ticker=ticker,
+                    data_type=data_type,
+                    interval=interval,
+                    outputsize=outputsize,
+                    **extra
+                )
+                return fresh_df if success else None
+            
+            # Splice the fetched bars into the gaps (sorted merge)
+            combined_df, calls = fill_gaps(current_df, fetch, gaps, requests)
+            if combined_df is current_df:
                 logger.error(f"Failed to fetch healing data for {ticker}")
                 return False
             
-            # Merge and deduplicate
-            combined_df = pd.concat([current_df, fresh_df], ignore_index=True)
-            combined_df = combined_df.drop_duplicates(
-                subset=['timestamp', 'ticker'],
-                keep='last'
-            ).sort_values('timestamp')
-            
             # Apply retention policies
             healed_df = self._apply_retention_policies(combined_df, data_type)
             
@@ -347,7 +385,10 @@ class IntelligentDataManager:
             
             if local_success:
                 gap_reduction = len(healed_df) - len(current_df)
-                logger.info(f"✨ Self-healing completed for {ticker}: +{gap_reduction} records")
+                logger.info(
+                    f"✨ Self-healing completed for {ticker}: +{gap_reduction} records "
+                    f"({calls} API calls)"
+                )
                 return True
             else:
                 logger.error(f"Failed to save healed data for {ticker}")
@@ -484,6 +525,28 @@ class IntelligentDataManager:
         except Exception:
             return 0.0
     
+    def _calculate_manifest_coverage(self, entry: Dict, data_type: str) -> float:
+        """Estimate data coverage ratio from a manifest entry."""
+        try:
+            recent_days = 7
+            end_date = pd.Timestamp.now(tz=self.timezone)
+            start_date = end_date - timedelta(days=recent_days)
+            
+            max_ts = pd.Timestamp(entry['max_timestamp'])
+            min_ts = pd.Timestamp(entry['min_timestamp'])
+            if pd.isna(max_ts) or max_ts < start_date:
+                return 0.0
+            
+            # Bounded by both the row count and the time span actually covered
+            expected_records = recent_days * 390 if data_type.upper() == "INTRADAY" else recent_days
+            row_ratio = int(entry['row_count']) / expected_records
+            span_ratio = (max_ts - max(min_ts, start_date)) / (end_date - start_date)
+            
+            return max(0.0, min(row_ratio, span_ratio, 1.0))
+            
+        except Exception:
+            return 0.0
+    
     def _apply_retention_policies(self, df: pd.DataFrame, data_type: str) -> pd.DataFrame:
         """Apply data retention policies."""
         if data_type.upper() == "INTRADAY":
@@ -522,18 +585,33 @@ class IntelligentDataManager:
             logger.error(f"Error saving to local storage for {ticker}: {e}")
             return False
     
+    def _get_cloud_object_name(self, ticker: str, interval: str, data_type: str) -> str:
+        """Get the cloud object name for storing data."""
+        if data_type.upper() == "DAILY":
+            return f"data/daily/{ticker}.csv"
+        elif interval == "30min":
+            return f"data/intraday_30min/{ticker}.csv"
+        else:
+            return f"data/intraday/{ticker}.csv"
+    
+    def _get_manifest_entry(
+        self, ticker: str, interval: str, data_type: str
+    ) -> Optional[Dict]:
+        """Get the dataset manifest entry for the cloud object, if any."""
+        try:
+            return get_manifest().get_entry(
+                self._get_cloud_object_name(ticker, interval, data_type)
+            )
+        except Exception as e:
+            logger.debug(f"Manifest lookup failed for {ticker}: {e}")
+            return None
+    
     def _save_to_cloud_storage(
         self, df: pd.DataFrame, ticker: str, interval: str, data_type: str
     ) -> bool:
         """Save data to cloud storage."""
         try:
-            if data_type.upper() == "DAILY":
-                spaces_path = f"data/daily/{ticker}.csv"
-            elif interval == "30min":
-                spaces_path = f"data/intraday_30min/{ticker}.csv"
-            else:
-                spaces_path = f"data/intraday/{ticker}.csv"
-            
+            spaces_path = self._get_cloud_object_name(ticker, interval, data_type)
             return save_df_to_s3(df, spaces_path)
         except Exception as e:
             logger.error(f"Error saving to cloud storage for {ticker}: {e}")
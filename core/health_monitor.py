@@ -15,6 +15,7 @@ import aiohttp
 
 from core.config_manager import get_config
 from core.logging_system import get_logger
+from utils.rate_limiter import get_rate_limiter, is_throttled, request_cost
 
 logger = get_logger(__name__)
 
@@ -257,12 +258,19 @@ async def check_api_connectivity() -> Dict[str, Any]:
             url = "https://www.alphavantage.co/query"
             params = {"function": "GLOBAL_QUOTE", "symbol": "AAPL", "apikey": api_key}
 
+            # The probe spends from the same budget as the fetch jobs
+            rate_limiter = get_rate_limiter()
+            await rate_limiter.acquire_async(request_cost(params))
             async with session.get(url, params=params, timeout=10) as response:
+                if is_throttled(status_code=response.status):
+                    rate_limiter.on_throttled()
+                    return {"status": "warning", "message": "API rate limited"}
                 data = await response.json()
 
                 if "Error Message" in data:
                     return {"status": "critical", "message": "API returned error"}
-                elif "Note" in data:
+                elif is_throttled(data):
+                    rate_limiter.on_throttled()
                     return {"status": "warning", "message": "API rate limited"}
                 else:
                     return {"status": "healthy", "message": "API accessible"}
@@ -318,6 +326,7 @@ def check_cache_health() -> Dict[str, Any]:
         from utils.cache import get_cache
 
         cache = get_cache()
+        cache.publish_metrics()
         stats = cache.stats()
 
         utilization = stats["memory"]["utilization"]
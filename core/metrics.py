@@ -3,19 +3,34 @@ Metrics collection and monitoring system.
 
 This module provides comprehensive metrics collection for performance
 monitoring, alerting, and system optimization.
+
+Histograms (and the timers built on them) are streaming log-linear
+histograms: O(1) to record, bounded memory, windowed percentiles, real
+Prometheus _bucket series, and snapshots that merge across processes.
 """
 
 import json
+import math
 import time
-from collections import defaultdict, deque
+from collections import defaultdict
 from datetime import datetime, timedelta
 from threading import Lock
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from core.logging_system import get_logger
+from utils.config import (
+    HISTOGRAM_SIGNIFICANT_FIGURES,
+    HISTOGRAM_WINDOW_SECONDS,
+    HISTOGRAM_WINDOW_SLOTS,
+)
 
 logger = get_logger(__name__)
 
+# Prometheus le bounds of exported histograms (seconds, for timers)
+DEFAULT_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+# Quantiles exported for the sliding window
+WINDOW_QUANTILES = (0.5, 0.95, 0.99)
+
 
 class MetricType:
     """Metric type constants."""
@@ -100,61 +115,316 @@ class Gauge(Metric):
         return self.value
 
 
+class LogLinearHistogram:
+    """
+    Mergeable streaming histogram with log-linear buckets.
+
+    Each power of ten is split into linear buckets of significant_figures
+    digits (HDR-style): with 3 figures, 1.00-10.0 has buckets (1.00, 1.01],
+    (1.01, 1.02], ... so every recorded value is known to within 0.5%.
+    Recording is O(1), memory depends on the precision and the range of
+    values seen but not on how many were recorded, and two histograms of
+    the same precision merge by adding bucket counts. Values <= 0 share one
+    zero bucket; count, sum, min and max are exact.
+    """
+
+    def __init__(self, significant_figures: int = HISTOGRAM_SIGNIFICANT_FIGURES):
+        """
+        Args:
+            significant_figures: Digits of precision per bucket (1-5)
+        """
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        self.significant_figures = significant_figures
+        self._scale = 10 ** (significant_figures - 1)
+        self._per_decade = 9 * self._scale
+        self.buckets: Dict[int, int] = defaultdict(int)
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _bucket_index(self, value: float) -> int:
+        """Index of the bucket (lower, upper] holding a positive value."""
+        exponent = math.floor(math.log10(value))
+        mantissa = value / 10.0**exponent
+        # Rounding absorbs float error at bucket edges (e.g. 0.25 / 0.1)
+        sub = math.ceil(round((mantissa - 1.0) * self._scale, 6)) - 1
+        if sub < 0:
+            # Powers of ten are the upper edge of the decade below
+            exponent, sub = exponent - 1, self._per_decade - 1
+        return exponent * self._per_decade + sub
+
+    def bucket_bounds(self, index: int) -> Tuple[float, float]:
+        """(lower, upper] value range of a bucket."""
+        exponent, sub = divmod(index, self._per_decade)
+        base = 10.0**exponent
+        return base * (1 + sub / self._scale), base * (1 + (sub + 1) / self._scale)
+
+    def observe(self, value: float, count: int = 1) -> None:
+        """Record a value (count times)."""
+        if value > 0:
+            self.buckets[self._bucket_index(value)] += count
+        else:
+            self.zero_count += count
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LogLinearHistogram") -> None:
+        """Add another histogram's counts to this one."""
+        if other.significant_figures != self.significant_figures:
+            raise ValueError(
+                f"Cannot merge histograms of {other.significant_figures} and "
+                f"{self.significant_figures} significant figures"
+            )
+        for index, count in other.buckets.items():
+            self.buckets[index] += count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """
+        Value at quantile q (nearest rank), within the bucket precision.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Midpoint of the bucket holding the rank, clamped to [min, max]
+            (the exact max for the top rank)
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        if rank >= self.count:
+            return self.max
+        seen = self.zero_count
+        if rank <= seen:
+            return min(max(0.0, self.min), self.max)
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank <= seen:
+                lower, upper = self.bucket_bounds(index)
+                return min(max((lower + upper) / 2, self.min), self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds: List[float]) -> List[int]:
+        """
+        Number of values <= each bound, as in Prometheus' le buckets.
+
+        Exact when a bound is a bucket edge (every bound of DEFAULT_BUCKETS
+        is from 2 significant figures up).
+
+        Args:
+            bounds: Ascending upper bounds
+
+        Returns:
+            Cumulative count per bound
+        """
+        indices = sorted(self.buckets)
+        counts, seen, position = [], self.zero_count, 0
+        for bound in bounds:
+            if bound <= 0:
+                counts.append(self.zero_count if bound == 0 else 0)
+                continue
+            limit = self._bucket_index(bound)
+            while position < len(indices) and indices[position] <= limit:
+                seen += self.buckets[indices[position]]
+                position += 1
+            counts.append(seen)
+        return counts
+
+    def get_stats(self) -> Dict[str, float]:
+        """count, sum, mean, min, max and p50/p95/p99 ({'count': 0} when empty)."""
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable state (see from_dict)."""
+        return {
+            "significant_figures": self.significant_figures,
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "LogLinearHistogram":
+        """Rebuild a histogram saved with to_dict, e.g. by another process."""
+        histogram = cls(state["significant_figures"])
+        for index, count in state["buckets"].items():
+            histogram.buckets[int(index)] = count
+        histogram.zero_count = state["zero_count"]
+        histogram.count = state["count"]
+        histogram.sum = state["sum"]
+        if histogram.count:
+            histogram.min, histogram.max = state["min"], state["max"]
+        return histogram
+
+
 class Histogram(Metric):
-    """Histogram metric for tracking distributions."""
+    """
+    Histogram metric for tracking distributions.
+
+    Observations are recorded in O(1) into log-linear buckets
+    (LogLinearHistogram) instead of a sample buffer that had to be sorted
+    on every read. Statistics cover a sliding window made of window_slots
+    time slots aligned to the epoch, so windows line up across processes;
+    a lifetime histogram backs the Prometheus _bucket series. snapshot()
+    and merge_snapshot() combine histograms from several processes.
+    """
 
     def __init__(
         self,
         name: str,
         description: str = "",
         tags: Dict[str, str] = None,
-        max_samples: int = 1000,
+        window_seconds: float = HISTOGRAM_WINDOW_SECONDS,
+        window_slots: int = HISTOGRAM_WINDOW_SLOTS,
+        significant_figures: int = HISTOGRAM_SIGNIFICANT_FIGURES,
+        buckets: Optional[List[float]] = None,
     ):
+        """
+        Args:
+            name: Metric name
+            description: Help text
+            tags: Labels
+            window_seconds: Span of get_stats()
+            window_slots: Slots the window advances by (finer slots: smoother window)
+            significant_figures: Bucket precision
+            buckets: Prometheus le bounds (default: DEFAULT_BUCKETS)
+        """
         super().__init__(name, MetricType.HISTOGRAM, description, tags)
-        self.samples = deque(maxlen=max_samples)
+        self.window_seconds = window_seconds
+        self.window_slots = max(1, window_slots)
+        self.slot_seconds = window_seconds / self.window_slots
+        self.significant_figures = significant_figures
+        self.buckets = sorted(buckets or DEFAULT_BUCKETS)
+        self.cumulative = LogLinearHistogram(significant_figures)
+        # epoch slot number -> observations in that slot
+        self._slots: Dict[int, LogLinearHistogram] = {}
         self._lock = Lock()
 
+    def _slot(self, now: float) -> LogLinearHistogram:
+        """Histogram of the current slot, dropping slots that left the window."""
+        current = int(now // self.slot_seconds)
+        histogram = self._slots.get(current)
+        if histogram is None:
+            for old in [
+                slot for slot in self._slots if slot <= current - self.window_slots
+            ]:
+                del self._slots[old]
+            histogram = self._slots[current] = LogLinearHistogram(
+                self.significant_figures
+            )
+        return histogram
+
     def observe(self, value: float) -> None:
         """Record a value."""
         with self._lock:
-            self.samples.append((time.time(), value))
+            self._slot(time.time()).observe(value)
+            self.cumulative.observe(value)
             self.last_updated = datetime.now()
 
-    def get_stats(self) -> Dict[str, float]:
-        """Get histogram statistics."""
-        if not self.samples:
-            return {"count": 0}
-
-        values = [v for _, v in self.samples]
-        values.sort()
-
-        count = len(values)
-        total = sum(values)
-        mean = total / count
+    def window(self, window_seconds: Optional[float] = None) -> LogLinearHistogram:
+        """
+        Observations of the last window_seconds, merged into one histogram.
+
+        Args:
+            window_seconds: Span (default and maximum: the metric's window),
+                rounded up to whole slots
+
+        Returns:
+            LogLinearHistogram of the window
+        """
+        span = min(window_seconds or self.window_seconds, self.window_seconds)
+        slots = max(1, math.ceil(span / self.slot_seconds - 1e-9))
+        current = int(time.time() // self.slot_seconds)
+        merged = LogLinearHistogram(self.significant_figures)
+        with self._lock:
+            for slot, histogram in self._slots.items():
+                if current - slots < slot <= current:
+                    merged.merge(histogram)
+        return merged
 
-        # Percentiles
-        p50_idx = int(count * 0.5)
-        p95_idx = int(count * 0.95)
-        p99_idx = int(count * 0.99)
+    def get_stats(self, window_seconds: Optional[float] = None) -> Dict[str, float]:
+        """Get histogram statistics over a window (see window())."""
+        return self.window(window_seconds).get_stats()
 
-        return {
-            "count": count,
-            "sum": total,
-            "mean": mean,
-            "min": values[0],
-            "max": values[-1],
-            "p50": values[p50_idx],
-            "p95": values[p95_idx] if count > 20 else values[-1],
-            "p99": values[p99_idx] if count > 100 else values[-1],
-        }
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable state for merge_snapshot() in another process."""
+        with self._lock:
+            return {
+                "window_seconds": self.window_seconds,
+                "window_slots": self.window_slots,
+                "cumulative": self.cumulative.to_dict(),
+                "slots": {
+                    str(slot): histogram.to_dict()
+                    for slot, histogram in self._slots.items()
+                },
+            }
+
+    def merge_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """
+        Add another histogram's snapshot to this one.
+
+        Args:
+            snapshot: Result of snapshot() on a histogram with the same window
+                layout and precision
+
+        Raises:
+            ValueError: If the window layout or precision differs
+        """
+        if (snapshot["window_seconds"], snapshot["window_slots"]) != (
+            self.window_seconds,
+            self.window_slots,
+        ):
+            raise ValueError(f"Histogram {self.name}: snapshot window layout differs")
+        with self._lock:
+            self.cumulative.merge(LogLinearHistogram.from_dict(snapshot["cumulative"]))
+            current = int(time.time() // self.slot_seconds)
+            for slot, state in snapshot["slots"].items():
+                slot = int(slot)
+                if slot > current - self.window_slots:
+                    self._slots.setdefault(
+                        slot, LogLinearHistogram(self.significant_figures)
+                    ).merge(LogLinearHistogram.from_dict(state))
+            self.last_updated = datetime.now()
 
 
 class Timer(Metric):
     """Timer metric for measuring durations."""
 
-    def __init__(self, name: str, description: str = "", tags: Dict[str, str] = None):
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        tags: Dict[str, str] = None,
+        **histogram_options,
+    ):
         super().__init__(name, MetricType.TIMER, description, tags)
-        self.histogram = Histogram(f"{name}_duration", description, tags)
+        self.histogram = Histogram(
+            f"{name}_duration", description, tags, **histogram_options
+        )
         self.count = Counter(f"{name}_count", f"{description} - call count", tags)
 
     def time(self):
@@ -167,9 +437,9 @@ class Timer(Metric):
         self.count.increment()
         self.last_updated = datetime.now()
 
-    def get_stats(self) -> Dict[str, Any]:
-        """Get timer statistics."""
-        stats = self.histogram.get_stats()
+    def get_stats(self, window_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Get timer statistics over a window (see Histogram.window())."""
+        stats = self.histogram.get_stats(window_seconds)
         stats["total_calls"] = self.count.get_value()
         return stats
 
@@ -397,25 +667,101 @@ class MetricsCollector:
         for name, metric in self.metrics.items():
             # Add help comment
             lines.append(f"# HELP {name} {metric.description}")
-            lines.append(f"# TYPE {name} {metric.type}")
+            if isinstance(metric, (Counter, Gauge)):
+                lines.append(f"# TYPE {name} {metric.type}")
 
             # Add metric value(s)
             if isinstance(metric, (Counter, Gauge)):
                 tags_str = self._format_prometheus_tags(metric.tags)
                 lines.append(f"{name}{tags_str} {metric.get_value()}")
-            elif isinstance(metric, Histogram):
-                stats = metric.get_stats()
-                tags_str = self._format_prometheus_tags(metric.tags)
-                for stat_name, value in stats.items():
-                    lines.append(f"{name}_{stat_name}{tags_str} {value}")
-            elif isinstance(metric, Timer):
-                stats = metric.get_stats()
-                tags_str = self._format_prometheus_tags(metric.tags)
-                for stat_name, value in stats.items():
-                    lines.append(f"{name}_{stat_name}{tags_str} {value}")
+            elif isinstance(metric, (Histogram, Timer)):
+                histogram = (
+                    metric if isinstance(metric, Histogram) else metric.histogram
+                )
+                lines.extend(
+                    self._prometheus_histogram_lines(name, histogram, metric.tags)
+                )
 
         return "\n".join(lines)
 
+    def _prometheus_histogram_lines(
+        self, name: str, histogram: Histogram, tags: Dict[str, str]
+    ) -> List[str]:
+        """
+        Lifetime _bucket/_sum/_count series, then the window's quantiles.
+
+        The caller has written the HELP line; timers are exported as
+        histograms. Window quantiles form a separate summary family,
+        '<name>_window'.
+        """
+        lines = [f"# TYPE {name} histogram"]
+        lifetime = histogram.cumulative
+        with histogram._lock:
+            counts = lifetime.cumulative_counts(histogram.buckets)
+            total, count = lifetime.sum, lifetime.count
+        for bound, cumulative in zip(histogram.buckets, counts):
+            tags_str = self._format_prometheus_tags({**tags, "le": f"{bound:g}"})
+            lines.append(f"{name}_bucket{tags_str} {cumulative}")
+        tags_str = self._format_prometheus_tags({**tags, "le": "+Inf"})
+        lines.append(f"{name}_bucket{tags_str} {count}")
+        tags_str = self._format_prometheus_tags(tags)
+        lines.append(f"{name}_sum{tags_str} {total}")
+        lines.append(f"{name}_count{tags_str} {count}")
+
+        window = histogram.window()
+        lines.append(f"# TYPE {name}_window summary")
+        for q in WINDOW_QUANTILES:
+            tags_str = self._format_prometheus_tags({**tags, "quantile": f"{q:g}"})
+            lines.append(f"{name}_window{tags_str} {window.quantile(q)}")
+        tags_str = self._format_prometheus_tags(tags)
+        lines.append(f"{name}_window_sum{tags_str} {window.sum}")
+        lines.append(f"{name}_window_count{tags_str} {window.count}")
+        return lines
+
+    def histogram_snapshots(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Snapshots of every histogram and timer, to merge in another process.
+
+        Returns:
+            {metric name: Histogram.snapshot()} (JSON-serializable)
+        """
+        snapshots = {}
+        for name, metric in list(self.metrics.items()):
+            if isinstance(metric, Histogram):
+                snapshots[name] = {"type": metric.type, **metric.snapshot()}
+            elif isinstance(metric, Timer):
+                snapshots[name] = {"type": metric.type, **metric.histogram.snapshot()}
+        return snapshots
+
+    def merge_histogram_snapshots(self, snapshots: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Merge histogram_snapshots() taken in other processes into this collector.
+
+        Missing histograms and timers are registered with the snapshot's
+        window layout; a timer's call count grows by the merged observations.
+
+        Args:
+            snapshots: {metric name: snapshot}
+        """
+        for name, snapshot in snapshots.items():
+            layout = {
+                "window_seconds": snapshot["window_seconds"],
+                "window_slots": snapshot["window_slots"],
+                "significant_figures": snapshot["cumulative"]["significant_figures"],
+            }
+            if snapshot["type"] == MetricType.TIMER:
+                with self._lock:
+                    if name not in self.metrics:
+                        self.metrics[name] = Timer(name, **layout)
+                timer = self.metrics[name]
+                timer.histogram.merge_snapshot(snapshot)
+                timer.count.increment(snapshot["cumulative"]["count"])
+            else:
+                with self._lock:
+                    if name not in self.metrics:
+                        self.metrics[name] = Histogram(name, **layout)
+                self.metrics[name].merge_snapshot(snapshot)
+
     def _format_prometheus_tags(self, tags: Dict[str, str]) -> str:
         """Format tags for Prometheus export."""
         if not tags:
@@ -15,6 +15,8 @@ from typing import Any, Dict, List, Optional, Type
 
 from core.di_container import get_container
 from core.interfaces import Screener
+from core.screener_runner import get_screener_runner
+from utils.single_flight import get_single_flight
 
 logger = logging.getLogger(__name__)
 
@@ -275,27 +277,38 @@ class PluginManager:
         self, tickers: List[str], **kwargs
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
-        Run all registered screeners.
+        Run all registered screeners concurrently (see core/screener_runner.py).
 
         Args:
             tickers: List of tickers to scan
             **kwargs: Additional parameters for screeners
 
         Returns:
-            Dictionary mapping screener names to their results
+            Dictionary mapping screener names to their results ([] for a
+            screener that failed or timed out)
         """
-        results = {}
+        flights = get_single_flight().stats
+        before = flights.summary()
 
+        screeners = {}
+        results = {}
         for screener_name in self.registry.list_screeners():
             try:
-                screener_results = await self.run_screener(
-                    screener_name, tickers, **kwargs
-                )
-                results[screener_name] = screener_results
+                screeners[screener_name] = self.registry.get_screener(screener_name)
             except Exception as e:
                 logger.error(f"Error running screener {screener_name}: {e}")
                 results[screener_name] = []
 
+        # Concurrently, over one shared snapshot per (data_type, interval)
+        results.update(await get_screener_runner().run(screeners, tickers, **kwargs))
+
+        after = flights.summary()
+        logger.info(
+            "🔁 Shared data requests: "
+            f"executed={after['executed'] - before['executed']} "
+            f"coalesced={after['coalesced'] - before['coalesced']} "
+            f"memo_hits={after['memo_hits'] - before['memo_hits']}"
+        )
         return results
 
 
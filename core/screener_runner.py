@@ -0,0 +1,505 @@
+"""
+Concurrent screener execution.
+
+PluginManager.run_all_screeners used to await each screener in turn, and
+BaseScreener.scan awaited screen_ticker for one ticker after another. Each
+screener fetched its own copy of the universe, and the per-ticker pandas
+work ran on the event loop, so one slow ticker held up every ticker (and
+every screener) queued behind it.
+
+ScreenerRunner runs them concurrently:
+- screeners that need the same (data_type, interval) share one snapshot,
+  fetched once per run with fetch_multiple_tickers
+- screeners run side by side under asyncio.gather, each bounded by
+  SCREENER_TIMEOUT_SECONDS
+- per-ticker work runs with bounded concurrency, each ticker bounded by
+  SCREENER_TICKER_TIMEOUT_SECONDS
+- screeners that split their work into prepare_ticker (I/O, on the event
+  loop) and evaluate_ticker (CPU, synchronous) have the evaluation sent to
+  a process pool in chunks of SCREENER_CHUNK_SIZE tickers. Workers enforce
+  the per-ticker timeout with SIGALRM where available; the chunk as a whole
+  is bounded too. At most process_workers chunks are submitted at a time,
+  so a chunk's budget starts when a worker is free for it rather than while
+  it waits in the pool's queue. A screener that cannot be pickled into the
+  pool is evaluated in threads instead; a broken pool is restarted.
+
+Screeners that only implement an async screen_ticker are awaited on the
+loop; their timeout takes effect at the next await.
+
+get_screener_runner() returns the process-wide runner used by PluginManager
+and BaseScreener.scan.
+"""
+
+import asyncio
+import logging
+import pickle
+import signal
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from core.interfaces import Screener
+from utils.config import (
+    SCREENER_CHUNK_SIZE,
+    SCREENER_PROCESS_WORKERS,
+    SCREENER_TICKER_CONCURRENCY,
+    SCREENER_TICKER_TIMEOUT_SECONDS,
+    SCREENER_TIMEOUT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# (ticker, signal, error) as returned by _evaluate_chunk
+ChunkResult = Tuple[str, Optional[Dict[str, Any]], Optional[str]]
+
+TIMED_OUT = "timed out"
+
+
+class _TickerTimeout(BaseException):
+    """
+    Raised by SIGALRM inside a worker.
+
+    A BaseException, so screeners' `except Exception` cannot swallow it.
+    """
+
+
+def _raise_ticker_timeout(signum, frame):
+    raise _TickerTimeout()
+
+
+def _evaluate_chunk(
+    screener,
+    items: List[Tuple[str, pd.DataFrame, Any]],
+    kwargs: Dict[str, Any],
+    ticker_timeout: float,
+) -> List[ChunkResult]:
+    """
+    Run evaluate_ticker over a chunk of tickers (process-pool entry point).
+
+    Args:
+        screener: Screener instance (pickled without its data fetcher)
+        items: (ticker, df, context) per ticker
+        kwargs: Scan parameters passed through to evaluate_ticker
+        ticker_timeout: Seconds per ticker, enforced with SIGALRM when this
+            runs on a main thread with setitimer support (0: not enforced)
+
+    Returns:
+        (ticker, signal or None, error or None) per ticker
+    """
+    use_alarm = (
+        ticker_timeout > 0
+        and hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_ticker_timeout)
+
+    results = []
+    try:
+        for ticker, df, context in items:
+            try:
+                try:
+                    if use_alarm:
+                        signal.setitimer(signal.ITIMER_REAL, ticker_timeout)
+                    result = screener.evaluate_ticker(ticker, df, context, **kwargs)
+                finally:
+                    if use_alarm:
+                        signal.setitimer(signal.ITIMER_REAL, 0)
+                results.append((ticker, result, None))
+            except _TickerTimeout:
+                results.append((ticker, None, TIMED_OUT))
+            except Exception as e:
+                results.append((ticker, None, str(e) or type(e).__name__))
+    finally:
+        if use_alarm:
+            signal.signal(signal.SIGALRM, previous)
+    return results
+
+
+def _release_on(loop: asyncio.AbstractEventLoop, slots: asyncio.Semaphore):
+    """
+    Done-callback releasing a slot on its loop.
+
+    Executor futures finish on other threads, so the release is scheduled on
+    the loop that owns the semaphore.
+    """
+
+    def release(_future) -> None:
+        try:
+            loop.call_soon_threadsafe(slots.release)
+        except RuntimeError:
+            # The loop has closed; its semaphore is gone with it
+            pass
+
+    return release
+
+
+def _picklable(*objects) -> bool:
+    """Whether objects can be sent to a worker process."""
+    try:
+        pickle.dumps(objects)
+        return True
+    except Exception:
+        return False
+
+
+class ScreenerRunner:
+    """
+    Runs screeners concurrently over shared data.
+
+    Each screener and each ticker evaluation is bounded by its own timeout.
+    """
+
+    def __init__(
+        self,
+        screener_timeout: float = SCREENER_TIMEOUT_SECONDS,
+        ticker_timeout: float = SCREENER_TICKER_TIMEOUT_SECONDS,
+        ticker_concurrency: int = SCREENER_TICKER_CONCURRENCY,
+        process_workers: int = SCREENER_PROCESS_WORKERS,
+        chunk_size: int = SCREENER_CHUNK_SIZE,
+    ):
+        """
+        Args:
+            screener_timeout: Seconds a whole screener may run (0: unbounded)
+            ticker_timeout: Seconds per ticker (0: unbounded)
+            ticker_concurrency: Tickers screened at once per screener on the loop
+            process_workers: Process pool size for evaluate_ticker (0: threads)
+            chunk_size: Tickers per process-pool task
+        """
+        self.screener_timeout = screener_timeout
+        self.ticker_timeout = ticker_timeout
+        self.ticker_concurrency = max(1, ticker_concurrency)
+        self.process_workers = process_workers
+        self.chunk_size = max(1, chunk_size)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # Screener classes that cannot be pickled into the pool
+        self._no_offload: Set[type] = set()
+        # Process-pool slots per event loop (asyncio primitives belong to one loop)
+        self._pool_slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.process_workers <= 0:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.process_workers)
+            return self._pool
+
+    def _slots(self) -> asyncio.Semaphore:
+        """Semaphore bounding in-flight process-pool chunks on the running loop."""
+        loop = asyncio.get_running_loop()
+        slots = self._pool_slots.get(loop)
+        if slots is None:
+            slots = self._pool_slots[loop] = asyncio.Semaphore(
+                max(1, self.process_workers)
+            )
+        return slots
+
+    def _thread_executor(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(thread_name_prefix="screener-eval")
+            return self._threads
+
+    def _reset_pool(self) -> None:
+        """Drop the process pool (it is recreated on next use)."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """
+        Stop the process pool and evaluation threads.
+
+        Both are recreated on next use.
+        """
+        self._reset_pool()
+        with self._pool_lock:
+            threads, self._threads = self._threads, None
+        if threads is not None:
+            threads.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _snapshot_key(screener: Screener) -> Optional[Tuple[str, str]]:
+        """(data_type, interval) of a screener whose scan takes a shared snapshot."""
+        if not getattr(screener, "shares_snapshot", False):
+            return None
+        return screener.get_data_type(), screener.get_interval()
+
+    async def run(
+        self, screeners: Dict[str, Screener], tickers: List[str], **kwargs
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Run screeners concurrently over one data snapshot per (data_type, interval).
+
+        Args:
+            screeners: Screener instances by name
+            tickers: List of tickers to scan
+            **kwargs: Additional parameters for the screeners
+
+        Returns:
+            Dictionary mapping screener names to their signals ([] on error or timeout)
+        """
+        snapshots = await self._fetch_snapshots(
+            screeners, tickers, kwargs.get("max_concurrent", 5)
+        )
+        names = list(screeners)
+        outcomes = await asyncio.gather(
+            *(
+                self._run_screener(name, screeners[name], tickers, snapshots, kwargs)
+                for name in names
+            )
+        )
+        return dict(zip(names, outcomes))
+
+    async def _fetch_snapshots(
+        self, screeners: Dict[str, Screener], tickers: List[str], max_concurrent: int
+    ) -> Dict[Tuple[str, str], Dict[str, Tuple[Optional[pd.DataFrame], bool]]]:
+        """
+        Fetch each distinct (data_type, interval) once.
+
+        The first screener needing a key supplies the fetcher used for it.
+        """
+        fetchers = {}
+        for screener in screeners.values():
+            key = self._snapshot_key(screener)
+            if key is not None and key not in fetchers:
+                fetchers[key] = screener.data_fetcher
+
+        async def fetch(key, fetcher):
+            data_type, interval = key
+            return await fetcher.fetch_multiple_tickers(
+                tickers=tickers,
+                data_type=data_type,
+                interval=interval,
+                max_concurrent=max_concurrent,
+            )
+
+        keys = list(fetchers)
+        results = await asyncio.gather(
+            *(fetch(key, fetchers[key]) for key in keys), return_exceptions=True
+        )
+        snapshots = {}
+        for key, result in zip(keys, results):
+            if isinstance(result, BaseException):
+                # Screeners of this group fall back to fetching for themselves
+                logger.error(f"Error fetching shared {key[0]}/{key[1]} data: {result}")
+                continue
+            snapshots[key] = result
+        logger.info(
+            f"📦 Shared data snapshots: {len(snapshots)} for {len(screeners)} screeners"
+        )
+        return snapshots
+
+    async def _run_screener(
+        self, name, screener, tickers, snapshots, kwargs
+    ) -> List[Dict[str, Any]]:
+        key = self._snapshot_key(screener)
+        if key is not None and key in snapshots:
+            scan = screener.scan(tickers, data=snapshots[key], **kwargs)
+        else:
+            scan = screener.scan(tickers, **kwargs)
+
+        logger.info(f"Running screener: {name} on {len(tickers)} tickers")
+        try:
+            results = await asyncio.wait_for(scan, self.screener_timeout or None)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"⏱️ Screener {name} timed out after {self.screener_timeout:g}s"
+            )
+            return []
+        except Exception as e:
+            logger.error(f"Error running screener {name}: {e}")
+            return []
+        logger.info(f"Screener {name} found {len(results)} opportunities")
+        return results
+
+    async def screen(
+        self,
+        screener,
+        data_results: Dict[str, Tuple[Optional[pd.DataFrame], bool]],
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Screen every ticker of a snapshot.
+
+        Args:
+            screener: BaseScreener instance
+            data_results: {ticker: (df, success)} as returned by fetch_multiple_tickers
+            **kwargs: Additional parameters passed to the screener
+
+        Returns:
+            Valid signals, in snapshot order
+        """
+        frames = []
+        for ticker, (df, success) in data_results.items():
+            if not success or df is None or df.empty:
+                logger.debug(f"No data available for {ticker}")
+                continue
+            frames.append((ticker, df))
+
+        if screener.offloads_evaluation:
+            contexts = await self._bounded(
+                frames, lambda ticker, df: screener.prepare_ticker(ticker, df, **kwargs)
+            )
+            items = [
+                (ticker, df, contexts[ticker])
+                for ticker, df in frames
+                if contexts[ticker] is not None
+            ]
+            results = await self._evaluate(screener, items, kwargs)
+        else:
+            results = await self._bounded(
+                frames, lambda ticker, df: screener.screen_ticker(ticker, df, **kwargs)
+            )
+
+        signals = []
+        for ticker, _ in frames:
+            signal_ = results.get(ticker)
+            if signal_ and screener.validate_signal(signal_):
+                signals.append(signal_)
+        return signals
+
+    async def _bounded(self, frames, make) -> Dict[str, Any]:
+        """
+        Await make(ticker, df) per ticker.
+
+        Concurrency is bounded and each ticker gets the per-ticker timeout.
+        """
+        semaphore = asyncio.Semaphore(self.ticker_concurrency)
+
+        async def one(ticker, df):
+            async with semaphore:
+                try:
+                    return ticker, await asyncio.wait_for(
+                        make(ticker, df), self.ticker_timeout or None
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        f"⏱️ {ticker} timed out after {self.ticker_timeout:g}s"
+                    )
+                except Exception as e:
+                    logger.error(f"Error screening {ticker}: {e}")
+                return ticker, None
+
+        return dict(await asyncio.gather(*(one(ticker, df) for ticker, df in frames)))
+
+    async def _evaluate(
+        self, screener, items, kwargs
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        evaluate_ticker over all items, chunked into the process pool.
+
+        Chunks fall back to threads when the pool cannot run them.
+        """
+        chunks = [
+            items[i : i + self.chunk_size]
+            for i in range(0, len(items), self.chunk_size)
+        ]
+        chunk_results = await asyncio.gather(
+            *(self._evaluate_chunk(screener, chunk, kwargs) for chunk in chunks)
+        )
+
+        results = {}
+        for ticker, signal_, error in (row for rows in chunk_results for row in rows):
+            if error == TIMED_OUT:
+                logger.warning(f"⏱️ {ticker} timed out after {self.ticker_timeout:g}s")
+            elif error is not None:
+                logger.error(f"Error screening {ticker}: {error}")
+            results[ticker] = signal_
+        return results
+
+    async def _run_chunk(
+        self,
+        executor: Executor,
+        screener,
+        chunk,
+        kwargs,
+        ticker_timeout: float,
+        slots: Optional[asyncio.Semaphore] = None,
+    ) -> List[ChunkResult]:
+        """
+        _evaluate_chunk on an executor, bounded by the chunk budget.
+
+        With slots, the chunk is submitted only once a slot is free and holds
+        it until the executor finishes the task, even after a timeout, so the
+        budget of the next chunk starts when a worker is actually free.
+        """
+        # Backstop for the whole chunk (per-ticker alarms may be unavailable)
+        budget = self.ticker_timeout * (len(chunk) + 1) if self.ticker_timeout else None
+        if slots is not None:
+            await slots.acquire()
+        try:
+            future = executor.submit(
+                _evaluate_chunk, screener, chunk, kwargs, ticker_timeout
+            )
+        except BaseException:
+            if slots is not None:
+                slots.release()
+            raise
+        if slots is not None:
+            future.add_done_callback(_release_on(asyncio.get_running_loop(), slots))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), budget)
+        except asyncio.TimeoutError:
+            return [(ticker, None, TIMED_OUT) for ticker, _, _ in chunk]
+
+    async def _evaluate_chunk(self, screener, chunk, kwargs) -> List[ChunkResult]:
+        pool = None if type(screener) in self._no_offload else self._executor()
+        if pool is not None:
+            try:
+                # The pool queues (and reports running) more tasks than it has
+                # workers, so in-flight chunks are limited to one per worker
+                return await self._run_chunk(
+                    pool,
+                    screener,
+                    chunk,
+                    kwargs,
+                    self.ticker_timeout,
+                    slots=self._slots(),
+                )
+            except BrokenProcessPool as e:
+                # A worker died; the pool is recreated for the next chunk
+                logger.warning(
+                    f"⚠️ Process pool broke running {screener.name} ({e}); "
+                    "restarting it"
+                )
+                self._reset_pool()
+            except Exception as e:
+                # Per-ticker errors are caught in the worker; this is pickling
+                # or transport
+                if _picklable(screener, chunk, kwargs):
+                    logger.warning(
+                        f"⚠️ Process pool failed for {screener.name} ({e}); "
+                        "using threads"
+                    )
+                else:
+                    logger.warning(
+                        f"⚠️ {screener.name} cannot run in the process pool "
+                        f"({e}); using threads"
+                    )
+                    self._no_offload.add(type(screener))
+
+        return await self._run_chunk(
+            self._thread_executor(), screener, chunk, kwargs, 0
+        )
+
+
+_screener_runner: Optional[ScreenerRunner] = None
+_screener_runner_lock = threading.Lock()
+
+
+def get_screener_runner() -> ScreenerRunner:
+    """Process-wide ScreenerRunner shared by PluginManager and BaseScreener.scan."""
+    global _screener_runner
+    with _screener_runner_lock:
+        if _screener_runner is None:
+            _screener_runner = ScreenerRunner()
+        return _screener_runner
@@ -14,18 +14,19 @@ try:
     # Import unified ticker and config management functions
     from utils.helpers import (
         read_config_from_s3,
-        read_df_from_s3,
         read_master_tickerlist,
         save_config_to_s3,
         save_list_to_s3,
     )
+    from utils.data_storage import read_df_cached
+    from utils.manifest import get_manifest
 except ImportError:
     st.error(
         "Fatal Error: Could not import helper functions from `utils.helpers`. The app cannot function without them."
     )
 
-# Create cached wrapper for data loading functions to improve performance
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+# Bar files are read through the shared cache, which the orchestrator's jobs
+# and every dashboard session warm, instead of a per-page st.cache_data copy
 def cached_read_df_from_s3(object_name: str) -> pd.DataFrame:
     """
     Cached wrapper for read_df_from_s3 to improve dashboard performance.
@@ -36,9 +37,24 @@ def cached_read_df_from_s3(object_name: str) -> pd.DataFrame:
     Returns:
         DataFrame if successful, empty DataFrame otherwise
     """
-    return read_df_from_s3(object_name)
+    return read_df_cached(object_name)
     st.stop()
 
+
+@st.cache_data(ttl=60)  # Cache for 1 minute
+def cached_load_manifest() -> pd.DataFrame:
+    """
+    Cached wrapper for the dataset manifest (a single GET for all tickers).
+
+    Returns:
+        Manifest DataFrame, empty if unavailable
+    """
+    try:
+        return get_manifest().load(refresh=True)
+    except Exception:
+        return pd.DataFrame()
+
+
 # --- Page Configuration ---
 st.set_page_config(page_title="System Settings", layout="wide")
 
@@ -323,3 +339,44 @@ with st.expander("🔬 Raw Data Viewer", expanded=False):
             else:
                 st.warning(f"⚠️ No intraday data found for **{selected_ticker}** at `{intraday_file_path}`")
                 st.info("💡 Intraday data is typically generated by running `fetch_intraday_compact.py` or the data fetching jobs.")
+
+
+# --- Dataset Manifest ---
+st.markdown("---")
+with st.expander("📒 Dataset Manifest", expanded=False):
+    st.write(
+        "Row counts, coverage and sizes for every stored bar object, read from the "
+        "dataset manifest without downloading the objects themselves."
+    )
+
+    manifest_df = cached_load_manifest()
+    if manifest_df.empty:
+        st.info("💡 The manifest is empty - it is populated as the data jobs write bar objects.")
+    else:
+        interval_filter = st.multiselect(
+            "Intervals",
+            options=sorted(manifest_df["interval"].dropna().unique()),
+            default=None,
+        )
+        view_df = manifest_df
+        if interval_filter:
+            view_df = view_df[view_df["interval"].isin(interval_filter)]
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Objects", len(view_df))
+        with col2:
+            st.metric("Tickers", view_df["ticker"].nunique())
+        with col3:
+            st.metric("Total Size", f"{view_df['byte_size'].sum() / (1024 * 1024):.1f} MB")
+
+        if current_tickers:
+            missing = sorted(set(current_tickers) - set(view_df["ticker"]))
+            if missing:
+                st.warning(f"⚠️ Tickers without catalogued data: {', '.join(missing)}")
+
+        st.dataframe(
+            view_df.drop(columns=["content_hash"], errors="ignore"),
+            use_container_width=True,
+            hide_index=True,
+        )
@@ -9,7 +9,6 @@ Used for AVWAP anchors and swing analysis.
 import logging
 import os
 import sys
-import time
 from datetime import datetime, timedelta
 
 import pandas as pd
@@ -19,6 +18,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from utils.alpha_vantage_api import get_daily_data
 from utils.helpers import read_master_tickerlist, save_df_to_s3, update_scheduler_status
+from utils.manifest import get_manifest
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -46,36 +46,37 @@ def fetch_daily_data():
     successful_fetches = 0
     total_tickers = len(tickers)
 
-    for ticker in tickers:
-        logger.info(f"🔄 Fetching daily data for {ticker}")
-
-        try:
-            # Fetch daily data with full history
-            daily_df = get_daily_data(ticker, outputsize="full")
-
-            if not daily_df.empty:
-                # Take exactly 200 rows as specified
-                daily_df = daily_df.head(200)
-
-                # Save to Spaces with correct path format
-                file_path = f"data/daily/{ticker}_daily.csv"
-                upload_success = save_df_to_s3(daily_df, file_path)
-
-                if upload_success:
-                    successful_fetches += 1
-                    logger.info(
-                        f"✅ {ticker}: Saved {len(daily_df)} rows of daily data"
-                    )
+    # One manifest commit for the whole run instead of one per ticker
+    with get_manifest().batch():
+        for ticker in tickers:
+            logger.info(f"🔄 Fetching daily data for {ticker}")
+
+            try:
+                # Fetch daily data with full history
+                daily_df = get_daily_data(ticker, outputsize="full")
+
+                if not daily_df.empty:
+                    # Take exactly 200 rows as specified
+                    daily_df = daily_df.head(200)
+
+                    # Save to Spaces with correct path format
+                    file_path = f"data/daily/{ticker}_daily.csv"
+                    upload_success = save_df_to_s3(daily_df, file_path)
+
+                    if upload_success:
+                        successful_fetches += 1
+                        logger.info(
+                            f"✅ {ticker}: Saved {len(daily_df)} rows of daily data"
+                        )
+                    else:
+                        logger.error(
+                            f"❌ {ticker}: Failed to upload daily data to Spaces"
+                        )
                 else:
-                    logger.error(f"❌ {ticker}: Failed to upload daily data to Spaces")
-            else:
-                logger.warning(f"⚠️ {ticker}: No daily data returned from API")
-
-        except Exception as e:
-            logger.error(f"❌ {ticker}: Error fetching daily data - {e}")
+                    logger.warning(f"⚠️ {ticker}: No daily data returned from API")
 
-        # Respect API rate limits (150 requests/minute = ~2.5 seconds between requests)
-        time.sleep(1)
+            except Exception as e:
+                logger.error(f"❌ {ticker}: Error fetching daily data - {e}")
 
     logger.info(f"📋 Daily Data Fetch Job Completed")
     logger.info(f"   Success: {successful_fetches}/{total_tickers} tickers")
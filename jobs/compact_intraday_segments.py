@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Intraday Delta Segment Compaction Job
+=====================================
+
+DataFetchManager appends new 1-minute bars as small delta segments beside an
+immutable base object (see utils/spaces_manager.write_delta_segment). This
+job periodically folds those segments back into the base:
+1. Discovers every ticker with pending segments under intraday_1min/_deltas/
+2. Reads the base plus the listed segments and merges them
+3. Applies the rolling retention window (8 days = 7 days + today)
+4. Rewrites the base object, then deletes exactly the segments it folded in
+
+Segments written while compaction runs are not in the folded list, so they
+survive and are picked up by the next run.
+"""
+
+import logging
+import os
+import sys
+from datetime import timedelta
+from typing import List, Optional
+
+import pandas as pd
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.config import SPACES_BUCKET_NAME
+from utils.helpers import update_scheduler_status
+from utils.manifest import get_manifest
+from utils.spaces_manager import (
+    DELTA_DIRECTORY,
+    delete_objects,
+    get_spaces_client,
+    list_delta_segments,
+    read_segmented_dataframe,
+)
+from utils.storage_format import write_bars
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+INTRADAY_1MIN_DIRECTORY = "intraday_1min"
+RETENTION_DAYS = 8  # 7 days + today
+
+
+def prune_to_retention(
+    df: pd.DataFrame, retention_days: int = RETENTION_DAYS
+) -> pd.DataFrame:
+    """
+    Keep only rows inside the rolling retention window.
+
+    Args:
+        df: DataFrame with a 'timestamp' column
+        retention_days: Number of days to keep
+
+    Returns:
+        Pruned DataFrame
+    """
+    if df.empty or "timestamp" not in df.columns:
+        return df
+
+    timestamps = pd.to_datetime(df["timestamp"], utc=True)
+    cutoff = pd.Timestamp.now(tz="UTC") - timedelta(days=retention_days)
+    return df[timestamps >= cutoff]
+
+
+def find_tickers_with_segments(directory: str = INTRADAY_1MIN_DIRECTORY) -> List[str]:
+    """
+    Discover tickers that have pending delta segments.
+
+    Args:
+        directory: Base object directory
+
+    Returns:
+        List of ticker symbols
+    """
+    client = get_spaces_client()
+    if not client:
+        return []
+
+    prefix = f"{directory}/{DELTA_DIRECTORY}/"
+    tickers = []
+    paginator = client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(
+        Bucket=SPACES_BUCKET_NAME, Prefix=prefix, Delimiter="/"
+    ):
+        for common_prefix in page.get("CommonPrefixes", []):
+            tickers.append(common_prefix["Prefix"][len(prefix) :].rstrip("/"))
+    return tickers
+
+
+def compact_ticker(
+    ticker: str,
+    directory: str = INTRADAY_1MIN_DIRECTORY,
+    retention_days: int = RETENTION_DAYS,
+) -> bool:
+    """
+    Fold a ticker's delta segments into its base object.
+
+    Args:
+        ticker: Stock ticker symbol
+        directory: Base object directory
+        retention_days: Rolling retention window applied to the new base
+
+    Returns:
+        bool: True if compaction succeeded or there was nothing to do
+    """
+    base_object = f"{directory}/{ticker}.csv"
+    segments = list_delta_segments(base_object)
+    if not segments:
+        logger.debug(f"⏭️ {ticker}: No delta segments to compact")
+        return True
+
+    merged = read_segmented_dataframe(base_object, segments=segments)
+    pre_prune_count = len(merged)
+    merged = prune_to_retention(merged, retention_days)
+
+    written_name, success = write_bars(merged, base_object)
+    if not success:
+        logger.error(f"❌ {ticker}: Failed to write compacted base {base_object}")
+        return False
+
+    # Only delete segments once the new base is durable
+    if not delete_objects(segments):
+        logger.warning(
+            f"⚠️ {ticker}: Base compacted but some segments were not deleted - "
+            f"they will be merged idempotently on the next run"
+        )
+
+    logger.info(
+        f"✅ {ticker}: Compacted {len(segments)} segments into {written_name} "
+        f"({len(merged)} rows, pruned {pre_prune_count - len(merged)})"
+    )
+    return True
+
+
+def run_compaction(tickers: Optional[List[str]] = None) -> bool:
+    """
+    Compact delta segments for all (or the given) tickers.
+
+    Args:
+        tickers: Tickers to compact; discovered from Spaces if None
+
+    Returns:
+        bool: True if every ticker compacted successfully
+    """
+    if tickers is None:
+        tickers = find_tickers_with_segments()
+
+    logger.info(f"🗜️ Compacting intraday delta segments for {len(tickers)} tickers")
+
+    failures = []
+    with get_manifest().batch():
+        for ticker in tickers:
+            try:
+                if not compact_ticker(ticker):
+                    failures.append(ticker)
+            except Exception as e:
+                logger.error(f"❌ {ticker}: Error during compaction: {e}")
+                failures.append(ticker)
+
+    if failures:
+        logger.warning(f"⚠️ Compaction failed for {len(failures)} tickers: {failures}")
+    else:
+        logger.info("✅ Intraday segment compaction complete")
+    return not failures
+
+
+if __name__ == "__main__":
+    job_name = "compact_intraday_segments"
+    update_scheduler_status(job_name, "Running")
+
+    try:
+        if run_compaction():
+            update_scheduler_status(job_name, "Success")
+        else:
+            update_scheduler_status(job_name, "Fail", "Some tickers failed to compact")
+    except Exception as e:
+        error_message = f"Critical error in segment compaction: {e}"
+        logger.error(error_message)
+        update_scheduler_status(job_name, "Fail", error_message)
+        sys.exit(1)
@@ -18,14 +18,17 @@ Key Features:
 - Comprehensive logging for production monitoring
 """
 
+import asyncio
 import io
 import logging
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import pytz
 
@@ -33,9 +36,20 @@ import pytz
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # Import core utilities
-from utils.alpha_vantage_api import get_daily_data, get_intraday_data, get_real_time_price
+from utils.alpha_vantage_api import (
+    current_day_present,
+    get_daily_data,
+    get_intraday_data,
+    get_real_time_price,
+)
 from utils.config import (
     ALPHA_VANTAGE_API_KEY,
+    ASYNC_FETCH_CONCURRENCY,
+    ASYNC_MERGE_WORKERS,
+    ASYNC_UPLOAD_CONCURRENCY,
+    DATA_FETCH_MODE,
+    DEFERRED_RETRY_ENABLED,
+    RETRY_DRAIN_SECONDS,
     SPACES_ACCESS_KEY_ID,
     SPACES_SECRET_ACCESS_KEY, 
     SPACES_BUCKET_NAME,
@@ -44,14 +58,27 @@ from utils.config import (
     INTRADAY_1MIN_COMPACT_COUNTBACK,
     INTRADAY_1MIN_HEAL_EVERY_MINUTES,
     INTRADAY_1MIN_HEAL_COUNTBACK,
+    INTRADAY_1MIN_HEAL_STAGGER,
+    INTRADAY_HEAL_MAX_ATTEMPTS,
+    INTRADAY_30MIN_RECONCILE_EVERY_MINUTES,
+    INTRADAY_30MIN_SOURCE,
     INTRADAY_EXTENDED
 )
 from utils.spaces_manager import (
     get_spaces_credentials_status,
     get_spaces_client,
     download_dataframe,
-    upload_dataframe
+    read_segmented_dataframe,
+    write_delta_segment
 )
+from utils.gap_healing import fill_gaps, find_gaps, gap_rows, heal_summary, plan_heal_requests
+from utils.heal_scheduler import HealScheduler, needs_heal
+from utils.manifest import get_manifest
+from utils.market_time import detect_market_session
+from utils.resample import interval_minutes, reconcile_bars, resample_ticker
+from utils.retry_queue import RetryQueue
+from utils.session_kernels import utc_nanos
+from utils.storage_format import read_bars, write_bars
 
 # Setup comprehensive logging
 logging.basicConfig(
@@ -117,6 +144,27 @@ class DataFetchManager:
         
         self.master_tickers = []
         self.spaces_client = None
+
+        # Latest stored 1-min timestamp per ticker, so steady-state cycles can
+        # append delta segments without re-reading the stored history
+        self._latest_1min_timestamps = {}
+
+        # Dataset manifest: one GET answers existence/size/row-count questions
+        # for every ticker instead of a HEAD or download per object
+        self.manifest = get_manifest()
+
+        # "sequential" or "async" (see process_tickers_async)
+        self.fetch_mode = DATA_FETCH_MODE
+
+        # Heal checks and derived 30-min reconciliations are staggered across
+        # their intervals by ticker
+        self.heal_scheduler = HealScheduler(INTRADAY_1MIN_HEAL_EVERY_MINUTES)
+        self.reconcile_scheduler = HealScheduler(INTRADAY_30MIN_RECONCILE_EVERY_MINUTES)
+        self._heal_universe = ()
+
+        # Failed / stale fetches are parked here instead of sleeping inline
+        self.defer_retries = DEFERRED_RETRY_ENABLED
+        self.retry_queue = RetryQueue()
         
         # Validate credentials
         self._validate_credentials()
@@ -208,10 +256,30 @@ class DataFetchManager:
             logger.critical(f"❌ CRITICAL ERROR downloading master_tickerlist.csv: {e}")
             return False
             
+    def get_manifest_entry(self, ticker: str, directory: str) -> Optional[Dict]:
+        """
+        Look up a ticker's object in the dataset manifest.
+        
+        Args:
+            ticker: Stock ticker symbol
+            directory: Cloud directory (daily, intraday_1min, intraday_30min)
+            
+        Returns:
+            Manifest entry dict, or None if the object is not catalogued
+        """
+        try:
+            return self.manifest.get_entry(f"{directory}/{ticker}.csv")
+        except Exception as e:
+            logger.warning(f"⚠️ {ticker} ({directory}): Manifest lookup failed: {e}")
+            return None
+            
     def check_cloud_file_state(self, ticker: str, directory: str) -> Tuple[bool, int]:
         """
         Check if file exists in cloud and get its size for decision logic.
         
+        The dataset manifest is consulted first; objects it does not know
+        about fall back to a HEAD request on the Parquet and CSV objects.
+        
         Args:
             ticker: Stock ticker symbol
             directory: Cloud directory (daily/, intraday_1min/, intraday_30min/)
@@ -219,24 +287,30 @@ class DataFetchManager:
         Returns:
             Tuple of (file_exists, file_size_bytes)
         """
+        entry = self.get_manifest_entry(ticker, directory)
+        if entry is not None:
+            file_size = int(entry.get('byte_size', 0))
+            logger.info(f"📁 {ticker} ({directory}): File exists (manifest), size: {file_size} bytes")
+            return True, file_size
+            
         if not self.spaces_client:
             return False, 0
             
-        try:
-            file_key = f"{directory}/{ticker}.csv"
-            
-            response = self.spaces_client.head_object(
-                Bucket=SPACES_BUCKET_NAME,
-                Key=file_key
-            )
-            
+        for file_key in (f"{directory}/{ticker}.parquet", f"{directory}/{ticker}.csv"):
+            try:
+                response = self.spaces_client.head_object(
+                    Bucket=SPACES_BUCKET_NAME,
+                    Key=file_key
+                )
+            except Exception:
+                continue
+                
             file_size = response.get('ContentLength', 0)
             logger.info(f"📁 {ticker} ({directory}): File exists, size: {file_size} bytes")
             return True, file_size
             
-        except Exception:
-            logger.info(f"📁 {ticker} ({directory}): File does not exist")
-            return False, 0
+        logger.info(f"📁 {ticker} ({directory}): File does not exist")
+        return False, 0
             
     def fetch_daily_data(self, ticker: str) -> bool:
         """
@@ -250,56 +324,66 @@ class DataFetchManager:
         Returns:
             bool: Success status
         """
-        logger.info(f"📈 Processing daily data for {ticker}")
-        
         try:
-            # Step 1: Full historical fetch
-            df_daily = get_daily_data(ticker, outputsize='full')
-            if df_daily is None or df_daily.empty:
-                logger.error(f"❌ {ticker}: Failed to fetch daily data")
-                return False
-                
-            # Step 2: Trim to 200 most recent rows
-            df_daily = df_daily.tail(self.DAILY_ROWS)
-            
-            # Step 3: Get real-time quote for current day
-            real_time_data = get_real_time_price(ticker)
-            if real_time_data:
-                # Update or append latest row with real-time data
-                today = datetime.now(self.ny_tz).date()
-                today_str = today.strftime('%Y-%m-%d')
-                
-                # Create or update today's row
-                if today_str in df_daily.index:
-                    # Update existing row
-                    df_daily.loc[today_str, 'close'] = real_time_data.get('price', df_daily.loc[today_str, 'close'])
-                else:
-                    # Append new row for today
-                    new_row = {
-                        'open': real_time_data.get('price'),
-                        'high': real_time_data.get('price'),
-                        'low': real_time_data.get('price'),
-                        'close': real_time_data.get('price'),
-                        'volume': 0
-                    }
-                    df_daily.loc[today_str] = new_row
-                    
-            # Step 4: Save to cloud
-            success = upload_dataframe(
-                df_daily,
-                f"daily/{ticker}.csv"
-            )
-            
-            if success:
-                logger.info(f"✅ {ticker}: Daily data saved ({len(df_daily)} rows)")
-                return True
-            else:
-                logger.error(f"❌ {ticker}: Failed to save daily data")
-                return False
-                
+            return self._run_stages(ticker, 'daily')
         except Exception as e:
             logger.error(f"❌ {ticker}: Error processing daily data: {e}")
             return False
+
+    def _fetch_daily_source(self, ticker: str) -> Optional[Dict]:
+        """Fetch stage for daily data: full history plus the real-time quote."""
+        logger.info(f"📈 Processing daily data for {ticker}")
+
+        # Step 1: Full historical fetch
+        df_daily = get_daily_data(ticker, outputsize='full', retry_inline=not self.defer_retries)
+        if df_daily is None or df_daily.empty:
+            logger.error(f"❌ {ticker}: Failed to fetch daily data")
+            self._defer_retry(ticker, 'daily', "failed")
+            return None
+        self.retry_queue.resolve((ticker, 'daily'))
+
+        # Step 3 input: real-time quote for the current day
+        return {'daily': df_daily, 'quote': get_real_time_price(ticker)}
+
+    def _merge_daily(self, ticker: str, fetched: Dict) -> pd.DataFrame:
+        """Merge stage for daily data: trim and fold in the real-time quote."""
+        # Step 2: Trim to 200 most recent rows
+        df_daily = fetched['daily'].tail(self.DAILY_ROWS)
+
+        # Step 3: Get real-time quote for current day
+        real_time_data = fetched['quote']
+        if real_time_data:
+            # Update or append latest row with real-time data
+            today = datetime.now(self.ny_tz).date()
+            today_str = today.strftime('%Y-%m-%d')
+
+            # Create or update today's row
+            if today_str in df_daily.index:
+                # Update existing row
+                df_daily.loc[today_str, 'close'] = real_time_data.get('price', df_daily.loc[today_str, 'close'])
+            else:
+                # Append new row for today
+                new_row = {
+                    'open': real_time_data.get('price'),
+                    'high': real_time_data.get('price'),
+                    'low': real_time_data.get('price'),
+                    'close': real_time_data.get('price'),
+                    'volume': 0
+                }
+                df_daily.loc[today_str] = new_row
+        return df_daily
+
+    def _store_daily(self, ticker: str, df_daily: pd.DataFrame) -> bool:
+        """Upload stage for daily data."""
+        # Step 4: Save to cloud
+        _, success = write_bars(df_daily, f"daily/{ticker}.csv")
+
+        if success:
+            logger.info(f"✅ {ticker}: Daily data saved ({len(df_daily)} rows)")
+            return True
+        else:
+            logger.error(f"❌ {ticker}: Failed to save daily data")
+            return False
             
     def fetch_intraday_data(self, ticker: str, interval: str) -> bool:
         """
@@ -329,255 +413,738 @@ class DataFetchManager:
         
         Strategy:
         - Default: Compact fetch with configurable countback
-        - Periodic healing: Every N minutes, do a heal fetch
+        - Periodic healing: Every N minutes, check the stored series for gaps
+          and fetch only what fills them (see utils.gap_healing)
+        - New bars are appended as delta segments beside the base object;
+          jobs/compact_intraday_segments.py folds them in and prunes to 8 days
         - Enhanced logging with all metrics
         """
         start_time = time.time()
-        interval = '1min'
-        directory = "intraday_1min"
         
         try:
-            # Step 1: Determine fetch mode (compact or heal)
-            now_minute = int(datetime.utcnow().strftime("%M"))
-            is_heal_cycle = (now_minute % INTRADAY_1MIN_HEAL_EVERY_MINUTES == 0)
-            
-            if is_heal_cycle:
-                mode = "heal"
-                countback = INTRADAY_1MIN_HEAL_COUNTBACK
-                outputsize = 'full'  # Use full to get enough data, then trim
-                logger.info(f"🔧 {ticker} ({interval}): HEAL FETCH - every {INTRADAY_1MIN_HEAL_EVERY_MINUTES} min cycle")
-            else:
-                mode = "compact" 
-                countback = INTRADAY_1MIN_COMPACT_COUNTBACK
-                outputsize = 'compact'  # Alpha Vantage compact gives ~100 bars (~180 min)
-                logger.info(f"⚡ {ticker} ({interval}): COMPACT FETCH - regular update")
+            return self._run_stages(ticker, '1min')
+        except Exception as e:
+            elapsed_ms = int((time.time() - start_time) * 1000)
+            logger.error(f"❌ {ticker} (1min): Error processing intraday data: {e} elapsed_ms={elapsed_ms}")
+            return False
 
-            # Step 2: Check if we have existing data for merge logic
-            file_exists, file_size = self.check_cloud_file_state(ticker, directory)
-            existing_df = None
-            existing_max_timestamp = None
-            
-            if file_exists:
-                try:
-                    existing_df = download_dataframe(f"{directory}/{ticker}.csv")
-                    if not existing_df.empty:
-                        existing_df['timestamp'] = pd.to_datetime(existing_df['timestamp'])
-                        existing_max_timestamp = existing_df['timestamp'].max()
-                except Exception as e:
-                    logger.warning(f"⚠️ {ticker}: Could not load existing data: {e}")
-            
-            # Step 3: Fetch new data
-            new_df = get_intraday_data(ticker, interval=interval, outputsize=outputsize)
-            if new_df is None or new_df.empty:
-                logger.error(f"❌ {ticker} ({interval}): Failed to fetch intraday data")
-                return False
-            
-            # Step 4: Process new data and apply countback limit
-            new_df['timestamp'] = pd.to_datetime(new_df['timestamp'])
-            new_df = new_df.sort_values('timestamp')
-            
-            # For heal mode, limit to countback rows to avoid excessive data
-            if mode == "heal" and len(new_df) > countback:
-                new_df = new_df.tail(countback)
-            
-            # Step 5: Apply merge rule - append only rows with new.timestamp > existing_max
-            appended_count = 0
-            if existing_df is not None and not existing_df.empty and existing_max_timestamp is not None:
-                # Filter new data to only include timestamps newer than existing max
-                new_rows = new_df[new_df['timestamp'] > existing_max_timestamp].copy()
-                appended_count = len(new_rows)
-                
-                if appended_count > 0:
-                    # Combine DataFrames - existing + new rows only
-                    combined_df = pd.concat([existing_df, new_rows], ignore_index=True)
-                    combined_df = combined_df.sort_values('timestamp')
-                    # Remove any potential duplicates, keeping last
-                    combined_df = combined_df.drop_duplicates(subset=['timestamp'], keep='last')
-                else:
-                    # No new data to append
-                    combined_df = existing_df.copy()
-                    logger.info(f"📊 {ticker} ({mode}): No new timestamps to append")
+    def _fetch_1min_source(self, ticker: str) -> Optional[Dict]:
+        """Fetch stage for 1-min data: stored high-water mark plus new bars."""
+        start_time = time.time()
+        interval = '1min'
+        directory = "intraday_1min"
+
+        # Step 1: Determine fetch mode (compact or heal)
+        is_heal_cycle = self._is_heal_due(ticker)
+
+        # Alpha Vantage compact gives ~100 bars (~180 min); heal cycles add
+        # month-sliced requests only for gaps older than that window
+        outputsize = 'compact'
+        if is_heal_cycle:
+            mode = "heal"
+            countback = INTRADAY_1MIN_HEAL_COUNTBACK
+            logger.info(f"🔧 {ticker} ({interval}): HEAL CHECK - every {INTRADAY_1MIN_HEAL_EVERY_MINUTES} min cycle")
+        else:
+            mode = "compact" 
+            countback = INTRADAY_1MIN_COMPACT_COUNTBACK
+            logger.info(f"⚡ {ticker} ({interval}): COMPACT FETCH - regular update")
+
+        # Step 2: Determine the latest stored timestamp (base + delta segments)
+        base_object = f"{directory}/{ticker}.csv"
+        existing_max_timestamp = self._latest_1min_timestamps.get(ticker)
+        existing_df = None
+
+        if existing_max_timestamp is None:
+            entry = self.get_manifest_entry(ticker, directory)
+            if entry is not None and pd.notna(entry.get('max_timestamp')):
+                existing_max_timestamp = pd.Timestamp(entry['max_timestamp'])
+
+        if existing_max_timestamp is None or is_heal_cycle:
+            try:
+                existing_df = read_segmented_dataframe(base_object)
+                if existing_max_timestamp is None and not existing_df.empty:
+                    existing_max_timestamp = pd.to_datetime(
+                        existing_df['timestamp'], utc=True
+                    ).max()
+            except Exception as e:
+                logger.warning(f"⚠️ {ticker}: Could not load existing data: {e}")
+
+        # Step 3: Fetch new data
+        new_df = self._get_intraday_deferred(ticker, interval, outputsize)
+        if new_df is None:
+            return None
+
+        # Step 3b: Heal cycle - fill gaps in the stored series
+        heal_rows = None
+        if is_heal_cycle and existing_df is not None and not existing_df.empty:
+            heal_rows = self._fetch_gap_fill(ticker, interval, existing_df, new_df)
+
+        return {
+            'start_time': start_time,
+            'mode': mode,
+            'countback': countback,
+            'base_object': base_object,
+            'existing_max_timestamp': existing_max_timestamp,
+            'new_df': new_df,
+            'heal_rows': heal_rows,
+        }
+
+    def _is_heal_due(self, ticker: str) -> bool:
+        """
+        Whether this cycle runs the 1-min heal check for a ticker.
+
+        Staggered: each ticker heals in its own minute of the heal interval,
+        and only if its manifest entry does not record a clean gap check.
+        Otherwise every ticker heals when the minute is a multiple of the interval.
+        """
+        now = datetime.utcnow()
+        if not INTRADAY_1MIN_HEAL_STAGGER:
+            return now.minute % INTRADAY_1MIN_HEAL_EVERY_MINUTES == 0
+
+        self._assign_schedules()
+        if not self.heal_scheduler.is_due(ticker, now.hour * 60 + now.minute):
+            return False
+        if not needs_heal(self.get_manifest_entry(ticker, "intraday_1min")):
+            logger.info(f"✅ {ticker} (1min): Heal skipped - manifest records no open gaps")
+            return False
+        return True
+
+    def _assign_schedules(self):
+        """Spread the current universe over the heal and reconciliation schedules."""
+        if self._heal_universe != tuple(self.master_tickers):
+            self._heal_universe = tuple(self.master_tickers)
+            self.heal_scheduler.assign(self._heal_universe)
+            self.reconcile_scheduler.assign(self._heal_universe)
+
+    def _gap_min_missing(self, interval: str) -> int:
+        """Shortest run of missing bars that counts as a gap for an interval."""
+        threshold = self.GAP_THRESHOLD_1MIN if interval == '1min' else self.GAP_THRESHOLD_30MIN
+        return max(1, threshold // interval_minutes(interval))
+
+    def _fetch_gap_fill(
+        self, ticker: str, interval: str, existing_df: pd.DataFrame, compact_df: pd.DataFrame
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch the bars missing from a stored intraday series.
+
+        Gaps inside the compact window are filled from the compact fetch the
+        cycle already made; older gaps cost one month-sliced request per month.
+        The gaps still open once the recovered bars are spliced in are recorded
+        in the manifest. If every request succeeded and gaps stay open for
+        INTRADAY_HEAL_MAX_ATTEMPTS heals, their bars are taken as never printed
+        (no trades) and the series is recorded as complete.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Series interval
+            existing_df: Stored series
+            compact_df: This cycle's compact fetch
+
+        Returns:
+            Bars inside the gaps, or None if there are no gaps
+        """
+        base_object = f"intraday_{interval}/{ticker}.csv"
+        gaps = self._detect_gaps(existing_df, interval, ticker)
+        requests = plan_heal_requests(gaps, interval)
+        if not requests:
+            self.manifest.record_gap_check(base_object, 0)
+            return None
+        logger.info(f"🎯 {ticker} ({interval}): Heal plan {heal_summary(gaps, requests)}")
+
+        fetched, failed = [compact_df], 0
+        for request in requests:
+            if request['month'] is None:
+                continue
+            month_df = get_intraday_data(
+                ticker, interval=interval, outputsize='full', month=request['month']
+            )
+            if month_df is not None and not month_df.empty:
+                fetched.append(month_df)
             else:
-                # No existing data, use all new data
-                combined_df = new_df.copy()
-                appended_count = len(combined_df)
-            
-            # Step 6: Apply pruning - keep rows with timestamp >= now_utc - 8d (7d + today)
-            now_utc = datetime.utcnow()
-            cutoff_date = now_utc - timedelta(days=8)  # 8 days to ensure 7 days + today coverage
-            
-            pre_prune_count = len(combined_df)
-            combined_df = combined_df[combined_df['timestamp'] >= cutoff_date]
-            pruned_count = pre_prune_count - len(combined_df)
-            
-            # Step 7: Calculate metrics
-            elapsed_ms = int((time.time() - start_time) * 1000)
-            final_rows = len(combined_df)
-            latest_ts_utc = combined_df['timestamp'].max().isoformat() if not combined_df.empty else None
-            
-            # Step 8: Save to cloud  
-            success = upload_dataframe(combined_df, f"{directory}/{ticker}.csv")
-            
-            if success:
-                # Enhanced logging as specified
+                failed += 1
+
+        rows = gap_rows(pd.concat(fetched, ignore_index=True), gaps)
+        logger.info(f"🩹 {ticker} ({interval}): {len(rows)} bars recovered for {len(gaps)} gaps")
+
+        remaining = len(gaps)
+        if len(rows):
+            # Naive stamps are exchange time; compare both frames in UTC
+            stamps = [utc_nanos(frame['timestamp']) for frame in (existing_df, rows)]
+            healed = pd.DatetimeIndex(np.concatenate(stamps), tz='UTC')
+            remaining = len(find_gaps(healed, interval, min_missing=self._gap_min_missing(interval)))
+
+        # A failed request keeps the recorded attempts; it says nothing about the gaps
+        attempts = None if failed else 0
+        if remaining and not failed:
+            # The API answered and still has no bars for these gaps
+            entry = self.get_manifest_entry(ticker, f"intraday_{interval}") or {}
+            previous = entry.get('heal_attempts')
+            attempts = (0 if previous is None or pd.isna(previous) else int(previous)) + 1
+            if attempts >= INTRADAY_HEAL_MAX_ATTEMPTS:
                 logger.info(
-                    f"✅ Update 1min Intraday Data completed in {elapsed_ms/1000:.1f}s "
-                    f"provider=marketdata mode={mode} countback={countback} "
-                    f"appended={appended_count} final_rows={final_rows} "
-                    f"latest_ts_utc={latest_ts_utc} elapsed_ms={elapsed_ms}"
+                    f"✅ {ticker} ({interval}): {remaining} gaps still empty after {attempts} heals "
+                    f"- treating them as never printed"
                 )
-                return True
-            else:
-                logger.error(f"❌ {ticker} ({interval}): Failed to save intraday data")
-                return False
-                
-        except Exception as e:
-            elapsed_ms = int((time.time() - start_time) * 1000)
-            logger.error(f"❌ {ticker} ({interval}): Error processing intraday data: {e} elapsed_ms={elapsed_ms}")
+                remaining, attempts = 0, 0
+        self.manifest.record_gap_check(base_object, remaining, heal_attempts=attempts)
+        return rows
+
+    def _merge_1min(self, ticker: str, fetched: Dict) -> Dict:
+        """Merge stage for 1-min data: keep only bars past the stored high-water mark."""
+        new_df = fetched['new_df']
+        existing_max_timestamp = fetched['existing_max_timestamp']
+
+        # Step 4: Process new data and apply countback limit
+        new_df['timestamp'] = pd.to_datetime(new_df['timestamp'], utc=True)
+        new_df = new_df.sort_values('timestamp')
+
+        # For heal mode, limit to countback rows to avoid excessive data
+        if fetched['mode'] == "heal" and len(new_df) > fetched['countback']:
+            new_df = new_df.tail(fetched['countback'])
+
+        # Step 5: Apply merge rule - append only rows with new.timestamp > existing_max
+        if existing_max_timestamp is not None:
+            new_rows = new_df[new_df['timestamp'] > existing_max_timestamp]
+            new_rows = new_rows.drop_duplicates(subset=['timestamp'], keep='last')
+        else:
+            # No existing data - this write becomes the base; prune it to 8 days
+            cutoff_date = pd.Timestamp.now(tz="UTC") - timedelta(days=8)
+            new_rows = new_df[new_df['timestamp'] >= cutoff_date]
+            new_rows = new_rows.drop_duplicates(subset=['timestamp'], keep='last')
+
+        # Gap fills all precede the stored high-water mark, so prepending them
+        # keeps the delta segment in time order
+        heal_rows = fetched.get('heal_rows')
+        if heal_rows is not None and not heal_rows.empty and existing_max_timestamp is not None:
+            heal_rows = heal_rows.assign(timestamp=pd.to_datetime(heal_rows['timestamp'], utc=True))
+            heal_rows = heal_rows[heal_rows['timestamp'] < existing_max_timestamp]
+            new_rows = pd.concat([heal_rows, new_rows], ignore_index=True)
+
+        # Step 6: Calculate metrics
+        latest_ts = new_rows['timestamp'].max() if len(new_rows) else existing_max_timestamp
+        return dict(fetched, new_rows=new_rows, latest_ts=latest_ts)
+
+    def _store_1min(self, ticker: str, merged: Dict) -> bool:
+        """Upload stage for 1-min data: a delta segment, or the base object on first write."""
+        new_rows = merged['new_rows']
+        latest_ts = merged['latest_ts']
+        appended_count = len(new_rows)
+        latest_ts_utc = latest_ts.isoformat() if latest_ts is not None else None
+
+        # Step 7: Save to cloud - only the new rows are uploaded. Existing
+        # data gets a small delta segment; compaction folds segments into
+        # the base and applies the 8-day prune.
+        if appended_count == 0:
+            logger.info(f"📊 {ticker} ({merged['mode']}): No new timestamps to append")
+            success = True
+        elif merged['existing_max_timestamp'] is not None:
+            _, success = write_delta_segment(new_rows, merged['base_object'])
+        else:
+            _, success = write_bars(new_rows, merged['base_object'])
+
+        elapsed_ms = int((time.time() - merged['start_time']) * 1000)
+
+        if success:
+            if latest_ts is not None:
+                self._latest_1min_timestamps[ticker] = latest_ts
+            self._record_append_gaps(ticker, merged)
+            # Enhanced logging as specified
+            logger.info(
+                f"✅ Update 1min Intraday Data completed in {elapsed_ms/1000:.1f}s "
+                f"provider=marketdata mode={merged['mode']} countback={merged['countback']} "
+                f"appended={appended_count} "
+                f"latest_ts_utc={latest_ts_utc} elapsed_ms={elapsed_ms}"
+            )
+            return True
+        else:
+            logger.error(f"❌ {ticker} (1min): Failed to save intraday data")
             return False
     
+    def _record_append_gaps(self, ticker: str, merged: Dict):
+        """Flag gaps between the stored high-water mark and newly appended bars in the manifest."""
+        existing_max = merged['existing_max_timestamp']
+        new_rows = merged['new_rows']
+        if existing_max is None or new_rows.empty:
+            return
+        stamps = pd.concat(
+            [pd.Series([pd.Timestamp(existing_max)]), pd.to_datetime(new_rows['timestamp'], utc=True)],
+            ignore_index=True,
+        )
+        stamps = stamps[stamps >= pd.Timestamp(existing_max)]
+        new_gaps = find_gaps(stamps, '1min', min_missing=self._gap_min_missing('1min'))
+        if new_gaps:
+            logger.info(f"🕳️ {ticker} (1min): {len(new_gaps)} new gaps behind the appended bars")
+            self.manifest.record_new_gaps(merged['base_object'], len(new_gaps))
+
     def _fetch_30min_intraday_data(self, ticker: str, interval: str) -> bool:
         """
-        30-minute intraday data fetch - UNCHANGED from original implementation.
-        
-        Phase 2.1: Keep existing 30-min logic exactly as is.
+        30-minute intraday data fetch.
+
+        In "derived" mode (INTRADAY_30MIN_SOURCE) new bars are aggregated from
+        the stored 1-min series; the API is only called for initial loads,
+        short histories, 1-min series with open gaps and each ticker's
+        reconciliation fetch.
         """
+        try:
+            return self._run_stages(ticker, interval)
+        except Exception as e:
+            logger.error(f"❌ {ticker} ({interval}): Error processing intraday data: {e}")
+            return False
+
+    def _fetch_30min_source(self, ticker: str, interval: str) -> Optional[Dict]:
+        """Fetch stage for 30-min data: new bars plus the stored object."""
         directory = f"intraday_{interval}"
         logger.info(f"📊 Processing {interval} intraday data for {ticker}")
-        
-        try:
-            # Step 1: Check cloud state
+
+        # Step 1: Check cloud state - the manifest row count is exact and
+        # independent of the storage encoding; file size is the fallback
+        entry = self.get_manifest_entry(ticker, directory)
+        if entry is not None:
+            file_exists = True
+            needs_full_fetch = int(entry.get('row_count', 0)) < self.INTRADAY_30MIN_ROWS
+        else:
             file_exists, file_size = self.check_cloud_file_state(ticker, directory)
-            
-            # Step 2: Decision point
-            if not file_exists or file_size < self.FILE_SIZE_THRESHOLD:
-                logger.info(f"🔄 {ticker} ({interval}): Triggering FULL FETCH (recovery/initial)")
-                outputsize = 'full'
-            else:
-                logger.info(f"⚡ {ticker} ({interval}): Triggering COMPACT FETCH (standard update)")
-                outputsize = 'compact'
-                
-            # Step 3: Fetch new data
-            new_df = get_intraday_data(ticker, interval=interval, outputsize=outputsize)
-            if new_df is None or new_df.empty:
-                logger.error(f"❌ {ticker} ({interval}): Failed to fetch intraday data")
-                return False
-                
-            # Step 4: Load existing data if it exists
-            existing_df = None
-            if file_exists:
-                try:
-                    existing_df = download_dataframe(
-                        f"{directory}/{ticker}.csv"
-                    )
-                except Exception as e:
-                    logger.warning(f"⚠️ {ticker} ({interval}): Could not load existing data: {e}")
-                    
-            # Step 5: Merge data
-            if existing_df is not None and not existing_df.empty:
-                # Combine DataFrames
-                combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-                
-                # Sort by timestamp
-                combined_df['timestamp'] = pd.to_datetime(combined_df['timestamp'])
-                combined_df = combined_df.sort_values('timestamp')
-                
-                # Remove duplicates, keeping newest
-                combined_df = combined_df.drop_duplicates(subset=['timestamp'], keep='last')
-            else:
-                combined_df = new_df.copy()
-                combined_df['timestamp'] = pd.to_datetime(combined_df['timestamp'])
-                combined_df = combined_df.sort_values('timestamp')
-                
-            # Step 6: Trim to specification - 30min keeps last 500 rows
-            combined_df = combined_df.tail(self.INTRADAY_30MIN_ROWS)
-                
-            # Step 7: Self-healing gap detection (existing logic)
-            gap_detected = self._detect_gaps(combined_df, interval, ticker)
-            if gap_detected:
-                logger.warning(f"⚠️ {ticker} ({interval}): Data gap detected - triggering auto-remediation")
-                # Trigger full fetch to fix gaps
-                remediation_df = get_intraday_data(ticker, interval=interval, outputsize='full')
-                if remediation_df is not None and not remediation_df.empty:
-                    combined_df = remediation_df.copy()
-                    combined_df['timestamp'] = pd.to_datetime(combined_df['timestamp'])
-                    combined_df = combined_df.sort_values('timestamp')
-                    
-                    # Re-apply trimming after remediation
-                    combined_df = combined_df.tail(self.INTRADAY_30MIN_ROWS)
-                        
-                    logger.info(f"✅ {ticker} ({interval}): Auto-remediation completed")
-                else:
-                    logger.error(f"❌ {ticker} ({interval}): Auto-remediation failed")
-                    
-            # Step 8: Save to cloud
-            success = upload_dataframe(
-                combined_df,
-                f"{directory}/{ticker}.csv"
+            needs_full_fetch = not file_exists or file_size < self.FILE_SIZE_THRESHOLD
+
+        # Step 2: Decision point
+        if needs_full_fetch:
+            logger.info(f"🔄 {ticker} ({interval}): Triggering FULL FETCH (recovery/initial)")
+            outputsize = 'full'
+        else:
+            logger.info(f"⚡ {ticker} ({interval}): Triggering COMPACT FETCH (standard update)")
+            outputsize = 'compact'
+
+        # Step 3: Load existing data if it exists
+        existing_df = None
+        if file_exists:
+            try:
+                existing_df = read_bars(f"{directory}/{ticker}.csv")
+            except Exception as e:
+                logger.warning(f"⚠️ {ticker} ({interval}): Could not load existing data: {e}")
+
+        # Step 4: Fetch new data - derived locally from the 1-min series when
+        # possible, otherwise (or when reconciliation is due) from the API
+        derive = (
+            INTRADAY_30MIN_SOURCE == "derived"
+            and not needs_full_fetch
+            and existing_df is not None
+            and not existing_df.empty
+        )
+        new_df = None
+        source = 'api'
+        if derive and not self._is_reconcile_due(ticker, entry):
+            last_stored = pd.to_datetime(existing_df['timestamp'], utc=True).max()
+            new_df = self._derive_intraday_bars(ticker, interval, after=last_stored)
+            if new_df is not None:
+                source = 'derived'
+                logger.info(f"🧮 {ticker} ({interval}): Derived {len(new_df)} new bars from 1-min data")
+
+        if new_df is None:
+            new_df = self._get_intraday_deferred(ticker, interval, outputsize)
+            if new_df is None:
+                return None
+            if INTRADAY_30MIN_SOURCE == "derived":
+                # Later bars are derived after the last stored one, so a
+                # still-forming API bar would never be completed
+                new_df = self._completed_bars(new_df, interval, pd.Timestamp(datetime.utcnow(), tz="UTC"))
+            if derive:
+                self._reconcile_derived_bars(ticker, interval, new_df)
+
+        return {'interval': interval, 'new_df': new_df, 'existing_df': existing_df, 'source': source}
+
+    def _is_reconcile_due(self, ticker: str, entry: Optional[Dict]) -> bool:
+        """
+        Whether derived 30-min bars are due to be checked against an API fetch.
+
+        Each ticker has its own phase within INTRADAY_30MIN_RECONCILE_EVERY_MINUTES;
+        it is due once that phase minute has passed since its bars were last
+        taken from the API (manifest api_synced_at), so a late cycle still
+        reconciles and tickers do not all call the API in the same minute.
+        """
+        synced_at = (entry or {}).get('api_synced_at')
+        if synced_at is None or pd.isna(synced_at):
+            return True
+        self._assign_schedules()
+        # Naive timestamps are taken as UTC
+        now_minute = int(pd.Timestamp(datetime.utcnow()).timestamp() // 60)
+        synced_minute = int(pd.Timestamp(synced_at).timestamp() // 60)
+        return self.reconcile_scheduler.is_overdue(ticker, now_minute, synced_minute)
+
+    @staticmethod
+    def _completed_bars(bars: pd.DataFrame, interval: str, until: pd.Timestamp) -> pd.DataFrame:
+        """Bars whose period (start label + interval) ends by a UTC timestamp."""
+        width = pd.Timedelta(minutes=interval_minutes(interval))
+        ends = pd.to_datetime(bars['timestamp'], utc=True) + width
+        return bars[(ends <= until).to_numpy()].reset_index(drop=True)
+
+    def _derive_intraday_bars(
+        self, ticker: str, interval: str, after: Optional[pd.Timestamp] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Aggregate the stored 1-min series into bars of the given interval.
+
+        Only bars the 1-min series covers to their end are returned, so a
+        bar is never stored while it is still forming. Bars whose start the
+        1-min history does not reach (it is pruned at an arbitrary minute)
+        are dropped too, as they may be missing their opening minutes. A
+        series whose manifest records open gaps is not used at all.
+
+        Args:
+            ticker: Stock ticker symbol
+            interval: Target interval, e.g. '30min'
+            after: Only return bars starting after this UTC timestamp (the
+                last stored bar), so stored bars are never replaced
+
+        Returns:
+            Derived bars (empty if none are new), or None if no usable 1-min
+            data is stored
+        """
+        entry = self.get_manifest_entry(ticker, "intraday_1min") or {}
+        gap_count = entry.get('gap_count')
+        if gap_count is not None and pd.notna(gap_count) and int(gap_count) > 0:
+            logger.info(f"🕳️ {ticker} ({interval}): 1-min series has open gaps - not deriving bars")
+            return None
+
+        try:
+            one_min = read_segmented_dataframe(f"intraday_1min/{ticker}.csv")
+        except Exception as e:
+            logger.warning(f"⚠️ {ticker} ({interval}): Could not load 1-min data to derive bars: {e}")
+            return None
+        if one_min is None or one_min.empty:
+            return None
+
+        session = "extended" if INTRADAY_EXTENDED else "regular"
+        bars = resample_ticker(one_min, interval, session)
+        if bars is None:
+            return pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+
+        stamps = pd.to_datetime(one_min['timestamp'], utc=True)
+        bars = self._completed_bars(bars, interval, stamps.max() + pd.Timedelta(minutes=1))
+        starts = pd.to_datetime(bars['timestamp'], utc=True)
+        keep = starts >= stamps.min()
+        if after is not None and pd.notna(after):
+            keep &= starts > after
+        return bars[keep.to_numpy()].reset_index(drop=True)
+
+    def _reconcile_derived_bars(self, ticker: str, interval: str, api_df: pd.DataFrame):
+        """
+        Check how closely bars derived from 1-min data match the API's bars.
+
+        The API bars are merged over the stored ones either way, so any
+        mismatched bars are repaired by this fetch.
+        """
+        derived = self._derive_intraday_bars(ticker, interval)
+        if derived is None:
+            return
+        report = reconcile_bars(derived, api_df)
+        if report['mismatched'] or report['missing']:
+            logger.warning(
+                f"⚠️ {ticker} ({interval}): Derived bars differ from API, storing the API bars - "
+                f"compared={report['compared']} mismatched={report['mismatched']} "
+                f"missing={report['missing']} first={report['mismatched_timestamps'][:3]}"
             )
-            
-            if success:
-                logger.info(f"✅ {ticker} ({interval}): Intraday data saved ({len(combined_df)} rows)")
-                return True
+        else:
+            logger.info(f"✅ {ticker} ({interval}): Derived bars match API ({report['compared']} compared)")
+
+    def _merge_30min(self, ticker: str, fetched: Dict) -> Dict:
+        """Merge stage for 30-min data: combine, de-duplicate, trim and check for gaps."""
+        interval = fetched['interval']
+        new_df = fetched['new_df']
+        existing_df = fetched['existing_df']
+
+        # Step 5: Merge data
+        if fetched['source'] == 'derived' and new_df.empty:
+            # No derived bar has completed since the last stored one
+            combined_df = existing_df.copy()
+            combined_df['timestamp'] = pd.to_datetime(combined_df['timestamp'], utc=True)
+        elif existing_df is not None and not existing_df.empty:
+            # Combine DataFrames
+            combined_df = pd.concat([existing_df, new_df], ignore_index=True)
+
+            # Sort by timestamp
+            combined_df['timestamp'] = pd.to_datetime(combined_df['timestamp'], utc=True)
+            combined_df = combined_df.sort_values('timestamp')
+
+            # Remove duplicates, keeping newest
+            combined_df = combined_df.drop_duplicates(subset=['timestamp'], keep='last')
+        else:
+            combined_df = new_df.copy()
+            combined_df['timestamp'] = pd.to_datetime(combined_df['timestamp'])
+            combined_df = combined_df.sort_values('timestamp')
+
+        # Step 6: Trim to specification - 30min keeps last 500 rows
+        combined_df = combined_df.tail(self.INTRADAY_30MIN_ROWS)
+
+        # Step 7: Self-healing gap detection (existing logic)
+        gaps = self._detect_gaps(combined_df, interval, ticker)
+        return {
+            'interval': interval,
+            'combined_df': combined_df,
+            'gaps': gaps,
+            'new_df': new_df,
+            'source': fetched['source'],
+        }
+
+    def _heal_30min(self, ticker: str, merged: Dict) -> Dict:
+        """Remediation stage for 30-min data: fetch and splice in only the missing bars."""
+        gaps = merged['gaps']
+        if not gaps:
+            return merged
+
+        interval = merged['interval']
+        requests = plan_heal_requests(gaps, interval)
+        logger.warning(
+            f"⚠️ {ticker} ({interval}): Data gap detected - triggering auto-remediation "
+            f"({heal_summary(gaps, requests)})"
+        )
+
+        def fetch(outputsize, month):
+            return get_intraday_data(ticker, interval=interval, outputsize=outputsize, month=month)
+
+        # Derived bars are not a compact API response and cannot stand in for one
+        compact_df = merged['new_df'] if merged['source'] == 'api' else None
+        combined_df, calls = fill_gaps(merged['combined_df'], fetch, gaps, requests, compact_df=compact_df)
+        if combined_df is merged['combined_df']:
+            logger.error(f"❌ {ticker} ({interval}): Auto-remediation failed")
+            return merged
+
+        # Re-apply trimming after remediation
+        combined_df = combined_df.tail(self.INTRADAY_30MIN_ROWS)
+        logger.info(f"✅ {ticker} ({interval}): Auto-remediation completed ({calls} API calls)")
+        return dict(merged, combined_df=combined_df)
+
+    def _store_30min(self, ticker: str, merged: Dict) -> bool:
+        """Upload stage for 30-min data."""
+        interval = merged['interval']
+        combined_df = merged['combined_df']
+
+        if merged['source'] == 'derived' and merged['new_df'].empty and not merged['gaps']:
+            logger.info(f"✅ {ticker} ({interval}): No new bars to store")
+            return True
+
+        # Step 8: Save to cloud
+        _, success = write_bars(combined_df, f"intraday_{interval}/{ticker}.csv")
+
+        if success:
+            if merged['source'] == 'api':
+                self.manifest.record_api_sync(f"intraday_{interval}/{ticker}.csv")
+            logger.info(f"✅ {ticker} ({interval}): Intraday data saved ({len(combined_df)} rows)")
+            return True
+        else:
+            logger.error(f"❌ {ticker} ({interval}): Failed to save intraday data")
+            return False
+
+    def _get_intraday_deferred(self, ticker: str, interval: str, outputsize: str) -> Optional[pd.DataFrame]:
+        """
+        Fetch intraday bars, parking failed or stale fetches for a later retry.
+
+        A stale compact response (no bars from today while the market is in
+        session) is still returned so whatever is new gets stored now; the
+        ticker is retried for today's bars once its backoff expires.
+
+        Returns:
+            New bars, or None if the fetch failed
+        """
+        new_df = get_intraday_data(
+            ticker, interval=interval, outputsize=outputsize, retry_inline=not self.defer_retries
+        )
+        if new_df is None or new_df.empty:
+            logger.error(f"❌ {ticker} ({interval}): Failed to fetch intraday data")
+            self._defer_retry(ticker, interval, "failed")
+            return None
+
+        if (
+            self.defer_retries
+            and outputsize == 'compact'
+            and detect_market_session() != "CLOSED"
+            and not current_day_present(new_df)
+        ):
+            self._defer_retry(ticker, interval, "stale")
+        else:
+            self.retry_queue.resolve((ticker, interval))
+        return new_df
+
+    def _defer_retry(self, ticker: str, interval: str, reason: str):
+        """Park a ticker/interval in the retry queue when deferred retries are enabled."""
+        if self.defer_retries:
+            self.retry_queue.park((ticker, interval), reason)
+
+    def _deferred_retry(self, results: Dict[str, Dict[str, bool]]) -> Callable:
+        """
+        Retry callback for the queue that records outcomes in results.
+
+        Args:
+            results: ticker -> {interval -> success}, updated in place
+        """
+        def retry(key: Tuple[str, str]):
+            ticker, interval = key
+            if interval == 'daily':
+                success = self.fetch_daily_data(ticker)
             else:
-                logger.error(f"❌ {ticker} ({interval}): Failed to save intraday data")
-                return False
-                
-        except Exception as e:
-            logger.error(f"❌ {ticker} ({interval}): Error processing intraday data: {e}")
+                success = self.fetch_intraday_data(ticker, interval)
+            if ticker in results:
+                results[ticker][interval] = results[ticker].get(interval, False) or success
+
+        return retry
+
+    def _finish_deferred_retries(self, results: Dict[str, Dict[str, bool]]):
+        """
+        Retry every parked fetch until it recovers or runs out of attempts,
+        then log the cycle's retry distributions.
+
+        Args:
+            results: ticker -> {interval -> success}, updated in place
+        """
+        if len(self.retry_queue):
+            logger.info(f"🔁 Finishing {len(self.retry_queue)} deferred retries")
+        self.retry_queue.drain(self._deferred_retry(results), max_wait=RETRY_DRAIN_SECONDS)
+        self.retry_queue.stats.log_summary()
+
+    def _interval_stages(self, interval: str) -> Tuple[Callable, Callable, Optional[Callable], Callable]:
+        """
+        Pipeline stages of one data type.
+
+        Args:
+            interval: 'daily', '1min' or an intraday interval such as '30min'
+
+        Returns:
+            Tuple of (fetch, merge, heal, store) callables taking the ticker first.
+            fetch and heal do API/storage I/O, merge is CPU only, store uploads;
+            heal may be None.
+        """
+        if interval == 'daily':
+            return self._fetch_daily_source, self._merge_daily, None, self._store_daily
+        if interval == '1min':
+            return self._fetch_1min_source, self._merge_1min, None, self._store_1min
+        return (
+            lambda ticker: self._fetch_30min_source(ticker, interval),
+            self._merge_30min,
+            self._heal_30min,
+            self._store_30min,
+        )
+
+    def _run_stages(self, ticker: str, interval: str) -> bool:
+        """Run one ticker/interval through its stages in the calling thread."""
+        fetch, merge, heal, store = self._interval_stages(interval)
+        fetched = fetch(ticker)
+        if fetched is None:
             return False
+        merged = merge(ticker, fetched)
+        if heal is not None:
+            merged = heal(ticker, merged)
+        return store(ticker, merged)
+
+    async def process_tickers_async(
+        self, tickers: List[str], intervals: Tuple[str, ...]
+    ) -> Dict[str, Dict[str, bool]]:
+        """
+        Run many tickers through their fetch / merge / upload stages concurrently.
+
+        Every ticker's intervals start together (except derived 30-min bars,
+        which follow that ticker's 1-min upload), and while one ticker's bars
+        are merged on the CPU pool other tickers are fetching or uploading on
+        the I/O pool. API calls are paced by the shared token bucket, so a full
+        cycle is bounded by the Alpha Vantage budget rather than by the sum of
+        request, merge and upload latencies.
+
+        Args:
+            tickers: Tickers to process
+            intervals: Data types per ticker ('daily', '1min', '30min')
+
+        Returns:
+            Dict: ticker -> {interval -> success}
+        """
+        loop = asyncio.get_running_loop()
+        fetch_slots = asyncio.Semaphore(ASYNC_FETCH_CONCURRENCY)
+        upload_slots = asyncio.Semaphore(ASYNC_UPLOAD_CONCURRENCY)
+        # Bounds how many tickers hold fetched data in memory at once
+        ticker_slots = asyncio.Semaphore(max(1, 2 * ASYNC_FETCH_CONCURRENCY))
+        io_pool = ThreadPoolExecutor(
+            ASYNC_FETCH_CONCURRENCY + ASYNC_UPLOAD_CONCURRENCY, thread_name_prefix="fetch-io"
+        )
+        merge_pool = ThreadPoolExecutor(ASYNC_MERGE_WORKERS, thread_name_prefix="fetch-merge")
+
+        async def run_interval(ticker: str, interval: str) -> bool:
+            fetch, merge, heal, store = self._interval_stages(interval)
+            try:
+                async with fetch_slots:
+                    fetched = await loop.run_in_executor(io_pool, fetch, ticker)
+                if fetched is None:
+                    return False
+                merged = await loop.run_in_executor(merge_pool, merge, ticker, fetched)
+                if heal is not None:
+                    async with fetch_slots:
+                        merged = await loop.run_in_executor(io_pool, heal, ticker, merged)
+                async with upload_slots:
+                    return await loop.run_in_executor(io_pool, store, ticker, merged)
+            except Exception as e:
+                logger.error(f"❌ {ticker} ({interval}): Error processing data: {e}")
+                return False
+
+        # Derived 30-min bars are aggregated from the stored 1-min series, so as
+        # in sequential mode they wait for this cycle's 1-min bars to be stored
+        derived = tuple(
+            interval for interval in intervals
+            if interval == '30min' and INTRADAY_30MIN_SOURCE == "derived" and '1min' in intervals
+        )
+        independent = tuple(interval for interval in intervals if interval not in derived)
+
+        async def run_ticker(ticker: str) -> Tuple[str, Dict[str, bool]]:
+            async with ticker_slots:
+                outcomes = await asyncio.gather(
+                    *(run_interval(ticker, interval) for interval in independent)
+                )
+                outcomes += await asyncio.gather(
+                    *(run_interval(ticker, interval) for interval in derived)
+                )
+            outcome = dict(zip(independent + derived, outcomes))
+            return ticker, {interval: outcome[interval] for interval in intervals}
+
+        try:
+            pairs = await asyncio.gather(*(run_ticker(ticker) for ticker in tickers))
+        finally:
+            io_pool.shutdown(wait=True)
+            merge_pool.shutdown(wait=True)
+        return dict(pairs)
+
+    def _process_tickers_concurrently(self, intervals: Tuple[str, ...]) -> Dict[str, Dict[str, bool]]:
+        """Run the async pipeline over the master tickerlist from synchronous code."""
+        logger.info(
+            f"⚡ Async pipeline: {len(self.master_tickers)} tickers x {len(intervals)} data types "
+            f"(fetch={ASYNC_FETCH_CONCURRENCY}, merge={ASYNC_MERGE_WORKERS}, upload={ASYNC_UPLOAD_CONCURRENCY})"
+        )
+        return asyncio.run(self.process_tickers_async(self.master_tickers, intervals))
             
-    def _detect_gaps(self, df: pd.DataFrame, interval: str, ticker: str) -> bool:
+    def _detect_gaps(self, df: pd.DataFrame, interval: str, ticker: str) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
         """
         Detect gaps in timestamp data for self-healing mechanism.
         
+        The series is laid over the NYSE regular-session grid, so overnight,
+        weekend, holiday and early-close breaks are not reported.
+        
         Args:
             df: DataFrame with timestamp column
             interval: '1min' or '30min'
             ticker: Stock ticker symbol for logging
             
         Returns:
-            bool: True if gap detected
+            List of (first missing bar, last missing bar) ranges; empty if none
         """
         if df.empty or len(df) < 2:
-            return False
+            return []
             
         try:
-            # Ensure timestamp column is datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
-            # Calculate time differences between consecutive rows
-            time_diffs = df['timestamp'].diff().dt.total_seconds() / 60  # Convert to minutes
-            
-            # Set gap threshold based on interval
-            if interval == '1min':
-                threshold = self.GAP_THRESHOLD_1MIN
-            else:  # 30min
-                threshold = self.GAP_THRESHOLD_30MIN
-                
-            # Check for gaps during market hours
-            gaps = time_diffs > threshold
-            
-            if gaps.any():
-                gap_indices = gaps[gaps].index.tolist()
-                for idx in gap_indices:
-                    if idx > 0:
-                        gap_start = df.iloc[idx-1]['timestamp']
-                        gap_end = df.iloc[idx]['timestamp']
-                        gap_duration = time_diffs.iloc[idx]
-                        
-                        logger.warning(
-                            f"⚠️ GAP DETECTED: {ticker} {interval} between "
-                            f"{gap_start} and {gap_end} ({gap_duration:.1f} minutes)"
-                        )
-                        
-                return True
-                
-            return False
+            gaps = find_gaps(df['timestamp'], interval, min_missing=self._gap_min_missing(interval))
+            for gap_start, gap_end in gaps:
+                logger.warning(
+                    f"⚠️ GAP DETECTED: {ticker} {interval} missing bars "
+                    f"{gap_start} to {gap_end}"
+                )
+            return gaps
             
         except Exception as e:
             logger.error(f"❌ Error detecting gaps for {ticker} ({interval}): {e}")
-            return False
+            return []
             
     def process_all_tickers(self) -> Dict[str, Dict[str, bool]]:
         """
@@ -594,34 +1161,38 @@ class DataFetchManager:
         start_time = time.time()
         
         results = {}
-        successful_tickers = 0
         
-        for i, ticker in enumerate(self.master_tickers, 1):
-            logger.info(f"📈 Processing ticker {i}/{len(self.master_tickers)}: {ticker}")
-            
-            ticker_results = {
-                'daily': False,
-                '1min': False,
-                '30min': False
-            }
+        # Refresh the manifest once, then commit all entries in one write
+        self.manifest.load(refresh=True)
+        with self.manifest.batch():
+            if self.fetch_mode == "async":
+                results = self._process_tickers_concurrently(('daily', '1min', '30min'))
+            else:
+                for i, ticker in enumerate(self.master_tickers, 1):
+                    logger.info(f"📈 Processing ticker {i}/{len(self.master_tickers)}: {ticker}")
             
-            # Process daily data
-            ticker_results['daily'] = self.fetch_daily_data(ticker)
+                    ticker_results = {
+                        'daily': False,
+                        '1min': False,
+                        '30min': False
+                    }
             
-            # Process 1-minute intraday data
-            ticker_results['1min'] = self.fetch_intraday_data(ticker, '1min')
+                    # Process daily data
+                    ticker_results['daily'] = self.fetch_daily_data(ticker)
             
-            # Process 30-minute intraday data
-            ticker_results['30min'] = self.fetch_intraday_data(ticker, '30min')
+                    # Process 1-minute intraday data
+                    ticker_results['1min'] = self.fetch_intraday_data(ticker, '1min')
             
-            results[ticker] = ticker_results
+                    # Process 30-minute intraday data
+                    ticker_results['30min'] = self.fetch_intraday_data(ticker, '30min')
             
-            # Check if ticker was successful
-            if any(ticker_results.values()):
-                successful_tickers += 1
-                
-            # Brief pause between tickers to respect API limits
-            time.sleep(0.2)
+                    results[ticker] = ticker_results
+
+                    # Retry parked fetches whose backoff has expired
+                    self.retry_queue.retry_due(self._deferred_retry(results))
+
+            self._finish_deferred_retries(results)
+            successful_tickers = sum(1 for r in results.values() if any(r.values()))
             
         # Final summary
         elapsed_time = time.time() - start_time
@@ -646,15 +1217,20 @@ class DataFetchManager:
         logger.info(f"🚀 Running DAILY updates for {len(self.master_tickers)} tickers")
         start_time = time.time()
         
-        successful_tickers = 0
-        for i, ticker in enumerate(self.master_tickers, 1):
-            logger.info(f"📈 Processing daily data for ticker {i}/{len(self.master_tickers)}: {ticker}")
+        results = {}
+        self.manifest.load(refresh=True)
+        with self.manifest.batch():
+            if self.fetch_mode == "async":
+                results = self._process_tickers_concurrently(('daily',))
+            else:
+                for i, ticker in enumerate(self.master_tickers, 1):
+                    logger.info(f"📈 Processing daily data for ticker {i}/{len(self.master_tickers)}: {ticker}")
             
-            if self.fetch_daily_data(ticker):
-                successful_tickers += 1
-                
-            # Brief pause between tickers to respect API limits
-            time.sleep(0.2)
+                    results[ticker] = {'daily': self.fetch_daily_data(ticker)}
+                    self.retry_queue.retry_due(self._deferred_retry(results))
+
+            self._finish_deferred_retries(results)
+        successful_tickers = sum(1 for r in results.values() if r['daily'])
             
         elapsed_time = time.time() - start_time
         logger.info(f"🏁 Daily updates completed in {elapsed_time:.1f} seconds")
@@ -685,15 +1261,20 @@ class DataFetchManager:
         logger.info(f"🚀 Running {interval.upper()} intraday updates for {len(self.master_tickers)} tickers")
         start_time = time.time()
         
-        successful_tickers = 0
-        for i, ticker in enumerate(self.master_tickers, 1):
-            logger.info(f"📊 Processing {interval} data for ticker {i}/{len(self.master_tickers)}: {ticker}")
+        results = {}
+        self.manifest.load(refresh=True)
+        with self.manifest.batch():
+            if self.fetch_mode == "async":
+                results = self._process_tickers_concurrently((interval,))
+            else:
+                for i, ticker in enumerate(self.master_tickers, 1):
+                    logger.info(f"📊 Processing {interval} data for ticker {i}/{len(self.master_tickers)}: {ticker}")
             
-            if self.fetch_intraday_data(ticker, interval):
-                successful_tickers += 1
-                
-            # Brief pause between tickers to respect API limits
-            time.sleep(0.2)
+                    results[ticker] = {interval: self.fetch_intraday_data(ticker, interval)}
+                    self.retry_queue.retry_due(self._deferred_retry(results))
+
+            self._finish_deferred_retries(results)
+        successful_tickers = sum(1 for r in results.values() if r[interval])
             
         elapsed_time = time.time() - start_time
         per_symbol_ms = int((elapsed_time * 1000) / len(self.master_tickers)) if self.master_tickers else 0
@@ -806,6 +1387,11 @@ if __name__ == "__main__":
             action='store_true',
             help="Run in test mode (simulation)"
         )
+        parser.add_argument(
+            '--async-fetch',
+            action='store_true',
+            help="Process tickers concurrently (same as DATA_FETCH_MODE=async)"
+        )
         parser.add_argument(
             '--verbose',
             action='store_true',
@@ -837,6 +1423,8 @@ if __name__ == "__main__":
 
         # Instantiate the main class that contains the fetching logic
         manager = DataFetchManager() 
+        if args.async_fetch:
+            manager.fetch_mode = "async"
         
         # Get deployment info for tracking
         deployment_info = get_deployment_info()
@@ -14,6 +14,10 @@ Data Requirements:
 - 30-Minute Data: Minimum 500 rows
 - 1-Minute Data: Minimum 7 days of coverage
 
+Row counts and timestamp coverage come from the dataset manifest
+(utils/manifest.py), loaded with a single GET; objects missing from the
+manifest are downloaded as before.
+
 This supervisor job runs every 6 hours to maintain system health.
 """
 
@@ -37,6 +41,7 @@ from utils.config import (
 )
 from utils.data_storage import read_df_from_s3
 from utils.helpers import read_master_tickerlist, update_scheduler_status
+from utils.manifest import get_manifest
 
 # Setup logging
 logging.basicConfig(
@@ -45,12 +50,54 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def check_daily_data_health(ticker):
+def load_manifest_entries():
+    """
+    Load the dataset manifest once for the whole health check.
+
+    Returns:
+        dict: Object name -> manifest entry (empty if unavailable)
+    """
+    try:
+        manifest_df = get_manifest().load(refresh=True)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not load dataset manifest, reading objects instead: {e}")
+        return {}
+    return {row["object_name"]: row for row in manifest_df.to_dict("records")}
+
+
+def get_bar_summary(path, manifest_entries=None):
+    """
+    Get the row count and oldest timestamp for a bar object.
+
+    Args:
+        path (str): Logical object name
+        manifest_entries (dict): Preloaded manifest entries, or None
+
+    Returns:
+        tuple: (row_count, oldest_timestamp or None); row_count is 0 if missing
+    """
+    entry = (manifest_entries or {}).get(path)
+    if entry is not None:
+        oldest = entry.get("min_timestamp")
+        return int(entry.get("row_count", 0)), (oldest if pd.notna(oldest) else None)
+
+    df = read_df_from_s3(path)
+    if df.empty:
+        return 0, None
+
+    timestamp_col = "timestamp" if "timestamp" in df.columns else "Date"
+    if timestamp_col not in df.columns:
+        return len(df), None
+    return len(df), pd.to_datetime(df[timestamp_col]).min()
+
+
+def check_daily_data_health(ticker, manifest_entries=None):
     """
     Check if daily data meets minimum requirements.
 
     Args:
         ticker (str): Stock ticker symbol
+        manifest_entries (dict): Preloaded manifest entries, or None
 
     Returns:
         bool: True if data is compliant
@@ -60,26 +107,26 @@ def check_daily_data_health(ticker):
             f"[{ticker}] Checking Daily data against rule: min {DAILY_MIN_ROWS} rows."
         )
         daily_path = f"data/daily/{ticker}_daily.csv"
-        daily_df = read_df_from_s3(daily_path)
+        daily_rows, _ = get_bar_summary(daily_path, manifest_entries)
 
-        if daily_df.empty:
+        if daily_rows == 0:
             logging.warning(
                 f"[{ticker}] Daily data file NOT FOUND. Flagging as deficient."
             )
             logger.debug(f"❌ {ticker}: Daily data file is empty or missing")
             return False
 
-        if len(daily_df) < DAILY_MIN_ROWS:
+        if daily_rows < DAILY_MIN_ROWS:
             logging.warning(
-                f"[{ticker}] Daily data FAILED check. Found {len(daily_df)} rows, require {DAILY_MIN_ROWS}. Flagging as deficient."
+                f"[{ticker}] Daily data FAILED check. Found {daily_rows} rows, require {DAILY_MIN_ROWS}. Flagging as deficient."
             )
             logger.debug(
-                f"❌ {ticker}: Daily data insufficient - {len(daily_df)} rows (required: {DAILY_MIN_ROWS})"
+                f"❌ {ticker}: Daily data insufficient - {daily_rows} rows (required: {DAILY_MIN_ROWS})"
             )
             return False
 
-        logging.info(f"[{ticker}] Daily data OK ({len(daily_df)} rows).")
-        logger.debug(f"✅ {ticker}: Daily data compliant - {len(daily_df)} rows")
+        logging.info(f"[{ticker}] Daily data OK ({daily_rows} rows).")
+        logger.debug(f"✅ {ticker}: Daily data compliant - {daily_rows} rows")
         return True
 
     except Exception as e:
@@ -88,12 +135,13 @@ def check_daily_data_health(ticker):
         return False
 
 
-def check_30min_data_health(ticker):
+def check_30min_data_health(ticker, manifest_entries=None):
     """
     Check if 30-minute data meets minimum requirements.
 
     Args:
         ticker (str): Stock ticker symbol
+        manifest_entries (dict): Preloaded manifest entries, or None
 
     Returns:
         bool: True if data is compliant
@@ -103,26 +151,26 @@ def check_30min_data_health(ticker):
             f"[{ticker}] Checking 30min data against rule: min {THIRTY_MIN_MIN_ROWS} rows."
         )
         min_30_path = f"data/intraday_30min/{ticker}_30min.csv"
-        min_30_df = read_df_from_s3(min_30_path)
+        min_30_rows, _ = get_bar_summary(min_30_path, manifest_entries)
 
-        if min_30_df.empty:
+        if min_30_rows == 0:
             logging.warning(
                 f"[{ticker}] 30min data file NOT FOUND. Flagging as deficient."
             )
             logger.debug(f"❌ {ticker}: 30-minute data file is empty or missing")
             return False
 
-        if len(min_30_df) < THIRTY_MIN_MIN_ROWS:
+        if min_30_rows < THIRTY_MIN_MIN_ROWS:
             logging.warning(
-                f"[{ticker}] 30min data FAILED check. Found {len(min_30_df)} rows, require {THIRTY_MIN_MIN_ROWS}. Flagging as deficient."
+                f"[{ticker}] 30min data FAILED check. Found {min_30_rows} rows, require {THIRTY_MIN_MIN_ROWS}. Flagging as deficient."
             )
             logger.debug(
-                f"❌ {ticker}: 30-minute data insufficient - {len(min_30_df)} rows (required: {THIRTY_MIN_MIN_ROWS})"
+                f"❌ {ticker}: 30-minute data insufficient - {min_30_rows} rows (required: {THIRTY_MIN_MIN_ROWS})"
             )
             return False
 
-        logging.info(f"[{ticker}] 30min data OK ({len(min_30_df)} rows).")
-        logger.debug(f"✅ {ticker}: 30-minute data compliant - {len(min_30_df)} rows")
+        logging.info(f"[{ticker}] 30min data OK ({min_30_rows} rows).")
+        logger.debug(f"✅ {ticker}: 30-minute data compliant - {min_30_rows} rows")
         return True
 
     except Exception as e:
@@ -131,12 +179,13 @@ def check_30min_data_health(ticker):
         return False
 
 
-def check_1min_data_health(ticker):
+def check_1min_data_health(ticker, manifest_entries=None):
     """
     Check if 1-minute data meets minimum coverage requirements.
 
     Args:
         ticker (str): Stock ticker symbol
+        manifest_entries (dict): Preloaded manifest entries, or None
 
     Returns:
         bool: True if data is compliant
@@ -146,9 +195,9 @@ def check_1min_data_health(ticker):
             f"[{ticker}] Checking 1min data against rule: min {ONE_MIN_REQUIRED_DAYS} days coverage."
         )
         min_1_path = f"data/intraday/{ticker}_1min.csv"
-        min_1_df = read_df_from_s3(min_1_path)
+        min_1_rows, oldest_data = get_bar_summary(min_1_path, manifest_entries)
 
-        if min_1_df.empty:
+        if min_1_rows == 0:
             logging.warning(
                 f"[{ticker}] 1min data file NOT FOUND. Flagging as deficient."
             )
@@ -156,23 +205,20 @@ def check_1min_data_health(ticker):
             return False
 
         # Check date coverage
-        timestamp_col = "timestamp" if "timestamp" in min_1_df.columns else "Date"
-        if timestamp_col not in min_1_df.columns:
+        if oldest_data is None:
             logging.warning(
                 f"[{ticker}] 1min data FAILED check. Missing timestamp column. Flagging as deficient."
             )
             logger.debug(f"❌ {ticker}: 1-minute data missing timestamp column")
             return False
 
-        min_1_df[timestamp_col] = pd.to_datetime(min_1_df[timestamp_col])
-
         # Calculate required cutoff date
         cutoff_date = datetime.now(pytz.timezone(TIMEZONE)) - timedelta(
             days=ONE_MIN_REQUIRED_DAYS
         )
 
-        # Find oldest data point
-        oldest_data = min_1_df[timestamp_col].min()
+        # Localize oldest data point
+        oldest_data = pd.Timestamp(oldest_data)
         oldest_data_localized = (
             oldest_data.tz_localize(pytz.timezone(TIMEZONE))
             if oldest_data.tz is None
@@ -195,10 +241,10 @@ def check_1min_data_health(ticker):
             datetime.now(pytz.timezone(TIMEZONE)) - oldest_data_localized
         ).days
         logging.info(
-            f"[{ticker}] 1min data OK ({days_coverage} days coverage, {len(min_1_df)} rows)."
+            f"[{ticker}] 1min data OK ({days_coverage} days coverage, {min_1_rows} rows)."
         )
         logger.debug(
-            f"✅ {ticker}: 1-minute data compliant - {days_coverage} days coverage, {len(min_1_df)} rows"
+            f"✅ {ticker}: 1-minute data compliant - {days_coverage} days coverage, {min_1_rows} rows"
         )
         return True
 
@@ -233,6 +279,10 @@ def run_health_check():
     logging.info(f"Loaded {len(tickers)} tickers from master list.")
     logger.info(f"📋 Checking health for {len(tickers)} tickers: {tickers}")
 
+    # One GET for row counts and coverage of every object
+    manifest_entries = load_manifest_entries()
+    logger.info(f"📒 Loaded {len(manifest_entries)} manifest entries")
+
     # Initialize deficiencies tracking
     deficient_tickers = []
 
@@ -242,13 +292,13 @@ def run_health_check():
         logger.debug(f"🔍 Checking health for ticker: {ticker} ({i}/{len(tickers)})")
 
         # Check daily data first (most critical)
-        if not check_daily_data_health(ticker):
+        if not check_daily_data_health(ticker, manifest_entries):
             deficient_tickers.append(ticker)
             logger.info(f"⚠️ {ticker}: Added to deficient list due to daily data issues")
             continue  # Skip other checks if daily data fails
 
         # Check 30-minute data
-        if not check_30min_data_health(ticker):
+        if not check_30min_data_health(ticker, manifest_entries):
             deficient_tickers.append(ticker)
             logger.info(
                 f"⚠️ {ticker}: Added to deficient list due to 30-minute data issues"
@@ -256,7 +306,7 @@ def run_health_check():
             continue  # Skip 1-minute check if 30-minute fails
 
         # Check 1-minute data
-        if not check_1min_data_health(ticker):
+        if not check_1min_data_health(ticker, manifest_entries):
             deficient_tickers.append(ticker)
             logger.info(
                 f"⚠️ {ticker}: Added to deficient list due to 1-minute data issues"
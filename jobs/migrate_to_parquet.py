@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+CSV to Parquet Migration Tool
+=============================
+
+Converts existing per-ticker bar objects in DigitalOcean Spaces from CSV to
+the typed Parquet layout defined in utils/storage_format.py:
+1. Lists every .csv object under the bar prefixes (data/daily, data/intraday,
+   data/intraday_30min and the DataFetchManager directories)
+2. Encodes each one (UTC timestamps - values without an offset are exchange
+   time - float32 prices, uint64 volume)
+3. Uploads the .parquet sibling and verifies the row count by reading it back
+4. Optionally deletes the original CSV once the Parquet copy is verified
+
+Readers fall back to CSV automatically, so the migration can run while the
+system is live and can be re-run safely; already-migrated objects are skipped
+unless --reconvert is given (e.g. to rewrite copies made before naive
+timestamps were read as exchange time, schema version 1).
+
+Usage:
+    python jobs/migrate_to_parquet.py --dry-run
+    python jobs/migrate_to_parquet.py --prefix data/daily/ --delete-csv
+    python jobs/migrate_to_parquet.py --prefix data/daily/ --reconvert
+"""
+
+import argparse
+import io
+import logging
+import os
+import sys
+from typing import Dict, List
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.config import SPACES_BUCKET_NAME
+from utils.spaces_manager import (
+    PARQUET_COMPRESSION,
+    download_dataframe,
+    file_exists_in_spaces,
+    get_spaces_client,
+    upload_dataframe,
+)
+from utils.storage_format import (
+    BAR_PREFIXES,
+    PARQUET_AVAILABLE,
+    encode_bar_frame,
+    parquet_object_name,
+)
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def list_csv_objects(client, prefixes: List[str]) -> List[Dict]:
+    """
+    List CSV objects under the given prefixes.
+
+    Args:
+        client: boto3 S3 client
+        prefixes: Object prefixes to scan
+
+    Returns:
+        List of dicts with 'Key' and 'Size' for every .csv object
+    """
+    objects = []
+    paginator = client.get_paginator("list_objects_v2")
+    for prefix in prefixes:
+        for page in paginator.paginate(Bucket=SPACES_BUCKET_NAME, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                if obj["Key"].endswith(".csv"):
+                    objects.append({"Key": obj["Key"], "Size": obj.get("Size", 0)})
+    return objects
+
+
+def migrate_object(client, object_name: str, delete_csv: bool = False) -> Dict:
+    """
+    Migrate a single CSV bar object to Parquet.
+
+    Args:
+        client: boto3 S3 client
+        object_name: CSV object name to migrate
+        delete_csv: Delete the CSV after the Parquet copy is verified
+
+    Returns:
+        dict: Migration result with status and byte sizes
+    """
+    target = parquet_object_name(object_name)
+    result = {"object": object_name, "status": "failed", "parquet_bytes": 0}
+
+    df = download_dataframe(object_name, "csv")
+    if df.empty:
+        result["status"] = "empty"
+        return result
+
+    typed = encode_bar_frame(df)
+    buffer = io.BytesIO()
+    typed.to_parquet(buffer, index=False, compression=PARQUET_COMPRESSION)
+    result["parquet_bytes"] = buffer.getbuffer().nbytes
+
+    if not upload_dataframe(typed, target, "parquet"):
+        return result
+
+    # Verify the Parquet copy before touching the original
+    verified = download_dataframe(target, "parquet")
+    if len(verified) != len(df):
+        logger.error(f"❌ Row count mismatch for {target}: {len(verified)} vs {len(df)}")
+        return result
+
+    result["status"] = "migrated"
+    if delete_csv:
+        client.delete_object(Bucket=SPACES_BUCKET_NAME, Key=object_name)
+        logger.info(f"🗑️ Deleted migrated CSV: {object_name}")
+    return result
+
+
+def run_migration(
+    prefixes: List[str],
+    dry_run: bool = False,
+    delete_csv: bool = False,
+    reconvert: bool = False,
+):
+    """
+    Migrate all CSV bar objects under the given prefixes to Parquet.
+
+    Args:
+        prefixes: Object prefixes to migrate
+        dry_run: Only report what would be migrated
+        delete_csv: Delete each CSV after its Parquet copy is verified
+        reconvert: Rewrite Parquet copies that already exist from their CSV
+
+    Returns:
+        bool: True if every object migrated (or was skipped) successfully
+    """
+    if not PARQUET_AVAILABLE:
+        logger.error("❌ pyarrow is not installed - cannot write Parquet objects")
+        return False
+
+    client = get_spaces_client()
+    if not client:
+        logger.error("❌ No Spaces client available - check credentials")
+        return False
+
+    objects = list_csv_objects(client, prefixes)
+    logger.info(f"📋 Found {len(objects)} CSV bar objects under {prefixes}")
+
+    csv_bytes = 0
+    parquet_bytes = 0
+    failures = 0
+
+    for i, obj in enumerate(objects, 1):
+        object_name = obj["Key"]
+        target = parquet_object_name(object_name)
+
+        if not reconvert and file_exists_in_spaces(target):
+            logger.info(f"⏭️ [{i}/{len(objects)}] Already migrated: {object_name}")
+            if delete_csv and not dry_run:
+                client.delete_object(Bucket=SPACES_BUCKET_NAME, Key=object_name)
+            continue
+
+        if dry_run:
+            logger.info(f"🔍 [{i}/{len(objects)}] Would migrate: {object_name}")
+            continue
+
+        try:
+            result = migrate_object(client, object_name, delete_csv)
+        except Exception as e:
+            logger.error(f"❌ [{i}/{len(objects)}] Error migrating {object_name}: {e}")
+            failures += 1
+            continue
+
+        if result["status"] == "migrated":
+            csv_bytes += obj["Size"]
+            parquet_bytes += result["parquet_bytes"]
+            logger.info(
+                f"✅ [{i}/{len(objects)}] {object_name} -> {target} "
+                f"({obj['Size']} -> {result['parquet_bytes']} bytes)"
+            )
+        elif result["status"] == "empty":
+            logger.warning(
+                f"⚠️ [{i}/{len(objects)}] Empty or unreadable: {object_name}"
+            )
+        else:
+            failures += 1
+
+    if parquet_bytes:
+        logger.info(
+            f"📊 Migrated {csv_bytes} CSV bytes to {parquet_bytes} Parquet bytes "
+            f"({csv_bytes / parquet_bytes:.1f}x smaller)"
+        )
+    logger.info(f"🏁 Migration finished with {failures} failures")
+    return failures == 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Migrate per-ticker bar objects from CSV to Parquet"
+    )
+    parser.add_argument(
+        "--prefix",
+        action="append",
+        dest="prefixes",
+        help="Prefix to migrate (repeatable, defaults to all bar prefixes)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="List objects without migrating"
+    )
+    parser.add_argument(
+        "--delete-csv",
+        action="store_true",
+        help="Delete each CSV once its Parquet copy is verified",
+    )
+    parser.add_argument(
+        "--reconvert",
+        action="store_true",
+        help="Rewrite existing Parquet copies from their CSV",
+    )
+    args = parser.parse_args()
+
+    success = run_migration(
+        prefixes=args.prefixes or list(BAR_PREFIXES),
+        dry_run=args.dry_run,
+        delete_csv=args.delete_csv,
+        reconvert=args.reconvert,
+    )
+    sys.exit(0 if success else 1)
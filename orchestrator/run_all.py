@@ -30,6 +30,7 @@ import argparse
 import asyncio
 import logging
 import os
+import shutil
 import subprocess
 import sys
 import threading
@@ -47,12 +48,16 @@ from config import get_config, validate_config
 from core.data_manager import update_data
 from core.logging_system import setup_logging, get_logger
 
+from utils.config import JOB_EXECUTION_MODE, SNAPSHOT_DATA_DIR, WARM_WORKER_COUNT
 from utils.helpers import (
     detect_market_session,
     get_test_mode_reason,
+    read_tickerlist_from_s3,
     should_use_test_mode,
     update_scheduler_status,
 )
+from utils.snapshot import SNAPSHOT_DIR_ENV, build_snapshot, ticker_object_names
+from orchestrator.worker_pool import WarmWorkerPool, run_script_subprocess
 
 # Set up strategic logging system
 config = get_config()
@@ -68,6 +73,8 @@ if not validate_config():
 TEST_MODE_ACTIVE = False
 TEST_MODE_REASON = ""
 KILL_SWITCH_ACTIVE = False
+JOB_TIMEOUT_SECONDS = 1800  # 30-minute timeout for any single job
+WORKER_POOL = None
 
 
 def detect_and_log_test_mode():
@@ -100,7 +107,40 @@ def detect_and_log_test_mode():
     return TEST_MODE_ACTIVE
 
 
-def run_job(script_path, job_name):
+def get_worker_pool():
+    """
+    Get the warm worker pool, starting it on first use.
+
+    Returns:
+        WarmWorkerPool when JOB_EXECUTION_MODE is "warm", otherwise None
+    """
+    global WORKER_POOL, JOB_EXECUTION_MODE
+
+    if JOB_EXECUTION_MODE != "warm":
+        return None
+    if WORKER_POOL is None:
+        env = os.environ.copy()
+        if TEST_MODE_ACTIVE:
+            env["TEST_MODE"] = "enabled"
+            env["MODE"] = "test"
+        try:
+            WORKER_POOL = WarmWorkerPool(size=WARM_WORKER_COUNT, env=env)
+        except Exception as e:
+            logger.error(f"❌ Could not start warm worker pool - using subprocesses: {e}")
+            JOB_EXECUTION_MODE = "subprocess"
+            return None
+    return WORKER_POOL
+
+
+def shutdown_worker_pool():
+    """Stop the warm worker pool if it was started."""
+    global WORKER_POOL
+    if WORKER_POOL is not None:
+        WORKER_POOL.close()
+        WORKER_POOL = None
+
+
+def run_job(script_path, job_name, env_overrides=None):
     """
     Runs a Python script sequentially and waits for it to complete.
     Returns True on success, False on failure.
@@ -108,6 +148,7 @@ def run_job(script_path, job_name):
     Args:
         script_path: Can be just script path or "script_path args" format
         job_name: Name for logging and status tracking
+        env_overrides: Extra environment variables for the job process
     """
     mode_prefix = "[TEST MODE]" if TEST_MODE_ACTIVE else "[LIVE MODE]"
     logger.info(f"{mode_prefix} Starting Job: {job_name}")
@@ -124,27 +165,31 @@ def run_job(script_path, job_name):
         full_path = os.path.join(project_root, script_only)
 
         # Set environment variable to ensure jobs run in the same mode
-        env = os.environ.copy()
+        job_env = {}
         if TEST_MODE_ACTIVE:
-            env["TEST_MODE"] = "enabled"
-            env["MODE"] = "test"
+            job_env["TEST_MODE"] = "enabled"
+            job_env["MODE"] = "test"
+        if env_overrides:
+            job_env.update(env_overrides)
 
         # Build command with script and arguments
         cmd = [sys.executable, full_path] + script_args
-        
-        # DEBUG: Log the exact command being executed and cwd
-        logger.info(f"ORCHESTRATOR: Executing command: {' '.join(cmd)}")
-        logger.info(f"ORCHESTRATOR: Working directory: {project_root}")
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            shell=False,
-            cwd=project_root,
-            env=env,
-            timeout=1800,  # 30-minute timeout for any single job
-        )
+
+        pool = get_worker_pool()
+        if pool is not None:
+            # Warm worker: the script runs in an already-initialized process
+            logger.info(f"ORCHESTRATOR: Dispatching to warm worker: {' '.join(cmd)}")
+            result = pool.run(full_path, script_args, job_env, timeout=JOB_TIMEOUT_SECONDS)
+        else:
+            # DEBUG: Log the exact command being executed and cwd
+            logger.info(f"ORCHESTRATOR: Executing command: {' '.join(cmd)}")
+            logger.info(f"ORCHESTRATOR: Working directory: {project_root}")
+
+            env = os.environ.copy()
+            env.update(job_env)
+            result = run_script_subprocess(
+                full_path, script_args, env, project_root, timeout=JOB_TIMEOUT_SECONDS
+            )
 
         # Check for successful execution
         if result.returncode == 0:
@@ -294,9 +339,16 @@ def run_30min_updates():
     return result
 
 
-def run_screener(screener_name, script_path):
+def run_segment_compaction():
+    """Fold 1-minute intraday delta segments into their base objects."""
+    mode_prefix = "[TEST MODE]" if TEST_MODE_ACTIVE else "[LIVE MODE]"
+    logger.info(f"{mode_prefix} Starting intraday segment compaction")
+    return run_job("jobs/compact_intraday_segments.py", "compact_intraday_segments")
+
+
+def run_screener(screener_name, script_path, env_overrides=None):
     """Run a specific screener."""
-    result = run_job(script_path, screener_name)
+    result = run_job(script_path, screener_name, env_overrides)
     if TEST_MODE_ACTIVE and result:
         logger.info(f"[TEST MODE] {screener_name} screener simulation completed")
     return result
@@ -312,6 +364,37 @@ def run_orb_screener():
     return run_screener("orb", "screeners/orb.py")
 
 
+def build_hourly_snapshot():
+    """
+    Download the daily frames and AVWAP anchors the hourly screeners share.
+
+    Each object is downloaded once, concurrently, and saved as a shared
+    snapshot directory that the screener processes memory-map.
+
+    Returns:
+        MarketDataSnapshot saved to disk, or None if it could not be shared
+    """
+    anchors_object = "data/avwap_anchors.csv"
+    snapshot = build_snapshot([anchors_object])
+    anchor_df = snapshot.get(anchors_object)
+
+    tickers = set(read_tickerlist_from_s3("tickerlist.txt"))
+    for column in ("Ticker", "ticker", "TICKER"):
+        if anchor_df is not None and column in anchor_df.columns:
+            tickers.update(anchor_df[column].dropna().astype(str))
+            break
+
+    snapshot = build_snapshot(
+        ticker_object_names(sorted(tickers), include_intraday=False), base=snapshot
+    )
+    cycle_dir = os.path.join(
+        SNAPSHOT_DATA_DIR, f"hourly_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    )
+    if snapshot.save(cycle_dir) is None:
+        return None
+    return snapshot
+
+
 def run_hourly_screeners():
     """Run screeners that operate on hourly frequency."""
     mode_prefix = "[TEST MODE]" if TEST_MODE_ACTIVE else "[LIVE MODE]"
@@ -324,14 +407,30 @@ def run_hourly_screeners():
         ("exhaustion", "screeners/exhaustion.py"),
     ]
 
+    # Shared per-cycle snapshot: every screener reads the same frames
+    snapshot = None
+    try:
+        snapshot = build_hourly_snapshot()
+    except Exception as e:
+        logger.warning(f"Could not build market data snapshot - screeners will read directly: {e}")
+    env_overrides = {SNAPSHOT_DIR_ENV: snapshot.directory} if snapshot else None
+
     results = []
-    for name, script in screeners:
-        try:
-            result = run_screener(name, script)
-            results.append(result)
-        except Exception as e:
-            logger.error(f"Error running {name} screener: {e}")
-            results.append(False)
+    try:
+        for name, script in screeners:
+            try:
+                result = run_screener(name, script, env_overrides)
+                results.append(result)
+            except Exception as e:
+                logger.error(f"Error running {name} screener: {e}")
+                results.append(False)
+    finally:
+        if snapshot is not None:
+            logger.info(
+                f"📦 Snapshot cycle: {snapshot.served} reads served from "
+                f"{snapshot.downloads} downloads - saved {snapshot.saved_downloads} downloads"
+            )
+            shutil.rmtree(snapshot.directory, ignore_errors=True)
 
     success = all(results)
     if TEST_MODE_ACTIVE and success:
@@ -380,6 +479,13 @@ def setup_production_schedule():
                 "intraday_1min"
             )
 
+    # Delta segment compaction - hourly at :05 through the evening close
+    for hour in range(5, 21):
+        time_str = f"{hour:02d}:05"
+        schedule.every().day.at(time_str).do(run_segment_compaction).tag(
+            "segment_compaction"
+        )
+
     # 30-minute intraday updates - every 15 minutes
     for hour in range(4, 20):  # Extended hours coverage
         for minute in [0, 15, 30, 45]:
@@ -526,6 +632,10 @@ def main():
     
     logger.info(f"⏰ Orchestrator running in {mode_str.lower()} - 24/7 operation")
     logger.info(f"📅 Scheduled jobs: {len(schedule.jobs)}")
+    if JOB_EXECUTION_MODE == "warm":
+        logger.info(f"🔥 Jobs run on {WARM_WORKER_COUNT} warm workers")
+    else:
+        logger.info("🧵 Jobs run in a fresh subprocess each")
     
     if test_mode_active:
         logger.info("🧪 [TEST MODE] Jobs will run with simulated data for testing purposes")
@@ -558,6 +668,7 @@ def main():
             logger.error(f"💥 Unexpected error in main loop: {e}")
             time.sleep(60)  # Wait 1 minute before retrying
     
+    shutdown_worker_pool()
     logger.info("🏁 Strategic Orchestrator shutdown complete")
     return 0
 
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Warm worker pool for orchestrator jobs.
+
+run_job used to start a fresh interpreter for every job, including the
+every-minute intraday update and Gap & Go runs, paying interpreter start-up
+plus the pandas / boto3 / pandas_market_calendars / requests imports each
+time and losing every in-process cache.
+
+A WarmWorkerPool keeps long-lived worker processes that import those modules
+once. Each job is dispatched to an idle worker, which runs the script in
+process as __main__ (same argv, cwd and environment overrides), captures
+stdout/stderr at the file-descriptor level and reports the exit code. Results
+are subprocess.CompletedProcess objects and timeouts raise
+subprocess.TimeoutExpired, so callers handle both execution modes the same
+way. A worker that times out or dies is killed and replaced; if no worker can
+be started any more, jobs run as plain subprocesses instead.
+
+Workers are separate `python orchestrator/worker_pool.py` processes connected
+over a local multiprocessing connection, so they never re-import the
+orchestrator's main module.
+"""
+
+import argparse
+import logging
+import os
+import queue
+import runpy
+import secrets
+import select
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from multiprocessing.connection import Client, Listener
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+AUTHKEY_ENV = "WARM_WORKER_AUTHKEY"
+
+# Imported once per worker; the project modules also build their clients
+PRELOAD_MODULES = (
+    "numpy",
+    "pandas",
+    "requests",
+    "boto3",
+    "pandas_market_calendars",
+    "utils.helpers",
+    "utils.spaces_manager",
+)
+
+
+def run_script_subprocess(
+    script_path: str,
+    args: Optional[List[str]] = None,
+    env: Optional[Dict[str, str]] = None,
+    cwd: str = PROJECT_ROOT,
+    timeout: Optional[float] = None,
+) -> subprocess.CompletedProcess:
+    """
+    Run a script in a fresh interpreter (the original execution mode).
+
+    Args:
+        script_path: Absolute path of the script
+        args: Command-line arguments
+        env: Full environment for the process
+        cwd: Working directory
+        timeout: Seconds before the process is killed
+
+    Returns:
+        subprocess.CompletedProcess with captured stdout/stderr
+    """
+    return subprocess.run(
+        [sys.executable, script_path] + list(args or []),
+        capture_output=True,
+        text=True,
+        shell=False,
+        cwd=cwd,
+        env=env,
+        timeout=timeout,
+    )
+
+
+# --- Worker side ---
+
+
+def _reset_job_state():
+    """Drop per-job process state that must not leak into the next job."""
+    try:
+        from utils.snapshot import activate_snapshot
+
+        # The snapshot directory of a finished cycle is deleted by the orchestrator
+        activate_snapshot(None)
+    except Exception:
+        pass
+
+
+def _run_job_in_process(
+    script_path: str, args: List[str], env_overrides: Dict[str, str]
+):
+    """
+    Execute one job script as __main__ inside this worker.
+
+    Returns:
+        Tuple of (returncode, stdout, stderr)
+    """
+    saved_argv = sys.argv
+    saved_env = {key: os.environ.get(key) for key in env_overrides}
+    saved_fds = (os.dup(1), os.dup(2))
+    returncode = 0
+
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(out.fileno(), 1)
+        os.dup2(err.fileno(), 2)
+        try:
+            os.environ.update(env_overrides)
+            sys.argv = [script_path] + list(args)
+            runpy.run_path(script_path, run_name="__main__")
+        except SystemExit as e:
+            if e.code is None:
+                returncode = 0
+            elif isinstance(e.code, int):
+                returncode = e.code
+            else:
+                print(e.code, file=sys.stderr)
+                returncode = 1
+        except BaseException:
+            traceback.print_exc()
+            returncode = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved_fds[0], 1)
+            os.dup2(saved_fds[1], 2)
+            for fd in saved_fds:
+                os.close(fd)
+            sys.argv = saved_argv
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+            _reset_job_state()
+
+        out.seek(0)
+        err.seek(0)
+        stdout = out.read().decode("utf-8", errors="replace")
+        stderr = err.read().decode("utf-8", errors="replace")
+
+    return returncode, stdout, stderr
+
+
+def worker_main(address: str):
+    """Worker process loop: preload modules, then run jobs until told to stop."""
+    os.chdir(PROJECT_ROOT)
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    logging.basicConfig(level=logging.INFO)
+
+    for module in PRELOAD_MODULES:
+        try:
+            __import__(module)
+        except Exception as e:
+            logger.warning(f"⚠️ Warm worker could not preload {module}: {e}")
+
+    conn = Client(address, authkey=bytes.fromhex(os.environ.pop(AUTHKEY_ENV)))
+    conn.send(("ready", os.getpid()))
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        script_path, args, env_overrides = message
+        conn.send(_run_job_in_process(script_path, args, env_overrides))
+    conn.close()
+
+
+# --- Orchestrator side ---
+
+
+class _Worker:
+    """One warm worker process and its connection."""
+
+    def __init__(self, process: subprocess.Popen, conn):
+        self.process = process
+        self.conn = conn
+        self.jobs_run = 0
+
+    def kill(self):
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+
+
+class WarmWorkerPool:
+    """Pool of pre-warmed worker processes that run job scripts as function calls."""
+
+    def __init__(
+        self,
+        size: int = 2,
+        env: Optional[Dict[str, str]] = None,
+        startup_timeout: float = 120,
+    ):
+        """
+        Start the workers.
+
+        Args:
+            size: Number of worker processes
+            env: Base environment of the workers (defaults to os.environ)
+            startup_timeout: Seconds to wait for a worker to finish preloading
+        """
+        self.size = max(1, size)
+        self.env = dict(os.environ if env is None else env)
+        self.startup_timeout = startup_timeout
+        self._authkey = secrets.token_bytes(32)
+        self._listener = Listener(authkey=self._authkey)
+        self._listener_lock = threading.Lock()
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._closed = False
+
+        for _ in range(self.size):
+            self._idle.put(self._start_worker())
+        logger.info(f"🔥 Warm worker pool ready with {self.size} workers")
+
+    def _start_worker(self) -> _Worker:
+        """
+        Start one worker and wait until it has preloaded its modules.
+
+        Raises:
+            RuntimeError: If the worker exits or is not ready within startup_timeout
+        """
+        env = dict(self.env)
+        env[AUTHKEY_ENV] = self._authkey.hex()
+        # One start at a time, so the connection accepted belongs to this process
+        with self._listener_lock:
+            deadline = time.monotonic() + self.startup_timeout
+            process = subprocess.Popen(
+                [
+                    sys.executable,
+                    os.path.abspath(__file__),
+                    "--address",
+                    self._listener.address,
+                ],
+                cwd=PROJECT_ROOT,
+                env=env,
+            )
+            conn = None
+            try:
+                # Listener.accept() has no timeout; wait on its socket instead
+                listen_socket = self._listener._listener._socket
+                self._wait_for_worker(process, deadline, listen_socket)
+                conn = self._listener.accept()
+                self._wait_for_worker(process, deadline, conn)
+                conn.recv()
+            except BaseException:
+                if conn is not None:
+                    conn.close()
+                if process.poll() is None:
+                    process.kill()
+                process.wait()
+                raise
+        worker = _Worker(process, conn)
+        self._workers.append(worker)
+        return worker
+
+    @staticmethod
+    def _wait_for_worker(process: subprocess.Popen, deadline: float, waitable):
+        """Wait until a starting worker's socket or connection is readable, or fail."""
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(
+                    f"Warm worker exited during start-up (code {process.returncode})"
+                )
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError("Warm worker did not finish starting")
+            interval = min(remaining, 0.2)
+            if isinstance(waitable, socket.socket):
+                if select.select([waitable], [], [], interval)[0]:
+                    return
+            elif waitable.poll(interval):
+                return
+
+    def _replace(self, worker: _Worker):
+        worker.kill()
+        self._workers.remove(worker)
+        if self._closed:
+            return
+        try:
+            self._idle.put(self._start_worker())
+        except Exception as e:
+            logger.error(
+                f"❌ Could not replace warm worker ({len(self._workers)} left): {e}"
+            )
+
+    def _acquire(self) -> Optional[_Worker]:
+        """Take an idle worker, or None once the pool has no workers left."""
+        while True:
+            try:
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                if not self._workers:
+                    return None
+
+    def run(
+        self,
+        script_path: str,
+        args: Optional[List[str]] = None,
+        env_overrides: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a job script on an idle warm worker.
+
+        If every worker has died and none could be restarted, the job runs in a
+        fresh interpreter via run_script_subprocess instead.
+
+        Args:
+            script_path: Absolute path of the script
+            args: Command-line arguments
+            env_overrides: Environment variables set for this job only
+            timeout: Seconds before the worker is killed and replaced
+
+        Returns:
+            subprocess.CompletedProcess with captured stdout/stderr
+
+        Raises:
+            subprocess.TimeoutExpired: If the job exceeds the timeout
+        """
+        if self._closed:
+            raise RuntimeError("Warm worker pool is closed")
+
+        args = list(args or [])
+        cmd = [sys.executable, script_path] + args
+        worker = self._acquire()
+        if worker is None:
+            logger.warning("⚠️ No warm workers left - running job as a subprocess")
+            env = dict(self.env)
+            env.update(env_overrides or {})
+            return run_script_subprocess(
+                script_path, args, env, PROJECT_ROOT, timeout=timeout
+            )
+        try:
+            worker.conn.send((script_path, args, dict(env_overrides or {})))
+            if not worker.conn.poll(timeout):
+                self._replace(worker)
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            returncode, stdout, stderr = worker.conn.recv()
+        except (EOFError, OSError):
+            # The job took the worker down (os._exit, crash); report it like a
+            # dead process
+            exit_code = worker.process.wait()
+            self._replace(worker)
+            return subprocess.CompletedProcess(
+                cmd, exit_code or 1, "", "Warm worker exited"
+            )
+
+        worker.jobs_run += 1
+        self._idle.put(worker)
+        return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+
+    def close(self):
+        """Stop every worker."""
+        self._closed = True
+        for worker in list(self._workers):
+            try:
+                worker.conn.send(None)
+                worker.process.wait(timeout=5)
+            except Exception:
+                pass
+            worker.kill()
+        self._workers.clear()
+        self._listener.close()
+
+    def __enter__(self) -> "WarmWorkerPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm orchestrator worker")
+    parser.add_argument("--address", required=True)
+    worker_main(parser.parse_args().address)
@@ -16,12 +16,9 @@ logger = logging.getLogger(__name__)
 # This makes sure the script can find the 'utils' directory
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from utils.helpers import (
-    calculate_vwap,
-    format_to_two_decimal,
-    read_df_from_s3,
-    save_df_to_s3,
-)
+from utils.avwap import AVWAPEngine, load_avwap_anchors
+from utils.helpers import format_to_two_decimal, save_df_to_s3
+from utils.snapshot import prefetch_market_data, read_market_data, ticker_object_names
 
 # --- Screener-Specific Configuration ---
 VOLUME_SPIKE_THRESHOLD = 1.15  # 115%
@@ -47,81 +44,51 @@ def get_reclaim_quality(candle: pd.Series) -> str:
 def run_avwap_screener():
     """
     AVWAP Reclaim Screener per specification:
-    Detects reclaim or rejection of 1-2 anchored VWAPs and produces fields needed by trade planning.
+    Detects reclaim or rejection of the anchored VWAPs of every anchor and produces fields needed by trade planning.
     """
     logger.info("Running Anchored VWAP (AVWAP) Screener")
 
     # --- 1. Load AVWAP anchors ---
-    anchor_df = read_df_from_s3("data/avwap_anchors.csv")
+    anchor_df = read_market_data("data/avwap_anchors.csv")
     if anchor_df.empty:
         logger.error(
             "Anchor file not found in cloud storage. Please run the find_avwap_anchors.py job first."
         )
         return
 
-    # Handle different possible column names
-    ticker_col = None
-    for col in ["Ticker", "ticker", "TICKER"]:
-        if col in anchor_df.columns:
-            ticker_col = col
-            break
-
-    if ticker_col is None:
-        logger.error("No ticker column found in AVWAP anchors file")
+    # Every anchor per ticker (all power candles, not just two)
+    anchor_dict = load_avwap_anchors(anchor_df)
+    if not anchor_dict:
+        logger.error("No usable anchors found in AVWAP anchors file")
         return
 
-    anchor_dict = {}
-    for _, row in anchor_df.iterrows():
-        ticker = row[ticker_col]
-        anchor_1_date = row.get("Anchor 1 Date")
-        anchor_2_date = row.get("Anchor 2 Date")
-
-        anchor_dict[ticker] = {
-            "anchor_1": (
-                pd.to_datetime(anchor_1_date) if pd.notna(anchor_1_date) else None
-            ),
-            "anchor_2": (
-                pd.to_datetime(anchor_2_date) if pd.notna(anchor_2_date) else None
-            ),
-        }
-
     all_results = []
 
-    # --- 2. Process Each Ticker ---
-    for ticker, anchors in anchor_dict.items():
-        try:
-            # Load daily data (or intraday if preferred)
-            daily_df = read_df_from_s3(f"data/daily/{ticker}_daily.csv")
-            if daily_df is None or daily_df.empty:
-                continue
+    # Load every anchored ticker's daily frame once, concurrently
+    prefetch_market_data(ticker_object_names(anchor_dict, include_intraday=False))
 
-            daily_df["timestamp"] = pd.to_datetime(daily_df["timestamp"])
-            daily_df = daily_df.sort_values("timestamp")
+    daily_frames = {}
+    for ticker in anchor_dict:
+        daily_df = read_market_data(f"data/daily/{ticker}_daily.csv")
+        if daily_df is None or daily_df.empty:
+            continue
+        daily_df["timestamp"] = pd.to_datetime(daily_df["timestamp"])
+        daily_frames[ticker] = daily_df.sort_values("timestamp")
 
-            # --- 3. Core logic - Calculate AVWAPs ---
+    # --- 2. Evaluate every anchor of every ticker in one batch ---
+    avwaps_by_ticker = AVWAPEngine(daily_frames).by_ticker(anchor_dict)
+
+    # --- 3. Process Each Ticker ---
+    for ticker, daily_df in daily_frames.items():
+        try:
             latest = daily_df.iloc[-1]
             current_price = latest["close"]
 
-            avwap_1 = np.nan
-            avwap_2 = np.nan
-
-            # Calculate AVWAP 1
-            if anchors["anchor_1"] is not None:
-                anchor_1_df = daily_df[
-                    daily_df["timestamp"] >= anchors["anchor_1"]
-                ].copy()
-                if not anchor_1_df.empty:
-                    anchor_1_df["vwap"] = calculate_vwap(anchor_1_df)
-                    avwap_1 = anchor_1_df["vwap"].iloc[-1]
-
-            # Calculate AVWAP 2
-            if anchors["anchor_2"] is not None:
-                anchor_2_df = daily_df[
-                    daily_df["timestamp"] >= anchors["anchor_2"]
-                ].copy()
-                if not anchor_2_df.empty:
-                    anchor_2_df["vwap"] = calculate_vwap(anchor_2_df)
-                    avwap_2 = anchor_2_df["vwap"].iloc[-1]
+            # Anchors are sorted oldest first: AVWAP 1 is the most recent anchor
+            ticker_avwaps = avwaps_by_ticker.get(ticker, np.array([]))
+            ticker_avwaps = ticker_avwaps[~np.isnan(ticker_avwaps)]
+            avwap_1 = ticker_avwaps[-1] if len(ticker_avwaps) >= 1 else np.nan
+            avwap_2 = ticker_avwaps[-2] if len(ticker_avwaps) >= 2 else np.nan
 
             # --- 4. Direction determination ---
             direction = "None"
@@ -129,12 +96,8 @@ def run_avwap_screener():
             nearest_avwap = None
             distance_to_nearest = np.nan
 
-            # Find nearest AVWAP
-            valid_avwaps = []
-            if not np.isnan(avwap_1):
-                valid_avwaps.append(avwap_1)
-            if not np.isnan(avwap_2):
-                valid_avwaps.append(avwap_2)
+            # Find nearest AVWAP across all anchors
+            valid_avwaps = list(ticker_avwaps)
 
             if valid_avwaps:
                 # Find nearest AVWAP to current price
@@ -193,6 +156,7 @@ def run_avwap_screener():
                 "AVWAP 2": (
                     format_to_two_decimal(avwap_2) if not np.isnan(avwap_2) else "N/A"
                 ),
+                "Anchors": len(ticker_avwaps),
                 "Volume vs Avg %": format_to_two_decimal(volume_vs_avg_pct),
                 "Distance to Nearest AVWAP %": (
                     format_to_two_decimal(distance_to_nearest)
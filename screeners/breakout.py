@@ -14,41 +14,33 @@ logger = logging.getLogger(__name__)
 # Add project root to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from utils.data_storage import read_df_from_s3
+from utils.avwap import AVWAPEngine, avwap_from_anchor, load_avwap_anchors
 from utils.helpers import (
     format_to_two_decimal,
     read_tickerlist_from_s3,
     save_df_to_s3,
     update_scheduler_status,
 )
+from utils.indicators import IndicatorPanel, bollinger_band_series, ema_series
+from utils.snapshot import prefetch_market_data, read_market_data, ticker_object_names
 
 
 def calculate_bollinger_bands(series, window=20, num_std=2):
-    """Calculate Bollinger Bands manually"""
-    rolling_mean = series.rolling(window=window).mean()
-    rolling_std = series.rolling(window=window).std()
-    upper_band = rolling_mean + (rolling_std * num_std)
-    lower_band = rolling_mean - (rolling_std * num_std)
-    return upper_band, lower_band, rolling_mean
+    """Calculate Bollinger Bands (single-ticker view over the indicator engine)"""
+    return bollinger_band_series(series, window=window, num_std=num_std)
 
 
 def calculate_ema(series, span=20):
-    """Calculate Exponential Moving Average"""
-    return series.ewm(span=span, adjust=False).mean()
+    """Calculate Exponential Moving Average (single-ticker view over the indicator engine)"""
+    return ema_series(series, span=span)
 
 
 def calculate_vwap_from_anchor(df, anchor_date):
-    """Calculate AVWAP from anchor date using helper function"""
+    """Calculate AVWAP from anchor date (single-ticker view over the AVWAP engine)"""
     try:
-        from utils.helpers import calculate_vwap
-
-        anchor_df = df[df["timestamp"] >= anchor_date].copy()
-        if not anchor_df.empty:
-            anchor_df["vwap"] = calculate_vwap(anchor_df)
-            return anchor_df["vwap"].iloc[-1]
+        return avwap_from_anchor(df, anchor_date)
     except Exception:
-        pass
-    return None
+        return None
 
 
 def run_breakout_screener():
@@ -64,19 +56,13 @@ def run_breakout_screener():
         return
 
     # Load the AVWAP anchor data
-    anchor_df = read_df_from_s3("data/avwap_anchors.csv")
-    anchor_dict = {}
-    if (
-        not anchor_df.empty
-        and "Ticker" in anchor_df.columns
-        and "Anchor 1 Date" in anchor_df.columns
-    ):
-        for _, row in anchor_df.iterrows():
-            ticker_symbol = row["Ticker"]
-            anchor_date = row["Anchor 1 Date"]
-            if pd.notna(anchor_date):
-                anchor_dict[ticker_symbol] = pd.to_datetime(anchor_date)
-        logger.info(f"Loaded {len(anchor_dict)} AVWAP anchors")
+    prefetch_market_data(
+        ["data/avwap_anchors.csv"]
+        + ticker_object_names(tickers, include_intraday=False)
+    )
+    anchor_dict = load_avwap_anchors(read_market_data("data/avwap_anchors.csv"))
+    if anchor_dict:
+        logger.info(f"Loaded AVWAP anchors for {len(anchor_dict)} tickers")
     else:
         logger.warning(
             "AVWAP anchors file not found or invalid format. AVWAP confluence will not be calculated."
@@ -84,31 +70,39 @@ def run_breakout_screener():
 
     all_signals = []
 
+    # --- Calculate Technical Indicators for the whole universe at once ---
+    panel = IndicatorPanel.from_frames(
+        {
+            ticker: read_market_data(f"data/daily/{ticker}_daily.csv")
+            for ticker in tickers
+        }
+    )
+    ema20 = panel.ema(span=20)
+    std_dev = panel.rolling_std(window=20)
+    avg_vol_20d = panel.average_volume(window=20)  # Lagged to avoid lookahead
+
+    # AVWAP of every anchor for the whole universe in one batch
+    avwaps_by_ticker = AVWAPEngine(
+        {ticker: panel.frames[ticker] for ticker in anchor_dict if ticker in panel}
+    ).by_ticker(anchor_dict)
+
     for ticker in tqdm(tickers, desc="Scanning for Breakouts"):
         try:
-            daily_df = read_df_from_s3(f"data/daily/{ticker}_daily.csv")
             if (
-                daily_df is None or len(daily_df) < 20
+                ticker not in panel or len(panel.frame(ticker)) < 20
             ):  # Need at least 20 days for indicators
                 continue
 
-            # Ensure timestamp column is datetime
-            daily_df["timestamp"] = pd.to_datetime(daily_df["timestamp"])
-            daily_df = daily_df.sort_values("timestamp")
-
-            # --- Calculate Technical Indicators ---
-            # EMA20
-            daily_df["EMA20"] = calculate_ema(daily_df["close"], span=20)
+            daily_df = panel.frame(ticker)
 
-            # Standard deviation for Bollinger Bands
-            daily_df["STD_DEV"] = daily_df["close"].rolling(window=20).std()
+            # EMA20 and Bollinger Bands around it
+            daily_df["EMA20"] = panel.series(ema20, ticker)
+            daily_df["STD_DEV"] = panel.series(std_dev, ticker)
             daily_df["BB_Upper"] = daily_df["EMA20"] + 2 * daily_df["STD_DEV"]
             daily_df["BB_Lower"] = daily_df["EMA20"] - 2 * daily_df["STD_DEV"]
 
-            # Volume metrics (avoid lookahead)
-            daily_df["Avg_Vol_20D"] = (
-                daily_df["volume"].shift(1).rolling(window=20).mean()
-            )
+            # Volume metrics
+            daily_df["Avg_Vol_20D"] = panel.series(avg_vol_20d, ticker)
             daily_df["Volume_vs_Avg_Pct"] = (
                 daily_df["volume"] / daily_df["Avg_Vol_20D"]
             ) * 100
@@ -168,11 +162,12 @@ def run_breakout_screener():
 
             # --- AVWAP confirmation ---
             avwap_reclaimed = "No"
-            if ticker in anchor_dict:
-                anchor_date = anchor_dict[ticker]
-                avwap_value = calculate_vwap_from_anchor(daily_df, anchor_date)
-                if avwap_value is not None:
-                    avwap_reclaimed = "Yes" if latest["close"] > avwap_value else "No"
+            ticker_avwaps = avwaps_by_ticker.get(ticker, np.array([]))
+            ticker_avwaps = ticker_avwaps[~np.isnan(ticker_avwaps)]
+            if len(ticker_avwaps):
+                # Anchors are sorted oldest first: confirm against the most recent
+                avwap_value = ticker_avwaps[-1]
+                avwap_reclaimed = "Yes" if latest["close"] > avwap_value else "No"
 
             # --- Validation (positive conditions for clarity) ---
             volume_condition = latest["Volume_vs_Avg_Pct"] >= 115
@@ -14,13 +14,10 @@ logger = logging.getLogger(__name__)
 # This makes sure the script can find the 'utils' directory
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from utils.helpers import (
-    calculate_vwap,
-    format_to_two_decimal,
-    read_df_from_s3,
-    read_tickerlist_from_s3,
-    save_df_to_s3,
-)
+from utils.avwap import AVWAPEngine, load_avwap_anchors
+from utils.helpers import format_to_two_decimal, read_tickerlist_from_s3, save_df_to_s3
+from utils.indicators import IndicatorPanel
+from utils.snapshot import prefetch_market_data, read_market_data, ticker_object_names
 
 # --- Screener-Specific Configuration ---
 EMA_LONG_PERIOD = 50
@@ -43,38 +40,41 @@ def run_ema_pullback_screener():
         return
 
     # Load AVWAP anchors for confluence
-    anchor_df = read_df_from_s3("data/avwap_anchors.csv")
-    anchor_dict = {}
-    if (
-        not anchor_df.empty
-        and "Ticker" in anchor_df.columns
-        and "Anchor 1 Date" in anchor_df.columns
-    ):
-        for _, row in anchor_df.iterrows():
-            ticker_symbol = row["Ticker"]
-            anchor_date = row["Anchor 1 Date"]
-            if pd.notna(anchor_date):
-                anchor_dict[ticker_symbol] = pd.to_datetime(anchor_date)
+    prefetch_market_data(
+        ["data/avwap_anchors.csv"]
+        + ticker_object_names(tickers, include_intraday=False)
+    )
+    anchor_dict = load_avwap_anchors(read_market_data("data/avwap_anchors.csv"))
 
     all_results = []
 
+    # --- 2. Load Data and Calculate Indicators for the whole universe ---
+    panel = IndicatorPanel.from_frames(
+        {
+            ticker: read_market_data(f"data/daily/{ticker}_daily.csv")
+            for ticker in tickers
+        }
+    )
+    ema50 = panel.ema(span=EMA_LONG_PERIOD)
+    ema21 = panel.ema(span=EMA_MEDIUM_PERIOD)
+    ema8 = panel.ema(span=EMA_SHORT_PERIOD)
+    avg_vol_20d = panel.average_volume(window=20)  # Lagged to avoid lookahead
+
+    # Every anchor's AVWAP for the whole universe in one batch
+    avwaps_by_ticker = AVWAPEngine(
+        {ticker: panel.frames[ticker] for ticker in anchor_dict if ticker in panel}
+    ).by_ticker(anchor_dict)
+
     for ticker in tickers:
         try:
-            # --- 2. Load Data and Calculate Indicators ---
-            df = read_df_from_s3(f"data/daily/{ticker}_daily.csv")
-            if df is None or len(df) < EMA_LONG_PERIOD + 1:
+            if ticker not in panel or len(panel.frame(ticker)) < EMA_LONG_PERIOD + 1:
                 continue
 
-            df["timestamp"] = pd.to_datetime(df["timestamp"])
-            df = df.sort_values("timestamp")
-
-            # Calculate EMAs
-            df["EMA50"] = df["close"].ewm(span=EMA_LONG_PERIOD, adjust=False).mean()
-            df["EMA21"] = df["close"].ewm(span=EMA_MEDIUM_PERIOD, adjust=False).mean()
-            df["EMA8"] = df["close"].ewm(span=EMA_SHORT_PERIOD, adjust=False).mean()
-
-            # Volume metrics (avoid lookahead)
-            df["Avg_Vol_20D"] = df["volume"].shift(1).rolling(window=20).mean()
+            df = panel.frame(ticker)
+            df["EMA50"] = panel.series(ema50, ticker)
+            df["EMA21"] = panel.series(ema21, ticker)
+            df["EMA8"] = panel.series(ema8, ticker)
+            df["Avg_Vol_20D"] = panel.series(avg_vol_20d, ticker)
             df["Volume_vs_Avg_Pct"] = (df["volume"] / df["Avg_Vol_20D"]) * 100
 
             # --- 3. Candle metrics (latest and previous) ---
@@ -139,19 +139,14 @@ def run_ema_pullback_screener():
 
             # --- 6. AVWAP Confluence ---
             avwap_confluence = "N/A"
-            if ticker in anchor_dict:
-                try:
-                    anchor_date = anchor_dict[ticker]
-                    anchor_df_filtered = df[df["timestamp"] >= anchor_date].copy()
-                    if not anchor_df_filtered.empty:
-                        anchor_df_filtered["vwap"] = calculate_vwap(anchor_df_filtered)
-                        avwap_value = anchor_df_filtered["vwap"].iloc[-1]
-                        distance_to_avwap = (
-                            abs(latest["close"] - avwap_value) / avwap_value * 100
-                        )
-                        avwap_confluence = "Yes" if distance_to_avwap <= 1.0 else "No"
-                except Exception:
-                    avwap_confluence = "N/A"
+            ticker_avwaps = avwaps_by_ticker.get(ticker, np.array([]))
+            ticker_avwaps = ticker_avwaps[~np.isnan(ticker_avwaps)]
+            if len(ticker_avwaps):
+                # Confluence with the nearest of the ticker's anchored VWAPs
+                distance_to_avwap = (
+                    np.abs(latest["close"] - ticker_avwaps) / ticker_avwaps * 100
+                ).min()
+                avwap_confluence = "Yes" if distance_to_avwap <= 1.0 else "No"
 
             # --- 7. Validation ---
             conditions = [
@@ -14,12 +14,9 @@ logger = logging.getLogger(__name__)
 # This makes sure the script can find the 'utils' directory
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from utils.helpers import (
-    format_to_two_decimal,
-    read_df_from_s3,
-    read_tickerlist_from_s3,
-    save_df_to_s3,
-)
+from utils.helpers import format_to_two_decimal, read_tickerlist_from_s3, save_df_to_s3
+from utils.indicators import IndicatorPanel, atr_series
+from utils.snapshot import prefetch_market_data, read_market_data, ticker_object_names
 
 # --- Screener-Specific Configuration ---
 MIN_DROP_PCT = -7.0
@@ -30,14 +27,8 @@ MIN_RED_DAYS_IN_PREVIOUS_5 = 3
 
 
 def calculate_atr(df, period=14):
-    """Calculate Average True Range"""
-    df = df.copy()
-    df["prev_close"] = df["close"].shift(1)
-    df["tr1"] = df["high"] - df["low"]
-    df["tr2"] = abs(df["high"] - df["prev_close"])
-    df["tr3"] = abs(df["low"] - df["prev_close"])
-    df["tr"] = df[["tr1", "tr2", "tr3"]].max(axis=1)
-    return df["tr"].rolling(window=period).mean()
+    """Calculate Average True Range (single-ticker view over the indicator engine)"""
+    return atr_series(df, period=period)
 
 
 def run_exhaustion_screener():
@@ -55,21 +46,27 @@ def run_exhaustion_screener():
 
     all_results = []
 
-    for ticker in tickers:
-        try:
-            # --- 2. Load Data and Calculate Indicators ---
-            df = read_df_from_s3(f"data/daily/{ticker}_daily.csv")
-            if df is None or len(df) < 21:  # Need at least 21 days for indicators
-                continue
+    # Load every ticker's daily frame once, concurrently
+    prefetch_market_data(ticker_object_names(tickers, include_intraday=False))
 
-            df["timestamp"] = pd.to_datetime(df["timestamp"])
-            df = df.sort_values("timestamp")
+    # --- 2. Load Data and Calculate Indicators for the whole universe ---
+    panel = IndicatorPanel.from_frames(
+        {
+            ticker: read_market_data(f"data/daily/{ticker}_daily.csv")
+            for ticker in tickers
+        }
+    )
+    atr_14 = panel.atr(period=14)  # For gauging large moves
+    avg_vol_20d = panel.average_volume(window=20)  # Lagged to avoid lookahead
 
-            # Calculate ATR for gauging large moves
-            df["ATR_14"] = calculate_atr(df, 14)
+    for ticker in tickers:
+        try:
+            if ticker not in panel or len(panel.frame(ticker)) < 21:
+                continue  # Need at least 21 days for indicators
 
-            # Volume metrics (avoid lookahead)
-            df["Avg_Vol_20D"] = df["volume"].shift(1).rolling(window=20).mean()
+            df = panel.frame(ticker)
+            df["ATR_14"] = panel.series(atr_14, ticker)
+            df["Avg_Vol_20D"] = panel.series(avg_vol_20d, ticker)
             df["Volume_vs_Avg_Pct"] = (df["volume"] / df["Avg_Vol_20D"]) * 100
 
             latest = df.iloc[-1]
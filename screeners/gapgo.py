@@ -14,15 +14,15 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from utils.helpers import (
     calculate_avg_daily_volume,
     calculate_avg_early_volume,
-    calculate_vwap,
     detect_market_session,
     format_to_two_decimal,
     get_premarket_data,
     get_previous_day_close,
-    read_df_from_s3,
     read_tickerlist_from_s3,
     save_df_to_s3,
 )
+from utils.snapshot import prefetch_market_data, read_market_data, ticker_object_names
+from utils.streaming_indicators import IndicatorStateStore
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -51,11 +51,17 @@ def run_gapgo_screener():
 
     breakout_valid_time = time(9, 36)
 
+    # Load every ticker's frames once, concurrently
+    prefetch_market_data(ticker_object_names(tickers))
+
+    # Persisted per-ticker indicator state: only new bars are applied each run
+    indicator_store = IndicatorStateStore()
+
     for ticker in tickers:
         try:
             # --- 1. Load Data from Cloud Storage ---
-            daily_df = read_df_from_s3(f"data/daily/{ticker}_daily.csv")
-            intraday_df = read_df_from_s3(f"data/intraday/{ticker}_1min.csv")
+            daily_df = read_market_data(f"data/daily/{ticker}_daily.csv")
+            intraday_df = read_market_data(f"data/intraday/{ticker}_1min.csv")
 
             if daily_df.empty or intraday_df.empty:
                 logger.debug(f"Data missing for {ticker} - skipping")
@@ -64,6 +70,7 @@ def run_gapgo_screener():
             # Convert index to datetime objects
             daily_df.index = pd.to_datetime(daily_df["timestamp"])
             intraday_df.index = pd.to_datetime(intraday_df["timestamp"])
+            indicator_state = indicator_store.update(ticker, intraday_df)
 
             today_intraday_df = intraday_df[
                 intraday_df.index.date == ny_time.date()
@@ -123,12 +130,7 @@ def run_gapgo_screener():
                     )
                     is_live_spike = today_early_volume >= (avg_early_volume_5d * 1.15)
 
-                regular_session_df = today_intraday_df.between_time(
-                    time(9, 30), time(16, 0)
-                )
-                if not regular_session_df.empty:
-                    regular_session_df["vwap"] = calculate_vwap(regular_session_df)
-                    last_vwap = regular_session_df["vwap"].iloc[-1]
+                last_vwap = indicator_state.vwap.value_for(ny_time.date())
 
             live_gap_percent_pm = (
                 ((last_price - prev_close) / prev_close) * 100
@@ -324,6 +326,11 @@ def run_gapgo_screener():
         except Exception as e:
             logger.error(f"Error processing {ticker}: {e}")
 
+    logger.info(
+        f"⚡ Indicator state updated with {indicator_store.bars_applied} new bars "
+        f"({indicator_store.rebuilt} tickers rebuilt)"
+    )
+
     # --- 10. Final Processing & Save to Cloud ---
     if all_results:
         final_df = pd.DataFrame(all_results)
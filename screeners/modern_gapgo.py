@@ -61,8 +61,31 @@ class GapGoScreener(BaseScreener):
         """Uses 1-minute intervals for precise entry timing."""
         return "1min"
 
-    async def screen_ticker(
+    async def prepare_ticker(
         self, ticker: str, df: pd.DataFrame, **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the daily bars the gap is measured against.
+
+        Args:
+            ticker: Ticker symbol
+            df: Intraday price data
+            **kwargs: Additional parameters
+
+        Returns:
+            {"daily": daily bars}, or None if there is nothing to evaluate
+        """
+        # No bars from today: no gap to measure, skip the daily request
+        if not self._has_todays_bars(df):
+            return None
+
+        daily_df = await self._get_daily_data(ticker)
+        if daily_df is None or daily_df.empty:
+            return None
+        return {"daily": daily_df}
+
+    def evaluate_ticker(
+        self, ticker: str, df: pd.DataFrame, context: Dict[str, Any], **kwargs
     ) -> Optional[Dict[str, Any]]:
         """
         Screen a ticker for Gap & Go opportunities.
@@ -70,6 +93,7 @@ class GapGoScreener(BaseScreener):
         Args:
             ticker: Ticker symbol
             df: Intraday price data
+            context: {"daily": daily bars} from prepare_ticker
             **kwargs: Additional parameters
 
         Returns:
@@ -86,13 +110,8 @@ class GapGoScreener(BaseScreener):
             if df.empty:
                 return None
 
-            # Get daily data for gap calculation
-            daily_df = await self._get_daily_data(ticker)
-            if daily_df is None or daily_df.empty:
-                return None
-
             # Check for gap
-            gap_info = self._analyze_gap(df, daily_df)
+            gap_info = self._analyze_gap(df, context["daily"])
             if not gap_info["has_gap"]:
                 return None
 
@@ -110,6 +129,19 @@ class GapGoScreener(BaseScreener):
             logger.error(f"Error screening {ticker} for Gap & Go: {e}")
             return None
 
+    def _has_todays_bars(self, df: pd.DataFrame) -> bool:
+        """Is the latest bar from today (exchange time)?"""
+        if df.empty or "datetime" not in df.columns:
+            return False
+
+        latest = pd.to_datetime(df["datetime"]).max()
+        if pd.isna(latest):
+            return False
+        if latest.tzinfo is None:
+            latest = latest.tz_localize("UTC")
+        ny_tz = pytz.timezone("America/New_York")
+        return latest.tz_convert(ny_tz).date() == datetime.now(ny_tz).date()
+
     def _prepare_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Prepare and validate intraday data."""
         if df.empty:
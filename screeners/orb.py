@@ -14,15 +14,15 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from utils.helpers import (
     calculate_avg_daily_volume,
     calculate_avg_early_volume,
-    calculate_vwap,
     detect_market_session,
     format_to_two_decimal,
     get_premarket_data,
     get_previous_day_close,
-    read_df_from_s3,
     read_tickerlist_from_s3,
     save_df_to_s3,
 )
+from utils.snapshot import prefetch_market_data, read_market_data, ticker_object_names
+from utils.streaming_indicators import IndicatorStateStore
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -67,17 +67,24 @@ def run_orb_screener():
     all_results = []
     ny_date = datetime.now(ny_timezone).date()
 
+    # Load every ticker's frames once, concurrently
+    prefetch_market_data(ticker_object_names(tickers))
+
+    # Persisted per-ticker indicator state: only new bars are applied each run
+    indicator_store = IndicatorStateStore()
+
     # --- 2. Process Each Ticker Independently ---
     for ticker in tickers:
         try:
             # Load intraday and daily data from cloud
-            intraday_df = read_df_from_s3(f"data/intraday/{ticker}_1min.csv")
-            daily_df = read_df_from_s3(f"data/daily/{ticker}_daily.csv")
+            intraday_df = read_market_data(f"data/intraday/{ticker}_1min.csv")
+            daily_df = read_market_data(f"data/daily/{ticker}_daily.csv")
 
             if intraday_df.empty:
                 continue
 
             intraday_df.index = pd.to_datetime(intraday_df["timestamp"])
+            indicator_state = indicator_store.update(ticker, intraday_df)
             today_intraday_df = intraday_df[intraday_df.index.date == ny_date].copy()
 
             if today_intraday_df.empty:
@@ -110,14 +117,10 @@ def run_orb_screener():
             elif orb_breakdown:
                 direction = "Short"
 
-            # --- 6. Calculate VWAP Internally (DECOUPLED) ---
-            regular_session_df = today_intraday_df.between_time(
-                time(9, 30), time(16, 0)
-            )
+            # --- 6. Session VWAP from the streaming indicator state ---
             vwap_reclaimed = "No"
-            if not regular_session_df.empty:
-                regular_session_df["vwap"] = calculate_vwap(regular_session_df)
-                last_vwap = regular_session_df["vwap"].iloc[-1]
+            last_vwap = indicator_state.vwap.value_for(ny_date)
+            if not np.isnan(last_vwap):
                 vwap_reclaimed = "Yes" if last_price > last_vwap else "No"
 
             # --- 7. Calculate Volume Spikes Internally (DECOUPLED) ---
@@ -225,6 +228,11 @@ def run_orb_screener():
         except Exception as e:
             logger.error(f"Error processing {ticker} for ORB: {e}")
 
+    logger.info(
+        f"⚡ Indicator state updated with {indicator_store.bars_applied} new bars "
+        f"({indicator_store.rebuilt} tickers rebuilt)"
+    )
+
     # --- 12. Final Processing & Save to Cloud ---
     if not all_results:
         logger.info("No tickers processed for ORB")
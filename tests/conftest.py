@@ -4,12 +4,16 @@ Pytest configuration and shared fixtures for all tests.
 
 import os
 import tempfile
-from typing import Any, Dict, Generator
+from typing import Any, Callable, Dict, Generator
 from unittest.mock import Mock
 
+import numpy as np
 import pandas as pd
 import pytest
 
+# Tests never attach to the host-wide shared cache (utils.cache.SharedCache)
+os.environ.setdefault("SHARED_CACHE_ENABLED", "false")
+
 
 @pytest.fixture
 def sample_ticker_data() -> pd.DataFrame:
@@ -71,6 +75,37 @@ def sample_ticker_data() -> pd.DataFrame:
     )
 
 
+@pytest.fixture
+def random_bars() -> Callable[..., pd.DataFrame]:
+    """
+    Factory for seeded random-walk OHLCV bars.
+
+    random_bars(timestamps, seed, start=50.0, scale=1.0) returns one bar per
+    timestamp (the values are used as given, so callers pick the index and
+    its formatting) with high/low bracketing open and close.
+    """
+
+    def make(
+        timestamps, seed: int, start: float = 50.0, scale: float = 1.0
+    ) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        rows = len(timestamps)
+        close = start + rng.standard_normal(rows).cumsum() * scale
+        open_ = close + rng.normal(0, 0.3 * scale, rows)
+        return pd.DataFrame(
+            {
+                "timestamp": timestamps,
+                "open": open_,
+                "high": np.maximum(open_, close) + rng.random(rows) * scale,
+                "low": np.minimum(open_, close) - rng.random(rows) * scale,
+                "close": close,
+                "volume": rng.integers(100, 100_000, rows).astype(float),
+            }
+        )
+
+    return make
+
+
 @pytest.fixture
 def mock_config() -> Dict[str, Any]:
     """Mock configuration for testing."""
@@ -0,0 +1,162 @@
+"""
+Unit tests for single-parse Alpha Vantage payload handling.
+"""
+
+import os
+import sys
+from datetime import date
+from io import StringIO
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import utils.alpha_vantage_api as av
+from utils.api_payload import parse_bar_payload, time_series_frame
+from utils.timestamp_standardizer import apply_timestamp_standardization_to_api_data
+
+
+def _payload(stamps) -> str:
+    return pd.DataFrame(
+        {
+            "timestamp": stamps,
+            "open": 10.0,
+            "high": 11.0,
+            "low": 9.0,
+            "close": 10.5,
+            "volume": 1000,
+        }
+    ).to_csv(index=False)
+
+
+class TestBarPayload:
+    """Parsing, current-day checks and the shared parse."""
+
+    def test_matches_legacy_standardization(self):
+        """
+        Test that stored CSV output is unchanged across a DST switch.
+
+        Both intraday and daily payloads are checked.
+        """
+        intraday = _payload(
+            ["2024-11-04 09:31:00", "2024-11-04 09:30:00", "2024-11-01 19:59:00"]
+        )
+        daily = _payload(["2024-11-04", "2024-11-01"])
+
+        for text, data_type in ((intraday, "intraday"), (daily, "daily")):
+            legacy = apply_timestamp_standardization_to_api_data(
+                pd.read_csv(StringIO(text)), data_type
+            )
+            parsed = parse_bar_payload(text, data_type).to_frame()
+            assert str(parsed["timestamp"].dtype) == "datetime64[ns, UTC]"
+            assert parsed.to_csv(index=False) == legacy.to_csv(index=False)
+
+        # EST after the switch, EDT before it
+        assert list(parse_bar_payload(intraday).to_frame()["timestamp"].dt.hour) == [
+            14,
+            14,
+            23,
+        ]
+
+    def test_error_and_today_rows(self):
+        """
+        Test that JSON error bodies fail cleanly.
+
+        Today's rows are counted from the same parse.
+        """
+        throttled = parse_bar_payload(
+            '{"Information": "Please consider spreading out your free API requests"}'
+        )
+        assert throttled.empty and "spreading out" in throttled.error
+
+        payload = parse_bar_payload(
+            _payload(
+                [
+                    "2025-01-03 04:01:00",
+                    "2025-01-03 04:00:00",
+                    "2025-01-02 19:59:00",
+                    "bad",
+                ]
+            )
+        )
+        assert payload.invalid_rows == 1 and len(payload) == 3
+        assert payload.rows_on(date(2025, 1, 3)).sum() == 2
+        first, last = payload.wall_range(payload.rows_on(date(2025, 1, 3)))
+        assert (first.hour, first.minute, last.minute) == (4, 0, 1)
+
+    def test_validation_and_fetch_share_one_parse(self, monkeypatch):
+        """Test that retry validation and get_intraday_data read the CSV once."""
+        response = SimpleNamespace(
+            text=_payload(["2025-01-03 09:31:00", "2025-01-03 09:30:00"])
+        )
+        reads = []
+        read_csv = pd.read_csv
+
+        def counting_read_csv(*args, **kwargs):
+            reads.append(1)
+            return read_csv(*args, **kwargs)
+
+        monkeypatch.setattr(pd, "read_csv", counting_read_csv)
+        monkeypatch.setattr(
+            av, "_make_api_request", lambda params, retry_inline=True: response
+        )
+
+        assert av._validate_current_day_data(response, date(2025, 1, 3), "AAA")
+        df = av.get_intraday_data("AAA", outputsize="compact")
+
+        assert len(reads) == 1
+        assert list(df.columns) == [
+            "timestamp",
+            "open",
+            "high",
+            "low",
+            "close",
+            "volume",
+        ]
+        assert df["timestamp"].iloc[0] == pd.Timestamp("2025-01-03 14:31", tz="UTC")
+
+
+class TestTimeSeriesFrame:
+    """JSON time-series conversion shared by the JSON clients."""
+
+    def test_typed_sorted_frame(self):
+        """Test typed columns, a sorted index and coerce/raise on bad values."""
+        series = {
+            "2025-01-02 09:31:00": {
+                "1. open": "10.5",
+                "2. high": "11",
+                "3. low": "10",
+                "4. close": "10.7",
+                "5. volume": "1200",
+            },
+            "2025-01-02 09:30:00": {
+                "1. open": "10.0",
+                "2. high": "10.9",
+                "3. low": "9.9",
+                "4. close": "10.5",
+                "5. volume": "1000",
+            },
+        }
+        df = time_series_frame(series)
+
+        assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+        assert df.index.is_monotonic_increasing and df.index[0] == pd.Timestamp(
+            "2025-01-02 09:30"
+        )
+        assert df["open"].tolist() == [10.0, 10.5]
+        assert (
+            str(df["volume"].dtype) == "int64" and str(df["close"].dtype) == "float64"
+        )
+
+        series["2025-01-02 09:31:00"]["4. close"] = "n/a"
+        assert pd.isna(time_series_frame(series)["close"].iloc[1])
+        with pytest.raises(ValueError):
+            time_series_frame(series, errors="raise")
+
+        daily = time_series_frame(
+            {"2025-01-03": {"4. close": "1"}, "2025-01-02": {"4. close": "2"}}, "daily"
+        )
+        assert list(daily.index.day) == [2, 3]
@@ -0,0 +1,96 @@
+"""
+Unit tests for the prefix-sum anchored VWAP engine.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.avwap import AVWAPEngine, avwap_from_anchor, load_avwap_anchors
+from utils.helpers import calculate_vwap
+
+
+@pytest.fixture
+def daily_frame(random_bars):
+    """daily_frame(rows, seed): business-day bars from 2024-01-02."""
+    return lambda rows, seed: random_bars(
+        pd.bdate_range("2024-01-02", periods=rows), seed
+    )
+
+
+def _sliced_vwap(df: pd.DataFrame, anchor) -> float:
+    """The previous per-anchor implementation: slice, then recompute."""
+    anchor_df = df[df["timestamp"] >= anchor].copy()
+    if anchor_df.empty:
+        return np.nan
+    return calculate_vwap(anchor_df).iloc[-1]
+
+
+class TestAVWAPEngine:
+    """Parity of the prefix-sum engine with slice-and-recompute AVWAP."""
+
+    def test_batch_matches_recompute_for_many_anchors(self, daily_frame):
+        """Test every anchor of every ticker against the sliced recompute."""
+        frames = {"AAA": daily_frame(200, 1), "BBB": daily_frame(80, 2)}
+        anchors = {
+            "AAA": [
+                pd.Timestamp("2024-01-01"),
+                pd.Timestamp("2024-03-15"),
+                pd.Timestamp("2024-09-30"),
+            ],
+            "BBB": [pd.Timestamp("2024-02-10"), pd.Timestamp("2024-04-19")],
+            "ZZZ": [pd.Timestamp("2024-02-10")],
+        }
+
+        result = AVWAPEngine(frames).by_ticker(anchors)
+
+        assert set(result) == {"AAA", "BBB"}
+        for ticker, values in result.items():
+            expected = [
+                _sliced_vwap(frames[ticker], anchor) for anchor in anchors[ticker]
+            ]
+            np.testing.assert_allclose(values, expected, rtol=1e-9)
+
+    def test_anchor_after_last_bar_and_evaluation_point(self, daily_frame):
+        """Test NaN for anchors past the data and AVWAP as of an earlier bar."""
+        df = daily_frame(60, 3)
+        engine = AVWAPEngine({"AAA": df})
+
+        assert np.isnan(engine.ticker_avwaps("AAA", ["2030-01-01"])[0])
+        assert np.isnan(engine.avwap(["MISSING"], ["2024-01-02"])[0])
+
+        at = df["timestamp"].iloc[30]
+        value = engine.ticker_avwaps("AAA", [df["timestamp"].iloc[10]], at=at)[0]
+        assert np.isclose(value, _sliced_vwap(df.iloc[:31], df["timestamp"].iloc[10]))
+        assert np.isclose(
+            avwap_from_anchor(df, "2024-02-01"), _sliced_vwap(df, "2024-02-01")
+        )
+
+    def test_load_anchors_from_both_layouts(self):
+        """Test the job's one-row-per-anchor layout and the wide layout."""
+        long_df = pd.DataFrame(
+            {
+                "ticker": ["AAA", "AAA", "BBB", "AAA"],
+                "anchor_date": ["2024-05-01", "2024-02-01", "2024-03-01", "2024-02-01"],
+            }
+        )
+        wide_df = pd.DataFrame(
+            {
+                "Ticker": ["AAA"],
+                "Anchor 1 Date": ["2024-05-01"],
+                "Anchor 2 Date": [None],
+            }
+        )
+
+        assert load_avwap_anchors(long_df) == {
+            "AAA": [pd.Timestamp("2024-02-01"), pd.Timestamp("2024-05-01")],
+            "BBB": [pd.Timestamp("2024-03-01")],
+        }
+        assert load_avwap_anchors(wide_df) == {"AAA": [pd.Timestamp("2024-05-01")]}
+        assert load_avwap_anchors(pd.DataFrame()) == {}
@@ -2,7 +2,13 @@
 Unit tests for cache module.
 """
 
+import asyncio
+import os
+import subprocess
+import sys
 import tempfile
+import textwrap
+import threading
 import time
 from unittest.mock import patch
 
@@ -13,11 +19,15 @@ from utils.cache import (
     CacheEntry,
     DiskCache,
     InMemoryCache,
+    SharedCache,
     TieredCache,
     cache_key_for_ticker_data,
     cached_fetch_wrapper,
     get_cache,
 )
+from utils.data_storage import object_cache_key, read_df_cached
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 
 
 class TestCacheEntry:
@@ -124,6 +134,79 @@ class TestInMemoryCache:
         assert stats["total_accesses"] == 1
         assert 0 <= stats["utilization"] <= 1
 
+    def test_lru_order_follows_access(self):
+        """Test that a read makes an entry most recently used."""
+        cache = InMemoryCache(max_size_bytes=1000)
+
+        cache.set("key1", "x" * 400)
+        cache.set("key2", "x" * 400)
+        cache.get("key1")
+        cache.set("key3", "x" * 400)
+
+        assert cache.get("key1") is not None
+        assert cache.get("key2") is None
+        assert cache.current_size_bytes == 800
+        assert cache.stats()["evictions"] == 1
+
+    def test_namespace_budget(self):
+        """Test that a namespace over its budget evicts only its own entries."""
+        cache = InMemoryCache(max_size_bytes=10_000, namespace_budgets={"ticker": 1000})
+
+        cache.set("other_key", "y" * 400)
+        for i in range(4):
+            cache.set(f"ticker_T{i}", "x" * 400)
+
+        assert cache.get("other_key") is not None
+        assert [key for key in cache.cache if key.startswith("ticker_")] == [
+            "ticker_T2",
+            "ticker_T3",
+        ]
+        assert cache.stats()["namespace_bytes"] == {"other": 400, "ticker": 800}
+
+    def test_expired_entries_leave_without_reads(self):
+        """Test that the expiry heap drops expired entries on the next write."""
+        cache = InMemoryCache()
+
+        cache.set("old", "value", ttl_seconds=0)
+        time.sleep(0.01)
+        cache.set("new", "value")
+
+        assert "old" not in cache.cache
+        assert cache.current_size_bytes == len("value")
+        assert cache.stats()["expirations"] == 1
+
+    def test_size_measured_once(self):
+        """Test that DataFrame sizes are not recomputed on eviction or removal."""
+        cache = InMemoryCache(max_size_bytes=10**6)
+        df = pd.DataFrame({"close": range(100)})
+
+        with patch.object(pd.DataFrame, "memory_usage", wraps=df.memory_usage) as usage:
+            cache.set("a", df)
+            cache.set("a", df)
+            cache.get("a")
+            cache.clear()
+
+        assert usage.call_count == 2
+
+    def test_publish_metrics(self):
+        """Test hit/miss/eviction export to core.metrics."""
+        from core.metrics import MetricsCollector
+
+        collector = MetricsCollector()
+        cache = InMemoryCache()
+        cache.set("key1", "value1")
+        cache.get("key1")
+        cache.get("missing")
+
+        cache.publish_metrics(collector)
+        cache.get("key1")
+        cache.publish_metrics(collector)
+
+        assert collector.get_metric("cache_memory_hits_total").get_value() == 2
+        assert collector.get_metric("cache_memory_misses_total").get_value() == 1
+        assert collector.get_metric("cache_memory_entries").get_value() == 1
+        assert collector.get_metric("cache_hit_rate").get_value() == pytest.approx(66.7)
+
 
 class TestDiskCache:
     """Test cases for disk cache."""
@@ -161,6 +244,100 @@ class TestDiskCache:
             assert isinstance(result, pd.DataFrame)
             pd.testing.assert_frame_equal(result, df)
 
+    def test_disk_cache_extension_dtypes_round_trip(self):
+        """Test that nullable extension columns keep their dtypes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = DiskCache(cache_dir=temp_dir, sweep_interval_seconds=0)
+            df = pd.DataFrame(
+                {
+                    "volume": pd.array([100, None, 300], dtype="Int64"),
+                    "ticker": pd.array(["AAPL", None, "MSFT"], dtype="string"),
+                    "halted": pd.array([True, None, False], dtype="boolean"),
+                    "timestamp": pd.date_range(
+                        "2025-01-02 14:30", periods=3, freq="1min", tz="UTC"
+                    ),
+                }
+            )
+
+            cache.set("df_key", df)
+            result = cache.get("df_key")
+
+            pd.testing.assert_frame_equal(result, df)
+            cache.close()
+
+    def test_disk_cache_tuple_is_memory_mapped(self):
+        """Test that cached (df, success) tuples are read from Arrow without a copy."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = DiskCache(cache_dir=temp_dir, sweep_interval_seconds=0)
+            df = pd.DataFrame(
+                {
+                    "timestamp": pd.date_range(
+                        "2025-01-02 14:30", periods=5, freq="1min", tz="UTC"
+                    ),
+                    "close": [1.0, 2.0, 3.0, 4.0, 5.0],
+                }
+            )
+
+            cache.set("ticker_AAPL_intraday", (df, True))
+            result, success = cache.get("ticker_AAPL_intraday")
+
+            assert success is True
+            pd.testing.assert_frame_equal(result, df)
+            assert not result["close"].to_numpy().flags.writeable
+            assert [
+                f
+                for f in os.listdir(temp_dir)
+                if f.endswith(".arrow") or f.startswith(DiskCache.TMP_PREFIX)
+            ] == [
+                file_name
+                for (file_name,) in cache._db.execute("SELECT file FROM entries")
+            ]
+            cache.close()
+
+    def test_disk_cache_enforces_budget_lru(self):
+        """Test that the byte budget evicts the least recently read entries."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = DiskCache(
+                cache_dir=temp_dir,
+                max_size_gb=3000 / 1024**3,
+                sweep_interval_seconds=0,
+            )
+            payload = "x" * 900
+
+            cache.set("key1", payload)
+            time.sleep(0.01)
+            cache.set("key2", payload)
+            time.sleep(0.01)
+            cache.get("key1")
+            time.sleep(0.01)
+            cache.set("key3", payload)
+            time.sleep(0.01)
+            cache.set("key4", payload)
+
+            assert cache.get("key2") is None
+            assert cache.get("key1") == payload
+            assert cache.current_size_bytes <= cache.max_size_bytes
+            assert cache.stats()["entries"] == len(
+                [f for f in os.listdir(temp_dir) if f.endswith(".pkl")]
+            )
+            cache.close()
+
+    def test_disk_cache_sweeper_and_reopen(self):
+        """Test that the sweeper drops expired entries and the index is reopened."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = DiskCache(cache_dir=temp_dir, sweep_interval_seconds=0.05)
+            cache.set("short", "value", ttl_seconds=0)
+            cache.set("long", "value")
+            time.sleep(0.3)
+
+            assert cache.stats()["entries"] == 1
+            cache.close()
+
+            reopened = DiskCache(cache_dir=temp_dir, sweep_interval_seconds=0)
+            assert reopened.get("long") == "value"
+            assert reopened.current_size_bytes == cache.current_size_bytes
+            reopened.close()
+
 
 class TestTieredCache:
     """Test cases for tiered cache."""
@@ -193,6 +370,312 @@ class TestTieredCache:
         assert "memory" in stats
         assert "disk_dir" in stats
 
+    def test_stale_value_served_while_one_refresh_runs(self):
+        """
+        Test that an expired value is returned at once.
+
+        It is refreshed in the background, once.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = TieredCache(
+                cache_dir=temp_dir, stale_seconds=60, early_refresh_beta=0
+            )
+            release = threading.Event()
+            calls = []
+
+            def fetch():
+                calls.append(1)
+                release.wait(2)
+                return f"v{len(calls)}"
+
+            cache.set("key", "v0", ttl_seconds=0)
+            assert cache.lookup("key") == ("v0", "stale")
+
+            # Both callers get the stale value; only one refresh is started
+            assert cache.get_or_refresh("key", fetch, ttl_seconds=60) == "v0"
+            assert cache.get_or_refresh("key", fetch, ttl_seconds=60) == "v0"
+            release.set()
+            cache._executor().shutdown(wait=True)
+
+            assert calls == [1]
+            assert cache.lookup("key") == ("v1", "fresh")
+            assert cache.stats()["refresh"]["stale_served"] == 2
+
+    def test_concurrent_misses_fetch_once(self):
+        """Test that threads missing the same key share one fetch."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = TieredCache(cache_dir=temp_dir)
+            calls = []
+
+            def fetch():
+                calls.append(1)
+                time.sleep(0.2)
+                return "value"
+
+            results = []
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(cache.get_or_refresh("key", fetch))
+                )
+                for _ in range(5)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert calls == [1]
+            assert results == ["value"] * 5
+
+    def test_batch_misses_coalesce_across_tasks(self):
+        """
+        Test that overlapping batches fetch each missing ticker once.
+
+        Failed fetches are skipped rather than cached.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = TieredCache(cache_dir=temp_dir)
+            cache.set("k_AAPL", ("cached", True))
+            fetched = []
+
+            async def fetch_many(tickers):
+                fetched.append(sorted(tickers))
+                await asyncio.sleep(0.1)
+                return {ticker: (ticker.lower(), ticker != "BAD") for ticker in tickers}
+
+            async def run():
+                keys = {ticker: f"k_{ticker}" for ticker in ["AAPL", "MSFT", "BAD"]}
+                states = {}
+                first, second = await asyncio.gather(
+                    cache.get_or_refresh_many_async(
+                        keys, fetch_many, cacheable=lambda r: r[1], states=states
+                    ),
+                    cache.get_or_refresh_many_async(
+                        keys, fetch_many, cacheable=lambda r: r[1]
+                    ),
+                )
+                return first, second, states
+
+            first, second, states = asyncio.run(run())
+
+            assert fetched == [["BAD", "MSFT"]]
+            assert (
+                first
+                == second
+                == {
+                    "AAPL": ("cached", True),
+                    "MSFT": ("msft", True),
+                    "BAD": ("bad", False),
+                }
+            )
+            assert states == {"AAPL": "fresh", "MSFT": "miss", "BAD": "miss"}
+            # Failed fetches are not cached
+            assert cache.get("k_BAD") is None
+
+    def test_freshness_aligned_to_bar_boundary(self):
+        """Test that an interval expires the value at the next bar, not on its ttl."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = TieredCache(cache_dir=temp_dir, stale_seconds=30)
+            now = 1_700_000_130.0  # 10s into a 1-minute bar
+            with patch("utils.cache.time.time", return_value=now):
+                cache.set("key", "value", ttl_seconds=3600, interval="1min")
+
+            fresh_until, kept_until, _ = cache._freshness["key"]
+            assert fresh_until == 1_700_000_160.0
+            assert kept_until == fresh_until + 30
+
+    def test_early_refresh_probability(self):
+        """Test that a slow fetch makes refreshes start before expiry."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = TieredCache(cache_dir=temp_dir, early_refresh_beta=1.0)
+            cache.set("slow", "value", ttl_seconds=1, fetch_seconds=100_000)
+            cache.set("fast", "value", ttl_seconds=3600, fetch_seconds=0.001)
+
+            assert cache.lookup("slow") == ("value", "early")
+            assert cache.lookup("fast") == ("value", "fresh")
+
+
+def _run_in_process(code: str) -> None:
+    """Run code in a fresh interpreter, as an orchestrator job would."""
+    subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=PROJECT_ROOT,
+        check=True,
+        timeout=60,
+    )
+
+
+class TestSharedCache:
+    """Test cases for the cross-process shared cache."""
+
+    def test_value_cached_by_another_process_is_fresh(self):
+        """Test that a frame cached in one process is served fresh in another."""
+        with tempfile.TemporaryDirectory() as shared_dir:
+            _run_in_process(
+                f"""
+                import pandas as pd
+                from utils.cache import SharedCache, TieredCache
+                cache = TieredCache(
+                    l2=SharedCache({shared_dir!r}, sweep_interval_seconds=0)
+                )
+                frame = pd.DataFrame({{"close": [1.0, 2.0]}})
+                cache.set("ticker_AAPL", (frame, True), ttl_seconds=600)
+                """
+            )
+
+            cache = TieredCache(l2=SharedCache(shared_dir, sweep_interval_seconds=0))
+            (df, success), state = cache.lookup("ticker_AAPL")
+
+            assert state == "fresh"
+            assert success is True
+            assert df["close"].tolist() == [1.0, 2.0]
+            assert not df["close"].to_numpy().flags.writeable
+            cache.disk_cache.close()
+
+    def test_refresh_by_another_cache_is_seen_as_fresh(self):
+        """Test that a stale entry rewritten by another cache is seen as fresh."""
+        with tempfile.TemporaryDirectory() as shared_dir:
+            first = TieredCache(l2=SharedCache(shared_dir, sweep_interval_seconds=0))
+            second = TieredCache(l2=SharedCache(shared_dir, sweep_interval_seconds=0))
+
+            first.set("ticker_AAPL", "old", ttl_seconds=0, stale_seconds=60)
+            assert first.lookup("ticker_AAPL") == ("old", "stale")
+
+            second.set("ticker_AAPL", "new", ttl_seconds=100)
+            # Evicted from memory or not, the rewritten entry is fresh
+            assert first.lookup("ticker_AAPL") == ("new", "fresh")
+            first.memory_cache.clear()
+            assert first.lookup("ticker_AAPL") == ("new", "fresh")
+            first.disk_cache.close()
+            second.disk_cache.close()
+
+    def test_concurrent_writers_share_one_budget(self):
+        """Test that concurrent writer processes keep the index, files and budget."""
+        with tempfile.TemporaryDirectory() as shared_dir:
+            writer = f"""
+                import sys
+                from utils.cache import SharedCache
+                cache = SharedCache(
+                    {shared_dir!r},
+                    max_size_mb=20_000 / 1024**2,
+                    sweep_interval_seconds=0,
+                )
+                for i in range(60):
+                    cache.set(f"key{{i % 20}}_{{sys.argv[1]}}", "x" * 900)
+                """
+            procs = [
+                subprocess.Popen(
+                    [sys.executable, "-c", textwrap.dedent(writer), name],
+                    cwd=PROJECT_ROOT,
+                )
+                for name in ("a", "b", "c")
+            ]
+            assert [proc.wait(timeout=60) for proc in procs] == [0, 0, 0]
+
+            cache = SharedCache(
+                shared_dir, max_size_mb=20_000 / 1024**2, sweep_interval_seconds=0
+            )
+            files = {f for f in os.listdir(shared_dir) if f.endswith(".pkl")}
+            indexed = {
+                file_name
+                for (file_name,) in cache._db.execute("SELECT file FROM entries")
+            }
+
+            assert files == indexed
+            assert cache.stats()["size_bytes"] <= cache.max_size_bytes
+            cache.close()
+
+    def test_invalidate_reaches_other_processes(self):
+        """Test that invalidating a key drops it from the shared tier everywhere."""
+        with tempfile.TemporaryDirectory() as shared_dir:
+            cache = TieredCache(l2=SharedCache(shared_dir, sweep_interval_seconds=0))
+            cache.set("object_data/daily/AAPL_daily.csv", "bars")
+
+            _run_in_process(
+                f"""
+                from utils.cache import SharedCache, TieredCache
+                cache = TieredCache(
+                    l2=SharedCache({shared_dir!r}, sweep_interval_seconds=0)
+                )
+                cache.invalidate("object_data/daily/AAPL_daily.csv")
+                """
+            )
+
+            assert cache.disk_cache.get("object_data/daily/AAPL_daily.csv") is None
+            cache.disk_cache.close()
+
+    def test_read_df_cached_reads_spaces_once(self):
+        """Test that repeated object reads are served from the shared cache."""
+        with tempfile.TemporaryDirectory() as shared_dir:
+            cache = TieredCache(l2=SharedCache(shared_dir, sweep_interval_seconds=0))
+            frame = pd.DataFrame({"close": [1.0, 2.0]})
+
+            with patch("utils.data_storage.SHARED_CACHE_ENABLED", True), patch(
+                "utils.cache.get_cache", return_value=cache
+            ), patch(
+                "utils.data_storage.read_df_from_s3", return_value=frame
+            ) as mock_read:
+                first = read_df_cached("data/daily/AAPL_daily.csv")
+                second = read_df_cached("data/daily/AAPL_daily.csv")
+
+            mock_read.assert_called_once_with("data/daily/AAPL_daily.csv")
+            pd.testing.assert_frame_equal(first, second)
+            assert (
+                cache.lookup(object_cache_key("data/daily/AAPL_daily.csv"))[1]
+                == "fresh"
+            )
+            cache.disk_cache.close()
+
+    def test_helpers_write_evicts_shared_entry(self):
+        """Test that rewriting bars through utils.helpers drops the cached frame."""
+        from utils import helpers
+
+        with tempfile.TemporaryDirectory() as shared_dir:
+            cache = TieredCache(l2=SharedCache(shared_dir, sweep_interval_seconds=0))
+            key = object_cache_key("data/daily/AAPL_daily.csv")
+            cache.set(key, pd.DataFrame({"close": [1.0]}))
+
+            with patch("utils.data_storage.SHARED_CACHE_ENABLED", True), patch(
+                "utils.cache.get_cache", return_value=cache
+            ), patch(
+                "utils.helpers.write_bars",
+                return_value=("data/daily/AAPL_daily.parquet", True),
+            ):
+                assert helpers.save_df_to_s3(
+                    pd.DataFrame({"close": [2.0]}), "data/daily/AAPL_daily.csv"
+                )
+
+            assert cache.lookup(key) == (None, "miss")
+            assert cache.disk_cache.get(key) is None
+            cache.disk_cache.close()
+
+    def test_cached_frames_are_writable_copies(self):
+        """Test that frames from the mapped tier can be modified without leaking."""
+        with tempfile.TemporaryDirectory() as shared_dir:
+            writer = TieredCache(l2=SharedCache(shared_dir, sweep_interval_seconds=0))
+            writer.set(
+                "ticker_AAPL", (pd.DataFrame({"x": [1.0, 2.0]}), True), ttl_seconds=600
+            )
+            cache = TieredCache(l2=SharedCache(shared_dir, sweep_interval_seconds=0))
+
+            def fetch():
+                raise AssertionError("served from cache")
+
+            df, _ = cache.get_or_refresh("ticker_AAPL", fetch)
+            df.loc[0, "x"] = 5
+            again, _ = cache.get_or_refresh("ticker_AAPL", fetch)
+            batch = asyncio.run(
+                cache.get_or_refresh_many_async({"AAPL": "ticker_AAPL"}, fetch)
+            )
+            batch["AAPL"][0].loc[0, "x"] = 6
+            shared, _ = cache.get_or_refresh("ticker_AAPL", fetch, zero_copy=True)
+
+            assert again["x"].tolist() == [1.0, 2.0]
+            assert shared["x"].tolist() == [1.0, 2.0]
+            assert not shared["x"].to_numpy().flags.writeable
+            writer.disk_cache.close()
+            cache.disk_cache.close()
+
 
 def test_cache_key_generation():
     """Test cache key generation for ticker data."""
@@ -0,0 +1,78 @@
+"""
+Unit tests for the intraday delta segment compaction job.
+"""
+
+from unittest.mock import patch
+
+import pandas as pd
+
+from jobs.compact_intraday_segments import compact_ticker, prune_to_retention
+
+
+class TestSegmentCompaction:
+    """Test cases for folding delta segments into the base object."""
+
+    def test_prune_to_retention(self):
+        """Test that rows older than the retention window are dropped."""
+        now = pd.Timestamp.now(tz="UTC")
+        df = pd.DataFrame(
+            {
+                "timestamp": [now - pd.Timedelta(days=10), now],
+                "close": [1.0, 2.0],
+            }
+        )
+
+        pruned = prune_to_retention(df, retention_days=8)
+
+        assert list(pruned["close"]) == [2.0]
+
+    def test_compact_ticker_deletes_only_folded_segments(self):
+        """Test that compaction rewrites the base then deletes listed segments."""
+        segments = ["intraday_1min/_deltas/AAPL/20250102T143100.parquet"]
+        merged = pd.DataFrame(
+            {"timestamp": [pd.Timestamp.now(tz="UTC")], "close": [101.0]}
+        )
+
+        with (
+            patch(
+                "jobs.compact_intraday_segments.list_delta_segments",
+                return_value=segments,
+            ),
+            patch(
+                "jobs.compact_intraday_segments.read_segmented_dataframe",
+                return_value=merged,
+            ) as mock_read,
+            patch(
+                "jobs.compact_intraday_segments.write_bars",
+                return_value=("intraday_1min/AAPL.parquet", True),
+            ) as mock_write,
+            patch(
+                "jobs.compact_intraday_segments.delete_objects", return_value=True
+            ) as mock_delete,
+        ):
+            assert compact_ticker("AAPL")
+
+        assert mock_read.call_args[1]["segments"] == segments
+        assert mock_write.call_args[0][1] == "intraday_1min/AAPL.csv"
+        mock_delete.assert_called_once_with(segments)
+
+    def test_compact_ticker_keeps_segments_when_write_fails(self):
+        """Test that segments survive if the new base could not be written."""
+        with (
+            patch(
+                "jobs.compact_intraday_segments.list_delta_segments",
+                return_value=["seg"],
+            ),
+            patch(
+                "jobs.compact_intraday_segments.read_segmented_dataframe",
+                return_value=pd.DataFrame(),
+            ),
+            patch(
+                "jobs.compact_intraday_segments.write_bars",
+                return_value=(None, False),
+            ),
+            patch("jobs.compact_intraday_segments.delete_objects") as mock_delete,
+        ):
+            assert not compact_ticker("AAPL")
+
+        mock_delete.assert_not_called()
@@ -0,0 +1,394 @@
+"""
+Unit tests for the DataFetchManager stage pipeline and its async mode.
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import jobs.data_fetch_manager as dfm
+from utils.retry_queue import RetryQueue
+
+API_LATENCY = 0.05
+
+
+class _OffHealMinute(datetime):
+    """Pins the 1-min fetch to a compact (non-heal) cycle."""
+
+    @classmethod
+    def utcnow(cls):
+        return datetime(2025, 1, 2, 15, 7)
+
+
+def _bars(freq: str, periods: int) -> pd.DataFrame:
+    end = pd.Timestamp.now(tz="UTC").floor(freq)
+    index = pd.date_range(end=end, periods=periods, freq=freq)
+    return pd.DataFrame(
+        {
+            "timestamp": index,
+            "open": 10.0,
+            "high": 11.0,
+            "low": 9.0,
+            "close": 10.5,
+            "volume": 1_000,
+        }
+    )
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """A manager whose API and storage calls are in-memory fakes with latency."""
+    writes = {}
+    lock = threading.Lock()
+
+    def slow(result):
+        time.sleep(API_LATENCY)
+        return result
+
+    def record(df, object_name):
+        time.sleep(API_LATENCY)
+        with lock:
+            writes[object_name] = len(df)
+        return object_name, True
+
+    monkeypatch.setattr(
+        dfm, "get_daily_data", lambda t, outputsize, **kw: slow(_bars("D", 250))
+    )
+    monkeypatch.setattr(dfm, "get_real_time_price", lambda t: slow({"price": 10.0}))
+    monkeypatch.setattr(
+        dfm,
+        "get_intraday_data",
+        lambda t, interval, outputsize, **kw: slow(_bars(interval, 120)),
+    )
+    monkeypatch.setattr(dfm, "read_segmented_dataframe", lambda name: pd.DataFrame())
+    monkeypatch.setattr(dfm, "write_bars", record)
+    monkeypatch.setattr(dfm, "write_delta_segment", record)
+
+    instance = dfm.DataFetchManager()
+    instance.master_tickers = [f"T{i}" for i in range(12)]
+    instance.get_manifest_entry = lambda ticker, directory: None
+    instance.check_cloud_file_state = lambda ticker, directory: (False, 0)
+    instance._detect_gaps = lambda df, interval, ticker: False
+    instance.manifest.load = lambda refresh=False: None
+    instance.writes = writes
+    return instance
+
+
+class TestDataFetchManagerPipeline:
+    """The async pipeline must produce the sequential results, faster."""
+
+    def test_async_matches_sequential(self, manager):
+        """Test identical results and uploads in both modes."""
+        start = time.perf_counter()
+        sequential = manager.process_all_tickers()
+        sequential_time = time.perf_counter() - start
+        sequential_writes = dict(manager.writes)
+
+        manager.writes.clear()
+        manager._latest_1min_timestamps.clear()
+        manager.fetch_mode = "async"
+        start = time.perf_counter()
+        concurrent = manager.process_all_tickers()
+        async_time = time.perf_counter() - start
+
+        assert concurrent == sequential
+        assert all(all(r.values()) for r in concurrent.values())
+        assert manager.writes == sequential_writes
+        assert len(sequential_writes) == 36
+        # 12 tickers x (2 daily + 2 intraday API calls + 3 uploads) of latency
+        assert async_time < sequential_time / 3
+
+    def test_failed_fetch_is_reported_per_interval(self, manager, monkeypatch):
+        """Test that one failing data type does not fail the ticker's others."""
+        monkeypatch.setattr(
+            dfm, "get_daily_data", lambda t, outputsize, **kw: pd.DataFrame()
+        )
+        manager.defer_retries = False
+
+        results = dfm.asyncio.run(
+            manager.process_tickers_async(["AAA"], ("daily", "1min", "30min"))
+        )
+
+        assert results == {"AAA": {"daily": False, "1min": True, "30min": True}}
+
+    def test_stale_ticker_is_deferred_not_blocking(self, manager, monkeypatch):
+        """Test that a stale compact fetch is parked while later tickers proceed."""
+        calls = []
+
+        def fetch(ticker, interval, outputsize, retry_inline=True):
+            assert retry_inline is False
+            calls.append(ticker)
+            if ticker == "STALE" and calls.count("STALE") == 1:
+                bars = _bars(interval, 120)
+                bars["timestamp"] -= pd.Timedelta(days=3)
+                return bars
+            return _bars(interval, 120)
+
+        monkeypatch.setattr(dfm, "get_intraday_data", fetch)
+        monkeypatch.setattr(dfm, "detect_market_session", lambda: "REGULAR")
+        monkeypatch.setattr(dfm, "datetime", _OffHealMinute)
+        manager.master_tickers = ["STALE", "AAA", "BBB"]
+        manager.retry_queue = RetryQueue(max_attempts=3, base_delay=0.2)
+
+        assert manager.run_intraday_updates("1min")
+
+        assert calls == ["STALE", "AAA", "BBB", "STALE"]
+        summary = manager.retry_queue.stats.summary()
+        assert summary["parked"] == {"stale": 1}
+        assert summary["recovered_after_attempts"] == {1: 1}
+
+    def test_30min_bars_derived_from_stored_1min(self, manager, monkeypatch):
+        """
+        Test that a steady-state 30-min update appends completed bars.
+
+        The bars are aggregated from the stored 1-min data.
+        """
+        api_calls = []
+        stored = {}
+
+        def fetch(ticker, interval, outputsize, **kw):
+            api_calls.append(interval)
+            return _bars(interval, 120)
+
+        def record(df, object_name):
+            stored[object_name] = df
+            return object_name, True
+
+        monkeypatch.setattr(dfm, "INTRADAY_30MIN_SOURCE", "derived")
+        monkeypatch.setattr(dfm, "get_intraday_data", fetch)
+        monkeypatch.setattr(dfm, "datetime", _OffHealMinute)
+        one_min = _bars("1min", 600)
+        one_min["timestamp"] = pd.date_range(
+            "2025-01-02 14:00", periods=600, freq="1min", tz="UTC"
+        )
+        existing = _bars("30min", 500)
+        existing["timestamp"] = pd.date_range(
+            end="2025-01-02 14:30", periods=500, freq="30min", tz="UTC"
+        )
+        monkeypatch.setattr(dfm, "read_segmented_dataframe", lambda name: one_min)
+        monkeypatch.setattr(dfm, "read_bars", lambda name: existing)
+        monkeypatch.setattr(dfm, "write_bars", record)
+        entry = {
+            "row_count": 500,
+            "gap_count": 0,
+            "api_synced_at": pd.Timestamp("2025-01-02 15:07", tz="UTC"),
+        }
+        manager.get_manifest_entry = lambda ticker, directory: entry
+        manager.master_tickers = ["AAA"]
+
+        assert manager.run_intraday_updates("30min")
+
+        assert api_calls == []
+        bars = stored["intraday_30min/AAA.csv"]
+        assert len(bars) == 500
+        assert bars["timestamp"].is_monotonic_increasing and bars["timestamp"].is_unique
+        # Stored bars are kept; new bars run from 15:00 to the last complete one (23:30)
+        derived = bars[bars["timestamp"] > pd.Timestamp("2025-01-02 14:30", tz="UTC")]
+        assert len(derived) == 18 and (derived["volume"] == 30_000).all()
+        assert (
+            bars.loc[
+                bars["timestamp"] <= pd.Timestamp("2025-01-02 14:30", tz="UTC"),
+                "volume",
+            ]
+            == 1_000
+        ).all()
+
+        # Nothing new has completed: no API call and no upload
+        stored.clear()
+        monkeypatch.setattr(dfm, "read_bars", lambda name: bars)
+        assert manager.run_intraday_updates("30min")
+        assert api_calls == [] and stored == {}
+
+    def test_derived_30min_reconciles_per_ticker_with_the_api(
+        self, manager, monkeypatch
+    ):
+        """
+        Test that a ticker overdue for reconciliation stores completed API bars.
+
+        The API sync is recorded in the manifest.
+        """
+        stored, syncs = {}, []
+        api = _bars("30min", 3)
+        api["timestamp"] = pd.date_range(
+            "2025-01-02 14:00", periods=3, freq="30min", tz="UTC"
+        )
+        existing = _bars("30min", 500)
+        existing["timestamp"] = pd.date_range(
+            end="2025-01-02 14:30", periods=500, freq="30min", tz="UTC"
+        )
+        existing["volume"] = 5
+
+        def record(df, object_name):
+            stored[object_name] = df
+            return object_name, True
+
+        monkeypatch.setattr(dfm, "INTRADAY_30MIN_SOURCE", "derived")
+        monkeypatch.setattr(dfm, "get_intraday_data", lambda *args, **kw: api)
+        monkeypatch.setattr(dfm, "datetime", _OffHealMinute)
+        monkeypatch.setattr(dfm, "read_bars", lambda name: existing)
+        monkeypatch.setattr(dfm, "write_bars", record)
+        manager.defer_retries = False
+        manager.manifest.record_api_sync = lambda name: syncs.append(name)
+        synced_at = pd.Timestamp("2025-01-02 15:07", tz="UTC") - pd.Timedelta(hours=5)
+        entry = {"row_count": 500, "gap_count": 0, "api_synced_at": synced_at}
+        manager.get_manifest_entry = lambda ticker, directory: entry
+        manager.master_tickers = ["AAA"]
+
+        assert manager.run_intraday_updates("30min")
+
+        bars = stored["intraday_30min/AAA.csv"].set_index("timestamp")["volume"]
+        # The API's bars replace the stored ones; its 15:00 bar is still forming
+        # at 15:07
+        assert bars[pd.Timestamp("2025-01-02 14:00", tz="UTC")] == 1_000
+        assert bars[pd.Timestamp("2025-01-02 14:30", tz="UTC")] == 1_000
+        assert bars.index.max() == pd.Timestamp("2025-01-02 14:30", tz="UTC")
+        assert syncs == ["intraday_30min/AAA.csv"]
+
+    def test_async_derives_30min_after_1min_is_stored(self, manager, monkeypatch):
+        """Test that the async pipeline derives 30-min bars after storing 1-min bars."""
+        events = []
+
+        def record(df, object_name):
+            time.sleep(API_LATENCY)
+            events.append(object_name)
+            return object_name, True
+
+        derive = manager._derive_intraday_bars
+
+        def derive_after_store(ticker, interval, after=None):
+            events.append(f"derive {ticker} {interval}")
+            return derive(ticker, interval, after)
+
+        monkeypatch.setattr(dfm, "INTRADAY_30MIN_SOURCE", "derived")
+        monkeypatch.setattr(dfm, "datetime", _OffHealMinute)
+        monkeypatch.setattr(dfm, "write_bars", record)
+        monkeypatch.setattr(dfm, "write_delta_segment", record)
+        monkeypatch.setattr(dfm, "read_bars", lambda name: _bars("30min", 500))
+        manager._derive_intraday_bars = derive_after_store
+        manager.get_manifest_entry = lambda ticker, directory: {
+            "row_count": 500,
+            "api_synced_at": pd.Timestamp("2025-01-02 15:07", tz="UTC"),
+        }
+
+        results = dfm.asyncio.run(
+            manager.process_tickers_async(["AAA"], ("1min", "30min"))
+        )
+
+        assert results == {"AAA": {"1min": True, "30min": True}}
+        assert "derive AAA 30min" in events
+        stored_1min = [i for i, event in enumerate(events) if "intraday_1min" in event]
+        assert stored_1min and stored_1min[0] < events.index("derive AAA 30min")
+        assert list(results["AAA"]) == ["1min", "30min"]
+
+    def test_heal_cycle_fetches_only_gap_months(self, manager, monkeypatch):
+        """Test that a heal splices old gaps from a month slice, not a full refetch."""
+        index = pd.date_range(
+            "2024-11-25 09:30", "2024-11-26 15:59", freq="1min", tz="America/New_York"
+        )
+        index = index[(index.hour * 60 + index.minute >= 570) & (index.hour < 16)]
+        complete = _bars("1min", len(index)).assign(timestamp=index.tz_convert("UTC"))
+        stored = complete.drop(index=range(100, 130)).reset_index(drop=True)
+        calls, segments = [], {}
+
+        def fetch(ticker, interval, outputsize, month=None, **kw):
+            calls.append((outputsize, month))
+            return complete if month else _bars(interval, 120)
+
+        class _HealMinute(datetime):
+            @classmethod
+            def utcnow(cls):
+                return datetime(2025, 1, 2, 15, 0)
+
+        def record(df, object_name):
+            segments[object_name] = df
+            return object_name, True
+
+        monkeypatch.setattr(dfm, "get_intraday_data", fetch)
+        monkeypatch.setattr(dfm, "datetime", _HealMinute)
+        monkeypatch.setattr(dfm, "read_segmented_dataframe", lambda name: stored)
+        monkeypatch.setattr(dfm, "write_delta_segment", record)
+        manager._detect_gaps = dfm.DataFetchManager._detect_gaps.__get__(manager)
+        manager.master_tickers = ["AAA"]
+
+        assert manager.run_intraday_updates("1min")
+
+        assert calls == [("compact", None), ("full", "2024-11")]
+        segment = segments["intraday_1min/AAA.csv"]
+        filled = segment[segment["timestamp"] < stored["timestamp"].max()]
+        assert list(filled["timestamp"]) == list(complete["timestamp"].iloc[100:130])
+        assert segment["timestamp"].is_monotonic_increasing
+
+    def test_unfilled_gaps_recorded_until_heal_attempts_run_out(
+        self, manager, monkeypatch
+    ):
+        """Test that gaps left open by a heal stay recorded until attempts run out."""
+        index = pd.date_range(
+            "2024-11-25 09:30", "2024-11-26 15:59", freq="1min", tz="America/New_York"
+        )
+        index = index[(index.hour * 60 + index.minute >= 570) & (index.hour < 16)]
+        # Stored bars are naive exchange time
+        complete = _bars("1min", len(index)).assign(timestamp=index.tz_localize(None))
+        stored = complete.drop(
+            index=list(range(100, 130)) + list(range(500, 530))
+        ).reset_index(drop=True)
+        # The API has the first gap's bars but never printed the second's
+        printed = complete.drop(index=range(500, 530)).reset_index(drop=True)
+        checks = []
+
+        monkeypatch.setattr(dfm, "get_intraday_data", lambda *args, **kw: printed)
+        monkeypatch.setattr(dfm, "INTRADAY_HEAL_MAX_ATTEMPTS", 2)
+        manager._detect_gaps = dfm.DataFetchManager._detect_gaps.__get__(manager)
+        manager.manifest.record_gap_check = (
+            lambda name, count, heal_attempts=0: checks.append((count, heal_attempts))
+        )
+
+        for previous in (None, 0, 1):
+            manager.get_manifest_entry = lambda ticker, directory: {
+                "heal_attempts": previous
+            }
+            rows = manager._fetch_gap_fill("AAA", "1min", stored, printed.iloc[-60:])
+            assert list(rows["timestamp"]) == list(complete["timestamp"].iloc[100:130])
+
+        assert checks == [(1, 1), (1, 1), (0, 0)]
+
+        monkeypatch.setattr(
+            dfm, "get_intraday_data", lambda *args, **kw: pd.DataFrame()
+        )
+        manager._fetch_gap_fill("AAA", "1min", stored, printed.iloc[-60:])
+        assert checks[-1] == (2, None)
+
+    def test_heal_staggered_and_skipped_when_manifest_is_clean(
+        self, manager, monkeypatch
+    ):
+        """Test that heals are spread out and skip series with no open gaps."""
+        reads = []
+
+        class _HealMinute(datetime):
+            @classmethod
+            def utcnow(cls):
+                return datetime(2025, 1, 2, 15, 0)
+
+        def read(name):
+            reads.append(name)
+            return pd.DataFrame()
+
+        monkeypatch.setattr(dfm, "datetime", _HealMinute)
+        monkeypatch.setattr(dfm, "read_segmented_dataframe", read)
+        manager.master_tickers = [f"T{i:02d}" for i in range(30)]
+        manager.get_manifest_entry = lambda ticker, directory: {
+            "max_timestamp": pd.Timestamp("2025-01-02 14:59", tz="UTC"),
+            "gap_count": 0 if ticker == "T15" else -1,
+        }
+
+        assert manager.run_intraday_updates("1min")
+
+        # Minute 900 is phase 0: T00 and T15 are due, and T15 is known to be complete
+        assert reads == ["intraday_1min/T00.csv"]
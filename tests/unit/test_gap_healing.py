@@ -0,0 +1,131 @@
+"""
+Unit tests for gap-targeted healing of stored intraday bars.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.gap_healing import fill_gaps, find_gaps, plan_heal_requests, splice_bars
+
+EXCHANGE_TZ = "America/New_York"
+
+
+def _regular_session_bars(start: str, end: str) -> pd.DataFrame:
+    """Complete regular-session 1-min bars (the NYSE calendar decides the days)."""
+    index = pd.date_range(start, end, freq="1min", tz=EXCHANGE_TZ)
+    minutes = index.hour * 60 + index.minute
+    index = index[(minutes >= 570) & (minutes < 960) & (index.dayofweek < 5)]
+    # 2024-11-28 is Thanksgiving and 2024-11-29 closes at 13:00
+    index = index[index.normalize() != pd.Timestamp("2024-11-28", tz=EXCHANGE_TZ)]
+    early = index.normalize() == pd.Timestamp("2024-11-29", tz=EXCHANGE_TZ)
+    index = index[~early | (index.hour < 13)]
+    return pd.DataFrame(
+        {
+            "timestamp": index.tz_convert("UTC"),
+            "close": np.arange(len(index), dtype=float),
+        }
+    )
+
+
+def _drop(df: pd.DataFrame, start: str, end: str) -> pd.DataFrame:
+    local = pd.DatetimeIndex(df["timestamp"]).tz_convert(EXCHANGE_TZ)
+    hole = (local >= pd.Timestamp(start, tz=EXCHANGE_TZ)) & (
+        local <= pd.Timestamp(end, tz=EXCHANGE_TZ)
+    )
+    return df[~hole].reset_index(drop=True)
+
+
+def _local(gaps):
+    return [
+        (
+            a.tz_convert(EXCHANGE_TZ).strftime("%m-%d %H:%M"),
+            b.tz_convert(EXCHANGE_TZ).strftime("%m-%d %H:%M"),
+        )
+        for a, b in gaps
+    ]
+
+
+class TestGapHealing:
+    """Gap detection, request planning and splicing."""
+
+    def test_calendar_aware_gap_ranges(self):
+        """
+        Test that session breaks are not gaps.
+
+        A hole spanning a break is reported as a single range.
+        """
+        complete = _regular_session_bars("2024-11-20", "2024-11-30")
+        assert find_gaps(complete["timestamp"], "1min") == []
+
+        stored = _drop(complete, "2024-11-22 15:50", "2024-11-25 09:40")
+        stored = _drop(stored, "2024-11-26 11:00", "2024-11-26 11:02")
+
+        assert _local(find_gaps(stored["timestamp"], "1min", min_missing=5)) == [
+            ("11-22 15:50", "11-25 09:40")
+        ]
+        assert len(find_gaps(stored["timestamp"], "1min")) == 2
+
+    def test_plan_uses_compact_window_then_month_slices(self):
+        """
+        Test that recent gaps ride the compact fetch.
+
+        Older gaps cost one call per month.
+        """
+        stored = _regular_session_bars("2024-10-28", "2024-11-30")
+        for start, end in [
+            ("2024-10-30 10:00", "2024-10-30 10:09"),
+            ("2024-10-31 15:55", "2024-11-01 09:40"),
+            ("2024-11-13 14:00", "2024-11-13 14:30"),
+            ("2024-11-29 12:10", "2024-11-29 12:20"),
+        ]:
+            stored = _drop(stored, start, end)
+        gaps = find_gaps(stored["timestamp"], "1min", min_missing=5)
+
+        requests = plan_heal_requests(
+            gaps, "1min", now=pd.Timestamp("2024-11-29 12:40", tz=EXCHANGE_TZ)
+        )
+
+        assert [(r["outputsize"], r["month"], len(r["gaps"])) for r in requests] == [
+            ("compact", None, 1),
+            ("full", "2024-10", 2),
+            ("full", "2024-11", 2),
+        ]
+        assert plan_heal_requests([], "1min") == []
+
+    def test_splice_fills_only_the_gaps(self):
+        """Test the sorted merge against the full series, with string API timestamps."""
+        complete = _regular_session_bars("2024-11-20", "2024-11-30")
+        stored = _drop(complete, "2024-11-21 10:00", "2024-11-21 10:20")
+        stored = _drop(stored, "2024-11-27 15:00", "2024-11-29 09:35")
+        gaps = find_gaps(stored["timestamp"], "1min")
+
+        api = complete.assign(
+            timestamp=complete["timestamp"].dt.strftime("%Y-%m-%d %H:%M:%S+00:00"),
+            close=complete["close"] + 0.5,
+        )
+        calls = []
+
+        def fetch(outputsize, month):
+            calls.append((outputsize, month))
+            return api
+
+        requests = plan_heal_requests(
+            gaps, "1min", now=pd.Timestamp("2024-12-02 10:00", tz=EXCHANGE_TZ)
+        )
+        healed, call_count = fill_gaps(stored, fetch, gaps, requests)
+
+        assert calls == [("full", "2024-11")] and call_count == 1
+        pd.testing.assert_series_equal(healed["timestamp"], complete["timestamp"])
+        # Stored bars are kept; only missing ones come from the API
+        original = healed["timestamp"].isin(stored["timestamp"])
+        assert (healed.loc[original, "close"] == complete.loc[original, "close"]).all()
+        assert (
+            healed.loc[~original, "close"] == complete.loc[~original, "close"] + 0.5
+        ).all()
+        assert splice_bars(stored, api.iloc[:0], gaps).equals(stored)
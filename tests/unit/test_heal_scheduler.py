@@ -0,0 +1,73 @@
+"""
+Unit tests for staggered heal scheduling.
+"""
+
+import os
+import sys
+from collections import Counter
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.heal_scheduler import HealScheduler, needs_heal
+
+
+class TestHealScheduler:
+    """Heal phase assignment and manifest-based skipping."""
+
+    def test_universe_is_spread_over_the_interval(self):
+        """Test every ticker heals once per interval with an even load per minute."""
+        tickers = [f"T{i:03d}" for i in range(100)]
+        scheduler = HealScheduler(every_minutes=15, tickers=reversed(tickers))
+
+        per_minute = [len(scheduler.due(tickers, minute)) for minute in range(900, 915)]
+        assert sum(per_minute) == 100
+        assert max(per_minute) - min(per_minute) <= 1
+
+        heals = Counter(
+            ticker
+            for minute in range(900, 960)
+            for ticker in scheduler.due(tickers, minute)
+        )
+        assert set(heals.values()) == {4}
+
+        # Tickers outside the universe still get a stable phase
+        assert scheduler.phase("ZZZZ") == HealScheduler(15).phase("ZZZZ")
+
+    def test_overdue_catches_a_missed_slot(self):
+        """
+        Test that a late run is still due.
+
+        First runs after a herd are spread out as well.
+        """
+        tickers = [f"T{i:03d}" for i in range(48)]
+        scheduler = HealScheduler(every_minutes=240, tickers=tickers)
+        ticker = tickers[5]
+        slot = 240 * 100 + scheduler.phase(ticker)
+
+        assert scheduler.is_overdue(ticker, slot, None)
+        assert not scheduler.is_overdue(ticker, slot - 1, slot - 230)
+        # Started ten minutes after the slot: still due, then not again until the
+        # next slot
+        assert scheduler.is_overdue(ticker, slot + 10, slot - 230)
+        assert not scheduler.is_overdue(ticker, slot + 239, slot + 10)
+        assert scheduler.is_overdue(ticker, slot + 240, slot + 10)
+
+        # Every ticker last ran in the same minute: each becomes due at its own phase
+        first_due = {
+            t: next(
+                m
+                for m in range(24_001, 24_001 + 240)
+                if scheduler.is_overdue(t, m, 24_000)
+            )
+            for t in tickers
+        }
+        assert len(set(first_due.values())) == 48
+
+    def test_needs_heal_follows_manifest_gap_count(self):
+        """Test only a completed check with no open gaps skips the heal."""
+        assert needs_heal(None)
+        assert needs_heal({"gap_count": -1})
+        assert needs_heal({"gap_count": 3})
+        assert needs_heal({})
+        assert not needs_heal({"gap_count": 0})
@@ -0,0 +1,110 @@
+"""
+Unit tests for the vectorized indicator engine.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.indicators import (
+    IndicatorPanel,
+    atr_series,
+    bollinger_band_series,
+    ema_series,
+)
+
+
+@pytest.fixture
+def frames(random_bars):
+    """Tickers with different history lengths (including shorter than a window)."""
+    return {
+        ticker: random_bars(
+            pd.bdate_range("2024-01-02", periods=rows).strftime("%Y-%m-%d"), seed
+        )
+        for ticker, rows, seed in [("AAA", 120, 1), ("BBB", 45, 2), ("CCC", 12, 3)]
+    }
+
+
+def _legacy_atr(df, period=14):
+    prev_close = df["close"].shift(1)
+    tr = pd.concat(
+        [
+            df["high"] - df["low"],
+            (df["high"] - prev_close).abs(),
+            (df["low"] - prev_close).abs(),
+        ],
+        axis=1,
+    ).max(axis=1)
+    return tr.rolling(window=period).mean()
+
+
+class TestIndicatorPanel:
+    """Test cases for panel indicators against the per-ticker pandas versions."""
+
+    def test_panel_is_right_aligned(self, frames):
+        """Test that each ticker's latest bar lands in the last column."""
+        panel = IndicatorPanel.from_frames(frames)
+
+        assert panel["close"].shape == (3, 120)
+        assert np.isnan(panel["close"][2, :-12]).all()
+        assert panel.latest(panel["close"])["CCC"] == frames["CCC"]["close"].iloc[-1]
+
+    def test_panel_matches_per_ticker_pandas(self, frames):
+        """Test EMA, rolling std, average volume and ATR parity for every ticker."""
+        panel = IndicatorPanel.from_frames(frames)
+        ema20 = panel.ema(span=20)
+        std20 = panel.rolling_std(window=20)
+        avg_vol = panel.average_volume(window=20)
+        atr14 = panel.atr(period=14)
+        high5 = panel.rolling_max(window=5)
+
+        for ticker, df in frames.items():
+            pd.testing.assert_series_equal(
+                panel.series(ema20, ticker),
+                df["close"].ewm(span=20, adjust=False).mean(),
+                check_names=False,
+            )
+            pd.testing.assert_series_equal(
+                panel.series(std20, ticker),
+                df["close"].rolling(window=20).std(),
+                check_names=False,
+            )
+            pd.testing.assert_series_equal(
+                panel.series(avg_vol, ticker),
+                df["volume"].shift(1).rolling(window=20).mean(),
+                check_names=False,
+            )
+            pd.testing.assert_series_equal(
+                panel.series(atr14, ticker), _legacy_atr(df), check_names=False
+            )
+            pd.testing.assert_series_equal(
+                panel.series(high5, ticker),
+                df["high"].rolling(window=5).max(),
+                check_names=False,
+            )
+
+    def test_single_ticker_views(self, frames):
+        """Test the thin single-series wrappers used by the screeners."""
+        df = frames["AAA"]
+        upper, lower, middle = bollinger_band_series(df["close"], window=20, num_std=2)
+        rolling_std = df["close"].rolling(window=20).std()
+
+        pd.testing.assert_series_equal(
+            ema_series(df["close"], span=20),
+            df["close"].ewm(span=20, adjust=False).mean(),
+            check_names=False,
+        )
+        pd.testing.assert_series_equal(
+            upper,
+            df["close"].rolling(window=20).mean() + 2 * rolling_std,
+            check_names=False,
+        )
+        pd.testing.assert_series_equal(
+            atr_series(df, 14), _legacy_atr(df), check_names=False
+        )
@@ -0,0 +1,250 @@
+"""
+Unit tests for the dataset manifest module.
+"""
+
+import io
+import json
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from botocore.exceptions import ClientError
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.manifest import (
+    MANIFEST_LOCK_OBJECT,
+    DatasetManifest,
+    base_object_for_segment,
+    parse_bar_object_name,
+)
+
+
+class FakeObjectStore:
+    """In-memory S3 stand-in supporting ETags and (optionally) conditional PUTs."""
+
+    def __init__(self, conditional=True):
+        self.conditional = conditional
+        self.objects = {}
+        self.versions = 0
+        self.puts = 0
+        self.before_put = None
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        body, etag = self.objects[Key]
+        return {"Body": io.BytesIO(body), "ETag": etag}
+
+    def put_object(self, Bucket, Key, Body, IfMatch=None, IfNoneMatch=None):
+        if self.before_put is not None:
+            hook, self.before_put = self.before_put, None
+            hook()
+        if not self.conditional and (IfMatch or IfNoneMatch):
+            raise ClientError({"Error": {"Code": "NotImplemented"}}, "PutObject")
+        current = self.objects.get(Key)
+        if IfNoneMatch == "*" and current is not None:
+            raise ClientError({"Error": {"Code": "PreconditionFailed"}}, "PutObject")
+        if IfMatch is not None and (current is None or current[1] != IfMatch):
+            raise ClientError({"Error": {"Code": "PreconditionFailed"}}, "PutObject")
+        self.versions += 1
+        self.puts += 1
+        self.objects[Key] = (Body, f'"v{self.versions}"')
+        return {}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+        return {}
+
+
+@pytest.fixture
+def store():
+    """Patch the manifest module onto an in-memory object store."""
+    fake = FakeObjectStore()
+    with patch("utils.manifest.get_spaces_client", return_value=fake):
+        yield fake
+
+
+def _bars(start: str, periods: int) -> pd.DataFrame:
+    timestamps = pd.date_range(start, periods=periods, freq="1min", tz="UTC")
+    return pd.DataFrame(
+        {
+            "timestamp": timestamps.strftime("%Y-%m-%d %H:%M:%S+00:00"),
+            "close": range(periods),
+        }
+    )
+
+
+class TestDatasetManifest:
+    """Test cases for the dataset manifest."""
+
+    def test_parse_bar_object_names(self):
+        """Test ticker/interval extraction for both storage layouts."""
+        assert parse_bar_object_name("data/daily/AAPL_daily.csv") == ("AAPL", "daily")
+        assert parse_bar_object_name("data/intraday/AAPL_1min.parquet") == (
+            "AAPL",
+            "1min",
+        )
+        assert parse_bar_object_name("intraday_30min/MSFT.csv") == ("MSFT", "30min")
+        assert parse_bar_object_name("data/signals/orb_signals.csv") is None
+        assert (
+            base_object_for_segment(
+                "intraday_1min/_deltas/AAPL/20250102T143100.parquet"
+            )
+            == "intraday_1min/AAPL.csv"
+        )
+
+    def test_record_write_is_queryable(self, store):
+        """Test that a recorded write is readable back with one GET."""
+        writer = DatasetManifest()
+        assert writer.record_write(
+            "data/daily/AAPL_daily.parquet", _bars("2025-01-02", 10), 512
+        )
+
+        entry = DatasetManifest().get_entry("data/daily/AAPL_daily.csv")
+
+        assert entry["ticker"] == "AAPL"
+        assert entry["interval"] == "daily"
+        assert entry["row_count"] == 10
+        assert entry["byte_size"] == 512
+        assert entry["max_timestamp"] == pd.Timestamp("2025-01-02 00:09", tz="UTC")
+
+    def test_segment_append_extends_base_entry(self, store):
+        """Test that delta segments update the base object's entry."""
+        manifest = DatasetManifest()
+        manifest.record_write(
+            "intraday_1min/AAPL.parquet", _bars("2025-01-02 14:30", 30), 1000
+        )
+        manifest.record_write(
+            "intraday_1min/_deltas/AAPL/20250102T150000.parquet",
+            _bars("2025-01-02 15:00", 5),
+            100,
+        )
+
+        entry = manifest.get_entry("intraday_1min/AAPL.csv", refresh=True)
+
+        assert entry["row_count"] == 35
+        assert entry["byte_size"] == 1100
+        assert entry["min_timestamp"] == pd.Timestamp("2025-01-02 14:30", tz="UTC")
+        assert entry["max_timestamp"] == pd.Timestamp("2025-01-02 15:04", tz="UTC")
+
+    def test_batch_commits_once(self, store):
+        """Test that a batch writes the manifest a single time."""
+        manifest = DatasetManifest()
+        with manifest.batch():
+            for ticker in ("AAPL", "MSFT", "NVDA"):
+                manifest.record_write(
+                    f"daily/{ticker}.parquet", _bars("2025-01-02", 3), 64
+                )
+
+        assert store.puts == 1
+        assert len(manifest.query(interval="daily", refresh=True)) == 3
+
+    def test_concurrent_writer_is_not_lost(self, store):
+        """Test that a conflicting commit retries and keeps both entries."""
+        first = DatasetManifest()
+        first.record_write("daily/AAPL.parquet", _bars("2025-01-02", 3), 64)
+
+        # Another process commits between our GET and our PUT
+        other = DatasetManifest()
+        store.before_put = lambda: other.record_write(
+            "daily/MSFT.parquet", _bars("2025-01-02", 4), 64
+        )
+        assert first.record_write("daily/NVDA.parquet", _bars("2025-01-02", 5), 64)
+
+        tickers = set(DatasetManifest().query(refresh=True)["ticker"])
+        assert tickers == {"AAPL", "MSFT", "NVDA"}
+
+    def test_unconditional_backend_writes_under_lock(self, store):
+        """Test that a backend without conditional PUTs never gets an unguarded PUT."""
+        store.conditional = False
+        store.objects[MANIFEST_LOCK_OBJECT] = (
+            json.dumps({"token": "other", "expires_at": time.time() + 60}).encode(),
+            '"lock"',
+        )
+        manifest = DatasetManifest(max_retries=2)
+
+        with patch("utils.manifest.time.sleep"):
+            # Another writer holds the lock: nothing is written, entries are kept
+            assert not manifest.record_write(
+                "daily/AAPL.parquet", _bars("2025-01-02", 3), 64
+            )
+            assert manifest.object_name not in store.objects
+
+            del store.objects[MANIFEST_LOCK_OBJECT]
+            assert manifest.record_write(
+                "daily/MSFT.parquet", _bars("2025-01-02", 3), 64
+            )
+
+        assert set(DatasetManifest().query(refresh=True)["ticker"]) == {"AAPL", "MSFT"}
+        assert MANIFEST_LOCK_OBJECT not in store.objects
+        assert not manifest._conditional_writes
+
+    def test_gap_count_tracks_checks_and_appends(self, store):
+        """Test that gap checks set the count and appends only add to a known count."""
+        manifest = DatasetManifest()
+        manifest.record_write(
+            "intraday_1min/AAPL.parquet", _bars("2025-01-02 14:30", 30), 1000
+        )
+        assert (
+            manifest.get_entry("intraday_1min/AAPL.csv", refresh=True)["gap_count"]
+            == -1
+        )
+
+        # Unknown stays unknown until a full check has run
+        manifest.record_new_gaps("intraday_1min/AAPL.csv", 2)
+        assert (
+            manifest.get_entry("intraday_1min/AAPL.csv", refresh=True)["gap_count"]
+            == -1
+        )
+
+        with manifest.batch():
+            manifest.record_gap_check("intraday_1min/AAPL.parquet", 0)
+            manifest.record_write(
+                "intraday_1min/_deltas/AAPL/20250102T150000.parquet",
+                _bars("2025-01-02 15:00", 5),
+                100,
+            )
+        assert (
+            manifest.get_entry("intraday_1min/AAPL.csv", refresh=True)["gap_count"] == 0
+        )
+
+        manifest.record_new_gaps("intraday_1min/AAPL.csv", 1)
+        assert (
+            manifest.get_entry("intraday_1min/AAPL.csv", refresh=True)["gap_count"] == 1
+        )
+
+        # Heal attempts survive appends and are kept by a check that passes None
+        manifest.record_gap_check("intraday_1min/AAPL.csv", 2, heal_attempts=1)
+        manifest.record_new_gaps("intraday_1min/AAPL.csv", 1)
+        manifest.record_gap_check("intraday_1min/AAPL.csv", 3, heal_attempts=None)
+        entry = manifest.get_entry("intraday_1min/AAPL.csv", refresh=True)
+        assert (entry["gap_count"], entry["heal_attempts"]) == (3, 1)
+
+    def test_api_sync_survives_rewrites_and_appends(self, store):
+        """Test that the last API sync time is kept by later writes of the object."""
+        manifest = DatasetManifest()
+        manifest.record_write(
+            "intraday_30min/AAPL.parquet", _bars("2025-01-02 14:30", 30), 1000
+        )
+        assert pd.isna(
+            manifest.get_entry("intraday_30min/AAPL.csv", refresh=True)["api_synced_at"]
+        )
+
+        synced_at = pd.Timestamp("2025-01-02 15:00", tz="UTC")
+        with manifest.batch():
+            manifest.record_write(
+                "intraday_30min/AAPL.parquet", _bars("2025-01-02 14:30", 31), 1000
+            )
+            manifest.record_api_sync("intraday_30min/AAPL.parquet", synced_at)
+        manifest.record_write(
+            "intraday_30min/AAPL.parquet", _bars("2025-01-02 14:30", 32), 1000
+        )
+
+        entry = DatasetManifest().get_entry("intraday_30min/AAPL.csv", refresh=True)
+        assert entry["row_count"] == 32
+        assert entry["api_synced_at"] == synced_at
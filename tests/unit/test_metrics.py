@@ -0,0 +1,126 @@
+"""
+Unit tests for the metrics module's streaming histograms.
+"""
+
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from core.metrics import Histogram, LogLinearHistogram, MetricsCollector
+
+
+class TestLogLinearHistogram:
+    """Bucketing, quantiles and merging."""
+
+    def test_quantiles_within_precision(self):
+        """Test that p50/p95/p99 match the exact percentiles to within 0.5%."""
+        values = np.random.default_rng(7).lognormal(mean=-3, sigma=1.5, size=100_000)
+        histogram = LogLinearHistogram(significant_figures=3)
+        for value in values:
+            histogram.observe(float(value))
+
+        ordered = np.sort(values)
+        for q in (0.5, 0.95, 0.99):
+            exact = ordered[int(np.ceil(q * len(values))) - 1]
+            assert histogram.quantile(q) == pytest.approx(exact, rel=0.005)
+        assert histogram.count == len(values)
+        assert histogram.min == values.min()
+        assert histogram.max == values.max()
+        # Memory follows the value range, not the number of observations
+        assert len(histogram.buckets) < 6000
+
+    def test_bucket_edges_are_inclusive(self):
+        """Test that a value on a Prometheus bound counts as <= that bound."""
+        histogram = LogLinearHistogram(significant_figures=2)
+        for value in (0.0, 0.005, 0.0051, 0.25, 1.0, 10.0, 11.0):
+            histogram.observe(value)
+
+        assert histogram.cumulative_counts([0.005, 0.25, 1.0, 10.0]) == [2, 4, 5, 6]
+
+    def test_merge_equals_observing_everything(self):
+        """Test that histograms merged through JSON equal one of all the values."""
+        first, second, combined = (LogLinearHistogram() for _ in range(3))
+        for i in range(1, 500):
+            (first if i % 2 else second).observe(i / 100)
+            combined.observe(i / 100)
+
+        merged = LogLinearHistogram.from_dict(json.loads(json.dumps(first.to_dict())))
+        merged.merge(
+            LogLinearHistogram.from_dict(json.loads(json.dumps(second.to_dict())))
+        )
+
+        assert merged.get_stats() == pytest.approx(combined.get_stats())
+        assert merged.buckets == combined.buckets
+        with pytest.raises(ValueError):
+            merged.merge(LogLinearHistogram(significant_figures=2))
+
+
+class TestHistogramMetric:
+    """Windowed statistics, Prometheus export and cross-process snapshots."""
+
+    def test_window_drops_old_observations(self):
+        """Test that statistics cover only the sliding window."""
+        histogram = Histogram("latency", window_seconds=60, window_slots=6)
+        with patch("core.metrics.time.time", return_value=1_000.0):
+            histogram.observe(5.0)
+        with patch("core.metrics.time.time", return_value=1_050.0):
+            histogram.observe(0.1)
+            assert histogram.get_stats()["count"] == 2
+            assert histogram.get_stats(window_seconds=10)["max"] == 0.1
+        with patch("core.metrics.time.time", return_value=1_065.0):
+            stats = histogram.get_stats()
+
+        assert stats["count"] == 1
+        assert stats["p99"] == 0.1
+        assert histogram.cumulative.count == 2
+
+    def test_prometheus_export_has_bucket_series(self):
+        """
+        Test that histograms and timers export cumulative _bucket series.
+
+        Window quantiles are exported alongside them.
+        """
+        collector = MetricsCollector()
+        for value in (0.004, 0.02, 0.3, 1.0, 30.0):
+            collector.observe_histogram("fetch_seconds", value, {"job": "intraday"})
+        collector.get_metric("api_call_duration").record(0.2)
+
+        lines = collector.export_prometheus().splitlines()
+
+        assert "# TYPE fetch_seconds histogram" in lines
+        assert 'fetch_seconds_bucket{job="intraday",le="0.005"} 1' in lines
+        assert 'fetch_seconds_bucket{job="intraday",le="1"} 4' in lines
+        assert 'fetch_seconds_bucket{job="intraday",le="+Inf"} 5' in lines
+        assert 'fetch_seconds_count{job="intraday"} 5' in lines
+        assert "# TYPE fetch_seconds_window summary" in lines
+        assert 'fetch_seconds_window{job="intraday",quantile="0.99"} 30.0' in lines
+        assert 'api_call_duration_bucket{component="api",le="0.25"} 1' in lines
+        assert not any(line.startswith("fetch_seconds_p50") for line in lines)
+
+    def test_collectors_merge_snapshots_across_processes(self):
+        """Test that snapshots from worker collectors add up in the parent."""
+        parent, worker = MetricsCollector(), MetricsCollector()
+        for value in (0.1, 0.2, 0.3):
+            parent.observe_histogram("scan_seconds", value)
+        for value in (0.4, 0.5):
+            worker.observe_histogram("scan_seconds", value)
+            worker.get_metric("screener_execution_time").record(value)
+        worker.observe_histogram("worker_only_seconds", 1.5)
+
+        parent.merge_histogram_snapshots(
+            json.loads(json.dumps(worker.histogram_snapshots()))
+        )
+
+        assert parent.get_metric("scan_seconds").get_stats()["count"] == 5
+        assert parent.get_metric("scan_seconds").get_stats()["max"] == 0.5
+        assert parent.get_metric("worker_only_seconds").cumulative.count == 1
+        timer_stats = parent.get_metric("screener_execution_time").get_stats()
+        assert timer_stats["count"] == 2
+        assert timer_stats["total_calls"] == 2
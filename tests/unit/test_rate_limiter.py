@@ -0,0 +1,76 @@
+"""
+Unit tests for the shared Alpha Vantage token bucket.
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.rate_limiter import TokenBucket, is_throttled, request_cost
+
+
+def _drain(state_path, results):
+    bucket = TokenBucket(calls_per_minute=60, burst=5, state_path=state_path)
+    results.put(sum(bucket.try_acquire() == 0.0 for _ in range(10)))
+    bucket.close()
+
+
+class TestTokenBucket:
+    """Burst, pacing, cross-process sharing and AIMD backoff."""
+
+    def test_burst_then_paced(self):
+        """Test that the burst is granted at once and then requests are paced."""
+        bucket = TokenBucket(calls_per_minute=600, burst=3)
+
+        assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        wait = bucket.try_acquire()
+        assert 0.0 < wait <= 0.1
+
+        start = time.perf_counter()
+        bucket.acquire()
+        assert time.perf_counter() - start >= 0.05
+        assert request_cost({"function": "TIME_SERIES_INTRADAY"}) == 1.0
+
+    def test_state_is_shared_across_processes(self, tmp_path):
+        """Test that concurrent processes draw from one bucket, not one each."""
+        state_path = str(tmp_path / "bucket.state")
+        results = multiprocessing.get_context("fork").Queue()
+        workers = [
+            multiprocessing.get_context("fork").Process(
+                target=_drain, args=(state_path, results)
+            )
+            for _ in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(10)
+
+        granted = sum(results.get(timeout=5) for _ in workers)
+        # 5 burst tokens plus at most a token of refill while the processes ran
+        assert 5 <= granted <= 6
+
+    def test_aimd_backoff_is_shared(self, tmp_path):
+        """Test multiplicative decrease on throttling and additive recovery."""
+        state_path = str(tmp_path / "bucket.state")
+        first = TokenBucket(calls_per_minute=60, burst=5, state_path=state_path)
+        second = TokenBucket(calls_per_minute=60, burst=5, state_path=state_path)
+
+        first.on_throttled()
+        assert second.rate_scale == 0.5
+        assert second.tokens < 0.1
+        # A throttle reported by another in-flight call in the same second counts once
+        second.on_throttled()
+        assert first.rate_scale == 0.5
+
+        second.on_success()
+        assert abs(first.rate_scale - 0.55) < 1e-9
+        assert second.try_acquire() > 1.0
+
+        assert is_throttled({"Note": "Thank you for using Alpha Vantage!"})
+        assert is_throttled(status_code=429)
+        assert not is_throttled({"Time Series (1min)": {}})
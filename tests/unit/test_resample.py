@@ -0,0 +1,140 @@
+"""
+Unit tests for deriving intraday and daily bars from 1-minute data.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.resample import partial_daily_bars, reconcile_bars, resample_bars
+
+EXCHANGE_TZ = "America/New_York"
+
+
+@pytest.fixture
+def minute_frame(random_bars):
+    """
+    minute_frame(start, end, seed, fill=0.8): sparse 1-min bars around the
+    clock, UTC timestamps like the API delivers.
+    """
+
+    def make(start: str, end: str, seed: int, fill: float = 0.8) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        index = pd.date_range(start, end, freq="1min", tz=EXCHANGE_TZ)
+        index = index[rng.random(len(index)) < fill]
+        return random_bars(index.tz_convert("UTC"), seed, start=100.0, scale=0.1)
+
+    return make
+
+
+def _api_style_bars(
+    df: pd.DataFrame, minutes: int, start: str, ends: dict
+) -> pd.DataFrame:
+    """
+    Reference bars built the way Alpha Vantage reports them.
+
+    Bars are start-labelled and confined to the session.
+    """
+    local = df.set_index(pd.DatetimeIndex(df["timestamp"]).tz_convert(EXCHANGE_TZ))
+    day = local.index.normalize()
+    tod = local.index - day
+    in_session = np.zeros(len(local), dtype=bool)
+    for date, end in ends.items():
+        in_session |= (
+            (day == pd.Timestamp(date, tz=EXCHANGE_TZ))
+            & (tod >= pd.Timedelta(start))
+            & (tod < pd.Timedelta(end))
+        )
+    bars = (
+        local[in_session]
+        .resample(f"{minutes}min", origin="start_day", offset=pd.Timedelta(start))
+        .agg(
+            {
+                "open": "first",
+                "high": "max",
+                "low": "min",
+                "close": "last",
+                "volume": "sum",
+            }
+        )
+        .dropna(subset=["open"])
+    )
+    bars.index = bars.index.tz_convert("UTC")
+    return bars.rename_axis("timestamp").reset_index()
+
+
+# 2024-11-27 full day, 11-28 Thanksgiving, 11-29 early close (13:00)
+SESSION_ENDS = {"2024-11-27": "20:00:00", "2024-11-29": "17:00:00"}
+REGULAR_ENDS = {"2024-11-27": "16:00:00", "2024-11-29": "13:00:00"}
+
+
+class TestResampleBars:
+    """Parity of the vectorized engine with API-style aggregation."""
+
+    @pytest.mark.parametrize(
+        "interval,minutes", [("5min", 5), ("15min", 15), ("30min", 30), ("60min", 60)]
+    )
+    def test_extended_session_parity_across_tickers(
+        self, interval, minutes, minute_frame
+    ):
+        """Test every interval for several tickers over a holiday and an early close."""
+        frames = {
+            "AAA": minute_frame("2024-11-27 02:00", "2024-11-29 22:00", 1),
+            "BBB": minute_frame("2024-11-27 02:00", "2024-11-29 22:00", 2, fill=0.1),
+            "EMPTY": pd.DataFrame(),
+        }
+
+        result = resample_bars(frames, interval)
+
+        assert set(result) == {"AAA", "BBB"}
+        for ticker, bars in result.items():
+            expected = _api_style_bars(
+                frames[ticker], minutes, "04:00:00", SESSION_ENDS
+            )
+            pd.testing.assert_frame_equal(
+                bars, expected, check_dtype=False, check_freq=False
+            )
+
+    def test_regular_session_respects_calendar(self, minute_frame):
+        """Test the regular session ends at the early close and skips the holiday."""
+        df = minute_frame("2024-11-27 02:00", "2024-11-29 22:00", 3)
+
+        bars = resample_bars({"AAA": df}, "30min", session="regular")["AAA"]
+        local = pd.DatetimeIndex(bars["timestamp"]).tz_convert(EXCHANGE_TZ)
+
+        assert local.min().strftime("%H:%M") == "09:30"
+        assert {d.strftime("%Y-%m-%d") for d in local.normalize()} == set(REGULAR_ENDS)
+        assert local[local.day == 29].max().strftime("%H:%M") == "12:30"
+        expected = _api_style_bars(df, 30, "09:30:00", REGULAR_ENDS)
+        pd.testing.assert_frame_equal(
+            bars, expected, check_dtype=False, check_freq=False
+        )
+
+    def test_partial_daily_bar_and_reconciliation(self, minute_frame):
+        """Test today's bar so far and the derived-vs-API comparison."""
+        df = minute_frame("2024-11-29 04:00", "2024-11-29 11:14", 4, fill=1.0)
+
+        daily = partial_daily_bars({"AAA": df, "BBB": pd.DataFrame()}, day="2024-11-29")
+        local = pd.DatetimeIndex(df["timestamp"]).tz_convert(EXCHANGE_TZ)
+        regular = df[local.hour * 60 + local.minute >= 9 * 60 + 30]
+        assert list(daily.index) == ["AAA"]
+        assert daily.loc["AAA", "open"] == regular["open"].iloc[0]
+        assert daily.loc["AAA", "close"] == regular["close"].iloc[-1]
+        assert daily.loc["AAA", "high"] == regular["high"].max()
+        assert daily.loc["AAA", "volume"] == regular["volume"].sum()
+        assert partial_daily_bars({"AAA": df}, day="2024-11-28").empty
+
+        derived = resample_bars({"AAA": df}, "30min")["AAA"]
+        api = _api_style_bars(df, 30, "04:00:00", {"2024-11-29": "17:00:00"})
+        assert reconcile_bars(derived, api)["mismatched"] == 0
+
+        api.loc[3, "close"] += 0.5
+        report = reconcile_bars(derived, api)
+        assert report["mismatched"] == 1
+        assert report["mismatched_timestamps"] == [api.loc[3, "timestamp"]]
@@ -0,0 +1,93 @@
+"""
+Unit tests for the deferred retry queue.
+"""
+
+import os
+import sys
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.retry_queue import RetryQueue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRetryQueue:
+    """Backoff ordering, give-up rules and retry statistics."""
+
+    def test_due_order_and_backoff(self):
+        """Test that keys come due in backoff order and not before."""
+        clock = FakeClock()
+        queue = RetryQueue(max_attempts=3, base_delay=2.0, max_delay=5.0, clock=clock)
+
+        queue.park("A", "stale")
+        clock.now = 1.0
+        queue.park("B", "failed")
+
+        assert queue.pop_due() == []
+        assert queue.next_due_in() == 1.0
+        clock.now = 3.0
+        assert queue.pop_due() == ["A", "B"]
+
+        # Second park of A doubles its backoff; the third is capped at max_delay
+        queue.park("A", "stale")
+        assert queue.next_due_in() == 4.0
+        clock.now = 7.0
+        queue.pop_due()
+        queue.park("A", "stale")
+        assert queue.next_due_in() == 5.0
+
+    def test_drain_records_recoveries_and_give_ups(self):
+        """
+        Test drain() with keys that recover late and never recover.
+
+        One key recovers on its second retry and the other gives up.
+        """
+        clock = FakeClock()
+        queue = RetryQueue(max_attempts=3, base_delay=1.0, max_delay=60.0, clock=clock)
+        calls = []
+
+        def attempt(key):
+            calls.append((key, clock.now))
+            if key == "FRESH" and len([c for c in calls if c[0] == key]) == 2:
+                queue.resolve(key)
+            else:
+                queue.park(key, "stale")
+
+        queue.park("FRESH", "stale")
+        queue.park("STUCK", "stale")
+        queue.drain(attempt, sleep=clock.sleep)
+
+        summary = queue.stats.summary()
+        assert len(queue) == 0 and "STUCK" not in queue
+        assert summary["recovered_after_attempts"] == {2: 1}
+        assert summary["gave_up"] == {"stale": 1}
+        assert summary["latency_seconds"]["p50"] == 3.0
+        assert [t for key, t in calls if key == "STUCK"] == [1.0, 3.0, 7.0]
+
+    def test_drain_deadline_and_errors(self):
+        """Test that a raising attempt and the drain deadline give keys up."""
+        clock = FakeClock()
+        queue = RetryQueue(max_attempts=5, base_delay=10.0, clock=clock)
+        queue.park("BOOM", "failed")
+        queue.park("SLOW", "failed")
+
+        def attempt(key):
+            if key == "BOOM":
+                raise RuntimeError("boom")
+            queue.park(key, "failed")
+
+        queue.drain(attempt, max_wait=25.0, sleep=clock.sleep)
+
+        assert len(queue) == 0
+        assert queue.stats.gave_up == {"error": 1, "deadline": 1}
@@ -0,0 +1,213 @@
+"""
+Unit tests for the concurrent screener runner.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from core.base_screener import BaseScreener
+from core.screener_runner import ScreenerRunner
+
+
+class _CountingFetcher:
+    def __init__(self):
+        self.calls = []
+
+    async def fetch_multiple_tickers(
+        self, tickers, data_type="intraday", interval="1min", **kwargs
+    ):
+        self.calls.append((data_type, interval))
+        df = pd.DataFrame({"close": [100.0, 101.0], "volume": [1000, 1200]})
+        return {ticker: (df, True) for ticker in tickers}
+
+
+class _SleepyScreener(BaseScreener):
+    """Async screen_ticker; SLOW never finishes in time."""
+
+    async def screen_ticker(self, ticker, df, **kwargs):
+        await asyncio.sleep(5 if ticker == "SLOW" else 0.05)
+        return self.create_signal(
+            ticker=ticker, signal_type="buy", entry_price=float(df["close"].iloc[-1])
+        )
+
+
+class _HangingScreener(BaseScreener):
+    async def scan(self, tickers, **kwargs):
+        await asyncio.sleep(5)
+        return []
+
+
+class _CpuScreener(BaseScreener):
+    """Split screener; evaluation spins for SPIN and runs in worker processes."""
+
+    async def prepare_ticker(self, ticker, df, **kwargs):
+        return None if ticker == "SKIP" else {"parent": os.getpid()}
+
+    def evaluate_ticker(self, ticker, df, context, **kwargs):
+        try:
+            while ticker == "SPIN":
+                pass
+        except Exception:
+            return None
+        return self.create_signal(
+            ticker=ticker,
+            signal_type="buy",
+            entry_price=float(df["close"].iloc[-1]),
+            worker_pid=os.getpid(),
+        )
+
+
+class _OneWorkerPool(Executor):
+    """Single-worker executor that counts tasks submitted but not yet finished."""
+
+    def __init__(self):
+        self._threads = ThreadPoolExecutor(max_workers=1)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def submit(self, fn, *args, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        future = self._threads.submit(fn, *args, **kwargs)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        with self._lock:
+            self.in_flight -= 1
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self._threads.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+class _BrokenPool(Executor):
+    """Executor whose tasks fail as if a worker process died."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+
+class TestScreenerRunner:
+    """Shared snapshots, concurrency, timeouts and process offload."""
+
+    @pytest.mark.asyncio
+    async def test_screeners_share_snapshot_and_run_concurrently(self):
+        """
+        Test that two screeners fetch once and overlap.
+
+        A slow ticker and a hung screener are dropped.
+        """
+        fetcher = _CountingFetcher()
+        screeners = {
+            "a": _SleepyScreener(data_fetcher=fetcher),
+            "b": _SleepyScreener(data_fetcher=fetcher),
+            "hung": _HangingScreener(data_fetcher=fetcher),
+        }
+        runner = ScreenerRunner(
+            screener_timeout=1.0, ticker_timeout=0.3, process_workers=0
+        )
+        tickers = ["AAPL", "MSFT", "SLOW", "NVDA"]
+
+        start = time.perf_counter()
+        with patch(
+            "core.base_screener.get_screener_runner", return_value=runner
+        ), patch("core.base_screener.detect_market_session", return_value="REGULAR"):
+            results = await runner.run(screeners, tickers)
+        elapsed = time.perf_counter() - start
+
+        assert fetcher.calls == [("intraday", "1min")]
+        assert [s["ticker"] for s in results["a"]] == ["AAPL", "MSFT", "NVDA"]
+        assert [s["ticker"] for s in results["b"]] == ["AAPL", "MSFT", "NVDA"]
+        assert results["hung"] == []
+        # Sequential would be 2 x (3 x 0.05 + 0.3) plus the 1s hang
+        assert elapsed < 1.5
+
+    @pytest.mark.asyncio
+    async def test_evaluation_runs_in_process_pool_with_ticker_timeout(self):
+        """Test that evaluate_ticker runs in workers and cuts off a spinning ticker."""
+        runner = ScreenerRunner(ticker_timeout=0.5, process_workers=2, chunk_size=2)
+        screener = _CpuScreener(data_fetcher=_CountingFetcher())
+        df = pd.DataFrame({"close": [10.0, 11.0]})
+        data = {
+            ticker: (df, True) for ticker in ["AAPL", "SPIN", "MSFT", "SKIP", "NVDA"]
+        }
+        data["EMPTY"] = (pd.DataFrame(), True)
+
+        try:
+            signals = await runner.screen(screener, data)
+        finally:
+            runner.shutdown()
+
+        assert [s["ticker"] for s in signals] == ["AAPL", "MSFT", "NVDA"]
+        assert all(s["worker_pid"] != os.getpid() for s in signals)
+
+    @pytest.mark.asyncio
+    async def test_unpicklable_screener_falls_back_to_threads(self):
+        """Test that a screener the pool cannot pickle is evaluated in threads."""
+
+        class LocalScreener(_CpuScreener):
+            pass
+
+        runner = ScreenerRunner(process_workers=1)
+        screener = LocalScreener(data_fetcher=_CountingFetcher())
+        data = {"AAPL": (pd.DataFrame({"close": [10.0]}), True)}
+
+        try:
+            signals = await runner.screen(screener, data)
+        finally:
+            runner.shutdown()
+
+        assert [s["worker_pid"] for s in signals] == [os.getpid()]
+        assert LocalScreener in runner._no_offload
+
+    @pytest.mark.asyncio
+    async def test_chunks_wait_for_a_free_worker_before_submission(self):
+        """Test that no more chunks are handed to the pool than it has workers."""
+        runner = ScreenerRunner(ticker_timeout=30, process_workers=1, chunk_size=1)
+        screener = _CpuScreener(data_fetcher=_CountingFetcher())
+        df = pd.DataFrame({"close": [10.0, 11.0]})
+        data = {ticker: (df, True) for ticker in ["AAPL", "MSFT", "NVDA", "TSLA"]}
+        pool = _OneWorkerPool()
+
+        try:
+            with patch.object(runner, "_executor", return_value=pool):
+                signals = await runner.screen(screener, data)
+        finally:
+            pool.shutdown()
+            runner.shutdown()
+
+        assert [s["ticker"] for s in signals] == ["AAPL", "MSFT", "NVDA", "TSLA"]
+        # Queued chunks never sat in the pool where their budget would run
+        assert pool.max_in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_does_not_disable_offload(self):
+        """Test that a dead worker restarts the pool instead of pinning to threads."""
+        runner = ScreenerRunner(process_workers=1)
+        screener = _CpuScreener(data_fetcher=_CountingFetcher())
+        data = {"AAPL": (pd.DataFrame({"close": [10.0]}), True)}
+
+        try:
+            with patch.object(runner, "_executor", return_value=_BrokenPool()):
+                signals = await runner.screen(screener, data)
+        finally:
+            runner.shutdown()
+
+        assert [s["worker_pid"] for s in signals] == [os.getpid()]
+        assert _CpuScreener not in runner._no_offload
@@ -0,0 +1,143 @@
+"""
+Unit tests for the session analytics kernels and their helpers wrappers.
+"""
+
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.helpers import (
+    calculate_avg_daily_volume,
+    calculate_avg_early_volume,
+    calculate_vwap,
+    get_premarket_data,
+    get_previous_day_close,
+)
+from utils.session_kernels import (
+    average_early_volume,
+    day_bounds,
+    stack_frames,
+    utc_nanos,
+    wall_clock,
+)
+
+
+@pytest.fixture
+def minute_bars(random_bars):
+    """
+    minute_bars(days, seed): 1-minute bars from 4:00 to 16:00 ET, stamped in
+    UTC like stored objects.
+    """
+
+    def make(days: int, seed: int) -> pd.DataFrame:
+        index = pd.DatetimeIndex([], tz="America/New_York")
+        for day in pd.bdate_range("2025-03-06", periods=days):
+            index = index.append(
+                pd.date_range(
+                    day + pd.Timedelta("04:00:00"),
+                    day + pd.Timedelta("16:00:00"),
+                    freq="1min",
+                    tz="America/New_York",
+                )
+            )
+        timestamps = index.tz_convert("UTC").strftime("%Y-%m-%d %H:%M:%S%z")
+        return random_bars(timestamps, seed, start=20.0, scale=0.05)
+
+    return make
+
+
+def _daily_bars(rows: int = 30) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": pd.bdate_range("2025-02-03", periods=rows).strftime(
+                "%Y-%m-%d"
+            ),
+            "close": np.arange(rows, dtype=float) + 10,
+            "volume": np.arange(rows, dtype=float) * 1_000,
+        }
+    )
+
+
+def _reference_early_volume(df: pd.DataFrame, days: int) -> float:
+    """Per-day groupby reference for the early volume kernel."""
+    et = pd.to_datetime(df["timestamp"], utc=True).dt.tz_convert("America/New_York")
+    minutes = et.dt.hour * 60 + et.dt.minute
+    early = df[(minutes >= 570) & (minutes < 585)]
+    per_day = early.groupby(et[early.index].dt.date)["volume"].mean()
+    return per_day.tail(days).mean()
+
+
+class TestSessionKernels:
+    """Correctness of the vectorized session kernels."""
+
+    def test_helpers_match_pandas_reference(self, minute_bars):
+        """Test the helpers against straightforward per-day pandas computations."""
+        intraday = minute_bars(days=6, seed=1)
+        daily = _daily_bars()
+        as_of = date(2025, 3, 10)
+
+        assert get_previous_day_close(daily, as_of=as_of) == daily["close"].iloc[24]
+        assert calculate_avg_daily_volume(daily, 10, as_of=as_of) == (
+            daily["volume"].iloc[15:25].mean()
+        )
+        assert np.isclose(
+            calculate_avg_early_volume(intraday, days=5),
+            _reference_early_volume(intraday, 5),
+        )
+
+        premarket = get_premarket_data(intraday)
+        et = pd.to_datetime(premarket["timestamp"], utc=True).dt.tz_convert(
+            "America/New_York"
+        )
+        assert len(premarket) == 6 * 330
+        assert et.dt.hour.max() == 9 and et.dt.minute[et.dt.hour == 9].max() == 29
+
+        vwap = calculate_vwap(intraday.iloc[:3])
+        typical = (intraday["high"] + intraday["low"] + intraday["close"]).iloc[:3] / 3
+        expected = (typical * intraday["volume"].iloc[:3]).cumsum() / intraday[
+            "volume"
+        ].iloc[:3].cumsum()
+        np.testing.assert_allclose(vwap.to_numpy(), expected.to_numpy())
+
+    def test_helpers_handle_missing_data(self):
+        """Test that empty inputs return the documented fallbacks."""
+        empty = pd.DataFrame()
+        assert get_previous_day_close(empty) is None
+        assert calculate_avg_daily_volume(empty, 10) is None
+        assert calculate_avg_early_volume(empty, days=5) == 0.0
+        assert get_premarket_data(empty).empty
+        assert calculate_vwap(empty).empty
+        assert get_previous_day_close(_daily_bars(), as_of=date(2025, 1, 1)) is None
+
+    def test_panel_matches_single_ticker(self, minute_bars):
+        """Test that one stacked call gives the same values as per-ticker calls."""
+        frames = {f"T{i}": minute_bars(days=3 + i, seed=i) for i in range(4)}
+        tickers, ticker_ids, utc, fields = stack_frames(frames)
+        panel = average_early_volume(
+            wall_clock(utc),
+            fields["volume"],
+            3,
+            ticker_ids=ticker_ids,
+            n_tickers=len(tickers),
+        )
+
+        for i, ticker in enumerate(tickers):
+            assert np.isclose(
+                panel[i], calculate_avg_early_volume(frames[ticker], days=3)
+            )
+
+    def test_day_bounds_slice_one_session(self, minute_bars):
+        """Test that searchsorted day bounds select exactly one day's bars."""
+        df = minute_bars(days=3, seed=5)
+        wall = wall_clock(utc_nanos(df["timestamp"]))
+
+        lo, hi = day_bounds(wall, date(2025, 3, 7))
+        assert hi - lo == 721
+        assert pd.Timestamp(wall[lo]) == pd.Timestamp("2025-03-07 04:00")
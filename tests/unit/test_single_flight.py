@@ -0,0 +1,168 @@
+"""
+Unit tests for single-flight request coalescing.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import utils.async_client as async_client
+from utils.single_flight import SingleFlight, bar_expiry
+
+
+class _Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSingleFlight:
+    """Coalescing, bar-aligned memoization and counters."""
+
+    def test_bar_expiry_is_aligned(self):
+        """Test that results expire at the next bar boundary of their interval."""
+        now = 1_735_830_000 + 17  # 15:00:17 UTC
+        assert bar_expiry("1min", now) == 1_735_830_060
+        assert bar_expiry("30min", now) == 1_735_831_800
+        assert bar_expiry("1min", 1_735_830_060) == 1_735_830_120
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        """Test that identical concurrent requests run once and are memoized."""
+        clock = _Clock(1_000.0)
+        flight = SingleFlight(clock=clock, enabled=True)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "bars"
+
+        results = await asyncio.gather(
+            *(
+                flight.run(("INTRADAY", "AAPL", "1min"), fetch, expires_at=1_060.0)
+                for _ in range(5)
+            )
+        )
+        assert results == ["bars"] * 5 and len(calls) == 1
+
+        assert (
+            await flight.run(("INTRADAY", "AAPL", "1min"), fetch, expires_at=1_060.0)
+            == "bars"
+        )
+        clock.now = 1_060.0
+        await flight.run(("INTRADAY", "AAPL", "1min"), fetch, expires_at=1_120.0)
+
+        assert len(calls) == 2
+        assert flight.stats.summary() == {
+            "executed": 2,
+            "coalesced": 4,
+            "memo_hits": 1,
+            "deduplicated": 5,
+            "dedup_ratio": 0.714,
+        }
+
+    @pytest.mark.asyncio
+    async def test_failures_are_shared_but_not_memoized(self):
+        """Test that joiners see the leader's error and the next request retries."""
+        flight = SingleFlight(enabled=True)
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ConnectionError("boom")
+
+        results = await asyncio.gather(
+            *(
+                flight.run("key", failing, expires_at=time.time() + 60)
+                for _ in range(3)
+            ),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, ConnectionError) for result in results)
+        assert len(calls) == 1
+
+        async def empty():
+            calls.append(1)
+            return None
+
+        await flight.run("key", empty, expires_at=time.time() + 60)
+        await flight.run("key", empty, expires_at=time.time() + 60)
+        assert len(calls) == 3
+
+    def test_threads_share_one_call(self):
+        """Test the blocking variant used by the sync fetch jobs."""
+        flight = SingleFlight(enabled=True)
+        calls, results = [], []
+        started = threading.Barrier(4)
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return "bars"
+
+        def worker():
+            started.wait()
+            results.append(flight.call("key", fetch))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["bars"] * 4 and len(calls) == 1
+        assert flight.stats.coalesced == 3
+
+    @pytest.mark.asyncio
+    async def test_screeners_share_client_requests(self):
+        """Test that two clients scanning the same universe send each request once."""
+        flight = SingleFlight(enabled=True)
+        requests = []
+
+        async def make_request(self, params, retries=0):
+            requests.append((params["function"], params["symbol"]))
+            await asyncio.sleep(0.01)
+            return {
+                "Time Series (1min)": {
+                    "2025-01-02 09:30:00": {
+                        "1. open": "1",
+                        "2. high": "1",
+                        "3. low": "1",
+                        "4. close": "1",
+                        "5. volume": "10",
+                    }
+                }
+            }
+
+        with patch.object(
+            async_client, "get_single_flight", return_value=flight
+        ), patch.object(
+            async_client.AsyncAlphaVantageClient, "_make_request", make_request
+        ):
+            clients = [
+                async_client.AsyncAlphaVantageClient(api_key="test") for _ in range(3)
+            ]
+            scans = await asyncio.gather(
+                *(client.fetch_multiple_tickers(["AAPL", "MSFT"]) for client in clients)
+            )
+
+        assert sorted(requests) == [
+            ("TIME_SERIES_INTRADAY", "AAPL"),
+            ("TIME_SERIES_INTRADAY", "MSFT"),
+        ]
+        assert all(scan["AAPL"][1] for scan in scans)
+        # Every screener gets its own frame
+        assert scans[0]["AAPL"][0] is not scans[1]["AAPL"][0]
+        assert flight.stats.deduplicated == 4
@@ -0,0 +1,135 @@
+"""
+Unit tests for the market data snapshot module.
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.snapshot import (
+    SNAPSHOT_DIR_ENV,
+    MarketDataSnapshot,
+    activate_snapshot,
+    build_snapshot,
+    get_active_snapshot,
+    prefetch_market_data,
+    read_market_data,
+    ticker_object_names,
+)
+
+
+@pytest.fixture(autouse=True)
+def _no_active_snapshot(monkeypatch):
+    """Ensure every test starts and ends without an active snapshot."""
+    monkeypatch.delenv(SNAPSHOT_DIR_ENV, raising=False)
+    activate_snapshot(None)
+    yield
+    activate_snapshot(None)
+
+
+def _fake_read(object_name: str) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"timestamp": ["2025-01-02", "2025-01-03"], "close": [1.0, 2.0]}
+    )
+
+
+class TestMarketDataSnapshot:
+    """Test cases for the shared market data snapshot."""
+
+    def test_build_downloads_each_object_once(self):
+        """Test that duplicate object names are downloaded a single time."""
+        names = ticker_object_names(["AAPL", "MSFT"]) * 3
+
+        with patch(
+            "utils.snapshot.read_df_cached", side_effect=_fake_read
+        ) as mock_read:
+            snapshot = build_snapshot(names, max_workers=4)
+
+        assert mock_read.call_count == 4
+        assert snapshot.downloads == 4
+        assert len(snapshot) == 4
+
+    def test_views_do_not_mutate_snapshot(self):
+        """Test that screener-side changes never reach the stored frame."""
+        snapshot = MarketDataSnapshot({"data/daily/AAPL_daily.csv": _fake_read("")})
+
+        view = snapshot.get("data/daily/AAPL_daily.csv")
+        view["timestamp"] = pd.to_datetime(view["timestamp"])
+        view.loc[0, "close"] = 99.0
+
+        again = snapshot.get("data/daily/AAPL_daily.csv")
+        assert again["close"].iloc[0] == 1.0
+        assert not isinstance(again["timestamp"].dtype, pd.DatetimeTZDtype)
+        assert again["timestamp"].iloc[0] == "2025-01-02"
+        assert snapshot.saved_downloads == 1
+
+    def test_get_returns_independent_copies(self):
+        """Test that frames from get() share no memory, so edits cannot leak."""
+        name = "data/daily/AAPL_daily.csv"
+        snapshot = MarketDataSnapshot({name: _fake_read("")})
+
+        first = snapshot.get(name)
+        second = snapshot.get(name)
+        assert not np.shares_memory(
+            first["close"].to_numpy(), second["close"].to_numpy()
+        )
+
+        first.iloc[1, 1] = -1.0
+        assert second["close"].tolist() == [1.0, 2.0]
+        assert snapshot.get(name)["close"].tolist() == [1.0, 2.0]
+
+    def test_read_market_data_falls_back(self):
+        """Test that objects outside the snapshot are read from Spaces."""
+        activate_snapshot(
+            MarketDataSnapshot({"data/daily/AAPL_daily.csv": _fake_read("")})
+        )
+
+        with patch(
+            "utils.snapshot.read_df_cached", side_effect=_fake_read
+        ) as mock_read:
+            read_market_data("data/daily/AAPL_daily.csv")
+            read_market_data("data/daily/MSFT_daily.csv")
+
+        mock_read.assert_called_once_with("data/daily/MSFT_daily.csv")
+
+    def test_prefetch_only_downloads_objects_missing_from_active(self):
+        """Test that prefetching extends the active snapshot instead of replacing it."""
+        activate_snapshot(
+            MarketDataSnapshot({"data/daily/AAPL_daily.csv": _fake_read("")})
+        )
+
+        with patch(
+            "utils.snapshot.read_df_cached", side_effect=_fake_read
+        ) as mock_read:
+            snapshot = prefetch_market_data(
+                ["data/daily/AAPL_daily.csv", "data/daily/MSFT_daily.csv"]
+            )
+
+        mock_read.assert_called_once_with("data/daily/MSFT_daily.csv")
+        assert "data/daily/AAPL_daily.csv" in snapshot
+        assert get_active_snapshot() is snapshot
+
+    def test_shared_snapshot_counts_reads_across_processes(self, tmp_path, monkeypatch):
+        """Test that a saved snapshot is found through the environment and counted."""
+        with patch("utils.snapshot.read_df_cached", side_effect=_fake_read):
+            owner = build_snapshot(
+                ticker_object_names(["AAPL"], include_intraday=False)
+            )
+        assert owner.save(str(tmp_path)) == str(tmp_path)
+
+        # A screener process finds the snapshot through the environment
+        monkeypatch.setenv(SNAPSHOT_DIR_ENV, str(tmp_path))
+        for _ in range(3):
+            df = read_market_data("data/daily/AAPL_daily.csv")
+            assert df["close"].tolist() == [1.0, 2.0]
+
+        assert get_active_snapshot() is not owner
+        assert owner.served == 3
+        assert owner.saved_downloads == 2
@@ -6,12 +6,30 @@ import os
 import sys
 from unittest.mock import MagicMock, patch
 
+import pandas as pd
 import pytest
+from botocore.exceptions import ClientError
 
 # Add project root to Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
-from utils.spaces_manager import get_spaces_client, get_spaces_credentials_status
+from utils.spaces_manager import (
+    delta_segment_prefix,
+    download_dataframe,
+    get_spaces_client,
+    get_spaces_credentials_status,
+    read_segmented_dataframe,
+    reset_spaces_client,
+    write_delta_segment,
+)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_client_pool():
+    """Ensure every test starts and ends with an empty client pool."""
+    reset_spaces_client()
+    yield
+    reset_spaces_client()
 
 
 class TestSpacesManager:
@@ -83,6 +101,7 @@ class TestSpacesManager:
             client = get_spaces_client()
 
             # Should have used fallback region
+            assert client is mock_client
             mock_session.client.assert_called_once()
             call_args = mock_session.client.call_args
             assert call_args[1]["region_name"] == "nyc3"
@@ -105,6 +124,139 @@ class TestSpacesManager:
             client = get_spaces_client()
 
             # Should have used fallback region
+            assert client is mock_client
             mock_session.client.assert_called_once()
             call_args = mock_session.client.call_args
             assert call_args[1]["region_name"] == "nyc3"
+
+
+class TestSpacesClientPool:
+    """Test cases for the pooled Spaces client and single-GET read path."""
+
+    def _patched_credentials(self, key="test_key"):
+        return patch.multiple(
+            "utils.spaces_manager",
+            SPACES_ACCESS_KEY_ID=key,
+            SPACES_SECRET_ACCESS_KEY="test_secret",
+            SPACES_BUCKET_NAME="test_bucket",
+            SPACES_REGION="nyc3",
+        )
+
+    def test_client_is_reused_across_calls(self):
+        """Test that repeated calls return the same pooled client."""
+        with (
+            self._patched_credentials(),
+            patch("utils.spaces_manager.boto3") as mock_boto3,
+        ):
+            mock_session = MagicMock()
+            mock_boto3.session.Session.return_value = mock_session
+
+            first = get_spaces_client()
+            second = get_spaces_client()
+
+            assert first is second
+            mock_session.client.assert_called_once()
+            config = mock_session.client.call_args[1]["config"]
+            assert config.tcp_keepalive is True
+            assert config.max_pool_connections >= 10
+
+    def test_credential_change_builds_new_client(self):
+        """Test that a different credential set gets its own client."""
+        with patch("utils.spaces_manager.boto3") as mock_boto3:
+            mock_session = MagicMock()
+            mock_session.client.side_effect = [MagicMock(), MagicMock()]
+            mock_boto3.session.Session.return_value = mock_session
+
+            with self._patched_credentials("key_a"):
+                client_a = get_spaces_client()
+
+            with self._patched_credentials("key_b"):
+                client_b = get_spaces_client()
+
+            assert client_a is not client_b
+            assert mock_session.client.call_count == 2
+
+    def test_download_missing_object_uses_single_get(self):
+        """Test that a missing object is one GET and returns an empty DataFrame."""
+        mock_client = MagicMock()
+        mock_client.get_object.side_effect = ClientError(
+            {"Error": {"Code": "NoSuchKey", "Message": "missing"}}, "GetObject"
+        )
+
+        with patch(
+            "utils.spaces_manager.get_spaces_client", return_value=mock_client
+        ):
+            df = download_dataframe("data/daily/MISSING_daily.csv")
+
+        assert df.empty
+        mock_client.get_object.assert_called_once()
+        mock_client.head_object.assert_not_called()
+
+    def test_download_existing_object_skips_head(self):
+        """Test that an existing object is read without a HEAD request."""
+        mock_client = MagicMock()
+        body = MagicMock()
+        body.read.return_value = b"timestamp,close\n2024-01-02 14:30:00+00:00,1.5\n"
+        mock_client.get_object.return_value = {"Body": body}
+
+        with patch(
+            "utils.spaces_manager.get_spaces_client", return_value=mock_client
+        ):
+            df = download_dataframe("data/daily/AAPL_daily.csv")
+
+        assert isinstance(df, pd.DataFrame)
+        assert len(df) == 1
+        mock_client.head_object.assert_not_called()
+
+
+class TestDeltaSegments:
+    """Test cases for the append-only delta segment layout."""
+
+    def _bars(self, timestamps, close):
+        return pd.DataFrame(
+            {
+                "timestamp": pd.to_datetime(timestamps, utc=True),
+                "close": close,
+            }
+        )
+
+    def test_delta_segment_prefix(self):
+        """Test that segments live beside the base object."""
+        assert (
+            delta_segment_prefix("intraday_1min/AAPL.csv")
+            == "intraday_1min/_deltas/AAPL/"
+        )
+
+    def test_write_delta_segment_uploads_only_new_rows(self):
+        """Test that a delta write uploads just the rows it was given."""
+        new_rows = self._bars(["2025-01-02 14:31"], [101.0])
+
+        with patch(
+            "utils.storage_format.write_bars",
+            return_value=("seg.parquet", True),
+        ) as mock_write:
+            _, success = write_delta_segment(new_rows, "intraday_1min/AAPL.csv")
+
+        assert success
+        written_df, segment_name = mock_write.call_args[0]
+        assert len(written_df) == 1
+        assert segment_name.startswith("intraday_1min/_deltas/AAPL/")
+
+    def test_read_segmented_dataframe_merges_and_dedupes(self):
+        """Test that base and segments merge in order with newest rows winning."""
+        base = self._bars(["2025-01-02 14:30", "2025-01-02 14:31"], [100.0, 101.0])
+        segment = self._bars(["2025-01-02 14:31", "2025-01-02 14:32"], [101.5, 102.0])
+
+        with (
+            patch("utils.storage_format.read_bars", return_value=base),
+            patch(
+                "utils.spaces_manager.download_dataframe", return_value=segment
+            ) as mock_download,
+        ):
+            merged = read_segmented_dataframe(
+                "intraday_1min/AAPL.csv",
+                segments=["intraday_1min/_deltas/AAPL/20250102T143200.parquet"],
+            )
+
+        assert list(merged["close"]) == [100.0, 101.5, 102.0]
+        assert mock_download.call_args[0][1] == "parquet"
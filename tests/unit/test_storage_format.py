@@ -0,0 +1,196 @@
+"""
+Unit tests for storage_format module.
+"""
+
+import io
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.avwap import avwap_from_anchor
+from utils.helpers import get_previous_day_close
+from utils.spaces_manager import PARQUET_COMPRESSION
+from utils.storage_format import (
+    encode_bar_frame,
+    is_bar_object,
+    parquet_object_name,
+    read_bars,
+    storage_candidates,
+    write_bars,
+)
+
+
+@pytest.fixture
+def csv_bars() -> pd.DataFrame:
+    """Bar data shaped like a CSV file read back from Spaces."""
+    rows = 390 * 8  # eight sessions of 1-minute bars
+    timestamps = pd.date_range("2025-01-02 14:30", periods=rows, freq="1min", tz="UTC")
+    prices = 100 + np.random.default_rng(0).standard_normal(rows).cumsum() * 0.05
+    return pd.DataFrame(
+        {
+            "timestamp": timestamps.strftime("%Y-%m-%d %H:%M:%S+00:00"),
+            "open": prices,
+            "high": prices + 0.05,
+            "low": prices - 0.05,
+            "close": prices + 0.02,
+            "volume": np.arange(rows) + 1000,
+        }
+    )
+
+
+class TestStorageFormat:
+    """Test cases for the bar storage format layer."""
+
+    def test_object_name_mapping(self):
+        """Test bar object detection and Parquet sibling names."""
+        assert is_bar_object("data/daily/AAPL_daily.csv")
+        assert is_bar_object("intraday_1min/AAPL.csv")
+        assert not is_bar_object("data/signals/orb_signals.csv")
+        assert (
+            parquet_object_name("data/intraday/AAPL_1min.csv")
+            == "data/intraday/AAPL_1min.parquet"
+        )
+
+    def test_encode_bar_frame_types(self, csv_bars):
+        """Test that encoding produces the typed columnar layout."""
+        typed = encode_bar_frame(csv_bars)
+
+        assert isinstance(typed["timestamp"].dtype, pd.DatetimeTZDtype)
+        assert str(typed["timestamp"].dt.tz) == "UTC"
+        assert typed["close"].dtype == np.float32
+        assert typed["volume"].dtype == np.uint64
+        assert typed["timestamp"].iloc[0] == pd.Timestamp("2025-01-02 14:30", tz="UTC")
+
+    def test_naive_timestamps_stay_exchange_time(self):
+        """Test that daily rows read the same from the CSV and the Parquet copy."""
+        csv_daily = pd.DataFrame(
+            {
+                "timestamp": ["2024-01-02", "2024-01-03", "2024-01-04"],
+                "open": [10.0, 20.0, 30.0],
+                "high": [11.0, 21.0, 31.0],
+                "low": [9.0, 19.0, 29.0],
+                "close": [10.0, 20.0, 30.0],
+                "volume": [1000, 1000, 4000],
+            }
+        )
+        buffer = io.BytesIO()
+        encode_bar_frame(csv_daily).to_parquet(buffer, index=False)
+        parquet_daily = pd.read_parquet(io.BytesIO(buffer.getvalue()))
+
+        assert parquet_daily["timestamp"].iloc[0] == pd.Timestamp(
+            "2024-01-02", tz="America/New_York"
+        )
+        for daily in (csv_daily, parquet_daily):
+            assert (
+                get_previous_day_close(daily, as_of=pd.Timestamp("2024-01-04").date())
+                == 20.0
+            )
+        assert avwap_from_anchor(parquet_daily, "2024-01-03") == pytest.approx(
+            avwap_from_anchor(csv_daily, "2024-01-03")
+        )
+
+    def test_parquet_is_smaller_than_csv(self, csv_bars):
+        """Test that the typed Parquet payload is much smaller than CSV."""
+        csv_buffer = io.BytesIO()
+        csv_bars.to_csv(csv_buffer, index=False)
+        parquet_buffer = io.BytesIO()
+        encode_bar_frame(csv_bars).to_parquet(
+            parquet_buffer, index=False, compression=PARQUET_COMPRESSION
+        )
+
+        assert parquet_buffer.getbuffer().nbytes * 3 < csv_buffer.getbuffer().nbytes
+
+    def test_write_bars_uses_parquet(self, csv_bars):
+        """Test that bar objects are written as Parquet siblings."""
+        with (
+            patch("utils.storage_format.BAR_STORAGE_FORMAT", "parquet"),
+            patch(
+                "utils.storage_format.upload_bytes", return_value=True
+            ) as mock_upload,
+            patch("utils.storage_format._record_in_manifest") as mock_record,
+        ):
+            written, success = write_bars(csv_bars, "data/daily/AAPL_daily.csv")
+
+        assert success
+        assert written == "data/daily/AAPL_daily.parquet"
+        payload, object_name = mock_upload.call_args[0]
+        uploaded_df = pd.read_parquet(io.BytesIO(payload))
+        assert uploaded_df["close"].dtype == np.float32
+        mock_record.assert_called_once_with(
+            "data/daily/AAPL_daily.parquet", csv_bars, len(payload)
+        )
+
+    def test_csv_fallback_deletes_parquet_sibling(self, csv_bars):
+        """Test that a failed Parquet upload removes the stale Parquet object."""
+        with (
+            patch("utils.storage_format.BAR_STORAGE_FORMAT", "parquet"),
+            patch(
+                "utils.storage_format.upload_bytes",
+                side_effect=lambda payload, name: name.endswith(".csv"),
+            ),
+            patch(
+                "utils.storage_format.delete_objects", return_value=True
+            ) as mock_delete,
+            patch("utils.storage_format._record_in_manifest") as mock_record,
+        ):
+            written, success = write_bars(csv_bars, "data/daily/AAPL_daily.csv")
+
+        assert success
+        assert written == "data/daily/AAPL_daily.csv"
+        mock_delete.assert_called_once_with(["data/daily/AAPL_daily.parquet"])
+        assert mock_record.call_args[0][0] == "data/daily/AAPL_daily.csv"
+
+        with (
+            patch("utils.storage_format.BAR_STORAGE_FORMAT", "parquet"),
+            patch(
+                "utils.storage_format.upload_bytes",
+                side_effect=lambda payload, name: name.endswith(".csv"),
+            ),
+            patch("utils.storage_format.delete_objects", return_value=False),
+            patch("utils.storage_format._record_in_manifest") as mock_record,
+        ):
+            written, success = write_bars(csv_bars, "data/daily/AAPL_daily.csv")
+
+        assert not success
+        assert written is None
+        mock_record.assert_not_called()
+
+    def test_write_non_bar_object_stays_csv(self, csv_bars):
+        """Test that non-bar objects keep the CSV format."""
+        with (
+            patch(
+                "utils.storage_format.upload_bytes", return_value=True
+            ) as mock_upload,
+            patch("utils.storage_format._record_in_manifest") as mock_record,
+        ):
+            written, success = write_bars(csv_bars, "data/signals/orb_signals.csv")
+
+        assert success
+        assert written == "data/signals/orb_signals.csv"
+        assert mock_upload.call_args[0][0].startswith(b"timestamp,")
+        mock_record.assert_not_called()
+
+    def test_read_bars_falls_back_to_csv(self, csv_bars):
+        """Test dual read: a missing Parquet object falls back to CSV."""
+        responses = {"parquet": pd.DataFrame(), "csv": csv_bars}
+
+        with (
+            patch("utils.storage_format.BAR_STORAGE_FORMAT", "parquet"),
+            patch(
+                "utils.storage_format.download_dataframe",
+                side_effect=lambda name, fmt: responses[fmt],
+            ) as mock_download,
+        ):
+            df = read_bars("data/intraday/AAPL_1min.csv")
+
+        assert len(df) == len(csv_bars)
+        assert [c[0][1] for c in mock_download.call_args_list] == ["parquet", "csv"]
+
+    def test_csv_mode_reads_csv_first(self):
+        """Test that rolling back to CSV reads the CSV object first."""
+        with patch("utils.storage_format.BAR_STORAGE_FORMAT", "csv"):
+            candidates = storage_candidates("data/daily/AAPL_daily.csv")
+
+        assert candidates[0] == ("data/daily/AAPL_daily.csv", "csv")
@@ -0,0 +1,157 @@
+"""
+Unit tests for the streaming indicator state.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.indicators import ema_series, rolling_mean, vwap_series, wilder_atr_series
+from utils.streaming_indicators import (
+    IndicatorStateStore,
+    RollingWindow,
+    StreamingEMA,
+    StreamingWilderATR,
+    TickerIndicatorState,
+)
+
+
+@pytest.fixture
+def minute_bars(random_bars):
+    """
+    minute_bars(days=2, seed=7): 1-min bars over pre-market and the regular
+    session.
+    """
+
+    def make(days: int = 2, seed: int = 7) -> pd.DataFrame:
+        index = pd.DatetimeIndex([])
+        for day in pd.bdate_range("2025-03-03", periods=days):
+            index = index.append(
+                pd.date_range(
+                    day + pd.Timedelta("09:00:00"),
+                    day + pd.Timedelta("16:30:00"),
+                    freq="1min",
+                )
+            )
+        df = random_bars(
+            index.strftime("%Y-%m-%d %H:%M:%S"), seed, start=100.0, scale=0.2
+        )
+        return df.set_index(index)
+
+    return make
+
+
+class TestStreamingIndicators:
+    """Parity of the O(1) streaming updates with the full-recompute kernels."""
+
+    def test_ema_atr_and_rolling_volume_match_full_recompute(self, minute_bars):
+        """Test that bar-by-bar updates reproduce the full-history indicators."""
+        df = minute_bars()
+        ema = StreamingEMA(20)
+        atr = StreamingWilderATR(14)
+        rolling = RollingWindow(20)
+
+        ema_values, atr_values, volume_values = [], [], []
+        for row in df.itertuples():
+            ema_values.append(ema.update(row.close))
+            atr_values.append(atr.update(row.high, row.low, row.close))
+            volume_values.append(rolling.update(row.volume))
+
+        np.testing.assert_allclose(ema_values, ema_series(df["close"], 20).to_numpy())
+        np.testing.assert_allclose(atr_values, wilder_atr_series(df, 14).to_numpy())
+        np.testing.assert_allclose(
+            volume_values, rolling_mean(df["volume"].to_numpy()[None, :], 20)[0]
+        )
+
+    def test_session_vwap_matches_regular_session_recompute(self, minute_bars):
+        """Test that the VWAP resets each day and ignores extended-hours bars."""
+        df = minute_bars(days=2)
+        state = TickerIndicatorState("AAPL")
+        state.update(df)
+
+        last_day = df[df.index.date == df.index[-1].date()]
+        regular = last_day.between_time("09:30", "16:00")
+        expected = vwap_series(regular).iloc[-1]
+
+        assert np.isclose(state.vwap.value, expected)
+        assert np.isclose(state.vwap.value_for(df.index[-1].date()), expected)
+        assert np.isnan(state.vwap.value_for(df.index[0].date()))
+
+    def test_persisted_state_resumes_on_the_tail(self, tmp_path, minute_bars):
+        """
+        Test that runs over a growing frame only apply new bars.
+
+        The resumed state matches one pass over the whole frame.
+        """
+        df = minute_bars(days=2)
+        store = IndicatorStateStore(directory=str(tmp_path))
+
+        store.update("AAPL", df.iloc[:500])
+        store.update("AAPL", df.iloc[:700])
+        resumed = store.update("AAPL", df.iloc[:900])
+
+        full = TickerIndicatorState("AAPL")
+        full.update(df.iloc[:900])
+
+        assert store.bars_applied == 900
+        assert resumed.bars == 900
+        for name, value in full.values().items():
+            assert np.isclose(resumed.values()[name], value, equal_nan=True), name
+
+        # Nothing new: no bars applied
+        store.update("AAPL", df.iloc[:900])
+        assert store.bars_applied == 900
+
+    def test_state_older_than_the_frame_is_rebuilt(self, tmp_path, minute_bars):
+        """Test that a gap between the stored state and the data forces a rebuild."""
+        df = minute_bars(days=2)
+        store = IndicatorStateStore(directory=str(tmp_path))
+
+        store.update("AAPL", df.iloc[:100])
+        state = store.update("AAPL", df.iloc[300:])
+
+        assert store.rebuilt == 1
+        assert state.bars == len(df) - 300
+
+    def test_back_filled_gap_rebuilds_to_full_recompute(self, tmp_path, minute_bars):
+        """Test that bars back-filled before the stored timestamp force a rebuild."""
+        df = minute_bars(days=2)
+        gapped = df.drop(df.index[200:230])
+        store = IndicatorStateStore(directory=str(tmp_path))
+
+        store.update("AAPL", gapped.iloc[:600])
+        # The gap is back-filled and new bars arrive
+        resumed = store.update("AAPL", df.iloc[:700])
+
+        full = TickerIndicatorState("AAPL")
+        full.update(df.iloc[:700])
+
+        assert store.rebuilt == 1
+        assert resumed.bars == 700
+        for name, value in full.values().items():
+            assert np.isclose(resumed.values()[name], value, equal_nan=True), name
+
+        # A rolling window that drops old bars is not a back-fill
+        store.update("AAPL", df.iloc[100:800])
+        assert store.rebuilt == 1
+
+    def test_unsorted_bars_are_applied_in_time_order(self, tmp_path, minute_bars):
+        """Test that shuffled bars update the state as if they arrived sorted."""
+        df = minute_bars(days=2)
+        shuffled = df.sample(frac=1.0, random_state=3)
+        store = IndicatorStateStore(directory=str(tmp_path))
+
+        state = store.update("AAPL", shuffled)
+
+        full = TickerIndicatorState("AAPL")
+        full.update(df)
+
+        assert state.bars == len(df)
+        for name, value in full.values().items():
+            assert np.isclose(state.values()[name], value, equal_nan=True), name
@@ -0,0 +1,127 @@
+"""
+Unit tests for the warm worker pool used by the orchestrator.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from orchestrator import worker_pool
+from orchestrator.worker_pool import WarmWorkerPool, run_script_subprocess
+
+
+@pytest.fixture(scope="module")
+def pool():
+    # Keep worker start-up light; the production preload list is exercised in the
+    # benchmark
+    preload = worker_pool.PRELOAD_MODULES
+    worker_pool.PRELOAD_MODULES = ()
+    env = dict(os.environ)
+    env.pop("JOB_LABEL", None)
+    try:
+        with WarmWorkerPool(size=1, env=env, startup_timeout=60) as warm_pool:
+            yield warm_pool
+    finally:
+        worker_pool.PRELOAD_MODULES = preload
+
+
+def _script(tmp_path, name, body):
+    path = tmp_path / name
+    path.write_text(body)
+    return str(path)
+
+
+class TestWarmWorkerPool:
+    """Warm workers must behave like one subprocess per job."""
+
+    def test_output_args_and_exit_code_match_subprocess(self, pool, tmp_path):
+        """Test stdout/stderr capture, argv and exit codes in both modes."""
+        script = _script(
+            tmp_path,
+            "job.py",
+            "import os, sys\n"
+            "import logging\n"
+            "print('args', sys.argv[1:])\n"
+            "print('label', os.environ.get('JOB_LABEL'))\n"
+            "logging.getLogger('job').warning('to stderr')\n"
+            "if __name__ == '__main__':\n"
+            "    sys.exit(3 if '--fail' in sys.argv else 0)\n",
+        )
+
+        warm = pool.run(script, ["--fail"], {"JOB_LABEL": "a"}, timeout=30)
+        cold = run_script_subprocess(
+            script, ["--fail"], dict(os.environ, JOB_LABEL="a"), timeout=30
+        )
+
+        assert warm.returncode == cold.returncode == 3
+        assert warm.stdout == cold.stdout == "args ['--fail']\nlabel a\n"
+        assert "to stderr" in warm.stderr
+
+        again = pool.run(script, [], timeout=30)
+        assert again.returncode == 0
+        assert "label None" in again.stdout
+
+    def test_exception_is_reported_as_failure(self, pool, tmp_path):
+        """Test that an uncaught exception gives exit code 1 and a traceback."""
+        script = _script(tmp_path, "boom.py", "raise ValueError('boom')\n")
+
+        result = pool.run(script, timeout=30)
+
+        assert result.returncode == 1
+        assert "ValueError: boom" in result.stderr
+
+    def test_timeout_and_crash_replace_the_worker(self, pool, tmp_path):
+        """Test that hung or crashed workers are replaced and the pool keeps working."""
+        hang = _script(tmp_path, "hang.py", "import time\ntime.sleep(60)\n")
+        crash = _script(tmp_path, "crash.py", "import os\nos._exit(7)\n")
+        ok = _script(tmp_path, "ok.py", "print('ok')\n")
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            pool.run(hang, timeout=0.5)
+        assert pool.run(crash, timeout=30).returncode == 7
+        assert pool.run(ok, timeout=30).stdout == "ok\n"
+
+    def test_worker_that_never_connects_times_out(self, pool, tmp_path, monkeypatch):
+        """Test that start-up gives up after startup_timeout and kills the process."""
+        silent = _script(tmp_path, "silent_worker.py", "import time\ntime.sleep(60)\n")
+        monkeypatch.setattr(worker_pool, "__file__", silent)
+        monkeypatch.setattr(pool, "startup_timeout", 1)
+        started = []
+        popen = subprocess.Popen
+        monkeypatch.setattr(
+            worker_pool.subprocess,
+            "Popen",
+            lambda *a, **kw: started.append(popen(*a, **kw)) or started[-1],
+        )
+
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="did not finish starting"):
+            pool._start_worker()
+
+        assert time.monotonic() - start < 10
+        assert started[0].poll() is not None
+
+    def test_jobs_fall_back_to_subprocess_without_workers(self, tmp_path, monkeypatch):
+        """Test that a pool that cannot replace workers runs jobs as subprocesses."""
+        monkeypatch.setattr(worker_pool, "PRELOAD_MODULES", ())
+        crash = _script(tmp_path, "crash.py", "import os\nos._exit(7)\n")
+        ok = _script(
+            tmp_path, "ok.py", "import os\nprint('ok', os.environ['JOB_LABEL'])\n"
+        )
+        silent = _script(tmp_path, "silent_worker.py", "import sys\nsys.exit(1)\n")
+
+        with WarmWorkerPool(size=1, startup_timeout=60) as degraded:
+            monkeypatch.setattr(worker_pool, "__file__", silent)
+            assert degraded.run(crash, timeout=30).returncode == 7
+            assert not degraded._workers
+
+            result = degraded.run(ok, [], {"JOB_LABEL": "b"}, timeout=30)
+
+        assert result.returncode == 0
+        assert result.stdout == "ok b\n"
@@ -2,7 +2,6 @@ import logging
 import os
 import time
 from datetime import datetime
-from io import StringIO
 
 import pandas as pd
 import pytz
@@ -14,13 +13,15 @@ BASE_URL = "https://www.alphavantage.co/query"
 # A short, aggressive timeout for every single API call to prevent hangs.
 REQUEST_TIMEOUT = 15
 
-# Import timestamp standardization module
-from utils.timestamp_standardizer import apply_timestamp_standardization_to_api_data
+# Responses are parsed once (utils.api_payload) and shared by validation and callers
+from utils.api_payload import payload_for
+from utils.rate_limiter import get_rate_limiter, is_throttled_response, request_cost
+from utils.single_flight import bar_expiry, get_single_flight
 
 logger = logging.getLogger(__name__)
 
 
-def _make_api_request_with_retry(params, max_retries=5, base_delay=2.0):
+def _make_api_request_with_retry(params, max_retries=5, base_delay=2.0, retry_inline=True):
     """
     Enhanced API request function with aggressive exponential backoff retry mechanism.
     
@@ -36,6 +37,8 @@ def _make_api_request_with_retry(params, max_retries=5, base_delay=2.0):
         params (dict): API request parameters
         max_retries (int): Maximum number of retry attempts (increased for compact)
         base_delay (float): Base delay in seconds for exponential backoff
+        retry_inline (bool): False makes a single attempt and returns stale
+            responses as-is, for callers that park retries in a RetryQueue
         
     Returns:
         requests.Response: Successful response or None if all retries failed
@@ -50,25 +53,41 @@ def _make_api_request_with_retry(params, max_retries=5, base_delay=2.0):
     today_et = datetime.now(ny_tz).date()
     symbol = params.get('symbol', 'unknown')
     outputsize = params.get('outputsize', 'compact')
+    data_type = "daily" if "DAILY" in params.get('function', '') else "intraday"
     
     # ENHANCED RETRY: Use consistent aggressive retry strategy for all compact fetches
     # Problem statement identified this as a systemic issue, not ticker-specific
-    if outputsize == 'compact':
+    if not retry_inline:
+        max_retries = 0
+    elif outputsize == 'compact':
         max_retries = 6  # Enhanced retries for all compact fetches
         base_delay = 2.5  # Consistent delay for better reliability
         logger.info(f"💪 COMPACT FETCH: {symbol} - Using enhanced retry strategy (max: {max_retries})")
     
+    rate_limiter = get_rate_limiter()
+    cost = request_cost(params)
+
     for attempt in range(max_retries + 1):
         try:
             logger.info(f"🔄 API request attempt {attempt + 1}/{max_retries + 1} for {symbol} ({outputsize})")
             
+            # Shared token bucket: paces every process calling Alpha Vantage
+            rate_limiter.acquire(cost)
             response = requests.get(BASE_URL, params=params, timeout=REQUEST_TIMEOUT)
+            if is_throttled_response(response):
+                # AIMD backoff lives in the bucket; the next acquire waits for it
+                rate_limiter.on_throttled()
+                logger.warning(f"⚠️ {symbol}: Alpha Vantage rate limit hit (attempt {attempt + 1})")
+                continue
             response.raise_for_status()
+            rate_limiter.on_success()
             
             # PHASE 2: Enhanced validation for compact fetches
             if outputsize == 'compact':
-                is_valid = _validate_current_day_data(response, today_et, symbol)
-                if not is_valid and attempt < max_retries:
+                is_valid = _validate_current_day_data(response, today_et, symbol, data_type)
+                if not is_valid and not retry_inline:
+                    logger.warning(f"⚠️ {symbol}: API response lacks current day data - retry deferred to caller")
+                elif not is_valid and attempt < max_retries:
                     delay = base_delay * (2 ** attempt)
                     logger.warning(f"⚠️ {symbol}: API response lacks current day data, aggressive retry in {delay:.1f}s...")
                     logger.warning(f"   This is the exact issue described in the problem statement!")
@@ -105,66 +124,43 @@ def _make_api_request_with_retry(params, max_retries=5, base_delay=2.0):
     return None
 
 
-def _validate_current_day_data(response, today_et, symbol):
+def _validate_current_day_data(response, today_et, symbol, data_type="intraday"):
     """
     Enhanced validation that the API response contains current day data.
     
     PHASE 2: THE DEFINITIVE FIX - Enhanced validation for compact fetch reliability
     
     This is critical for compact fetches which should include today's data
-    for real-time updates. Enhanced with more comprehensive checks.
+    for real-time updates. The payload parsed here is cached on the response
+    and reused by the caller (see utils.api_payload.payload_for).
     
     Args:
         response (requests.Response): API response to validate
         today_et (datetime.date): Today's date in Eastern Time
         symbol (str): Stock symbol for logging
+        data_type (str): 'intraday' or 'daily'
         
     Returns:
         bool: True if current day data is present, False otherwise
     """
     try:
-        # Parse the CSV response quickly
-        df = pd.read_csv(StringIO(response.text))
+        payload = payload_for(response, data_type)
         
-        if df.empty:
-            logger.warning(f"⚠️ {symbol}: API returned empty data")
-            return False
-            
-        if "Error Message" in df.columns:
-            logger.warning(f"⚠️ {symbol}: API returned error message: {df['Error Message'].iloc[0] if len(df) > 0 else 'Unknown error'}")
+        if payload.error:
+            logger.warning(f"⚠️ {symbol}: API returned error message: {payload.error}")
             return False
             
-        # Find timestamp column
-        timestamp_col = None
-        for col in ["timestamp", "datetime", "Date", "time"]:
-            if col in df.columns:
-                timestamp_col = col
-                break
-                
-        if not timestamp_col:
-            logger.warning(f"⚠️ {symbol}: No timestamp column found in API response")
-            logger.warning(f"   Available columns: {list(df.columns)}")
-            return False
-            
-        # Check for today's data with enhanced logging
-        df[timestamp_col] = pd.to_datetime(df[timestamp_col], errors='coerce')
-        
-        # Filter out any rows with invalid timestamps
-        valid_timestamps = df[df[timestamp_col].notna()]
-        if len(valid_timestamps) != len(df):
-            logger.warning(f"⚠️ {symbol}: Found {len(df) - len(valid_timestamps)} rows with invalid timestamps")
-            df = valid_timestamps
+        if payload.invalid_rows:
+            logger.warning(f"⚠️ {symbol}: Found {payload.invalid_rows} rows with invalid timestamps")
         
-        # Convert to ET timezone for comparison
-        ny_tz = pytz.timezone("America/New_York")
-        if df[timestamp_col].dt.tz is None:
-            df_et = df[timestamp_col].dt.tz_localize(ny_tz)
-        else:
-            df_et = df[timestamp_col].dt.tz_convert(ny_tz)
+        if payload.empty:
+            logger.warning(f"⚠️ {symbol}: API returned empty data")
+            return False
             
-        today_data_count = (df_et.dt.date == today_et).sum()
-        total_rows = len(df)
-        today_percentage = (today_data_count / total_rows * 100) if total_rows > 0 else 0
+        today_mask = payload.rows_on(today_et)
+        today_data_count = int(today_mask.sum())
+        total_rows = len(payload)
+        today_percentage = today_data_count / total_rows * 100
         
         logger.info(f"📊 Current day validation for {symbol}:")
         logger.info(f"   Total rows: {total_rows}")
@@ -173,13 +169,11 @@ def _validate_current_day_data(response, today_et, symbol):
         
         if today_data_count > 0:
             # Log the time range of today's data for debugging
-            today_rows = df_et[df_et.dt.date == today_et]
-            first_today = today_rows.min()
-            last_today = today_rows.max()
+            first_today, last_today = payload.wall_range(today_mask)
             logger.info(f"✅ {symbol}: TODAY'S DATA FOUND - Range: {first_today} to {last_today}")
             
             # Additional check: ensure we have recent data (within last 2 hours during market)
-            now_et = datetime.now(ny_tz)
+            now_et = datetime.now(pytz.timezone("America/New_York"))
             time_since_last = now_et - last_today.to_pydatetime()
             hours_since_last = time_since_last.total_seconds() / 3600
             
@@ -191,20 +185,16 @@ def _validate_current_day_data(response, today_et, symbol):
             return True
         else:
             # Enhanced logging for debugging stale data
-            if not df_et.empty:
-                available_min = df_et.min()
-                available_max = df_et.max()
-                logger.error(f"❌ {symbol}: NO TODAY'S DATA FOUND")
-                logger.error(f"   Available data range: {available_min} to {available_max}")
-                
-                # Check how many days old the most recent data is
-                days_old = (today_et - available_max.date()).days
-                logger.error(f"   Most recent data is {days_old} days old")
-                
-                if days_old > 7:
-                    logger.error(f"   WARNING: Data is severely stale ({days_old} days old)")
-            else:
-                logger.error(f"❌ {symbol}: No valid timestamp data found")
+            available_min, available_max = payload.wall_range()
+            logger.error(f"❌ {symbol}: NO TODAY'S DATA FOUND")
+            logger.error(f"   Available data range: {available_min} to {available_max}")
+            
+            # Check how many days old the most recent data is
+            days_old = (today_et - available_max.date()).days
+            logger.error(f"   Most recent data is {days_old} days old")
+            
+            if days_old > 7:
+                logger.error(f"   WARNING: Data is severely stale ({days_old} days old)")
                 
             return False
             
@@ -215,21 +205,53 @@ def _validate_current_day_data(response, today_et, symbol):
         return False
 
 
-def _make_api_request(params):
+def _make_api_request(params, retry_inline=True):
     """A centralized and robust function for making API requests."""
     # Use the enhanced retry mechanism
-    return _make_api_request_with_retry(params)
+    return _make_api_request_with_retry(params, retry_inline=retry_inline)
+
+
+def _coalesced(key, interval, fetch, cacheable):
+    """
+    Run a blocking fetch through the shared single-flight layer.
+
+    Concurrent identical requests share one API call and cacheable results
+    are reused until the next bar of the interval is due. Every caller gets
+    its own copy of the frame.
+    """
+    df = get_single_flight().call(
+        key,
+        fetch,
+        expires_at=bar_expiry(interval),
+        cacheable=lambda result: result is not None and not result.empty and cacheable(result),
+    )
+    return df.copy()
 
 
-def get_daily_data(symbol, outputsize="compact"):
+def get_daily_data(symbol, outputsize="compact", retry_inline=True):
     """
     Fetches daily adjusted time series data for a given symbol with proper timestamp standardization.
 
-    Implements the rigorous timestamp standardization process:
-    1. Parse Timestamps: Read the raw timestamp string from the API
-    2. Localize to New York Time: Convert to timezone-aware object using 'America/New_York' timezone
-    3. Standardize to UTC for Storage: Save the final timestamp in UTC format
+    Implements the rigorous timestamp standardization process in a single parse
+    (utils.api_payload):
+    1. Parse Timestamps: Read the raw date string from the API
+    2. Localize to New York Time: Stamp each date at the 4:00 PM ET close
+    3. Standardize to UTC for Storage: Return a datetime64[ns, UTC] 'timestamp' column
+
+    retry_inline=False makes a single attempt (see _make_api_request_with_retry).
+    Identical concurrent requests share one API call and results are reused
+    until the next daily refresh (utils.single_flight).
     """
+    return _coalesced(
+        ("TIME_SERIES_DAILY_ADJUSTED", symbol, "daily", outputsize, retry_inline),
+        "daily",
+        lambda: _fetch_daily_data(symbol, outputsize, retry_inline),
+        cacheable=lambda df: True,
+    )
+
+
+def _fetch_daily_data(symbol, outputsize="compact", retry_inline=True):
+    """Uncoalesced request behind get_daily_data()."""
     params = {
         "function": "TIME_SERIES_DAILY_ADJUSTED",
         "symbol": symbol,
@@ -237,26 +259,14 @@ def get_daily_data(symbol, outputsize="compact"):
         "apikey": API_KEY,
         "datatype": "csv",
     }
-    response = _make_api_request(params)
+    response = _make_api_request(params, retry_inline=retry_inline)
     if response:
         try:
-            df = pd.read_csv(StringIO(response.text))
-            if "Error Message" in df.columns or df.empty:
+            payload = payload_for(response, "daily")
+            if payload.error or payload.empty:
                 return pd.DataFrame()
 
-            # Rename the date column to timestamp for consistent processing
-            if "timestamp" in df.columns:
-                pass  # Already correctly named
-            elif "Date" in df.columns:
-                df = df.rename(columns={"Date": "timestamp"})
-            elif "date" in df.columns:
-                df = df.rename(columns={"date": "timestamp"})
-
-            logger.info(f"📊 Raw daily data fetched for {symbol}: {len(df)} rows")
-
-            # Apply rigorous timestamp standardization
-            df = apply_timestamp_standardization_to_api_data(df, data_type="daily")
-
+            df = payload.to_frame()
             logger.info(
                 f"✅ Daily data standardized for {symbol}: {len(df)} rows with UTC timestamps"
             )
@@ -266,27 +276,46 @@ def get_daily_data(symbol, outputsize="compact"):
     return pd.DataFrame()
 
 
-def get_intraday_data(symbol, interval="1min", outputsize="compact"):
+def get_intraday_data(symbol, interval="1min", outputsize="compact", retry_inline=True, month=None):
     """
     Fetches intraday time series data for a given symbol with robust current day data handling.
 
     Enhanced with comprehensive retry mechanism and current day data validation
     to address the compact fetch failure issue.
 
-    Implements the rigorous timestamp standardization process:
+    Implements the rigorous timestamp standardization process in a single parse
+    (utils.api_payload), shared with the current-day validation:
     1. Parse Timestamps: Read the raw timestamp string from the API
     2. Localize to New York Time: Convert to timezone-aware object using 'America/New_York' timezone
-    3. Standardize to UTC for Storage: Save the final timestamp in UTC format
+    3. Standardize to UTC for Storage: Return a datetime64[ns, UTC] 'timestamp' column
+
+    Identical concurrent requests share one API call and results are reused
+    until the next bar is due (utils.single_flight). Compact results without
+    today's bars are never memoized, so a deferred stale retry reaches the API.
     
     Args:
         symbol (str): Stock ticker symbol
         interval (str): Time interval ('1min', '30min', etc.)
         outputsize (str): 'compact' for latest 100 data points, 'full' for all available
+        retry_inline (bool): False makes a single attempt and returns stale data
+            as-is; check it with current_day_present()
+        month (str): Optional 'YYYY-MM' slice of history (use with outputsize='full')
         
     Returns:
         pandas.DataFrame: Processed data with UTC timestamps or empty DataFrame on failure
     """
-    logger.info(f"🔄 Fetching {outputsize} intraday data for {symbol} ({interval})")
+    return _coalesced(
+        ("TIME_SERIES_INTRADAY", symbol, interval, outputsize, retry_inline, month),
+        interval,
+        lambda: _fetch_intraday_data(symbol, interval, outputsize, retry_inline, month),
+        cacheable=lambda df: outputsize != "compact" or current_day_present(df),
+    )
+
+
+def _fetch_intraday_data(symbol, interval="1min", outputsize="compact", retry_inline=True, month=None):
+    """Uncoalesced request behind get_intraday_data()."""
+    slice_label = f" {month}" if month else ""
+    logger.info(f"🔄 Fetching {outputsize}{slice_label} intraday data for {symbol} ({interval})")
     
     params = {
         "function": "TIME_SERIES_INTRADAY",
@@ -296,46 +325,34 @@ def get_intraday_data(symbol, interval="1min", outputsize="compact"):
         "apikey": API_KEY,
         "datatype": "csv",
     }
+    if month:
+        params["month"] = month
     
     # Use enhanced retry mechanism
-    response = _make_api_request(params)
+    response = _make_api_request(params, retry_inline=retry_inline)
     if not response:
         logger.error(f"❌ Failed to get API response for {symbol}")
         return pd.DataFrame()
         
     try:
-        df = pd.read_csv(StringIO(response.text))
-        if "Error Message" in df.columns or df.empty:
-            logger.error(f"❌ API returned error or empty data for {symbol}")
+        payload = payload_for(response, "intraday")
+        if payload.error or payload.empty:
+            logger.error(f"❌ API returned error or empty data for {symbol}: {payload.error or 'no rows'}")
             return pd.DataFrame()
 
-        # Rename the timestamp column for consistent processing
-        timestamp_col = None
-        for col in ["timestamp", "datetime", "Date", "time"]:
-            if col in df.columns:
-                timestamp_col = col
-                break
-                
-        if timestamp_col and timestamp_col != "timestamp":
-            df = df.rename(columns={timestamp_col: "timestamp"})
-            logger.debug(f"Renamed timestamp column from '{timestamp_col}' to 'timestamp'")
-
-        logger.info(f"📊 Raw intraday data fetched for {symbol} ({interval}): {len(df)} rows")
-        
-        # Log current day data availability BEFORE processing
-        _log_current_day_availability(df, symbol, "before processing")
-
-        # Apply rigorous timestamp standardization
-        df = apply_timestamp_standardization_to_api_data(df, data_type="intraday")
+        logger.info(f"📊 Raw intraday data fetched for {symbol} ({interval}): {len(payload)} rows")
+        if payload.invalid_rows:
+            logger.warning(f"⚠️ {symbol}: Dropped {payload.invalid_rows} rows with invalid timestamps")
 
-        # Log current day data availability AFTER processing
-        _log_current_day_availability(df, symbol, "after processing")
+        # Log current day data availability
+        _log_current_day_availability(payload, symbol, "parsed")
 
+        df = payload.to_frame()
         logger.info(f"✅ Intraday data standardized for {symbol} ({interval}): {len(df)} rows with UTC timestamps")
         
         # Final validation for compact fetches
         if outputsize == "compact":
-            _final_compact_validation(df, symbol)
+            _final_compact_validation(payload, symbol)
             
         return df
         
@@ -344,73 +361,73 @@ def get_intraday_data(symbol, interval="1min", outputsize="compact"):
         return pd.DataFrame()
 
 
-def _log_current_day_availability(df, symbol, stage):
+def _log_current_day_availability(payload, symbol, stage):
     """
     Log the availability of current day data for debugging purposes.
     
     Args:
-        df (pandas.DataFrame): Data to analyze
+        payload (BarPayload): Parsed API payload
         symbol (str): Stock symbol
         stage (str): Processing stage for logging context
     """
-    if df.empty:
+    if payload.empty:
         logger.warning(f"⚠️ {symbol} ({stage}): DataFrame is empty")
         return
         
     try:
-        ny_tz = pytz.timezone("America/New_York")
-        today_et = datetime.now(ny_tz).date()
+        today_et = datetime.now(pytz.timezone("America/New_York")).date()
+        today_mask = payload.rows_on(today_et)
+        today_count = int(today_mask.sum())
         
-        # Handle different timestamp formats
-        if 'timestamp' in df.columns:
-            timestamps = pd.to_datetime(df['timestamp'], errors='coerce')
-            
-            # Convert to ET for analysis
-            if timestamps.dt.tz is None:
-                # For raw data, assume ET
-                timestamps_et = timestamps.dt.tz_localize(ny_tz)
-            else:
-                # For processed data, convert to ET
-                timestamps_et = timestamps.dt.tz_convert(ny_tz)
-                
-            today_count = (timestamps_et.dt.date == today_et).sum()
-            
-            if today_count > 0:
-                today_data = timestamps_et[timestamps_et.dt.date == today_et]
-                logger.info(f"✅ {symbol} ({stage}): {today_count} rows with today's data")
-                logger.info(f"   📅 Today's data range: {today_data.min()} to {today_data.max()}")
-            else:
-                if not timestamps_et.empty:
-                    logger.warning(f"⚠️ {symbol} ({stage}): No today's data found")
-                    logger.warning(f"   📅 Available range: {timestamps_et.min()} to {timestamps_et.max()}")
-                else:
-                    logger.warning(f"⚠️ {symbol} ({stage}): No valid timestamps found")
+        if today_count > 0:
+            first, last = payload.wall_range(today_mask)
+            logger.info(f"✅ {symbol} ({stage}): {today_count} rows with today's data")
+            logger.info(f"   📅 Today's data range: {first} to {last}")
         else:
-            logger.warning(f"⚠️ {symbol} ({stage}): No timestamp column found")
+            first, last = payload.wall_range()
+            logger.warning(f"⚠️ {symbol} ({stage}): No today's data found")
+            logger.warning(f"   📅 Available range: {first} to {last}")
             
     except Exception as e:
         logger.error(f"❌ Error analyzing current day data for {symbol} ({stage}): {e}")
 
 
-def _final_compact_validation(df, symbol):
+def current_day_present(df):
+    """
+    Whether standardized intraday data contains bars from today (ET).
+
+    Args:
+        df (pandas.DataFrame): Data returned by get_intraday_data
+
+    Returns:
+        bool: True if at least one bar is from the current ET date
+    """
+    if df is None or df.empty or 'timestamp' not in df.columns:
+        return False
+    try:
+        ny_tz = pytz.timezone("America/New_York")
+        timestamps = pd.to_datetime(df['timestamp'], errors='coerce', utc=True)
+        return bool((timestamps.dt.tz_convert(ny_tz).dt.date == datetime.now(ny_tz).date()).any())
+    except Exception:
+        return False
+
+
+def _final_compact_validation(payload, symbol):
     """
     Perform final validation for compact fetches to ensure current day data is present.
     
     Args:
-        df (pandas.DataFrame): Processed data
+        payload (BarPayload): Parsed API payload
         symbol (str): Stock symbol
     """
     try:
-        ny_tz = pytz.timezone("America/New_York")
-        today_et = datetime.now(ny_tz).date()
+        today_et = datetime.now(pytz.timezone("America/New_York")).date()
         
-        if df.empty or 'timestamp' not in df.columns:
+        if payload.empty:
             logger.error(f"❌ {symbol}: Final validation failed - no data or timestamp column")
             return
             
-        timestamps = pd.to_datetime(df['timestamp'], errors='coerce')
-        timestamps_et = timestamps.dt.tz_convert(ny_tz)
-        today_count = (timestamps_et.dt.date == today_et).sum()
+        today_count = int(payload.rows_on(today_et).sum())
         
         if today_count > 0:
             logger.info(f"✅ {symbol}: Final validation PASSED - {today_count} current day data points")
@@ -0,0 +1,269 @@
+"""
+Single-parse handling of Alpha Vantage CSV bar payloads.
+
+A compact intraday fetch used to parse the same response text several times:
+_validate_current_day_data read it with pd.read_csv to look for today's
+rows, get_intraday_data read it again, and apply_timestamp_standardization_to_api_data
+re-parsed the timestamps, localized them, formatted them back to strings and
+parsed a sample once more to validate them. Current-day logging parsed the
+column twice more.
+
+parse_bar_payload() reads a payload once:
+- one pd.read_csv call gives typed NumPy columns
+- timestamps are parsed with the fixed format Alpha Vantage uses
+  ('%Y-%m-%d %H:%M:%S' intraday, '%Y-%m-%d' daily, stamped at the 16:00
+  close), localized to exchange time and kept as UTC epoch nanoseconds
+- wall-clock nanoseconds are kept alongside, so "rows from today" is an
+  integer comparison
+
+The result is cached on the response (payload_for), so the retry loop's
+current-day validation and the caller share one parse. to_frame() hands
+the bars on with a datetime64[ns, UTC] timestamp column, which the merge
+stages use as-is and CSV storage writes as '%Y-%m-%d %H:%M:%S+00:00'.
+
+JSON clients (core.data_fetcher, utils.async_client, utils.data_fetcher)
+receive the same bars as a {timestamp: {"1. open": "...", ...}} dict.
+time_series_frame() converts it without DataFrame.from_dict: each field is
+written straight into a preallocated float64 array (volume becomes int64),
+the keys are parsed with the same fixed formats, and the frame comes back
+with a sorted DatetimeIndex.
+"""
+
+import json
+import logging
+from datetime import date
+from io import StringIO
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import TIMEZONE
+from .session_kernels import DAY_NS, MINUTE_NS, utc_nanos
+
+logger = logging.getLogger(__name__)
+
+INTRADAY_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+DAILY_TIMESTAMP_FORMAT = "%Y-%m-%d"
+# Daily bars are stamped at the regular-session close
+DAILY_CLOSE_NS = 16 * 60 * MINUTE_NS
+
+TIMESTAMP_COLUMNS = ("timestamp", "datetime", "Date", "date", "time")
+
+_NAT = np.iinfo(np.int64).min
+
+
+class BarPayload:
+    """Bars of one API response, parsed once."""
+
+    def __init__(
+        self,
+        frame: pd.DataFrame,
+        utc_ns: np.ndarray,
+        wall_ns: np.ndarray,
+        error: Optional[str] = None,
+        invalid_rows: int = 0,
+    ):
+        """
+        Args:
+            frame: Value columns (timestamp column removed), one row per bar
+            utc_ns: UTC epoch nanoseconds of each bar
+            wall_ns: Exchange wall-clock nanoseconds of each bar
+            error: API error message, if the payload was not bar data
+            invalid_rows: Rows dropped for unparseable timestamps
+        """
+        self.frame = frame
+        self.utc_ns = utc_ns
+        self.wall_ns = wall_ns
+        self.error = error
+        self.invalid_rows = invalid_rows
+
+    @classmethod
+    def failed(cls, error: str) -> "BarPayload":
+        empty = np.array([], dtype=np.int64)
+        return cls(pd.DataFrame(), empty, empty, error=error)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.utc_ns) == 0
+
+    def __len__(self) -> int:
+        return len(self.utc_ns)
+
+    def rows_on(self, day: date) -> np.ndarray:
+        """Mask of bars stamped on an exchange-local date."""
+        day_number = pd.Timestamp(day).value // DAY_NS
+        return self.wall_ns // DAY_NS == day_number
+
+    def wall_range(self, mask: Optional[np.ndarray] = None):
+        """(first, last) exchange-local Timestamps of the (masked) bars, or None."""
+        wall = self.wall_ns if mask is None else self.wall_ns[mask]
+        if not len(wall):
+            return None
+        return (
+            pd.Timestamp(int(wall.min())).tz_localize(TIMEZONE),
+            pd.Timestamp(int(wall.max())).tz_localize(TIMEZONE),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Bars as a DataFrame with a leading datetime64[ns, UTC] 'timestamp' column."""
+        if self.empty:
+            return pd.DataFrame()
+        timestamps = pd.DatetimeIndex(self.utc_ns.astype("datetime64[ns]"), tz="UTC")
+        df = self.frame.copy()
+        df.insert(0, "timestamp", timestamps)
+        return df
+
+
+def _error_message(text: str) -> Optional[str]:
+    """Alpha Vantage answers errors and throttling with JSON even for datatype=csv."""
+    if not text.lstrip().startswith("{"):
+        return None
+    try:
+        body = json.loads(text)
+    except ValueError:
+        return "Unparseable JSON response"
+    if isinstance(body, dict) and body:
+        return str(next(iter(body.values())))
+    return "Empty JSON response"
+
+
+def _parse_wall_ns(values: pd.Series, data_type: str) -> np.ndarray:
+    """Exchange wall-clock nanoseconds of raw timestamp strings (NaT where invalid)."""
+    daily = data_type == "daily"
+    fmt = DAILY_TIMESTAMP_FORMAT if daily else INTRADAY_TIMESTAMP_FORMAT
+    try:
+        parsed = pd.to_datetime(values, format=fmt)
+    except (ValueError, TypeError):
+        # Not the documented format: fall back to per-value inference
+        parsed = pd.to_datetime(values, errors="coerce", format="mixed")
+    index = pd.DatetimeIndex(parsed)
+    if index.tz is not None:
+        index = index.tz_convert(TIMEZONE).tz_localize(None)
+    wall = index.as_unit("ns").asi8.copy()
+    if daily:
+        valid = wall != _NAT
+        wall[valid] = (wall[valid] // DAY_NS) * DAY_NS + DAILY_CLOSE_NS
+    return wall
+
+
+def parse_bar_payload(text: str, data_type: str = "intraday") -> BarPayload:
+    """
+    Parse an Alpha Vantage CSV bar payload once.
+
+    Args:
+        text: Response body
+        data_type: 'intraday' or 'daily'
+
+    Returns:
+        BarPayload (error set and no rows if the body is not bar data)
+    """
+    error = _error_message(text)
+    if error is not None:
+        return BarPayload.failed(error)
+
+    df = pd.read_csv(StringIO(text))
+    if "Error Message" in df.columns:
+        return BarPayload.failed(
+            str(df["Error Message"].iloc[0]) if len(df) else "Unknown error"
+        )
+
+    timestamp_col = next((col for col in TIMESTAMP_COLUMNS if col in df.columns), None)
+    if timestamp_col is None:
+        return BarPayload.failed(f"No timestamp column in {list(df.columns)}")
+    if df.empty:
+        return BarPayload.failed("Empty payload")
+
+    wall = _parse_wall_ns(df[timestamp_col], data_type)
+    valid = wall != _NAT
+    utc = np.full(len(wall), _NAT, dtype=np.int64)
+    if valid.any():
+        utc[valid] = utc_nanos(pd.DatetimeIndex(wall[valid].astype("datetime64[ns]")))
+    # DST fall-back hours are ambiguous and come back as NaT
+    valid &= utc != _NAT
+
+    frame = df.drop(columns=timestamp_col)
+    invalid = int((~valid).sum())
+    if invalid:
+        frame = frame[valid].reset_index(drop=True)
+    return BarPayload(frame, utc[valid], wall[valid], invalid_rows=invalid)
+
+
+def payload_for(response, data_type: str = "intraday") -> BarPayload:
+    """
+    Parsed payload of a response, parsed on first use and cached on the response.
+
+    Args:
+        response: requests.Response (or anything with .text)
+        data_type: 'intraday' or 'daily'
+
+    Returns:
+        BarPayload
+    """
+    cache = vars(response).setdefault("_bar_payloads", {})
+    if data_type not in cache:
+        cache[data_type] = parse_bar_payload(response.text, data_type)
+    return cache[data_type]
+
+
+def _field_name(field: str) -> str:
+    """'1. open' -> 'open'."""
+    return field.split(". ", 1)[1] if ". " in field else field
+
+
+def time_series_frame(
+    time_series: Dict[str, Dict[str, str]],
+    data_type: str = "intraday",
+    errors: str = "coerce",
+) -> pd.DataFrame:
+    """
+    Convert an Alpha Vantage JSON time series to a typed frame.
+
+    Args:
+        time_series: {timestamp string: {"1. open": "...", ...}}
+        data_type: 'intraday' or 'daily' (selects the timestamp format)
+        errors: 'coerce' turns unparseable values into NaN, 'raise' raises ValueError
+
+    Returns:
+        DataFrame with float64 columns (int64 volume) and a sorted, naive
+        (exchange time) DatetimeIndex
+    """
+    if not time_series:
+        return pd.DataFrame(index=pd.DatetimeIndex([]))
+
+    rows = list(time_series.values())
+    fields = list(rows[0])
+    values = np.empty((len(fields), len(rows)), dtype=np.float64)
+    for j, field in enumerate(fields):
+        try:
+            values[j] = [row[field] for row in rows]
+        except (KeyError, ValueError, TypeError):
+            if errors == "raise":
+                raise ValueError(
+                    f"Non-numeric or missing values in '{_field_name(field)}'"
+                )
+            column = pd.Series([row.get(field) for row in rows], dtype=object)
+            values[j] = pd.to_numeric(column, errors="coerce").to_numpy(
+                dtype=np.float64
+            )
+
+    fmt = DAILY_TIMESTAMP_FORMAT if data_type == "daily" else INTRADAY_TIMESTAMP_FORMAT
+    keys = np.array(list(time_series), dtype=object)
+    try:
+        index = pd.DatetimeIndex(pd.to_datetime(keys, format=fmt))
+    except (ValueError, TypeError):
+        index = pd.DatetimeIndex(pd.to_datetime(keys, errors="coerce", format="mixed"))
+    order = np.argsort(index.asi8, kind="stable")
+
+    columns = {}
+    for j, field in enumerate(fields):
+        column = values[j][order]
+        name = _field_name(field)
+        if (
+            name == "volume"
+            and np.isfinite(column).all()
+            and (column == np.floor(column)).all()
+        ):
+            column = column.astype(np.int64)
+        columns[name] = column
+    return pd.DataFrame(columns, index=index[order])
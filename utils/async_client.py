@@ -8,51 +8,64 @@ with proper rate limiting and error handling.
 import asyncio
 import json
 import logging
-import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
 import aiohttp
 import pandas as pd
 
+from .api_payload import time_series_frame
 from .config import ALPHA_VANTAGE_API_KEY
+from .rate_limiter import TokenBucket, get_rate_limiter, is_throttled, request_cost
+from .single_flight import bar_expiry, get_single_flight
 
 logger = logging.getLogger(__name__)
 
 
 class RateLimiter:
-    """Rate limiter for API calls with exponential backoff."""
+    """Async front end to the shared Alpha Vantage token bucket."""
 
-    def __init__(self, calls_per_minute: int = 5):
-        self.calls_per_minute = calls_per_minute
-        self.min_interval = 60.0 / calls_per_minute  # seconds between calls
-        self.last_call_time = 0.0
+    def __init__(
+        self,
+        calls_per_minute: Optional[int] = None,
+        burst: int = 1,
+        bucket: Optional[TokenBucket] = None,
+    ):
+        """
+        Args:
+            calls_per_minute: Private budget for this limiter; None shares the
+                host-wide bucket with every other fetch path
+            burst: Capacity of a private bucket
+            bucket: Explicit bucket to use
+        """
+        if bucket is None:
+            if calls_per_minute is None:
+                bucket = get_rate_limiter()
+            else:
+                bucket = TokenBucket(calls_per_minute, burst)
+        self.bucket = bucket
+        self.calls_per_minute = bucket.rate * 60.0
         self.call_count = 0
-        self.backoff_factor = 1.0
-
-    async def acquire(self) -> None:
-        """Acquire permission to make an API call."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_call_time
 
-        if time_since_last < self.min_interval * self.backoff_factor:
-            sleep_time = (self.min_interval * self.backoff_factor) - time_since_last
-            logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            await asyncio.sleep(sleep_time)
+    @property
+    def backoff_factor(self) -> float:
+        """How much slower than the full rate requests are currently paced."""
+        return 1.0 / self.bucket.rate_scale
 
-        self.last_call_time = time.time()
+    async def acquire(self, cost: float = 1.0) -> None:
+        """Acquire permission to make an API call."""
+        waited = await self.bucket.acquire_async(cost)
+        if waited:
+            logger.debug(f"Rate limiting: waited {waited:.2f} seconds")
         self.call_count += 1
 
     def on_success(self) -> None:
         """Called after successful API call to reduce backoff."""
-        self.backoff_factor = max(1.0, self.backoff_factor * 0.9)
+        self.bucket.on_success()
 
     def on_rate_limit(self) -> None:
         """Called when rate limit is hit to increase backoff."""
-        self.backoff_factor = min(10.0, self.backoff_factor * 2.0)
-        logger.warning(
-            f"Rate limit hit, increasing backoff to {self.backoff_factor:.2f}x"
-        )
+        self.bucket.on_throttled()
 
 
 class AsyncAlphaVantageClient:
@@ -72,6 +85,9 @@ class AsyncAlphaVantageClient:
         self.retry_attempts = retry_attempts
         self.session: Optional[aiohttp.ClientSession] = None
         self.rate_limiter = RateLimiter()
+        # Shared by every client in the process, so screeners running
+        # together send each identical request once
+        self.single_flight = get_single_flight()
 
         if not self.api_key:
             raise ValueError("Alpha Vantage API key is required")
@@ -113,25 +129,29 @@ class AsyncAlphaVantageClient:
         if not self.session:
             await self.start()
 
-        await self.rate_limiter.acquire()
+        await self.rate_limiter.acquire(request_cost(params))
 
         try:
             async with self.session.get(self.base_url, params=params) as response:
-                response.raise_for_status()
-                data = await response.json()
+                if is_throttled(status_code=response.status):
+                    data = {"Note": "HTTP 429 Too Many Requests"}
+                else:
+                    response.raise_for_status()
+                    data = await response.json()
 
                 # Check for API errors
                 if "Error Message" in data:
                     logger.error(f"API error: {data['Error Message']}")
                     return None
 
-                if "Note" in data:
-                    # Rate limit hit
-                    logger.warning(f"Rate limit: {data['Note']}")
+                if is_throttled(data):
+                    # Rate limit hit: the shared bucket backs off, the retry waits on it
+                    logger.warning(
+                        f"Rate limit: {data.get('Note') or data.get('Information')}"
+                    )
                     self.rate_limiter.on_rate_limit()
 
                     if retries < self.retry_attempts:
-                        await asyncio.sleep(60)  # Wait before retry
                         return await self._make_request(params, retries + 1)
                     return None
 
@@ -149,12 +169,31 @@ class AsyncAlphaVantageClient:
             logger.error(f"Unexpected error: {e}")
             return None
 
+    async def _coalesced(
+        self, key: Tuple, interval: str, fetch
+    ) -> Tuple[Optional[pd.DataFrame], bool]:
+        """
+        Run a fetch through the shared single-flight layer.
+
+        Each caller gets its own copy of the frame.
+        """
+        df, success = await self.single_flight.run(
+            key,
+            fetch,
+            expires_at=bar_expiry(interval),
+            cacheable=lambda result: result[1],
+        )
+        return (df.copy() if df is not None else None), success
+
     async def fetch_intraday_data(
         self, ticker: str, interval: str = "1min", outputsize: str = "compact"
     ) -> Tuple[Optional[pd.DataFrame], bool]:
         """
         Fetch intraday data asynchronously.
 
+        Identical concurrent requests share one API call and successful
+        results are reused until the next bar is due (utils.single_flight).
+
         Args:
             ticker: Stock ticker symbol
             interval: Time interval (1min, 5min, 15min, 30min, 60min)
@@ -163,6 +202,16 @@ class AsyncAlphaVantageClient:
         Returns:
             Tuple of (DataFrame or None, success boolean)
         """
+        return await self._coalesced(
+            ("TIME_SERIES_INTRADAY", ticker, interval, outputsize),
+            interval,
+            lambda: self._fetch_intraday_data(ticker, interval, outputsize),
+        )
+
+    async def _fetch_intraday_data(
+        self, ticker: str, interval: str, outputsize: str
+    ) -> Tuple[Optional[pd.DataFrame], bool]:
+        """Request and convert intraday bars (no coalescing)."""
         params = {
             "function": "TIME_SERIES_INTRADAY",
             "symbol": ticker,
@@ -181,21 +230,13 @@ class AsyncAlphaVantageClient:
             return None, False
 
         try:
-            # Convert to DataFrame
-            time_series = data[time_series_key]
-            df = pd.DataFrame.from_dict(time_series, orient="index")
-
-            # Rename columns
-            df.columns = [col.split(". ")[1] for col in df.columns]
-
-            # Convert values to float
-            for col in df.columns:
-                df[col] = df[col].astype(float)
+            # Typed columns and a sorted DatetimeIndex straight from the JSON
+            df = time_series_frame(
+                data[time_series_key], data_type="intraday", errors="raise"
+            )
 
             # Add date and ticker columns
-            df.index = pd.to_datetime(df.index)
-            df = df.reset_index()
-            df.rename(columns={"index": "datetime"}, inplace=True)
+            df = df.rename_axis("datetime").reset_index()
             df["ticker"] = ticker
 
             logger.info(
@@ -213,6 +254,8 @@ class AsyncAlphaVantageClient:
         """
         Fetch daily data asynchronously.
 
+        Identical concurrent requests share one API call (utils.single_flight).
+
         Args:
             ticker: Stock ticker symbol
             outputsize: 'compact' or 'full'
@@ -220,6 +263,16 @@ class AsyncAlphaVantageClient:
         Returns:
             Tuple of (DataFrame or None, success boolean)
         """
+        return await self._coalesced(
+            ("TIME_SERIES_DAILY", ticker, "daily", outputsize),
+            "daily",
+            lambda: self._fetch_daily_data(ticker, outputsize),
+        )
+
+    async def _fetch_daily_data(
+        self, ticker: str, outputsize: str
+    ) -> Tuple[Optional[pd.DataFrame], bool]:
+        """Request and convert daily bars (no coalescing)."""
         params = {
             "function": "TIME_SERIES_DAILY",
             "symbol": ticker,
@@ -237,21 +290,13 @@ class AsyncAlphaVantageClient:
             return None, False
 
         try:
-            # Convert to DataFrame
-            time_series = data[time_series_key]
-            df = pd.DataFrame.from_dict(time_series, orient="index")
-
-            # Rename columns
-            df.columns = [col.split(". ")[1] for col in df.columns]
-
-            # Convert values to float
-            for col in df.columns:
-                df[col] = df[col].astype(float)
+            # Typed columns and a sorted DatetimeIndex straight from the JSON
+            df = time_series_frame(
+                data[time_series_key], data_type="daily", errors="raise"
+            )
 
             # Add date and ticker columns
-            df.index = pd.to_datetime(df.index)
-            df = df.reset_index()
-            df.rename(columns={"index": "Date"}, inplace=True)
+            df = df.rename_axis("Date").reset_index()
             df["ticker"] = ticker
 
             logger.info(f"Successfully fetched {len(df)} daily records for {ticker}")
@@ -0,0 +1,232 @@
+"""
+Prefix-sum anchored VWAP engine.
+
+The AVWAP, breakout and EMA pullback screeners used to slice the daily frame
+from each anchor date and recompute VWAP from scratch, per anchor per ticker.
+This engine stacks the universe once, precomputes cumulative sums of typical
+price x volume and of volume, and answers any anchored VWAP as
+
+    (cum_pv[end] - cum_pv[start]) / (cum_v[end] - cum_v[start])
+
+where start (first bar on/after the anchor) and end are found by binary
+search. Building is O(bars); each AVWAP is O(log bars) to locate and O(1) to
+compute, and whole batches of (ticker, anchor) pairs are evaluated with single
+vectorized calls.
+
+Values match calculate_vwap over df[df["timestamp"] >= anchor].
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .session_kernels import stack_frames, utc_nanos
+
+logger = logging.getLogger(__name__)
+
+NANOS_PER_SECOND = 1_000_000_000
+
+
+def load_avwap_anchors(anchor_df: pd.DataFrame) -> Dict[str, List[pd.Timestamp]]:
+    """
+    Read anchor dates per ticker from data/avwap_anchors.csv.
+
+    Accepts the one-row-per-anchor layout written by jobs/find_avwap_anchors.py
+    (ticker, anchor_date) as well as the older wide layout (Ticker,
+    Anchor 1 Date, Anchor 2 Date).
+
+    Args:
+        anchor_df: Anchors DataFrame
+
+    Returns:
+        Ticker -> sorted, de-duplicated anchor timestamps
+    """
+    if anchor_df is None or anchor_df.empty:
+        return {}
+
+    ticker_col = next(
+        (col for col in ("ticker", "Ticker", "TICKER") if col in anchor_df.columns),
+        None,
+    )
+    if ticker_col is None:
+        return {}
+
+    date_cols = [
+        col
+        for col in ("anchor_date", "Anchor 1 Date", "Anchor 2 Date")
+        if col in anchor_df.columns
+    ]
+    if not date_cols:
+        return {}
+
+    long_df = anchor_df.melt(
+        id_vars=[ticker_col], value_vars=date_cols, value_name="anchor"
+    )
+    long_df["anchor"] = pd.to_datetime(long_df["anchor"], errors="coerce")
+    long_df = long_df.dropna(subset=["anchor"]).drop_duplicates([ticker_col, "anchor"])
+
+    return {
+        str(ticker): sorted(group["anchor"].tolist())
+        for ticker, group in long_df.groupby(ticker_col, sort=False)
+    }
+
+
+class AVWAPEngine:
+    """Cumulative price x volume and volume sums over a stacked universe."""
+
+    def __init__(
+        self, frames: Dict[str, pd.DataFrame], timestamp_col: str = "timestamp"
+    ):
+        """
+        Build the prefix sums.
+
+        Args:
+            frames: Ticker -> OHLCV frame (any order; empty frames are skipped)
+            timestamp_col: Timestamp column (a DatetimeIndex takes precedence)
+        """
+        self.tickers, ids, utc, fields = stack_frames(
+            frames,
+            fields=("high", "low", "close", "volume"),
+            timestamp_col=timestamp_col,
+        )
+        self._rows = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+        typical = (fields["high"] + fields["low"] + fields["close"]) / 3.0
+        volume = fields["volume"]
+        missing = np.isnan(typical) | np.isnan(volume)
+        self.cum_pv = np.concatenate(
+            ([0.0], np.cumsum(np.where(missing, 0.0, typical * volume)))
+        )
+        self.cum_volume = np.concatenate(
+            ([0.0], np.cumsum(np.where(missing, 0.0, volume)))
+        )
+
+        # Bars are sorted by (ticker, time); fold both into one searchable key
+        seconds = utc // NANOS_PER_SECOND
+        self._origin = int(seconds.min()) if len(seconds) else 0
+        self._span = int(seconds.max()) - self._origin + 2 if len(seconds) else 2
+        self._keys = ids * self._span + (seconds - self._origin)
+        counts = np.bincount(ids, minlength=len(self.tickers))
+        self._ends = np.cumsum(counts)
+        self._starts = self._ends - counts
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._rows
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def _search_keys(self, rows: np.ndarray, timestamps) -> np.ndarray:
+        seconds = (
+            utc_nanos(pd.DatetimeIndex(pd.to_datetime(timestamps))) // NANOS_PER_SECOND
+        )
+        offsets = np.clip(seconds - self._origin, 0, self._span - 1)
+        return rows * self._span + offsets
+
+    def avwap(self, tickers: Iterable[str], anchors, at=None) -> np.ndarray:
+        """
+        Anchored VWAP for many (ticker, anchor) pairs at once.
+
+        Args:
+            tickers: Ticker of each pair
+            anchors: Anchor timestamp of each pair; the AVWAP starts at the
+                first bar on or after it
+            at: Optional timestamp(s) of the last bar included (default:
+                each ticker's latest bar)
+
+        Returns:
+            One AVWAP per pair (NaN for unknown tickers, anchors after the
+            evaluation bar, or zero volume)
+        """
+        tickers = list(tickers)
+        known = np.array([ticker in self._rows for ticker in tickers], dtype=bool)
+        rows = np.array(
+            [self._rows.get(ticker, 0) for ticker in tickers], dtype=np.int64
+        )
+        if not len(rows):
+            return np.array([])
+
+        start = np.searchsorted(
+            self._keys, self._search_keys(rows, anchors), side="left"
+        )
+        start = np.maximum(start, self._starts[rows])
+        if at is None:
+            end = self._ends[rows]
+        else:
+            at = [at] * len(rows) if np.ndim(at) == 0 else at
+            end = np.searchsorted(self._keys, self._search_keys(rows, at), side="right")
+            end = np.minimum(end, self._ends[rows])
+
+        volume = self.cum_volume[np.maximum(end, start)] - self.cum_volume[start]
+        pv = self.cum_pv[np.maximum(end, start)] - self.cum_pv[start]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values = np.where((end > start) & (volume > 0), pv / volume, np.nan)
+        return np.where(known, values, np.nan)
+
+    def ticker_avwaps(self, ticker: str, anchors: Iterable, at=None) -> np.ndarray:
+        """Anchored VWAPs of several anchors for one ticker."""
+        anchors = list(anchors)
+        return self.avwap([ticker] * len(anchors), anchors, at)
+
+    def evaluate(self, anchors: Dict[str, Iterable], at=None) -> pd.DataFrame:
+        """
+        Batch-evaluate every anchor of every ticker.
+
+        Args:
+            anchors: Ticker -> anchor timestamps (e.g. from load_avwap_anchors)
+            at: Optional timestamp of the last bar included
+
+        Returns:
+            DataFrame with ticker, anchor and avwap columns
+        """
+        pairs = [
+            (ticker, anchor) for ticker, dates in anchors.items() for anchor in dates
+        ]
+        if not pairs:
+            return pd.DataFrame(columns=["ticker", "anchor", "avwap"])
+        tickers, dates = zip(*pairs)
+        return pd.DataFrame(
+            {
+                "ticker": tickers,
+                "anchor": dates,
+                "avwap": self.avwap(tickers, dates, at),
+            }
+        )
+
+    def by_ticker(self, anchors: Dict[str, Iterable], at=None) -> Dict[str, np.ndarray]:
+        """
+        Batch-evaluate every anchor and group the AVWAPs per ticker.
+
+        Args:
+            anchors: Ticker -> anchor timestamps (e.g. from load_avwap_anchors)
+            at: Optional timestamp of the last bar included
+
+        Returns:
+            Ticker -> AVWAPs in anchor order (tickers not in the engine are skipped)
+        """
+        anchors = {
+            ticker: list(dates) for ticker, dates in anchors.items() if ticker in self
+        }
+        values = self.evaluate(anchors, at)["avwap"].to_numpy()
+        bounds = np.cumsum([0] + [len(dates) for dates in anchors.values()])
+        return {
+            ticker: values[bounds[i] : bounds[i + 1]]
+            for i, ticker in enumerate(anchors)
+        }
+
+
+def avwap_from_anchor(df: pd.DataFrame, anchor) -> Optional[float]:
+    """
+    Anchored VWAP of a single frame at its latest bar.
+
+    Args:
+        df: OHLCV frame with a timestamp column or DatetimeIndex
+        anchor: Anchor timestamp
+
+    Returns:
+        AVWAP, or None if no bar is on/after the anchor
+    """
+    value = AVWAPEngine({"_": df}).avwap(["_"], [anchor])[0]
+    return None if np.isnan(value) else float(value)
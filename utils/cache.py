@@ -3,37 +3,103 @@ Intelligent caching layer for market data with TTL and size limits.
 
 This module provides high-performance caching for frequently accessed data
 with automatic expiration and memory management.
+
+The in-memory tier is an ordered map with O(1) get/set/evict, sizes measured
+once per entry, a TTL expiry heap and optional per-namespace byte budgets
+(the namespace of 'ticker_AAPL_...' is 'ticker'). Hit/miss/eviction counts
+are exported to core.metrics by publish_metrics(). The disk tier keeps one
+SQLite index, enforces its byte budget and stores DataFrames as Arrow IPC
+files that are memory-mapped on read. Processes can share it: SharedCache
+is a disk tier in a fixed shared-memory directory that get_cache() attaches
+every process to, so orchestrator jobs and the dashboard warm each other.
 """
 
+import asyncio
 import hashlib
+import heapq
+import inspect
 import json
 import logging
+import math
 import os
 import pickle
+import random
+import sqlite3
 import tempfile
 import threading
 import time
+import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import pandas as pd
+import pyarrow as pa
+
+from .config import (
+    CACHE_EARLY_REFRESH_BETA,
+    CACHE_REFRESH_WORKERS,
+    CACHE_STALE_SECONDS,
+    SHARED_CACHE_DIR,
+    SHARED_CACHE_ENABLED,
+    SHARED_CACHE_SIZE_MB,
+)
+from .single_flight import SingleFlight, bar_expiry
 
 logger = logging.getLogger(__name__)
 
+# Namespace of keys without a '<namespace>_' prefix (e.g. hashed wrapper keys)
+DEFAULT_NAMESPACE = "default"
+
+# TieredCache.lookup states -> refresh_stats counters
+STATE_COUNTERS = {
+    "fresh": "fresh_hits",
+    "early": "early_served",
+    "stale": "stale_served",
+    "miss": "misses",
+}
+
+# Arrow schema metadata holding the pickled tail of a cached (df, ...) tuple
+ARROW_TUPLE_KEY = b"tradingstation.tuple_tail"
+# Set when the frame round-trips without pandas metadata (see _is_plain_frame)
+ARROW_PLAIN_KEY = b"tradingstation.plain"
+
 
 class CacheEntry:
     """Represents a cached data entry with metadata."""
 
-    def __init__(self, data: Any, ttl_seconds: int = 3600):
+    def __init__(
+        self, data: Any, ttl_seconds: int = 3600, namespace: str = DEFAULT_NAMESPACE
+    ):
         self.data = data
         self.created_at = time.time()
         self.ttl_seconds = ttl_seconds
+        self.expires_at = self.created_at + ttl_seconds
+        self.namespace = namespace
         self.access_count = 0
         self.last_accessed = self.created_at
+        self.sequence = 0  # insertion number, matches the entry's expiry-heap item
+        # Measured once; deep memory_usage / pickling is too slow to repeat
+        self.size = self._measure()
 
-    def is_expired(self) -> bool:
+    def is_expired(self, now: Optional[float] = None) -> bool:
         """Check if the cache entry has expired."""
-        return time.time() - self.created_at > self.ttl_seconds
+        return (
+            time.time() if now is None else now
+        ) - self.created_at > self.ttl_seconds
 
     def access(self) -> Any:
         """Access the cached data and update metadata."""
@@ -41,24 +107,102 @@ class CacheEntry:
         self.last_accessed = time.time()
         return self.data
 
-    def size_bytes(self) -> int:
-        """Get approximate size of cached data in bytes."""
+    def _measure(self) -> int:
         try:
             if isinstance(self.data, pd.DataFrame):
-                return self.data.memory_usage(deep=True).sum()
+                return int(self.data.memory_usage(deep=True).sum())
+            elif isinstance(self.data, (bytes, bytearray)):
+                return len(self.data)
+            elif isinstance(self.data, str):
+                return len(self.data.encode())
             else:
                 return len(pickle.dumps(self.data))
         except Exception:
             return 1024  # Default fallback size
 
+    def size_bytes(self) -> int:
+        """Get approximate size of cached data in bytes (measured at creation)."""
+        return self.size
+
+
+def namespace_of(key: str) -> str:
+    """
+    Namespace of a cache key: its prefix up to the first '_'.
+
+    'ticker_AAPL_...' -> 'ticker'
+    """
+    prefix, sep, _ = key.partition("_")
+    return prefix if sep else DEFAULT_NAMESPACE
+
+
+class CacheStats:
+    """Hit/miss/eviction counts of one cache tier, overall and per namespace."""
+
+    FIELDS = ("hits", "misses", "evictions", "expirations")
+
+    def __init__(self):
+        self.counts: Dict[str, Counter] = {field: Counter() for field in self.FIELDS}
+
+    def record(self, field: str, namespace: str) -> None:
+        self.counts[field][namespace] += 1
+
+    def total(self, field: str) -> int:
+        return sum(self.counts[field].values())
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the counters.
+
+        Returns:
+            Dict with hits/misses/evictions/expirations totals, hit_rate and a
+            per-namespace breakdown
+        """
+        totals = {field: self.total(field) for field in self.FIELDS}
+        lookups = totals["hits"] + totals["misses"]
+        namespaces = set().union(*self.counts.values())
+        return {
+            **totals,
+            "hit_rate": round(totals["hits"] / lookups, 3) if lookups else 0.0,
+            "namespaces": {
+                namespace: {
+                    field: self.counts[field][namespace] for field in self.FIELDS
+                }
+                for namespace in sorted(namespaces)
+            },
+        }
+
 
 class InMemoryCache:
-    """Thread-safe in-memory cache with TTL and LRU eviction."""
+    """
+    Thread-safe in-memory cache with TTL and LRU eviction.
+
+    Entries live in an OrderedDict kept in recency order, so get, set and
+    evicting the least recently used entry are O(1); each namespace keeps
+    its own recency order for its byte budget. Sizes are measured once, at
+    insertion. Expiry times sit in a heap, so expired entries are dropped
+    in O(log n) each instead of by scanning the cache.
+    """
 
-    def __init__(self, max_size_bytes: int = 100 * 1024 * 1024):  # 100MB default
+    def __init__(
+        self,
+        max_size_bytes: int = 100 * 1024 * 1024,  # 100MB default
+        namespace_budgets: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Args:
+            max_size_bytes: Budget for all entries
+            namespace_budgets: Optional byte budgets per namespace (see namespace_of)
+        """
         self.max_size_bytes = max_size_bytes
-        self.cache: Dict[str, CacheEntry] = {}
+        self.namespace_budgets = dict(namespace_budgets or {})
+        self.cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self.current_size_bytes = 0
+        self.stats_counters = CacheStats()
+        self._namespaces: Dict[str, "OrderedDict[str, None]"] = {}
+        self._namespace_bytes: Counter = Counter()
+        self._expiry_heap: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+        self._published: Dict[str, int] = {}
         self._lock = threading.RLock()
 
     def _generate_key(self, *args, **kwargs) -> str:
@@ -68,57 +212,104 @@ class InMemoryCache:
         # Use SHA-256 instead of MD5 for better security
         return hashlib.sha256(key_string.encode()).hexdigest()
 
-    def _evict_lru(self) -> None:
-        """Evict least recently used items to free space."""
-        if not self.cache:
-            return
-
-        # Sort by last accessed time (oldest first)
-        sorted_entries = sorted(self.cache.items(), key=lambda x: x[1].last_accessed)
-
-        # Remove oldest entries until we're under 80% of max size
-        target_size = int(self.max_size_bytes * 0.8)
-
-        for key, entry in sorted_entries:
-            if self.current_size_bytes <= target_size:
-                break
+    def _remove(self, key: str) -> CacheEntry:
+        """Unlink an entry from the cache, its namespace and the byte counts."""
+        entry = self.cache.pop(key)
+        self.current_size_bytes -= entry.size
+        self._namespace_bytes[entry.namespace] -= entry.size
+        self._namespaces[entry.namespace].pop(key, None)
+        return entry
+
+    def _evict_lru(
+        self, needed_bytes: int = 0, namespace: Optional[str] = None
+    ) -> None:
+        """
+        Evict least recently used entries until needed_bytes more fit.
+
+        Args:
+            needed_bytes: Size of the entry about to be stored
+            namespace: Evict within this namespace's budget instead of the global one
+        """
+        if namespace is None:
+            order, budget = self.cache, self.max_size_bytes
+            used = lambda: self.current_size_bytes  # noqa: E731
+        else:
+            order, budget = (
+                self._namespaces.get(namespace, {}),
+                self.namespace_budgets[namespace],
+            )
+            used = lambda: self._namespace_bytes[namespace]  # noqa: E731
 
-            self.current_size_bytes -= entry.size_bytes()
-            del self.cache[key]
+        while order and used() + needed_bytes > budget:
+            key = next(iter(order))
+            entry = self._remove(key)
+            self.stats_counters.record("evictions", entry.namespace)
             logger.debug(f"Evicted cache entry: {key}")
 
-    def _cleanup_expired(self) -> None:
-        """Remove expired entries from cache."""
-        expired_keys = [key for key, entry in self.cache.items() if entry.is_expired()]
-
-        for key in expired_keys:
-            entry = self.cache[key]
-            self.current_size_bytes -= entry.size_bytes()
-            del self.cache[key]
-            logger.debug(f"Removed expired cache entry: {key}")
+    def _cleanup_expired(self, now: Optional[float] = None) -> None:
+        """Remove expired entries, oldest expiry first."""
+        now = time.time() if now is None else now
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _, sequence, key = heapq.heappop(heap)
+            entry = self.cache.get(key)
+            # Stale heap items belong to entries that were replaced or removed
+            if (
+                entry is not None
+                and entry.sequence == sequence
+                and entry.is_expired(now)
+            ):
+                self._remove(key)
+                self.stats_counters.record("expirations", entry.namespace)
+                logger.debug(f"Removed expired cache entry: {key}")
+
+        # Drop stale items once they outnumber live entries
+        if len(heap) > 2 * len(self.cache) + 64:
+            self._expiry_heap = [
+                item
+                for item in heap
+                if item[2] in self.cache and self.cache[item[2]].sequence == item[1]
+            ]
+            heapq.heapify(self._expiry_heap)
 
     def get(self, key: str) -> Optional[Any]:
         """Get data from cache if it exists and is not expired."""
         with self._lock:
-            if key not in self.cache:
+            entry = self.cache.get(key)
+            if entry is None:
+                self.stats_counters.record("misses", namespace_of(key))
                 return None
 
-            entry = self.cache[key]
             if entry.is_expired():
-                self.current_size_bytes -= entry.size_bytes()
-                del self.cache[key]
+                self._remove(key)
+                self.stats_counters.record("expirations", entry.namespace)
+                self.stats_counters.record("misses", entry.namespace)
                 return None
 
+            self.cache.move_to_end(key)
+            self._namespaces[entry.namespace].move_to_end(key)
+            self.stats_counters.record("hits", entry.namespace)
             return entry.access()
 
-    def set(self, key: str, data: Any, ttl_seconds: int = 3600) -> None:
-        """Store data in cache with TTL."""
+    def set(
+        self,
+        key: str,
+        data: Any,
+        ttl_seconds: int = 3600,
+        namespace: Optional[str] = None,
+    ) -> None:
+        """Store data in cache with TTL (namespace defaults to namespace_of(key))."""
         with self._lock:
-            entry = CacheEntry(data, ttl_seconds)
-            entry_size = entry.size_bytes()
+            namespace = namespace or namespace_of(key)
+            entry = CacheEntry(data, ttl_seconds, namespace)
+            entry_size = entry.size
 
             # Check if single entry is too large
-            if entry_size > self.max_size_bytes:
+            budget = min(
+                self.max_size_bytes,
+                self.namespace_budgets.get(namespace, self.max_size_bytes),
+            )
+            if entry_size > budget:
                 logger.warning(
                     f"Cache entry too large ({entry_size} bytes), not caching"
                 )
@@ -126,34 +317,41 @@ class InMemoryCache:
 
             # Remove existing entry if key exists
             if key in self.cache:
-                old_entry = self.cache[key]
-                self.current_size_bytes -= old_entry.size_bytes()
+                self._remove(key)
 
-            # Ensure we have space
-            if self.current_size_bytes + entry_size > self.max_size_bytes:
-                self._evict_lru()
-
-            # If still not enough space, cleanup expired
-            if self.current_size_bytes + entry_size > self.max_size_bytes:
-                self._cleanup_expired()
-
-            # Final check and forced eviction if needed
-            if self.current_size_bytes + entry_size > self.max_size_bytes:
-                self._evict_lru()
+            # Expired entries go first, then least recently used ones
+            self._cleanup_expired()
+            if namespace in self.namespace_budgets:
+                self._evict_lru(entry_size, namespace)
+            self._evict_lru(entry_size)
 
             # Store the entry
+            self._sequence += 1
+            entry.sequence = self._sequence
             self.cache[key] = entry
+            self._namespaces.setdefault(namespace, OrderedDict())[key] = None
+            self._namespace_bytes[namespace] += entry_size
             self.current_size_bytes += entry_size
+            heapq.heappush(self._expiry_heap, (entry.expires_at, entry.sequence, key))
 
             logger.debug(
                 f"Cached entry: {key} ({entry_size} bytes, "
                 f"total: {self.current_size_bytes}/{self.max_size_bytes})"
             )
 
+    def delete(self, key: str) -> None:
+        """Remove an entry, if present."""
+        with self._lock:
+            if key in self.cache:
+                self._remove(key)
+
     def clear(self) -> None:
         """Clear all cached data."""
         with self._lock:
             self.cache.clear()
+            self._namespaces.clear()
+            self._namespace_bytes.clear()
+            self._expiry_heap.clear()
             self.current_size_bytes = 0
             logger.info("Cache cleared")
 
@@ -167,156 +365,972 @@ class InMemoryCache:
                 "max_size_bytes": self.max_size_bytes,
                 "utilization": self.current_size_bytes / self.max_size_bytes,
                 "total_accesses": total_accesses,
+                "namespace_bytes": {
+                    ns: used for ns, used in self._namespace_bytes.items() if used
+                },
+                **self.stats_counters.summary(),
             }
 
+    def publish_metrics(self, collector=None, prefix: str = "cache_memory") -> None:
+        """
+        Export hit/miss/eviction counters and occupancy to core.metrics.
+
+        Counters advance by the change since the previous publish.
+
+        Args:
+            collector: MetricsCollector (defaults to core.metrics.get_metrics())
+            prefix: Metric name prefix
+        """
+        if collector is None:
+            from core.metrics import get_metrics
+
+            collector = get_metrics()
+
+        with self._lock:
+            summary = self.stats_counters.summary()
+            for field in CacheStats.FIELDS:
+                delta = summary[field] - self._published.get(field, 0)
+                self._published[field] = summary[field]
+                collector.register_counter(
+                    f"{prefix}_{field}_total", f"In-memory cache {field}"
+                ).increment(delta)
+            collector.set_gauge(f"{prefix}_bytes", self.current_size_bytes)
+            collector.set_gauge(f"{prefix}_entries", len(self.cache))
+            collector.set_gauge("cache_hit_rate", summary["hit_rate"] * 100)
+
+
+def _is_plain_frame(frame: pd.DataFrame) -> bool:
+    """Default RangeIndex, unique string column names and no extension dtypes.
+
+    Tz-aware datetimes survive without the pandas metadata; categoricals,
+    nullable integers, strings and booleans do not.
+    """
+    index = frame.index
+    return (
+        isinstance(index, pd.RangeIndex)
+        and index.start == 0
+        and index.step == 1
+        and index.name is None
+        and frame.columns.is_unique
+        and all(isinstance(col, str) for col in frame.columns)
+        and not any(
+            isinstance(dtype, pd.api.extensions.ExtensionDtype)
+            and not isinstance(dtype, pd.DatetimeTZDtype)
+            for dtype in frame.dtypes
+        )
+    )
+
+
+def _writable_copy(value: Any) -> Any:
+    """Deep copy of a cached frame (or (frame, ...) tuple) that callers may modify."""
+    frame, tail = DiskCache._arrow_frame(value)
+    if frame is None:
+        return value
+    frame = frame.copy()
+    return (frame, *tail) if isinstance(value, tuple) else frame
+
 
 class DiskCache:
-    """Persistent disk cache for larger datasets."""
+    """
+    Persistent disk cache for larger datasets.
+
+    Metadata lives in one SQLite index (no per-entry .meta files) and the
+    byte budget is enforced by evicting the least recently used entries.
+    DataFrames - alone or as the (df, success) tuples the fetch wrappers
+    cache - are stored as uncompressed Arrow IPC files and read back through
+    a memory map without copying; such frames are read-only. Anything else
+    is pickled. Payloads are written to a temporary file and renamed into
+    place, so readers never see a partial file. Access times are batched in
+    memory and flushed by the background sweeper, which also drops expired
+    entries.
+
+    Several processes may open the same directory. Index changes run in
+    SQLite write transactions that re-read the byte count, and every write
+    gets a new file name, so a payload another process has mapped is only
+    ever unlinked (its mapping stays valid), never overwritten.
+    """
+
+    INDEX_FILE = "index.sqlite"
+    TMP_PREFIX = ".tmp-"
+    BUSY_TIMEOUT_MS = 10_000
 
-    def __init__(self, cache_dir: Optional[str] = None, max_size_gb: float = 1.0):
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size_gb: float = 1.0,
+        sweep_interval_seconds: float = 300,
+    ):
+        """
+        Args:
+            cache_dir: Cache directory (a new temporary directory by default)
+            max_size_gb: Byte budget for all payload files
+            sweep_interval_seconds: Period of the background sweeper (0: no sweeper)
+        """
         self.cache_dir = cache_dir or tempfile.mkdtemp(prefix="tradingstation-cache-")
         self.max_size_bytes = int(max_size_gb * 1024 * 1024 * 1024)
         os.makedirs(self.cache_dir, exist_ok=True)
 
-    def _get_cache_path(self, key: str) -> str:
-        """Get the file path for a cache key."""
-        return os.path.join(self.cache_dir, f"{key}.pkl")
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(
+            os.path.join(self.cache_dir, self.INDEX_FILE),
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._db.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, file TEXT NOT NULL, format TEXT NOT NULL, "
+            "size INTEGER NOT NULL, created_at REAL NOT NULL, "
+            "expires_at REAL NOT NULL, "
+            "last_accessed REAL NOT NULL, access_count INTEGER NOT NULL DEFAULT 0, "
+            "fresh_until REAL)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(entries)")}
+        if "fresh_until" not in columns:
+            try:
+                self._db.execute("ALTER TABLE entries ADD COLUMN fresh_until REAL")
+            except sqlite3.OperationalError:
+                pass  # Added by another process in the meantime
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_accessed)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS entries_expiry ON entries (expires_at)"
+        )
+        self.current_size_bytes = 0
+        self._refresh_size()
+        # key -> (last access time, accesses since the last flush)
+        self._pending_access: Dict[str, Tuple[float, int]] = {}
+
+        self._stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        if sweep_interval_seconds > 0:
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop,
+                args=(sweep_interval_seconds,),
+                name="disk-cache-sweeper",
+                daemon=True,
+            )
+            self._sweeper.start()
 
-    def _get_meta_path(self, key: str) -> str:
-        """Get the metadata file path for a cache key."""
-        return os.path.join(self.cache_dir, f"{key}.meta")
+    @contextmanager
+    def _transaction(self):
+        """Write transaction on the index; serializes writers across processes."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def _refresh_size(self) -> None:
+        """Re-read the byte count, which other processes may have changed."""
+        self.current_size_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    def _get_cache_path(self, key: str, fmt: str) -> str:
+        """Get a new payload path for a cache key (unique per write)."""
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{digest}-{uuid.uuid4().hex[:12]}.{fmt}")
+
+    @staticmethod
+    def _arrow_frame(data: Any) -> Tuple[Optional[pd.DataFrame], tuple]:
+        """(frame, tuple tail) if data is stored as Arrow, else (None, ())."""
+        if isinstance(data, pd.DataFrame):
+            return data, ()
+        if isinstance(data, tuple) and data and isinstance(data[0], pd.DataFrame):
+            return data[0], tuple(data[1:])
+        return None, ()
+
+    def _write_payload(self, key: str, data: Any) -> Tuple[str, str]:
+        """
+        Write data to a new payload file via a temporary file.
+
+        Returns:
+            Tuple of (path, format)
+        """
+        fd, tmp_path = tempfile.mkstemp(prefix=self.TMP_PREFIX, dir=self.cache_dir)
+        os.close(fd)
+        try:
+            frame, tail = self._arrow_frame(data)
+            fmt = "pkl"
+            if frame is not None:
+                try:
+                    # Plain frames skip pandas metadata, whose reconstruction
+                    # dominates reads of bar-sized frames
+                    plain = _is_plain_frame(frame)
+                    table = pa.Table.from_pandas(frame, preserve_index=not plain)
+                    metadata = dict(table.schema.metadata or {}) if not plain else {}
+                    metadata[ARROW_PLAIN_KEY] = b"1" if plain else b""
+                    metadata[ARROW_TUPLE_KEY] = (
+                        pickle.dumps(tail) if isinstance(data, tuple) else b""
+                    )
+                    table = table.replace_schema_metadata(metadata)
+                    with pa.OSFile(tmp_path, "wb") as sink:
+                        with pa.ipc.new_file(sink, table.schema) as writer:
+                            writer.write_table(table)
+                    fmt = "arrow"
+                except (pa.ArrowException, TypeError, ValueError) as e:
+                    # Mixed-type object columns and the like: fall back to pickle
+                    logger.debug(f"Arrow encoding failed, pickling instead: {e}")
+            if fmt == "pkl":
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            path = self._get_cache_path(key, fmt)
+            os.replace(tmp_path, path)
+            return path, fmt
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _read_payload(path: str, fmt: str) -> Any:
+        if fmt == "pkl":
+            with open(path, "rb") as f:
+                return pickle.load(f)
+
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        metadata = table.schema.metadata or {}
+        tail = metadata.get(ARROW_TUPLE_KEY, b"")
+        # split_blocks keeps each column on its mapped buffer instead of consolidating
+        frame = table.to_pandas(
+            split_blocks=True,
+            use_threads=False,
+            ignore_metadata=bool(metadata.get(ARROW_PLAIN_KEY)),
+        )
+        return (frame, *pickle.loads(tail)) if tail else frame
+
+    def _delete_rows(self, rows) -> None:
+        """Delete index rows and their payload files; rows are (key, file, size)."""
+        if not rows:
+            return
+        self._db.executemany(
+            "DELETE FROM entries WHERE key = ?", [(key,) for key, _, _ in rows]
+        )
+        for key, file_name, size in rows:
+            self.current_size_bytes -= size
+            self._pending_access.pop(key, None)
+            try:
+                os.remove(os.path.join(self.cache_dir, file_name))
+            except OSError:
+                pass
+
+    def _discard(self, key: str, created_at: float) -> None:
+        """Delete an entry unless another writer has replaced it since it was read."""
+        with self._transaction():
+            self._refresh_size()
+            rows = self._db.execute(
+                "SELECT key, file, size FROM entries WHERE key = ? AND created_at = ?",
+                (key, created_at),
+            ).fetchall()
+            self._delete_rows(rows)
+
+    def _flush_access(self) -> None:
+        """Write batched access times to the index."""
+        if not self._pending_access:
+            return
+        updates = [
+            (at, count, key) for key, (at, count) in self._pending_access.items()
+        ]
+        self._pending_access.clear()
+        self._db.executemany(
+            "UPDATE entries SET last_accessed = ?, "
+            "access_count = access_count + ? WHERE key = ?",
+            updates,
+        )
+
+    def _evict_lru(self, needed_bytes: int = 0) -> None:
+        """Evict least recently used entries until needed_bytes more fit."""
+        if self.current_size_bytes + needed_bytes <= self.max_size_bytes:
+            return
+        self._flush_access()
+        cursor = self._db.execute(
+            "SELECT key, file, size FROM entries ORDER BY last_accessed"
+        )
+        victims, freed = [], 0
+        for key, file_name, size in cursor:
+            if self.current_size_bytes - freed + needed_bytes <= self.max_size_bytes:
+                break
+            victims.append((key, file_name, size))
+            freed += size
+        cursor.close()
+        self._delete_rows(victims)
+        logger.debug(f"Evicted {len(victims)} disk cache entries ({freed} bytes)")
+
+    def cleanup_expired(self) -> int:
+        """
+        Remove expired entries.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock, self._transaction():
+            self._refresh_size()
+            rows = self._db.execute(
+                "SELECT key, file, size FROM entries WHERE expires_at < ?",
+                (time.time(),),
+            ).fetchall()
+            self._delete_rows(rows)
+            return len(rows)
+
+    def _sweep_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                removed = self.cleanup_expired()
+                with self._lock:
+                    self._flush_access()
+                self._remove_stale_temp_files(max_age_seconds=interval)
+                if removed:
+                    logger.debug(f"Disk cache sweep removed {removed} expired entries")
+            except Exception as e:
+                logger.debug(f"Disk cache sweep failed: {e}")
+
+    def _remove_stale_temp_files(self, max_age_seconds: float) -> None:
+        """Remove temporary files left behind by interrupted writes."""
+        cutoff = time.time() - max_age_seconds
+        for filename in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, filename)
+            try:
+                if (
+                    filename.startswith(self.TMP_PREFIX)
+                    and os.path.getmtime(path) < cutoff
+                ):
+                    os.remove(path)
+            except OSError:
+                pass  # Renamed or removed by its writer meanwhile
 
     def get(self, key: str) -> Optional[Any]:
         """Get data from disk cache."""
-        cache_path = self._get_cache_path(key)
-        meta_path = self._get_meta_path(key)
+        return self.get_with_freshness(key)[0]
 
-        if not os.path.exists(cache_path) or not os.path.exists(meta_path):
-            return None
+    def get_with_freshness(self, key: str) -> Tuple[Optional[Any], float, float]:
+        """
+        Get data from disk cache together with its freshness and expiry times.
 
-        try:
-            # Check if expired
-            with open(meta_path, "r") as f:
-                meta = json.load(f)
-
-            if time.time() - meta["created_at"] > meta["ttl_seconds"]:
-                # Expired, remove files
-                os.remove(cache_path)
-                os.remove(meta_path)
-                return None
+        Args:
+            key: Cache key
 
-            # Load data
-            with open(cache_path, "rb") as f:
-                data = pickle.load(f)
+        Returns:
+            Tuple of (data or None, epoch seconds it is fresh until, epoch
+            seconds at which it expires)
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT file, format, created_at, expires_at, fresh_until "
+                "FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None, 0.0, 0.0
+
+            file_name, fmt, created_at, expires_at, fresh_until = row
+            if expires_at < time.time():
+                self._discard(key, created_at)
+                return None, 0.0, 0.0
+
+            try:
+                data = self._read_payload(os.path.join(self.cache_dir, file_name), fmt)
+            except FileNotFoundError:
+                # Replaced or evicted by another process after the lookup
+                return None, 0.0, 0.0
+            except Exception as e:
+                logger.error(f"Error reading from disk cache: {e}")
+                # Clean up corrupted entries
+                self._discard(key, created_at)
+                return None, 0.0, 0.0
+
+            _, count = self._pending_access.get(key, (0.0, 0))
+            self._pending_access[key] = (time.time(), count + 1)
+            return data, expires_at if fresh_until is None else fresh_until, expires_at
+
+    def set(
+        self,
+        key: str,
+        data: Any,
+        ttl_seconds: int = 3600,
+        fresh_until: Optional[float] = None,
+    ) -> None:
+        """
+        Store data in disk cache.
+
+        Args:
+            key: Cache key
+            data: Value to cache
+            ttl_seconds: Seconds until the entry expires
+            fresh_until: Epoch seconds the value counts as fresh (default: its expiry)
+        """
+        with self._lock:
+            path = None
+            try:
+                path, fmt = self._write_payload(key, data)
+                size = os.path.getsize(path)
+
+                with self._transaction():
+                    self._refresh_size()
+                    old = self._db.execute(
+                        "SELECT key, file, size FROM entries WHERE key = ?", (key,)
+                    ).fetchall()
+                    self._delete_rows(old)
+
+                    if size > self.max_size_bytes:
+                        logger.warning(
+                            f"Disk cache entry too large ({size} bytes), not caching"
+                        )
+                        os.remove(path)
+                        return
+
+                    self._evict_lru(size)
+                    now = time.time()
+                    self._db.execute(
+                        "INSERT INTO entries "
+                        "(key, file, format, size, created_at, expires_at, "
+                        "last_accessed, access_count, fresh_until) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?)",
+                        (
+                            key,
+                            os.path.basename(path),
+                            fmt,
+                            size,
+                            now,
+                            now + ttl_seconds,
+                            now,
+                            fresh_until,
+                        ),
+                    )
+                    self.current_size_bytes += size
+
+                logger.debug(f"Cached to disk: {key} ({fmt}, {size} bytes)")
+
+            except Exception as e:
+                logger.error(f"Error writing to disk cache: {e}")
+                if path is not None and os.path.exists(path):
+                    os.remove(path)
 
-            # Update access time
-            meta["last_accessed"] = time.time()
-            meta["access_count"] = meta.get("access_count", 0) + 1
-            with open(meta_path, "w") as f:
-                json.dump(meta, f)
+    def delete(self, key: str) -> None:
+        """Remove an entry, if present."""
+        with self._lock, self._transaction():
+            self._refresh_size()
+            rows = self._db.execute(
+                "SELECT key, file, size FROM entries WHERE key = ?", (key,)
+            ).fetchall()
+            self._delete_rows(rows)
 
-            return data
+    def clear(self) -> None:
+        """Clear all disk cache files."""
+        with self._lock:
+            try:
+                with self._transaction():
+                    self._db.execute("DELETE FROM entries")
+                    self._pending_access.clear()
+                    self.current_size_bytes = 0
+                    for filename in os.listdir(self.cache_dir):
+                        if not filename.startswith(self.INDEX_FILE):
+                            try:
+                                os.remove(os.path.join(self.cache_dir, filename))
+                            except FileNotFoundError:
+                                pass
+                logger.info("Disk cache cleared")
+            except Exception as e:
+                logger.error(f"Error clearing disk cache: {e}")
 
-        except Exception as e:
-            logger.error(f"Error reading from disk cache: {e}")
-            # Clean up corrupted files
-            for path in [cache_path, meta_path]:
-                if os.path.exists(path):
-                    os.remove(path)
-            return None
+    def stats(self) -> Dict[str, Any]:
+        """Get disk cache statistics."""
+        with self._lock:
+            self._refresh_size()
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return {
+                "entries": entries,
+                "size_bytes": self.current_size_bytes,
+                "max_size_bytes": self.max_size_bytes,
+                "utilization": self.current_size_bytes / self.max_size_bytes,
+            }
 
-    def set(self, key: str, data: Any, ttl_seconds: int = 3600) -> None:
-        """Store data in disk cache."""
-        cache_path = self._get_cache_path(key)
-        meta_path = self._get_meta_path(key)
+    def close(self) -> None:
+        """Stop the sweeper and close the index."""
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=5)
+        with self._lock:
+            self._flush_access()
+            self._db.close()
 
-        try:
-            # Save data
-            with open(cache_path, "wb") as f:
-                pickle.dump(data, f)
-
-            # Save metadata
-            meta = {
-                "created_at": time.time(),
-                "ttl_seconds": ttl_seconds,
-                "access_count": 0,
-                "last_accessed": time.time(),
-            }
-            with open(meta_path, "w") as f:
-                json.dump(meta, f)
 
-            logger.debug(f"Cached to disk: {key}")
+class SharedCache(DiskCache):
+    """
+    Cache shared by every process on the host.
 
-        except Exception as e:
-            logger.error(f"Error writing to disk cache: {e}")
+    Orchestrator jobs, screener subprocesses and dashboard pages each start
+    with an empty in-memory tier. Attached to the same directory
+    (SHARED_CACHE_DIR, on the /dev/shm tmpfs where available) they share one
+    index and one set of Arrow files: a frame one process caches is mapped
+    by the others straight from memory, with no daemon, socket round trip
+    or copy in between. get_cache() uses it as the second tier when
+    SHARED_CACHE_ENABLED is set.
+    """
 
-    def clear(self) -> None:
-        """Clear all disk cache files."""
-        try:
-            for filename in os.listdir(self.cache_dir):
-                file_path = os.path.join(self.cache_dir, filename)
-                os.remove(file_path)
-            logger.info("Disk cache cleared")
-        except Exception as e:
-            logger.error(f"Error clearing disk cache: {e}")
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size_mb: float = SHARED_CACHE_SIZE_MB,
+        sweep_interval_seconds: float = 300,
+    ):
+        """
+        Args:
+            cache_dir: Shared directory (default: SHARED_CACHE_DIR)
+            max_size_mb: Byte budget shared by all attached processes
+            sweep_interval_seconds: Period of this process's sweeper (0: no sweeper)
+        """
+        super().__init__(
+            cache_dir or SHARED_CACHE_DIR, max_size_mb / 1024, sweep_interval_seconds
+        )
 
 
 class TieredCache:
-    """Two-tier cache system with memory and disk layers."""
+    """
+    Two-tier cache system with memory and disk layers.
+
+    Entries may outlive their freshness by a stale window. get_or_refresh
+    and get_or_refresh_many_async serve a stale value immediately and
+    revalidate it in the background, refresh fresh values early with a
+    probability that rises as expiry nears (scaled by how long the fetch
+    took), and let only one caller per key fetch a missing value while
+    concurrent callers wait for its result. Passing an interval expires a
+    value at the next bar boundary (utils.single_flight.bar_expiry) instead
+    of after a fixed number of seconds.
+
+    The second tier is a private DiskCache unless another one (e.g. a
+    SharedCache) is passed as l2. Freshness is stored with the entry there,
+    so values written by another process are served as fresh, not stale.
+
+    Frames read back from the disk tier are memory-mapped with read-only
+    columns, and frames in the memory tier are shared by every caller, so
+    get_or_refresh and get_or_refresh_many_async return writable deep copies
+    of DataFrame values unless the caller passes zero_copy=True.
+    """
 
     def __init__(
         self,
         memory_size_mb: int = 100,
         disk_size_gb: float = 1.0,
         cache_dir: Optional[str] = None,
+        namespace_budgets_mb: Optional[Dict[str, float]] = None,
+        stale_seconds: float = CACHE_STALE_SECONDS,
+        early_refresh_beta: float = CACHE_EARLY_REFRESH_BETA,
+        refresh_workers: int = CACHE_REFRESH_WORKERS,
+        l2: Optional[DiskCache] = None,
     ):
-        self.memory_cache = InMemoryCache(memory_size_mb * 1024 * 1024)
-        self.disk_cache = DiskCache(cache_dir, disk_size_gb)
+        """
+        Args:
+            memory_size_mb: In-memory tier budget
+            disk_size_gb: Disk tier budget
+            cache_dir: Disk tier directory
+            namespace_budgets_mb: Optional in-memory budgets per key namespace
+            stale_seconds: How long an expired value may still be served while it
+                refreshes
+            early_refresh_beta: Aggressiveness of early refresh (0 disables it)
+            refresh_workers: Threads running background refreshes
+            l2: Second tier to use instead of a private DiskCache (disk_size_gb
+                and cache_dir are then ignored)
+        """
+        namespace_budgets = {
+            namespace: int(budget * 1024 * 1024)
+            for namespace, budget in (namespace_budgets_mb or {}).items()
+        }
+        self.memory_cache = InMemoryCache(
+            memory_size_mb * 1024 * 1024, namespace_budgets
+        )
+        self.disk_cache = l2 if l2 is not None else DiskCache(cache_dir, disk_size_gb)
+        self.stale_seconds = stale_seconds
+        self.early_refresh_beta = early_refresh_beta
+        self.refresh_workers = refresh_workers
+        self.refresh_stats: Counter = Counter()
+        self.single_flight = SingleFlight(enabled=True)
+        # key -> (fresh until, kept until, seconds the last fetch took)
+        self._freshness: Dict[str, Tuple[float, float, float]] = {}
+        self._refreshing: Set[str] = set()
+        self._inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+        self._refresh_pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
 
     def get(self, key: str) -> Optional[Any]:
-        """Get data from cache, checking memory first, then disk."""
+        """
+        Get data from cache, checking memory first, then disk.
+
+        Stale values are included.
+        """
         # Try memory cache first
         data = self.memory_cache.get(key)
         if data is not None:
             return data
 
         # Try disk cache
-        data = self.disk_cache.get(key)
-        if data is not None:
-            # Promote to memory cache
-            self.memory_cache.set(key, data)
-            return data
+        return self._promote(key)
 
-        return None
+    def _promote(self, key: str) -> Optional[Any]:
+        """Copy a disk entry, and the freshness stored with it, into memory."""
+        data, fresh_until, expires_at = self.disk_cache.get_with_freshness(key)
+        if data is None:
+            return None
+        # Promote to memory cache for the rest of its lifetime
+        self.memory_cache.set(key, data, max(expires_at - time.time(), 0))
+        with self._lock:
+            # The disk entry may have been rewritten by another cache since this
+            # one saw it
+            previous = self._freshness.get(key)
+            self._freshness[key] = (
+                fresh_until,
+                expires_at,
+                previous[2] if previous else 0.0,
+            )
+        return data
 
-    def set(self, key: str, data: Any, ttl_seconds: int = 3600) -> None:
-        """Store data in both memory and disk cache."""
-        self.memory_cache.set(key, data, ttl_seconds)
-        self.disk_cache.set(key, data, ttl_seconds)
+    def set(
+        self,
+        key: str,
+        data: Any,
+        ttl_seconds: int = 3600,
+        interval: Optional[str] = None,
+        stale_seconds: Optional[float] = None,
+        fetch_seconds: float = 0.0,
+    ) -> None:
+        """
+        Store data in both memory and disk cache.
+
+        Args:
+            key: Cache key
+            data: Value to cache
+            ttl_seconds: Seconds the value is fresh (ignored when interval is given)
+            interval: Bar interval ('1min', ..., 'daily'); the value is fresh
+                until the next bar boundary
+            stale_seconds: Stale window after freshness ends (default: the cache's)
+            fetch_seconds: How long producing the value took (drives early refresh)
+        """
+        now = time.time()
+        fresh_until = bar_expiry(interval, now) if interval else now + ttl_seconds
+        stale = self.stale_seconds if stale_seconds is None else stale_seconds
+        kept_until = fresh_until + stale
+        with self._lock:
+            self._freshness[key] = (fresh_until, kept_until, fetch_seconds)
+            if len(self._freshness) > 2 * len(self.memory_cache.cache) + 1024:
+                self._freshness = {
+                    k: v for k, v in self._freshness.items() if v[1] > now
+                }
+        self.memory_cache.set(key, data, kept_until - now)
+        self.disk_cache.set(key, data, kept_until - now, fresh_until=fresh_until)
+
+    def lookup(self, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Get data and its freshness.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (data or None, 'fresh' | 'early' | 'stale' | 'miss'). 'early'
+            is a fresh value picked for early refresh. A value that is stale
+            in memory is re-read from the disk tier first, in case another
+            process sharing it has refreshed the entry.
+        """
+        data = self.get(key)
+        if data is None:
+            return None, "miss"
+
+        freshness = self._freshness.get(key)
+        now = time.time()
+        if freshness is None or now >= freshness[0]:
+            reloaded = self._promote(key)
+            if reloaded is not None:
+                data, freshness = reloaded, self._freshness.get(key)
+            if freshness is None or now >= freshness[0]:
+                return data, "stale"
+
+        fresh_until, _, fetch_seconds = freshness
+        if self.early_refresh_beta > 0 and fetch_seconds > 0:
+            # Probabilistic early expiration: -log(u) is exponentially distributed
+            gap = (
+                -fetch_seconds
+                * self.early_refresh_beta
+                * math.log(1.0 - random.random())
+            )
+            if now + gap >= fresh_until:
+                return data, "early"
+        return data, "fresh"
+
+    def _count(self, field: str, n: int = 1) -> None:
+        with self._lock:
+            self.refresh_stats[field] += n
+
+    def _store_result(
+        self, key: str, result: Any, started: float, cacheable, **set_kwargs
+    ) -> None:
+        if cacheable(result):
+            self.set(key, result, fetch_seconds=time.time() - started, **set_kwargs)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._refresh_pool is None:
+                self._refresh_pool = ThreadPoolExecutor(
+                    max_workers=max(1, self.refresh_workers),
+                    thread_name_prefix="cache-refresh",
+                )
+            return self._refresh_pool
+
+    def _claim_refresh(self, keys: List[str]) -> List[str]:
+        """Keys not already refreshing, marked as refreshing."""
+        with self._lock:
+            claimed = [key for key in keys if key not in self._refreshing]
+            self._refreshing.update(claimed)
+            return claimed
+
+    def _release_refresh(self, keys: List[str]) -> None:
+        with self._lock:
+            self._refreshing.difference_update(keys)
+
+    def get_or_refresh(
+        self,
+        key: str,
+        fetch: Callable[[], Any],
+        ttl_seconds: int = 3600,
+        interval: Optional[str] = None,
+        stale_seconds: Optional[float] = None,
+        cacheable: Callable[[Any], bool] = lambda result: result is not None,
+        zero_copy: bool = False,
+    ) -> Any:
+        """
+        Cached value of fetch(), refreshed without blocking once it goes stale.
+
+        Args:
+            key: Cache key
+            fetch: Function producing the value
+            ttl_seconds: Freshness in seconds (ignored when interval is given)
+            interval: Bar interval to align freshness to
+            stale_seconds: Stale window (default: the cache's)
+            cacheable: Whether a result may be cached (failures are not)
+            zero_copy: Return the cached frame itself (shared with the cache,
+                columns read from disk are read-only) instead of a copy
+
+        Returns:
+            Fresh or stale cached value, or the result of fetch() on a miss
+        """
+        set_kwargs = {
+            "ttl_seconds": ttl_seconds,
+            "interval": interval,
+            "stale_seconds": stale_seconds,
+        }
+
+        def fetch_and_store():
+            started = time.time()
+            result = fetch()
+            self._store_result(key, result, started, cacheable, **set_kwargs)
+            return result
+
+        own = (lambda value: value) if zero_copy else _writable_copy
+
+        data, state = self.lookup(key)
+        self._count(STATE_COUNTERS[state])
+        if state == "fresh":
+            return own(data)
+
+        if state in ("early", "stale"):
+            if self._claim_refresh([key]):
+
+                def refresh():
+                    try:
+                        self.single_flight.call(key, fetch_and_store)
+                        self._count("refreshes")
+                    except Exception as e:
+                        self._count("refresh_errors")
+                        logger.warning(f"⚠️ Background refresh of {key} failed: {e}")
+                    finally:
+                        self._release_refresh([key])
+
+                self._executor().submit(refresh)
+            return own(data)
+
+        return own(self.single_flight.call(key, fetch_and_store))
+
+    async def get_or_refresh_many_async(
+        self,
+        keys: Dict[Hashable, str],
+        fetch_many: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+        ttl_seconds: int = 3600,
+        interval: Optional[str] = None,
+        stale_seconds: Optional[float] = None,
+        cacheable: Callable[[Any], bool] = lambda result: result is not None,
+        states: Optional[Dict[Hashable, str]] = None,
+        zero_copy: bool = False,
+    ) -> Dict[Hashable, Any]:
+        """
+        Batch version of get_or_refresh for fetchers that take many items.
+
+        Missing items are fetched in one fetch_many call; items another
+        caller is already fetching are awaited instead. Stale and early
+        items are served and refreshed with one background fetch_many call
+        (run on its own event loop in a refresh thread, so it survives the
+        caller's loop).
+
+        Args:
+            keys: {item (e.g. ticker): cache key}
+            fetch_many: Coroutine function returning {item: value} for a list of items
+            ttl_seconds: Freshness in seconds (ignored when interval is given)
+            interval: Bar interval to align freshness to
+            stale_seconds: Stale window (default: the cache's)
+            cacheable: Whether a result may be cached
+            states: Optional dict filled with each item's lookup state
+            zero_copy: Return cached frames themselves instead of copies
+
+        Returns:
+            {item: value} for every item that is cached or was fetched
+        """
+        set_kwargs = {
+            "ttl_seconds": ttl_seconds,
+            "interval": interval,
+            "stale_seconds": stale_seconds,
+        }
+        results, misses, refresh = {}, [], []
+        for item, key in keys.items():
+            data, state = self.lookup(key)
+            self._count(STATE_COUNTERS[state])
+            if states is not None:
+                states[item] = state
+            if data is None:
+                misses.append(item)
+                continue
+            results[item] = data
+            if state != "fresh":
+                refresh.append(item)
+
+        # Background revalidation of stale / early items, once per key
+        claimed = self._claim_refresh([keys[item] for item in refresh])
+        if claimed:
+            items = [item for item in refresh if keys[item] in claimed]
+
+            def revalidate():
+                started = time.time()
+                try:
+                    fetched = asyncio.run(fetch_many(items))
+                    for item, result in fetched.items():
+                        self._store_result(
+                            keys[item], result, started, cacheable, **set_kwargs
+                        )
+                    self._count("refreshes", len(items))
+                except Exception as e:
+                    self._count("refresh_errors", len(items))
+                    logger.warning(
+                        f"⚠️ Background refresh of {len(items)} keys failed: {e}"
+                    )
+                finally:
+                    self._release_refresh([keys[item] for item in items])
+
+            self._executor().submit(revalidate)
+
+        if not misses:
+            return (
+                results
+                if zero_copy
+                else {item: _writable_copy(v) for item, v in results.items()}
+            )
+
+        # One fetch for the misses nobody else is fetching; join the rest
+        loop = asyncio.get_running_loop()
+        lead, joined = [], {}
+        for item in misses:
+            flight_key = (id(loop), keys[item])
+            future = self._inflight.get(flight_key)
+            if future is not None:
+                self.single_flight.stats.record("coalesced")
+                joined[item] = future
+            else:
+                self._inflight[flight_key] = loop.create_future()
+                lead.append(item)
+
+        if lead:
+            self.single_flight.stats.record("executed")
+            started = time.time()
+            try:
+                fetched = await fetch_many(lead)
+            except BaseException as e:
+                for item in lead:
+                    future = self._inflight.pop((id(loop), keys[item]))
+                    if isinstance(e, Exception):
+                        future.set_exception(e)
+                        future.exception()
+                    else:
+                        future.cancel()
+                raise
+            for item in lead:
+                result = fetched.get(item)
+                if result is not None:
+                    self._store_result(
+                        keys[item], result, started, cacheable, **set_kwargs
+                    )
+                    results[item] = result
+                self._inflight.pop((id(loop), keys[item])).set_result(result)
+
+        for item, future in joined.items():
+            result = await asyncio.shield(future)
+            if result is not None:
+                results[item] = result
+        return (
+            results
+            if zero_copy
+            else {item: _writable_copy(v) for item, v in results.items()}
+        )
+
+    def invalidate(self, key: str) -> None:
+        """Drop a key from both tiers (other processes keep their in-memory copy)."""
+        self.memory_cache.delete(key)
+        self.disk_cache.delete(key)
+        with self._lock:
+            self._freshness.pop(key, None)
 
     def clear(self) -> None:
         """Clear both memory and disk cache."""
         self.memory_cache.clear()
         self.disk_cache.clear()
+        with self._lock:
+            self._freshness.clear()
 
     def stats(self) -> Dict[str, Any]:
         """Get combined cache statistics."""
         memory_stats = self.memory_cache.stats()
         return {
             "memory": memory_stats,
+            "disk": self.disk_cache.stats(),
             "disk_dir": self.disk_cache.cache_dir,
+            "refresh": dict(
+                self.refresh_stats
+            ),  # fresh_hits, stale_served, refreshes, ...
+            "coalescing": self.single_flight.stats.summary(),
         }
 
+    def publish_metrics(self, collector=None) -> None:
+        """Export cache counters to core.metrics (see InMemoryCache.publish_metrics)."""
+        self.memory_cache.publish_metrics(collector)
+
 
 # Global cache instance
 _global_cache: Optional[TieredCache] = None
 
 
 def get_cache() -> TieredCache:
-    """Get or create the global cache instance."""
+    """Get or create the global cache instance (on the shared tier if enabled)."""
     global _global_cache
     if _global_cache is None:
-        _global_cache = TieredCache()
+        l2 = None
+        if SHARED_CACHE_ENABLED:
+            try:
+                l2 = SharedCache()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(
+                    f"⚠️ Shared cache unavailable, using a private disk cache: {e}"
+                )
+        _global_cache = TieredCache(l2=l2)
     return _global_cache
 
 
@@ -327,27 +1341,53 @@ def cache_key_for_ticker_data(
     return f"ticker_{ticker}_{data_type}_{interval}_{outputsize}"
 
 
+def _successful_fetch(result: Any) -> bool:
+    """(df, success) results are cached only when success is true."""
+    return result is not None and len(result) == 2 and bool(result[1])
+
+
+def bar_interval_for(
+    data_type: Optional[str], interval: Optional[str]
+) -> Optional[str]:
+    """Interval whose bar boundaries a cached fetch result should expire on."""
+    return "daily" if data_type == "daily" else interval
+
+
 def cached_fetch_wrapper(func):
-    """Decorator to add caching to data fetching functions."""
+    """
+    Decorator to add caching to data fetching functions.
+
+    Results expire at the next bar boundary when the call names an interval
+    (5 minutes otherwise), are served stale while one background call
+    refreshes them, and concurrent misses share one call.
+    """
+    signature = inspect.signature(func)
 
     def wrapper(*args, **kwargs):
         cache = get_cache()
 
-        # Generate cache key using the memory cache's method
-        cache_key = cache.memory_cache._generate_key(*args, **kwargs)
-
-        # Try to get from cache
-        cached_result = cache.get(cache_key)
-        if cached_result is not None:
-            logger.debug(f"Cache hit for {func.__name__}")
-            return cached_result
+        # Generate cache key using the memory cache's method; the function
+        # name keeps wrapped functions apart in the shared tier
+        cache_key = (
+            f"wrapped_{func.__module__}.{func.__qualname__}_"
+            f"{cache.memory_cache._generate_key(*args, **kwargs)}"
+        )
 
-        # Call function and cache result
-        result = func(*args, **kwargs)
-        if result is not None and len(result) == 2 and result[1]:  # Success case
-            cache.set(cache_key, result, ttl_seconds=300)  # 5 minute TTL for API data
-            logger.debug(f"Cached result for {func.__name__}")
-
-        return result
+        try:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+        except TypeError:
+            arguments = kwargs
+
+        return cache.get_or_refresh(
+            cache_key,
+            lambda: func(*args, **kwargs),
+            ttl_seconds=300,  # 5 minute TTL for API data
+            interval=bar_interval_for(
+                arguments.get("data_type"), arguments.get("interval")
+            ),
+            cacheable=_successful_fetch,
+        )
 
     return wrapper
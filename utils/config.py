@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 
 # Load environment variables from .env file if it exists
@@ -15,6 +16,53 @@ except ImportError:
 # API Keys
 ALPHA_VANTAGE_API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")
 
+# Alpha Vantage request budget, shared by every process on the host through a
+# token bucket state file (see utils/rate_limiter.py)
+ALPHA_VANTAGE_CALLS_PER_MINUTE = int(os.getenv("ALPHA_VANTAGE_CALLS_PER_MINUTE", "150"))
+ALPHA_VANTAGE_BURST = int(os.getenv("ALPHA_VANTAGE_BURST", "10"))
+RATE_LIMIT_STATE_FILE = os.getenv(
+    "RATE_LIMIT_STATE_FILE",
+    os.path.join(tempfile.gettempdir(), "alpha_vantage_rate_limiter.state"),
+)
+
+# Single-flight request coalescing (see utils/single_flight.py): identical
+# Alpha Vantage requests in flight at the same time share one call, and
+# results are reused until the next bar of their interval is due. Daily
+# requests are refreshed on this cadence instead of once per day.
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+SINGLE_FLIGHT_DAILY_REFRESH_MINUTES = int(os.getenv("SINGLE_FLIGHT_DAILY_REFRESH_MINUTES", "15"))
+
+# TieredCache stale-while-revalidate (see utils/cache.py): an expired value is
+# still served for this many seconds while one background refresh replaces
+# it. Fresh values are refreshed early with a probability that grows with
+# the fetch time as expiry nears (beta 0 disables early refresh).
+CACHE_STALE_SECONDS = float(os.getenv("CACHE_STALE_SECONDS", "60"))
+CACHE_EARLY_REFRESH_BETA = float(os.getenv("CACHE_EARLY_REFRESH_BETA", "1.0"))
+CACHE_REFRESH_WORKERS = int(os.getenv("CACHE_REFRESH_WORKERS", "2"))
+
+# Cross-process shared cache (see utils/cache.SharedCache): the second tier of
+# get_cache() in every process - orchestrator jobs, screeners, the dashboard -
+# lives in one directory, on the /dev/shm tmpfs where available, so a frame
+# read by one process is served to the others from memory. Stored objects
+# without bars (signals, journals, ...) stay fresh for the object TTL.
+SHARED_CACHE_ENABLED = os.getenv("SHARED_CACHE_ENABLED", "true").lower() == "true"
+SHARED_CACHE_DIR = os.getenv(
+    "SHARED_CACHE_DIR",
+    os.path.join(
+        "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+        "tradingstation-cache",
+    ),
+)
+SHARED_CACHE_SIZE_MB = int(os.getenv("SHARED_CACHE_SIZE_MB", "512"))
+SHARED_CACHE_OBJECT_TTL_SECONDS = int(os.getenv("SHARED_CACHE_OBJECT_TTL_SECONDS", "300"))
+
+# Streaming histograms (see core/metrics.Histogram): percentiles cover a
+# sliding window that advances in HISTOGRAM_WINDOW_SLOTS steps, and values are
+# bucketed to this many significant figures (3: within 0.5%).
+HISTOGRAM_WINDOW_SECONDS = float(os.getenv("HISTOGRAM_WINDOW_SECONDS", "300"))
+HISTOGRAM_WINDOW_SLOTS = int(os.getenv("HISTOGRAM_WINDOW_SLOTS", "10"))
+HISTOGRAM_SIGNIFICANT_FIGURES = int(os.getenv("HISTOGRAM_SIGNIFICANT_FIGURES", "3"))
+
 # DigitalOcean Spaces Configuration
 SPACES_ACCESS_KEY_ID = os.getenv("SPACES_ACCESS_KEY_ID")
 SPACES_SECRET_ACCESS_KEY = os.getenv("SPACES_SECRET_ACCESS_KEY")
@@ -26,6 +74,15 @@ SPACES_ENDPOINT_URL = (
     else None
 )
 
+# Connection pool size for the shared, process-wide Spaces client. Screeners
+# and fetch jobs read hundreds of objects per cycle, so keep this comfortably
+# above the number of concurrent readers.
+SPACES_MAX_POOL_CONNECTIONS = int(os.getenv("SPACES_MAX_POOL_CONNECTIONS", "50"))
+
+# Storage format for per-ticker bar objects ("parquet" or "csv"). Parquet is
+# read first with a CSV fallback, so existing CSV objects remain readable.
+BAR_STORAGE_FORMAT = os.getenv("BAR_STORAGE_FORMAT", "parquet").lower()
+
 # Phase 1: Environment Variable Setup - Path Structure Variables
 SPACES_BASE_PREFIX = os.getenv("SPACES_BASE_PREFIX", "data")
 SPACES_STRUCTURE_VERSION = os.getenv("SPACES_STRUCTURE_VERSION", "v2")
@@ -71,6 +128,49 @@ INTRADAY_DATA_DIR = f"{BASE_DATA_DIR}/intraday"
 INTRADAY_30MIN_DATA_DIR = f"{BASE_DATA_DIR}/intraday_30min"
 DAILY_DATA_DIR = f"{BASE_DATA_DIR}/daily"
 
+# Per-cycle market data snapshots shared by screener processes
+SNAPSHOT_DATA_DIR = f"{BASE_DATA_DIR}/snapshots"
+
+# Concurrent downloads used to build a market data snapshot
+SNAPSHOT_MAX_WORKERS = int(os.getenv("SNAPSHOT_MAX_WORKERS", "16"))
+
+# Persisted per-ticker streaming indicator state for the minute screeners
+INDICATOR_STATE_DIR = f"{BASE_DATA_DIR}/indicator_state"
+
+# DataFetchManager execution: "sequential" (one ticker, one interval at a
+# time) or "async" (fetch / merge / upload stages of many tickers overlap,
+# paced by the shared Alpha Vantage token bucket)
+DATA_FETCH_MODE = os.getenv("DATA_FETCH_MODE", "sequential").lower()
+ASYNC_FETCH_CONCURRENCY = int(os.getenv("ASYNC_FETCH_CONCURRENCY", "8"))
+ASYNC_UPLOAD_CONCURRENCY = int(os.getenv("ASYNC_UPLOAD_CONCURRENCY", "8"))
+ASYNC_MERGE_WORKERS = int(os.getenv("ASYNC_MERGE_WORKERS", "2"))
+
+# Deferred retries of failed / stale fetches (see utils/retry_queue.py). When
+# enabled, the fetch loop parks such tickers and keeps going instead of
+# sleeping inside the API request.
+DEFERRED_RETRY_ENABLED = os.getenv("DEFERRED_RETRY_ENABLED", "true").lower() == "true"
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "6"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "2.5"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "60"))
+# Longest a job waits at the end of its cycle for parked retries
+RETRY_DRAIN_SECONDS = float(os.getenv("RETRY_DRAIN_SECONDS", "120"))
+
+# Orchestrator job execution: "subprocess" (fresh interpreter per job) or
+# "warm" (pool of long-lived workers with heavy modules already imported).
+# Warm workers read import-time settings once, at pool start-up.
+JOB_EXECUTION_MODE = os.getenv("JOB_EXECUTION_MODE", "subprocess").lower()
+WARM_WORKER_COUNT = int(os.getenv("WARM_WORKER_COUNT", "2"))
+
+# Concurrent screener runs (see core/screener_runner.py): screeners share one
+# data snapshot and run side by side; CPU-bound per-ticker evaluation goes to
+# a process pool in chunks (0 workers evaluates in the event loop). A screener
+# or ticker that exceeds its timeout is dropped from the results.
+SCREENER_TIMEOUT_SECONDS = float(os.getenv("SCREENER_TIMEOUT_SECONDS", "300"))
+SCREENER_TICKER_TIMEOUT_SECONDS = float(os.getenv("SCREENER_TICKER_TIMEOUT_SECONDS", "15"))
+SCREENER_TICKER_CONCURRENCY = int(os.getenv("SCREENER_TICKER_CONCURRENCY", "16"))
+SCREENER_PROCESS_WORKERS = int(os.getenv("SCREENER_PROCESS_WORKERS", "4"))
+SCREENER_CHUNK_SIZE = int(os.getenv("SCREENER_CHUNK_SIZE", "25"))
+
 # Ensure directories exist
 os.makedirs(INTRADAY_DATA_DIR, exist_ok=True)
 os.makedirs(INTRADAY_30MIN_DATA_DIR, exist_ok=True)
@@ -113,5 +213,26 @@ INTRADAY_1MIN_HEAL_EVERY_MINUTES = int(os.getenv("INTRADAY_1MIN_HEAL_EVERY_MINUT
 # Heal fetch: number of 1-minute bars to fetch for healing (default 1440 = 1 day)
 INTRADAY_1MIN_HEAL_COUNTBACK = int(os.getenv("INTRADAY_1MIN_HEAL_COUNTBACK", "1440"))
 
+# Spread heal checks over the heal interval (one phase per ticker) instead of
+# healing every ticker in the same minute; tickers whose manifest records no
+# open gaps are skipped (see utils/heal_scheduler.py)
+INTRADAY_1MIN_HEAL_STAGGER = os.getenv("INTRADAY_1MIN_HEAL_STAGGER", "true").lower() == "true"
+
+# Heals whose requests all succeed but leave a gap open before its bars are
+# taken as never printed (no trades) and the series is recorded as complete
+INTRADAY_HEAL_MAX_ATTEMPTS = int(os.getenv("INTRADAY_HEAL_MAX_ATTEMPTS", "3"))
+
 # Extended hours trading data inclusion
 INTRADAY_EXTENDED = os.getenv("INTRADAY_EXTENDED", "true").lower() == "true"
+
+# 30-minute bars: "api" fetches them from Alpha Vantage every cycle; "derived"
+# appends bars aggregated from the stored 1-min series (see utils/resample.py)
+# after the last stored bar and only calls the API for reconciliation, initial
+# loads, short histories and 1-min series with open gaps
+INTRADAY_30MIN_SOURCE = os.getenv("INTRADAY_30MIN_SOURCE", "api").lower()
+
+# Reconcile each ticker's derived 30-min bars against an API fetch once per N
+# minutes since its last API fetch, staggered by ticker (default 240)
+INTRADAY_30MIN_RECONCILE_EVERY_MINUTES = int(
+    os.getenv("INTRADAY_30MIN_RECONCILE_EVERY_MINUTES", "240")
+)
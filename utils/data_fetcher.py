@@ -16,12 +16,41 @@ from typing import Any, Dict, Optional, Tuple
 import pandas as pd
 import requests
 
+from .api_payload import time_series_frame
 from .config import ALPHA_VANTAGE_API_KEY
+from .rate_limiter import get_rate_limiter, is_throttled, request_cost
 from .timestamp_standardizer import apply_timestamp_standardization_to_api_data
 
 logger = logging.getLogger(__name__)
 
 
+def rate_limited_get(endpoint: str, params: Dict[str, str]) -> Dict[str, Any]:
+    """
+    GET an Alpha Vantage endpoint through the shared token bucket.
+
+    Args:
+        endpoint: API URL
+        params: Request parameters
+
+    Returns:
+        Parsed JSON payload
+    """
+    rate_limiter = get_rate_limiter()
+    rate_limiter.acquire(request_cost(params))
+    response = requests.get(endpoint, params=params, timeout=30)
+    if is_throttled(status_code=response.status_code):
+        rate_limiter.on_throttled()
+        return {"Note": "HTTP 429 Too Many Requests"}
+    response.raise_for_status()
+    data = response.json()
+
+    if is_throttled(data):
+        rate_limiter.on_throttled()
+    else:
+        rate_limiter.on_success()
+    return data
+
+
 def fetch_intraday_data(
     ticker: str, interval: str = "1min", outputsize: str = "compact"
 ) -> Tuple[Optional[pd.DataFrame], bool]:
@@ -50,9 +79,7 @@ def fetch_intraday_data(
     }
 
     try:
-        response = requests.get(endpoint, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        data = rate_limited_get(endpoint, params)
 
         if "Error Message" in data:
             logger.error(
@@ -73,24 +100,15 @@ def fetch_intraday_data(
 
         time_series = data[time_series_key]
 
-        # Convert to DataFrame
-        df = pd.DataFrame.from_dict(time_series, orient="index")
-
-        # Rename columns
-        df.columns = [col.split(". ")[1] for col in df.columns]
-
-        # Convert values to float with robust error handling
-        for col in df.columns:
-            try:
-                df[col] = df[col].astype(float)
-            except ValueError as e:
-                logger.error(f"Failed to convert column '{col}' to float for {ticker}: {e}")
-                return None, False
+        # Typed columns and a sorted DatetimeIndex straight from the JSON
+        try:
+            df = time_series_frame(time_series, data_type="intraday", errors="raise")
+        except ValueError as e:
+            logger.error(f"Failed to convert time series to float for {ticker}: {e}")
+            return None, False
 
         # Add date and ticker columns
-        df.index = pd.to_datetime(df.index)
-        df = df.reset_index()
-        df.rename(columns={"index": "timestamp"}, inplace=True)
+        df = df.rename_axis("timestamp").reset_index()
         df["ticker"] = ticker
 
         logger.info(
@@ -142,9 +160,7 @@ def fetch_daily_data(
     }
 
     try:
-        response = requests.get(endpoint, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        data = rate_limited_get(endpoint, params)
 
         if "Error Message" in data:
             logger.error(
@@ -165,24 +181,15 @@ def fetch_daily_data(
 
         time_series = data[time_series_key]
 
-        # Convert to DataFrame
-        df = pd.DataFrame.from_dict(time_series, orient="index")
-
-        # Rename columns
-        df.columns = [col.split(". ")[1] for col in df.columns]
-
-        # Convert values to float with robust error handling
-        for col in df.columns:
-            try:
-                df[col] = df[col].astype(float)
-            except ValueError as e:
-                logger.error(f"Failed to convert column '{col}' to float for {ticker}: {e}")
-                return None, False
+        # Typed columns and a sorted DatetimeIndex straight from the JSON
+        try:
+            df = time_series_frame(time_series, data_type="daily", errors="raise")
+        except ValueError as e:
+            logger.error(f"Failed to convert time series to float for {ticker}: {e}")
+            return None, False
 
         # Add date and ticker columns
-        df.index = pd.to_datetime(df.index)
-        df = df.reset_index()
-        df.rename(columns={"index": "timestamp"}, inplace=True)
+        df = df.rename_axis("timestamp").reset_index()
         df["ticker"] = ticker
 
         logger.info(f"📊 Raw daily data fetched for {ticker}: {len(df)} rows")
@@ -4,6 +4,7 @@ Data storage and retrieval operations.
 This module handles all data storage operations including:
 - Local filesystem operations
 - Cloud storage (DigitalOcean Spaces) operations
+- Reads through the cross-process shared cache (read_df_cached)
 - Data retention and cleanup
 - Path management
 """
@@ -14,8 +15,14 @@ from typing import Optional, Tuple
 
 import pandas as pd
 
-from .config import DAILY_DATA_DIR, INTRADAY_30MIN_DATA_DIR, INTRADAY_DATA_DIR
-from .spaces_manager import upload_dataframe
+from .config import (
+    DAILY_DATA_DIR,
+    INTRADAY_30MIN_DATA_DIR,
+    INTRADAY_DATA_DIR,
+    SHARED_CACHE_ENABLED,
+    SHARED_CACHE_OBJECT_TTL_SECONDS,
+)
+from .storage_format import read_bars, write_bars
 
 logger = logging.getLogger(__name__)
 
@@ -111,40 +118,41 @@ def save_df_to_s3(
             max_date = pd.to_datetime(df[date_col]).max()
             logger.info(f"   Date range: {min_date} to {max_date}")
 
-    # Try Spaces upload first
-    success = upload_dataframe(df, object_name)
+    # Try Spaces upload first (bar objects are written in BAR_STORAGE_FORMAT)
+    written_name, success = write_bars(df, object_name)
+    invalidate_cached_object(object_name)
     if success:
         # PHASE 1.3: CONFIRM the file exists after saving as required
-        logger.info(f"✅ File saved successfully to CLOUD STORAGE: {object_name}")
+        logger.info(f"✅ File saved successfully to CLOUD STORAGE: {written_name}")
         logger.info(f"☁️ Spaces upload confirmed for {ticker}")
-        
-        # PHASE 1.3: Verify upload by checking if file exists and getting its size
-        from .spaces_manager import file_exists_in_spaces, get_cloud_file_size_bytes
-        
-        if file_exists_in_spaces(object_name):
-            cloud_file_size = get_cloud_file_size_bytes(object_name)
-            logger.info(f"🔍 PHASE 1.3 VERIFICATION: Cloud file exists at {object_name}")
+
+        # PHASE 1.3: Verify upload with a single HEAD for the object size
+        from .spaces_manager import get_cloud_file_size_bytes
+
+        cloud_file_size = get_cloud_file_size_bytes(written_name)
+        if cloud_file_size > 0:
+            logger.info(f"🔍 PHASE 1.3 VERIFICATION: Cloud file exists at {written_name}")
             logger.info(f"🔍 PHASE 1.3 VERIFICATION: Cloud file size: {cloud_file_size} bytes")
-            
-            # Additional verification: ensure the cloud file size matches expectations
-            # Calculate expected size based on DataFrame
-            import io
-            temp_buffer = io.StringIO()
-            df.to_csv(temp_buffer, index=False)
-            expected_size = len(temp_buffer.getvalue().encode('utf-8'))
-            temp_buffer.close()
-            
-            logger.info(f"🔍 PHASE 1.3 VERIFICATION: Expected size: {expected_size} bytes")
-            
-            # Allow for small differences due to encoding/formatting
-            size_difference = abs(cloud_file_size - expected_size)
-            if size_difference <= 100:  # Allow 100 bytes difference
-                logger.info(f"✅ PHASE 1.3 VERIFICATION: File size matches (diff: {size_difference} bytes)")
-            else:
-                logger.warning(f"⚠️ PHASE 1.3 VERIFICATION: File size mismatch (diff: {size_difference} bytes)")
-                logger.warning("   This could indicate a partial upload or file corruption!")
+
+            # Size comparison only makes sense for CSV, which we can re-render
+            if written_name.endswith(".csv"):
+                import io
+                temp_buffer = io.StringIO()
+                df.to_csv(temp_buffer, index=False)
+                expected_size = len(temp_buffer.getvalue().encode('utf-8'))
+                temp_buffer.close()
+
+                logger.info(f"🔍 PHASE 1.3 VERIFICATION: Expected size: {expected_size} bytes")
+
+                # Allow for small differences due to encoding/formatting
+                size_difference = abs(cloud_file_size - expected_size)
+                if size_difference <= 100:  # Allow 100 bytes difference
+                    logger.info(f"✅ PHASE 1.3 VERIFICATION: File size matches (diff: {size_difference} bytes)")
+                else:
+                    logger.warning(f"⚠️ PHASE 1.3 VERIFICATION: File size mismatch (diff: {size_difference} bytes)")
+                    logger.warning("   This could indicate a partial upload or file corruption!")
         else:
-            logger.error(f"❌ PHASE 1.3 VERIFICATION: Cloud file NOT FOUND at {object_name}")
+            logger.error(f"❌ PHASE 1.3 VERIFICATION: Cloud file NOT FOUND at {written_name}")
             logger.error("   This indicates a critical upload failure!")
             
         return True
@@ -221,11 +229,10 @@ def read_df_from_s3(object_name: str) -> pd.DataFrame:
     """
     logger.info(f"Attempting to read DataFrame from {object_name}")
 
-    # Try to read from Spaces first (if credentials available)
-    from .spaces_manager import download_dataframe
-
+    # Try to read from Spaces first (if credentials available); bar objects
+    # are read from Parquet with a fallback to the legacy CSV object
     try:
-        cloud_df = download_dataframe(object_name)
+        cloud_df = read_bars(object_name)
         if not cloud_df.empty:
             logger.info(
                 f"✅ Successfully read {len(cloud_df)} rows from CLOUD STORAGE: {object_name}"
@@ -274,6 +281,66 @@ def read_df_from_s3(object_name: str) -> pd.DataFrame:
     return pd.DataFrame()
 
 
+def object_cache_key(object_name: str) -> str:
+    """Cache key of a stored object."""
+    return f"object_{object_name}"
+
+
+def _object_bar_interval(object_name: str) -> Optional[str]:
+    """Bar interval a stored object is updated on (None if it holds no bars)."""
+    if object_name.startswith("data/daily/"):
+        return "daily"
+    if object_name.startswith("data/intraday/"):
+        return "1min"
+    return None
+
+
+def read_df_cached(object_name: str) -> pd.DataFrame:
+    """
+    Read a DataFrame through the shared cache (utils.cache.SharedCache).
+
+    Every process - orchestrator jobs, screeners, the dashboard - reads the
+    same cached frame; Spaces is only read on a miss or by the one
+    background refresh of a stale entry. Bar objects stay fresh until their
+    next bar is due, other objects for SHARED_CACHE_OBJECT_TTL_SECONDS.
+    Empty (missing) objects are not cached. Reads go straight to
+    read_df_from_s3 when SHARED_CACHE_ENABLED is off.
+
+    Args:
+        object_name: Object name/path in S3
+
+    Returns:
+        DataFrame (a view of the cached frame; columns read from the shared
+        cache are read-only, so take .copy() before modifying values in place)
+    """
+    if not SHARED_CACHE_ENABLED:
+        return read_df_from_s3(object_name)
+
+    from .cache import get_cache
+
+    frame = get_cache().get_or_refresh(
+        object_cache_key(object_name),
+        lambda: read_df_from_s3(object_name),
+        ttl_seconds=SHARED_CACHE_OBJECT_TTL_SECONDS,
+        interval=_object_bar_interval(object_name),
+        cacheable=lambda df: df is not None and not df.empty,
+        zero_copy=True,
+    )
+    return frame.copy(deep=False)
+
+
+def invalidate_cached_object(object_name: str) -> None:
+    """Drop an object from the shared cache after it was written."""
+    if not SHARED_CACHE_ENABLED:
+        return
+    try:
+        from .cache import get_cache
+
+        get_cache().invalidate(object_cache_key(object_name))
+    except Exception as e:
+        logger.warning(f"⚠️ Could not invalidate cached {object_name}: {e}")
+
+
 def get_data_directory(data_type: str) -> str:
     """
     Get the appropriate data directory for a given data type.
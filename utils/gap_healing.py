@@ -0,0 +1,320 @@
+"""
+Gap-targeted healing of stored intraday bars.
+
+Healing used to mean "re-download outputsize=full and concatenate it with
+everything on disk", whatever the size of the hole. This module turns the
+gaps in a stored series into the smallest set of requests that can fill them:
+
+1. find_gaps() lays the series over the NYSE session grid (early closes and
+   holidays included, see utils.resample.session_windows) and returns each
+   run of consecutive missing bars as one (first, last) range. Overnight,
+   weekend and holiday breaks are not gaps because the grid has no bars
+   there, and a hole that spans a session break is a single range.
+2. plan_heal_requests() maps the ranges to API requests: ranges inside the
+   latest `compact` window are covered by the regular compact fetch, older
+   ones by one month-sliced (month=YYYY-MM) request per month they touch.
+3. splice_bars() inserts only the fetched bars that fall inside the ranges
+   into the existing frame with a sorted merge (no concat + sort +
+   drop_duplicates over the whole history).
+
+API calls therefore scale with the number of months holding gaps (zero for
+recent gaps), and rewritten rows with the number of missing bars.
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import TIMEZONE
+from .resample import interval_minutes, session_windows
+from .session_kernels import DAY_NS, MINUTE_NS, utc_nanos, wall_clock
+
+logger = logging.getLogger(__name__)
+
+# Bars returned by an Alpha Vantage outputsize=compact request
+COMPACT_BARS = 100
+
+GapRange = Tuple[pd.Timestamp, pd.Timestamp]
+
+
+def _to_utc_ns(timestamps) -> np.ndarray:
+    """UTC nanoseconds of timestamps, sorted and de-duplicated, NaT dropped."""
+    values = utc_nanos(timestamps)
+    values = values[values != np.iinfo(np.int64).min]
+    return np.unique(values)
+
+
+def session_grid(first, last, interval="1min", session: str = "regular") -> np.ndarray:
+    """
+    Start time of every bar the exchange could print between two timestamps.
+
+    Args:
+        first: Earliest timestamp (its whole trading day is included)
+        last: Latest timestamp (its whole trading day is included)
+        interval: Bar width ('1min', '30min', ... or minutes)
+        session: 'regular' or 'extended'
+
+    Returns:
+        Sorted UTC nanoseconds
+    """
+    width = interval_minutes(interval) * MINUTE_NS
+    bounds = wall_clock(
+        utc_nanos(pd.DatetimeIndex(pd.to_datetime([first, last], utc=True)))
+    )
+    days = np.arange(bounds[0] // DAY_NS, bounds[1] // DAY_NS + 1, dtype=np.int64)
+    starts, ends = session_windows(days, session)
+
+    counts = np.maximum(0, (ends - starts + width - 1) // width)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    wall = np.repeat(days * DAY_NS + starts, counts) + offsets * width
+    return utc_nanos(pd.DatetimeIndex(wall.astype("datetime64[ns]")))
+
+
+def find_gaps(
+    timestamps,
+    interval="1min",
+    session: str = "regular",
+    min_missing: int = 1,
+) -> List[GapRange]:
+    """
+    Runs of missing bars between the first and last stored bar.
+
+    Extended-hours bars are only printed when something trades, so the
+    regular session is the default grid for detection.
+
+    Args:
+        timestamps: Stored bar timestamps (naive values are exchange time)
+        interval: Bar width of the series
+        session: Session grid to check against ('regular' or 'extended')
+        min_missing: Ignore runs shorter than this many bars
+
+    Returns:
+        List of (first missing bar, last missing bar) UTC timestamps
+    """
+    stamps = _to_utc_ns(timestamps)
+    if len(stamps) < 2:
+        return []
+
+    grid = session_grid(stamps[0], stamps[-1], interval, session)
+    grid = grid[(grid > stamps[0]) & (grid < stamps[-1])]
+    missing = np.flatnonzero(~np.isin(grid, stamps))
+    if not len(missing):
+        return []
+
+    breaks = np.flatnonzero(np.diff(missing) != 1) + 1
+    run_starts = missing[np.concatenate(([0], breaks))]
+    run_ends = missing[np.append(breaks - 1, len(missing) - 1)]
+    keep = run_ends - run_starts + 1 >= min_missing
+    return [
+        (pd.Timestamp(int(grid[a]), tz="UTC"), pd.Timestamp(int(grid[b]), tz="UTC"))
+        for a, b in zip(run_starts[keep], run_ends[keep])
+    ]
+
+
+def plan_heal_requests(
+    gaps: List[GapRange],
+    interval="1min",
+    now=None,
+    compact_bars: int = COMPACT_BARS,
+    session: str = "extended",
+) -> List[Dict]:
+    """
+    Group gap ranges into the API requests that can fill them.
+
+    Args:
+        gaps: Ranges from find_gaps()
+        interval: Bar width of the series
+        now: Current time (defaults to now)
+        compact_bars: Bars returned by a compact request
+        session: Session the API returns bars for (extended hours by default)
+
+    Returns:
+        List of {"outputsize", "month", "gaps"} dicts: at most one compact
+        request (month None) followed by one full request per month, oldest first
+    """
+    if not gaps:
+        return []
+
+    now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+    now = now.tz_localize(TIMEZONE) if now.tzinfo is None else now
+    lookback = pd.Timedelta(days=10) + pd.Timedelta(
+        minutes=compact_bars * interval_minutes(interval)
+    )
+    grid = session_grid(now - lookback, now, interval, session)
+    recent = grid[grid <= now.value]
+    compact_from = (
+        recent[-compact_bars] if len(recent) >= compact_bars else np.iinfo(np.int64).max
+    )
+
+    compact, months = [], {}
+    for start, end in gaps:
+        if start.value >= compact_from:
+            compact.append((start, end))
+            continue
+        first, last = (
+            stamp.tz_convert(TIMEZONE).tz_localize(None) for stamp in (start, end)
+        )
+        for month in pd.period_range(first, last, freq="M").strftime("%Y-%m"):
+            months.setdefault(month, []).append((start, end))
+
+    requests = (
+        [{"outputsize": "compact", "month": None, "gaps": compact}] if compact else []
+    )
+    requests += [
+        {"outputsize": "full", "month": month, "gaps": ranges}
+        for month, ranges in sorted(months.items())
+    ]
+    return requests
+
+
+def gap_rows(
+    df: pd.DataFrame, gaps: List[GapRange], timestamp_col: str = "timestamp"
+) -> pd.DataFrame:
+    """
+    Rows of df that fall inside any gap range, sorted and de-duplicated.
+
+    Args:
+        df: Fetched bars
+        gaps: Ranges from find_gaps()
+        timestamp_col: Timestamp column
+
+    Returns:
+        Matching rows (empty frame if none)
+    """
+    if df is None or df.empty or not gaps:
+        return pd.DataFrame(columns=[] if df is None else df.columns)
+
+    stamps = utc_nanos(df[timestamp_col])
+    starts = utc_nanos(pd.DatetimeIndex([start for start, _ in gaps]))
+    ends = utc_nanos(pd.DatetimeIndex([end for _, end in gaps]))
+    order = np.argsort(starts)
+    starts, ends = starts[order], ends[order]
+
+    pos = np.searchsorted(starts, stamps, side="right") - 1
+    inside = (pos >= 0) & (stamps <= ends[np.maximum(pos, 0)])
+    rows = df[inside].assign(_utc=stamps[inside])
+    rows = rows.sort_values("_utc", kind="stable").drop_duplicates("_utc", keep="last")
+    return rows.drop(columns="_utc").reset_index(drop=True)
+
+
+def _match_timestamps(values: pd.Series, template: pd.Series) -> pd.Series:
+    """Convert fetched timestamps to the representation used by the stored frame."""
+    if not pd.api.types.is_datetime64_any_dtype(template.dtype):
+        return values
+    converted = pd.to_datetime(values, utc=True)
+    if template.dt.tz is None:
+        return converted.dt.tz_convert(TIMEZONE).dt.tz_localize(None)
+    return converted.dt.tz_convert(template.dt.tz)
+
+
+def splice_bars(
+    existing: pd.DataFrame,
+    fetched: pd.DataFrame,
+    gaps: List[GapRange],
+    timestamp_col: str = "timestamp",
+) -> pd.DataFrame:
+    """
+    Insert the fetched bars that fill gaps into the existing frame.
+
+    Existing rows are never replaced; the gap rows are merged in by
+    timestamp with a single searchsorted pass over both sorted sides.
+
+    Args:
+        existing: Stored bars
+        fetched: Bars returned by the heal requests
+        gaps: Ranges from find_gaps()
+        timestamp_col: Timestamp column
+
+    Returns:
+        Existing bars plus the gap fills, in time order
+    """
+    fill = gap_rows(fetched, gaps, timestamp_col)
+    if fill.empty:
+        return existing.reset_index(drop=True)
+
+    existing_ts = utc_nanos(existing[timestamp_col])
+    if len(existing_ts) > 1 and np.any(np.diff(existing_ts) < 0):
+        order = np.argsort(existing_ts, kind="stable")
+        existing, existing_ts = existing.iloc[order], existing_ts[order]
+
+    fill_ts = utc_nanos(fill[timestamp_col])
+    fill = fill[~np.isin(fill_ts, existing_ts)]
+    fill_ts = utc_nanos(fill[timestamp_col])
+    if fill.empty:
+        return existing.reset_index(drop=True)
+    fill = fill.assign(
+        **{
+            timestamp_col: _match_timestamps(
+                fill[timestamp_col], existing[timestamp_col]
+            )
+        }
+    )
+
+    # Final position of each row in the merged order
+    n, m = len(existing_ts), len(fill_ts)
+    positions = np.concatenate(
+        (
+            np.arange(n) + np.searchsorted(fill_ts, existing_ts, side="left"),
+            np.arange(m) + np.searchsorted(existing_ts, fill_ts, side="right"),
+        )
+    )
+    order = np.empty(n + m, dtype=np.int64)
+    order[positions] = np.arange(n + m)
+
+    combined = pd.concat([existing, fill], ignore_index=True)
+    return combined.iloc[order].reset_index(drop=True)
+
+
+def heal_summary(gaps: List[GapRange], requests: List[Dict]) -> str:
+    """One-line description of a heal plan for logging."""
+    months = [request["month"] for request in requests if request["month"]]
+    compact = any(request["month"] is None for request in requests)
+    return (
+        f"gaps={len(gaps)} compact={'yes' if compact else 'no'} "
+        f"month_slices={months if months else 'none'}"
+    )
+
+
+def fill_gaps(
+    existing: pd.DataFrame,
+    fetch,
+    gaps: List[GapRange],
+    requests: List[Dict],
+    compact_df: Optional[pd.DataFrame] = None,
+    timestamp_col: str = "timestamp",
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Run a heal plan and splice the results into the existing frame.
+
+    Args:
+        existing: Stored bars
+        fetch: fetch(outputsize, month) -> DataFrame (empty/None on failure)
+        gaps: Ranges from find_gaps()
+        requests: Plan from plan_heal_requests()
+        compact_df: Bars of a compact fetch the caller already made; reused
+            instead of issuing the plan's compact request
+        timestamp_col: Timestamp column
+
+    Returns:
+        Tuple of (healed frame, number of API requests made)
+    """
+    fetched, calls = [], 0
+    for request in requests:
+        if request["month"] is None and compact_df is not None:
+            fetched.append(compact_df)
+            continue
+        df = fetch(request["outputsize"], request["month"])
+        calls += 1
+        if df is not None and not df.empty:
+            fetched.append(df)
+
+    if not fetched:
+        return existing, calls
+    return (
+        splice_bars(
+            existing, pd.concat(fetched, ignore_index=True), gaps, timestamp_col
+        ),
+        calls,
+    )
@@ -0,0 +1,118 @@
+"""
+Staggered scheduling of 1-minute heal checks.
+
+The 1-min fetch used to heal when `now_minute % INTRADAY_1MIN_HEAL_EVERY_MINUTES
+== 0`, so every ticker switched to its heavy heal path in the same minute.
+That cycle was many times slower than the others and could overrun into the
+next one, while the minutes in between did no healing at all.
+
+HealScheduler gives each ticker a phase within the heal interval and heals
+it only in the minutes matching its phase. Phases are a round robin over the
+sorted universe, so each minute takes ceil(N / interval) tickers (tickers
+outside the universe fall back to a stable hash). Every ticker is still
+checked once per interval.
+
+is_overdue() is the elapsed-time variant used for the 30-min reconciliation
+fetch: a ticker is due once its phase minute has passed since its last run,
+so a late or overrunning cycle still catches the slot it missed.
+
+needs_heal() skips tickers whose manifest entry records a completed gap
+check with no open gaps (see DatasetManifest.record_gap_check).
+"""
+
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .config import INTRADAY_1MIN_HEAL_EVERY_MINUTES
+from .manifest import GAPS_UNKNOWN
+
+
+class HealScheduler:
+    """Assigns every ticker a heal minute within the heal interval."""
+
+    def __init__(
+        self,
+        every_minutes: int = INTRADAY_1MIN_HEAL_EVERY_MINUTES,
+        tickers: Iterable[str] = (),
+    ):
+        """
+        Args:
+            every_minutes: Heal interval per ticker
+            tickers: Universe to spread evenly over the interval
+        """
+        self.every = max(1, int(every_minutes))
+        self._phases: Dict[str, int] = {}
+        self.assign(tickers)
+
+    def assign(self, tickers: Iterable[str]) -> None:
+        """
+        Spread a universe round-robin over the interval.
+
+        Tickers are sorted first, so the assignment is order-independent.
+        """
+        self._phases = {
+            ticker: i % self.every for i, ticker in enumerate(sorted(set(tickers)))
+        }
+
+    def phase(self, ticker: str) -> int:
+        """Minute offset of a ticker's heal within the interval."""
+        phase = self._phases.get(ticker)
+        if phase is None:
+            phase = zlib.crc32(ticker.encode()) % self.every
+        return phase
+
+    def is_due(self, ticker: str, minute_of_day: int) -> bool:
+        """
+        Whether a ticker heals in this minute.
+
+        Args:
+            ticker: Stock ticker symbol
+            minute_of_day: Minutes since midnight (UTC)
+
+        Returns:
+            True once per interval for every ticker
+        """
+        return (minute_of_day - self.phase(ticker)) % self.every == 0
+
+    def is_overdue(self, ticker: str, minute: int, last_minute: Optional[int]) -> bool:
+        """
+        Whether a ticker's slot has come round since it last ran.
+
+        Args:
+            ticker: Stock ticker symbol
+            minute: Current minute (e.g. minutes since the epoch)
+            last_minute: Minute of the ticker's last run on the same clock
+                (None: it never ran)
+
+        Returns:
+            True if a minute matching the ticker's phase lies after its last run
+        """
+        if last_minute is None:
+            return True
+        last_slot = minute - (minute - self.phase(ticker)) % self.every
+        return last_minute < last_slot
+
+    def due(self, tickers: Iterable[str], minute_of_day: int) -> List[str]:
+        """Tickers whose heal falls in this minute."""
+        return [ticker for ticker in tickers if self.is_due(ticker, minute_of_day)]
+
+
+def needs_heal(entry: Optional[Dict]) -> bool:
+    """
+    Whether a stored series may have gaps.
+
+    Args:
+        entry: Manifest entry of the base object (None if not catalogued)
+
+    Returns:
+        False only when the last gap check found no open gaps and no later
+        append introduced one
+    """
+    if entry is None:
+        return True
+    gap_count = entry.get("gap_count", GAPS_UNKNOWN)
+    if gap_count is None or pd.isna(gap_count):
+        return True
+    return int(gap_count) != 0
@@ -4,9 +4,9 @@ import os
 import time
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 import pytz
-import requests
 
 from utils.config import (
     ALPHA_VANTAGE_API_KEY,
@@ -18,12 +18,28 @@ from utils.config import (
     INTRADAY_TRIM_DAYS,
     TIMEZONE,
 )
-from utils.spaces_manager import upload_dataframe
+from utils.storage_format import write_bars
 
 # Import from new modular components
-from .data_fetcher import fetch_daily_data, fetch_intraday_data
-from .data_storage import read_df_from_s3, save_df_to_local, save_df_to_s3
+from .data_fetcher import fetch_daily_data, fetch_intraday_data, rate_limited_get
+from .data_storage import (
+    invalidate_cached_object,
+    read_df_from_s3,
+    save_df_to_local,
+    save_df_to_s3,
+)
+from .indicators import vwap_series
 from .market_time import detect_market_session, get_last_market_day, is_weekend
+from .session_kernels import (
+    PREMARKET_START,
+    REGULAR_OPEN,
+    average_daily_volume,
+    average_early_volume,
+    exchange_today,
+    previous_close,
+    timestamps_wall_clock,
+    window_mask,
+)
 from .ticker_manager import (
     load_manual_tickers,
     read_master_tickerlist,
@@ -59,8 +75,7 @@ def fetch_intraday_data(ticker, interval="1min", outputsize="compact"):
     }
 
     try:
-        response = requests.get(endpoint, params=params, timeout=30)
-        data = response.json()
+        data = rate_limited_get(endpoint, params)
 
         if "Error Message" in data:
             logger.error(
@@ -184,11 +199,14 @@ def save_df_to_s3(df, object_name_or_ticker, interval=None, s3_prefix="intraday"
             max_date = pd.to_datetime(df[date_col]).max()
             logger.info(f"   Date range: {min_date} to {max_date}")
 
-    # Try Spaces upload first
-    success = upload_dataframe(df, object_name)
+    # Try Spaces upload first (bar objects are written in BAR_STORAGE_FORMAT)
+    written_name, success = write_bars(df, object_name)
     if success:
+        # Readers key the shared cache by the requested name; drop both
+        for name in {object_name, written_name}:
+            invalidate_cached_object(name)
         # CONFIRM the file exists after saving as required
-        logger.info(f"✅ File saved successfully to {object_name}")
+        logger.info(f"✅ File saved successfully to {written_name}")
         logger.info(f"☁️ Spaces upload confirmed for {ticker}")
         return True
     else:
@@ -877,7 +895,7 @@ def append_new_candles(existing_df, new_df):
         return existing_df
 
 
-# Add simple stubs for other functions that might be needed
+# Screener formatting and session analytics helpers
 def format_to_two_decimal(value):
     """Format value to two decimal places."""
     try:
@@ -886,34 +904,135 @@ def format_to_two_decimal(value):
         return value
 
 
-def get_previous_day_close(ticker):
-    """Get previous day close price - stub implementation."""
-    logger.warning(f"get_previous_day_close not implemented for {ticker}")
-    return None
+def _bar_wall_clock(df):
+    """Exchange wall-clock nanoseconds of a frame's bars and their sort order."""
+    # Screeners index frames by their parsed timestamps; reuse that when present
+    if isinstance(df.index, pd.DatetimeIndex):
+        timestamps = df.index
+    elif "timestamp" in df.columns:
+        timestamps = df["timestamp"]
+    else:
+        timestamps = df["datetime"]
+    wall = timestamps_wall_clock(timestamps)
+    order = None if np.all(np.diff(wall) >= 0) else np.argsort(wall, kind="stable")
+    return wall, order
+
+
+def _sorted_column(df, column, order):
+    values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64)
+    return values if order is None else values[order]
+
+
+def get_previous_day_close(daily_df, as_of=None):
+    """
+    Get the last daily close before a given day.
+
+    Args:
+        daily_df: Daily bars with a timestamp column or DatetimeIndex
+        as_of: Day whose previous close is wanted (defaults to today in NY)
+
+    Returns:
+        float: Previous close, or None if there is no earlier bar
+    """
+    if daily_df is None or daily_df.empty:
+        return None
+    try:
+        wall, order = _bar_wall_clock(daily_df)
+        if order is not None:
+            wall = wall[order]
+        close = _sorted_column(daily_df, "close", order)
+        value = previous_close(wall, close, as_of or exchange_today())[0]
+        return None if np.isnan(value) else float(value)
+    except Exception as e:
+        logger.error(f"Error getting previous day close: {e}")
+        return None
+
+
+def get_premarket_data(df):
+    """
+    Get the pre-market bars (4:00 AM - 9:30 AM ET) of an intraday frame.
+
+    Args:
+        df: Intraday bars (normally one day's) with a timestamp column or DatetimeIndex
+
+    Returns:
+        pandas.DataFrame: Pre-market rows (empty if there are none)
+    """
+    if df is None or df.empty:
+        return pd.DataFrame()
+    try:
+        wall, _ = _bar_wall_clock(df)
+        return df[window_mask(wall, PREMARKET_START, REGULAR_OPEN)]
+    except Exception as e:
+        logger.error(f"Error getting premarket data: {e}")
+        return pd.DataFrame()
 
 
-def get_premarket_data(ticker):
-    """Get premarket data - stub implementation."""
-    logger.warning(f"get_premarket_data not implemented for {ticker}")
-    return None
+def calculate_avg_early_volume(df, days=5, minutes=15):
+    """
+    Calculate the average per-minute volume of the first minutes after the open.
 
+    Args:
+        df: 1-minute bars with a timestamp column or DatetimeIndex
+        days: Number of most recent days averaged
+        minutes: Length of the early window after 9:30 AM ET
 
-def calculate_avg_early_volume(ticker):
-    """Calculate average early volume - stub implementation."""
-    logger.warning(f"calculate_avg_early_volume not implemented for {ticker}")
-    return None
+    Returns:
+        float: Average early volume (0.0 if there are no early bars)
+    """
+    if df is None or df.empty:
+        return 0.0
+    try:
+        wall, order = _bar_wall_clock(df)
+        if order is not None:
+            wall = wall[order]
+        volume = _sorted_column(df, "volume", order)
+        value = average_early_volume(wall, volume, days, minutes)[0]
+        return 0.0 if np.isnan(value) else float(value)
+    except Exception as e:
+        logger.error(f"Error calculating average early volume: {e}")
+        return 0.0
 
 
 def calculate_vwap(df):
-    """Calculate VWAP - stub implementation."""
-    logger.warning(f"calculate_vwap not implemented")
-    return None
+    """
+    Calculate the cumulative VWAP of the typical price over a frame.
+
+    Args:
+        df: OHLCV bars already sliced to the session or anchor period
+
+    Returns:
+        pandas.Series: VWAP aligned to df's index
+    """
+    if df is None or df.empty:
+        return pd.Series(dtype=float)
+    return vwap_series(df)
+
 
+def calculate_avg_daily_volume(daily_df, days=10, as_of=None):
+    """
+    Calculate the average volume of the most recent completed days.
+
+    Args:
+        daily_df: Daily bars with a timestamp column or DatetimeIndex
+        days: Number of days averaged
+        as_of: First day excluded (defaults to today in NY)
 
-def calculate_avg_daily_volume(ticker):
-    """Calculate average daily volume - stub implementation."""
-    logger.warning(f"calculate_avg_daily_volume not implemented for {ticker}")
-    return None
+    Returns:
+        float: Average daily volume, or None if there is no history
+    """
+    if daily_df is None or daily_df.empty:
+        return None
+    try:
+        wall, order = _bar_wall_clock(daily_df)
+        if order is not None:
+            wall = wall[order]
+        volume = _sorted_column(daily_df, "volume", order)
+        value = average_daily_volume(wall, volume, days, as_of or exchange_today())[0]
+        return None if np.isnan(value) else float(value)
+    except Exception as e:
+        logger.error(f"Error calculating average daily volume: {e}")
+        return None
 
 
 def is_weekend():
@@ -0,0 +1,389 @@
+"""
+Vectorized indicator engine over a ticker x bar panel.
+
+The daily screeners used to compute EMA, Bollinger Bands, ATR and average
+volume one ticker at a time with pandas rolling calls. This module loads the
+whole universe into aligned 2-D NumPy arrays (one row per ticker) and
+computes each indicator for every ticker in a handful of batched array
+operations.
+
+Rows are right-aligned: a ticker's most recent bar is always in the last
+column and shorter histories are left-padded with NaN. Rolling windows and
+EMAs therefore run over each ticker's own bars exactly like the per-ticker
+pandas calls, so results match calculate_ema / calculate_bollinger_bands /
+calculate_atr (which are now thin single-ticker views over this engine).
+"""
+
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+PANEL_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+# --- Array kernels (operate along the last axis) ---
+
+
+def shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Shift values right along the time axis, filling with NaN."""
+    out = np.full_like(values, np.nan, dtype=np.float64)
+    if periods < values.shape[-1]:
+        out[..., periods:] = values[..., : values.shape[-1] - periods]
+    return out
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponential moving average, equivalent to ewm(span, adjust=False).mean().
+
+    Args:
+        values: 2-D array (tickers x bars)
+        span: EMA span
+
+    Returns:
+        Array of the same shape
+    """
+    alpha = 2.0 / (span + 1.0)
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(values)
+    prev = np.full(values.shape[:-1], np.nan)
+    for t in range(values.shape[-1]):
+        x = values[..., t]
+        # Seed with the first valid value, carry through missing bars
+        prev = np.where(
+            np.isnan(prev),
+            x,
+            np.where(np.isnan(x), prev, alpha * x + (1 - alpha) * prev),
+        )
+        out[..., t] = prev
+    return out
+
+
+def _rolling(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    """Apply a reducer over full trailing windows; partial windows are NaN."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full_like(values, np.nan)
+    if window <= values.shape[-1]:
+        windows = sliding_window_view(values, window, axis=-1)
+        with np.errstate(invalid="ignore"):
+            out[..., window - 1 :] = reducer(windows)
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing rolling mean, equivalent to rolling(window).mean()."""
+    return _rolling(values, window, lambda w: w.mean(axis=-1))
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """Trailing rolling standard deviation, equivalent to rolling(window).std()."""
+    return _rolling(values, window, lambda w: w.std(axis=-1, ddof=ddof))
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing rolling maximum, equivalent to rolling(window).max()."""
+    return _rolling(values, window, lambda w: w.max(axis=-1))
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing rolling minimum, equivalent to rolling(window).min()."""
+    return _rolling(values, window, lambda w: w.min(axis=-1))
+
+
+def bollinger_bands(
+    values: np.ndarray, window: int = 20, num_std: float = 2
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands around a simple moving average.
+
+    Returns:
+        Tuple of (upper band, lower band, middle band)
+    """
+    middle = rolling_mean(values, window)
+    std = rolling_std(values, window)
+    return middle + std * num_std, middle - std * num_std, middle
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range; the first bar (no previous close) uses high - low."""
+    prev_close = shift(close, 1)
+    tr = np.fmax(high - low, np.abs(high - prev_close))
+    return np.fmax(tr, np.abs(low - prev_close))
+
+
+def atr(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14
+) -> np.ndarray:
+    """Average True Range as a simple rolling mean of the true range."""
+    return rolling_mean(true_range(high, low, close), period)
+
+
+def wilder_atr(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14
+) -> np.ndarray:
+    """
+    Wilder's Average True Range.
+
+    Seeded with the simple mean of the first `period` true ranges, then
+    smoothed as (prev * (period - 1) + tr) / period. Missing bars carry the
+    previous value forward.
+
+    Args:
+        high: 2-D array (tickers x bars)
+        low: 2-D array (tickers x bars)
+        close: 2-D array (tickers x bars)
+        period: ATR period
+
+    Returns:
+        Array of the same shape
+    """
+    tr = true_range(
+        np.asarray(high, dtype=np.float64),
+        np.asarray(low, dtype=np.float64),
+        np.asarray(close, dtype=np.float64),
+    )
+    out = np.empty_like(tr)
+    count = np.zeros(tr.shape[:-1], dtype=np.int64)
+    total = np.zeros(tr.shape[:-1])
+    value = np.full(tr.shape[:-1], np.nan)
+    for t in range(tr.shape[-1]):
+        x = tr[..., t]
+        valid = ~np.isnan(x)
+        seeding = valid & (count < period)
+        smoothing = valid & (count >= period)
+        total = np.where(seeding, total + np.nan_to_num(x), total)
+        count = count + seeding
+        value = np.where(smoothing, (value * (period - 1) + x) / period, value)
+        value = np.where(seeding & (count == period), total / period, value)
+        out[..., t] = value
+    return out
+
+
+def vwap(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray
+) -> np.ndarray:
+    """
+    Cumulative VWAP of the typical price (high + low + close) / 3.
+
+    The caller passes one session's bars; missing bars contribute nothing and
+    a zero cumulative volume yields NaN.
+
+    Returns:
+        Array of the same shape
+    """
+    typical = (
+        np.asarray(high, dtype=np.float64)
+        + np.asarray(low, dtype=np.float64)
+        + np.asarray(close, dtype=np.float64)
+    ) / 3.0
+    volume = np.asarray(volume, dtype=np.float64)
+    missing = np.isnan(typical) | np.isnan(volume)
+    cum_pv = np.cumsum(np.where(missing, 0.0, typical * volume), axis=-1)
+    cum_vol = np.cumsum(np.where(missing, 0.0, volume), axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(cum_vol > 0, cum_pv / cum_vol, np.nan)
+
+
+def average_volume(volume: np.ndarray, window: int = 20, lag: int = 1) -> np.ndarray:
+    """Rolling average volume over the prior bars (lagged to avoid lookahead)."""
+    return rolling_mean(shift(volume, lag) if lag else volume, window)
+
+
+# --- Panel ---
+
+
+class IndicatorPanel:
+    """Aligned tickers x bars arrays for a whole universe of daily frames."""
+
+    def __init__(
+        self,
+        tickers,
+        fields: Dict[str, np.ndarray],
+        lengths: np.ndarray,
+        frames: Optional[Dict[str, pd.DataFrame]] = None,
+    ):
+        """
+        Initialize the panel.
+
+        Args:
+            tickers: Ticker symbols, one per panel row
+            fields: Field name -> 2-D array (tickers x bars), right-aligned
+            lengths: Number of real (non-padded) bars per ticker
+            frames: Sorted source frames by ticker
+        """
+        self.tickers = list(tickers)
+        self.fields = fields
+        self.lengths = np.asarray(lengths)
+        self.frames = frames or {}
+        self._rows = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Dict[str, pd.DataFrame],
+        fields: Iterable[str] = PANEL_FIELDS,
+        timestamp_col: str = "timestamp",
+        max_bars: Optional[int] = None,
+    ) -> "IndicatorPanel":
+        """
+        Build a panel from per-ticker daily frames.
+
+        Args:
+            frames: Ticker -> daily DataFrame (empty frames are skipped)
+            fields: Columns to load into the panel
+            timestamp_col: Column used to sort each frame
+            max_bars: Keep only the most recent bars per ticker
+
+        Returns:
+            IndicatorPanel
+        """
+        fields = tuple(fields)
+        prepared = {}
+        for ticker, df in frames.items():
+            if df is None or df.empty or not set(fields).issubset(df.columns):
+                continue
+            if timestamp_col in df.columns:
+                if not pd.api.types.is_datetime64_any_dtype(df[timestamp_col]):
+                    df = df.assign(**{timestamp_col: pd.to_datetime(df[timestamp_col])})
+                if not df[timestamp_col].is_monotonic_increasing:
+                    df = df.sort_values(timestamp_col)
+            if max_bars:
+                df = df.tail(max_bars)
+            prepared[ticker] = df
+
+        tickers = list(prepared)
+        lengths = np.array([len(prepared[t]) for t in tickers], dtype=np.int64)
+        width = int(lengths.max()) if len(lengths) else 0
+
+        # One (tickers x bars x fields) block, filled one ticker at a time
+        block = np.full((len(tickers), width, len(fields)), np.nan)
+        for i, ticker in enumerate(tickers):
+            df = prepared[ticker]
+            for j, field in enumerate(fields):
+                column = df[field]
+                if not pd.api.types.is_numeric_dtype(column.dtype):
+                    column = pd.to_numeric(column, errors="coerce")
+                block[i, width - lengths[i] :, j] = column.to_numpy(dtype=np.float64)
+
+        arrays = {field: block[:, :, j].copy() for j, field in enumerate(fields)}
+
+        return cls(tickers, arrays, lengths, prepared)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._rows
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.fields[field]
+
+    def frame(self, ticker: str) -> pd.DataFrame:
+        """Sorted source frame for a ticker (row order matches the panel)."""
+        return self.frames[ticker].copy(deep=False)
+
+    def series(self, values: np.ndarray, ticker: str) -> pd.Series:
+        """
+        Extract one ticker's indicator values, aligned to its source frame.
+
+        Args:
+            values: Indicator array computed over this panel
+            ticker: Ticker symbol
+
+        Returns:
+            Series indexed like frame(ticker)
+        """
+        row = self._rows[ticker]
+        length = int(self.lengths[row])
+        data = values[row, values.shape[-1] - length :] if length else values[row, :0]
+        return pd.Series(data, index=self.frames[ticker].index)
+
+    def latest(self, values: np.ndarray) -> pd.Series:
+        """Most recent value of an indicator for every ticker."""
+        if values.shape[-1] == 0:
+            return pd.Series(np.nan, index=self.tickers)
+        return pd.Series(values[:, -1], index=self.tickers)
+
+    def ema(self, span: int = 20, field: str = "close") -> np.ndarray:
+        """EMA of a field for every ticker."""
+        return ema(self.fields[field], span)
+
+    def bollinger_bands(
+        self, window: int = 20, num_std: float = 2, field: str = "close"
+    ):
+        """Bollinger Bands (upper, lower, middle) of a field for every ticker."""
+        return bollinger_bands(self.fields[field], window, num_std)
+
+    def rolling_std(self, window: int = 20, field: str = "close") -> np.ndarray:
+        """Rolling standard deviation of a field for every ticker."""
+        return rolling_std(self.fields[field], window)
+
+    def rolling_max(self, window: int, field: str = "high") -> np.ndarray:
+        """Rolling maximum of a field for every ticker."""
+        return rolling_max(self.fields[field], window)
+
+    def rolling_min(self, window: int, field: str = "low") -> np.ndarray:
+        """Rolling minimum of a field for every ticker."""
+        return rolling_min(self.fields[field], window)
+
+    def atr(self, period: int = 14) -> np.ndarray:
+        """Average True Range for every ticker."""
+        return atr(
+            self.fields["high"], self.fields["low"], self.fields["close"], period
+        )
+
+    def average_volume(self, window: int = 20, lag: int = 1) -> np.ndarray:
+        """Lagged rolling average volume for every ticker."""
+        return average_volume(self.fields["volume"], window, lag)
+
+
+# --- Single-ticker views ---
+
+
+def _as_row(series: pd.Series) -> np.ndarray:
+    return pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)[None, :]
+
+
+def ema_series(series: pd.Series, span: int = 20) -> pd.Series:
+    """EMA of a single series through the panel kernels."""
+    return pd.Series(ema(_as_row(series), span)[0], index=series.index)
+
+
+def bollinger_band_series(series: pd.Series, window: int = 20, num_std: float = 2):
+    """Bollinger Bands (upper, lower, middle) of a single series."""
+    upper, lower, middle = bollinger_bands(_as_row(series), window, num_std)
+    return (
+        pd.Series(upper[0], index=series.index),
+        pd.Series(lower[0], index=series.index),
+        pd.Series(middle[0], index=series.index),
+    )
+
+
+def atr_series(df: pd.DataFrame, period: int = 14) -> pd.Series:
+    """Average True Range of a single OHLC frame."""
+    values = atr(_as_row(df["high"]), _as_row(df["low"]), _as_row(df["close"]), period)
+    return pd.Series(values[0], index=df.index)
+
+
+def wilder_atr_series(df: pd.DataFrame, period: int = 14) -> pd.Series:
+    """Wilder's Average True Range of a single OHLC frame."""
+    values = wilder_atr(
+        _as_row(df["high"]), _as_row(df["low"]), _as_row(df["close"]), period
+    )
+    return pd.Series(values[0], index=df.index)
+
+
+def vwap_series(df: pd.DataFrame) -> pd.Series:
+    """Cumulative VWAP of a single session's OHLCV frame."""
+    values = vwap(
+        _as_row(df["high"]),
+        _as_row(df["low"]),
+        _as_row(df["close"]),
+        _as_row(df["volume"]),
+    )
+    return pd.Series(values[0], index=df.index)
@@ -0,0 +1,761 @@
+"""
+Object-store manifest (catalog) for per-ticker bar datasets.
+
+A single manifest object records, for every bar object in Spaces:
+- ticker and interval
+- min/max timestamp and row count
+- byte size, schema version and content hash
+- open gap count (-1 until a gap check has run, see record_gap_check)
+- heal attempts that ran without filling the open gaps
+- when the bars were last taken from the API (see record_api_sync)
+
+Writers update it on every successful bar write (see storage_format.write_bars)
+and readers answer "does it exist / how many rows / how fresh" for the whole
+universe with one GET instead of N HEAD or download requests.
+
+Updates are read-modify-write with optimistic concurrency: the manifest is
+re-read, the pending entries are merged and the new version is written with a
+conditional PUT (If-Match on the ETag that was read). A concurrent writer
+causes a retry instead of a lost update. Backends (or botocore versions) that
+reject conditional PUTs get the same read-modify-write under a lock object
+instead, never an unguarded overwrite.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from uuid import uuid4
+
+import pandas as pd
+from botocore.exceptions import ClientError, ParamValidationError
+
+from .config import SPACES_BUCKET_NAME
+from .spaces_manager import DELTA_DIRECTORY, get_spaces_client, serialize_dataframe
+from .storage_format import (
+    BAR_SCHEMA_VERSION,
+    PARQUET_AVAILABLE,
+    TIMESTAMP_COLUMNS,
+    csv_object_name,
+)
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PARQUET_OBJECT = "data/_manifest.parquet"
+MANIFEST_CSV_OBJECT = "data/_manifest.csv"
+MANIFEST_LOCK_OBJECT = "data/_manifest.lock"
+
+# A lock older than this is treated as abandoned by a crashed writer
+MANIFEST_LOCK_LEASE_SECONDS = 30
+# Wait before re-reading the lock, so a racing writer's PUT has landed
+MANIFEST_LOCK_SETTLE_SECONDS = 0.5
+
+MANIFEST_COLUMNS = [
+    "object_name",
+    "ticker",
+    "interval",
+    "min_timestamp",
+    "max_timestamp",
+    "row_count",
+    "byte_size",
+    "schema_version",
+    "content_hash",
+    "updated_at",
+    "gap_count",
+    "heal_attempts",
+    "api_synced_at",
+]
+
+TIMESTAMP_FIELDS = ("min_timestamp", "max_timestamp", "updated_at", "api_synced_at")
+
+# gap_count of an object whose series has not been checked for gaps
+GAPS_UNKNOWN = -1
+
+# Directory -> interval for both the data/ layout and the DataFetchManager layout
+_DIRECTORY_INTERVALS = {
+    "data/daily": "daily",
+    "data/intraday": "1min",
+    "data/intraday_30min": "30min",
+    "daily": "daily",
+    "intraday_1min": "1min",
+    "intraday_30min": "30min",
+}
+
+_CONFLICT_ERROR_CODES = {
+    "PreconditionFailed",
+    "412",
+    "ConditionalRequestConflict",
+    "409",
+}
+_UNSUPPORTED_ERROR_CODES = {"NotImplemented", "501"}
+
+
+def base_object_for_segment(object_name: str) -> Optional[str]:
+    """
+    Map a delta segment object to the base object it belongs to.
+
+    Args:
+        object_name: e.g. "intraday_1min/_deltas/AAPL/20250102T143100.parquet"
+
+    Returns:
+        Base object name (e.g. "intraday_1min/AAPL.csv"), or None if not a segment
+    """
+    marker = f"/{DELTA_DIRECTORY}/"
+    if marker not in object_name:
+        return None
+    directory, _, rest = object_name.partition(marker)
+    stem = rest.split("/", 1)[0]
+    return f"{directory}/{stem}.csv"
+
+
+def parse_bar_object_name(object_name: str) -> Optional[Tuple[str, str]]:
+    """
+    Extract (ticker, interval) from a bar object name.
+
+    Args:
+        object_name: e.g. "data/daily/AAPL_daily.csv" or "intraday_30min/AAPL.csv"
+
+    Returns:
+        Tuple of (ticker, interval), or None if the name is not a bar object
+    """
+    directory, _, filename = csv_object_name(object_name).rpartition("/")
+    interval = _DIRECTORY_INTERVALS.get(directory)
+    if interval is None or not filename:
+        return None
+    stem = filename.rsplit(".", 1)[0]
+    ticker = stem.split("_", 1)[0]
+    return ticker, interval
+
+
+def compute_content_hash(df: pd.DataFrame) -> str:
+    """
+    Compute a stable content hash for a DataFrame.
+
+    Args:
+        df: DataFrame to hash
+
+    Returns:
+        Hex digest of the row hashes
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).values
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()[:32]
+
+
+def _timestamp_bounds(df: pd.DataFrame):
+    """Return (min, max) UTC timestamps for the first timestamp-like column."""
+    for column in TIMESTAMP_COLUMNS:
+        if column in df.columns:
+            values = pd.to_datetime(df[column], utc=True, errors="coerce").dropna()
+            if not values.empty:
+                return values.min(), values.max()
+            break
+    return pd.NaT, pd.NaT
+
+
+def build_manifest_entry(
+    object_name: str,
+    df: pd.DataFrame,
+    byte_size: int,
+    schema_version: int = BAR_SCHEMA_VERSION,
+) -> Optional[Dict]:
+    """
+    Build a manifest entry for a bar object write.
+
+    Args:
+        object_name: Object name written (csv or parquet)
+        df: DataFrame that was written
+        byte_size: Size of the stored payload in bytes
+        schema_version: Storage schema version of the payload
+
+    Returns:
+        Manifest entry dict, or None if the object is not a bar object
+    """
+    parsed = parse_bar_object_name(object_name)
+    if parsed is None:
+        return None
+
+    ticker, interval = parsed
+    min_ts, max_ts = _timestamp_bounds(df)
+    return {
+        "object_name": csv_object_name(object_name),
+        "ticker": ticker,
+        "interval": interval,
+        "min_timestamp": min_ts,
+        "max_timestamp": max_ts,
+        "row_count": int(len(df)),
+        "byte_size": int(byte_size),
+        "schema_version": int(schema_version),
+        "content_hash": compute_content_hash(df),
+        "updated_at": pd.Timestamp.now(tz="UTC"),
+        "gap_count": GAPS_UNKNOWN,
+        "heal_attempts": 0,
+        "api_synced_at": pd.NaT,
+    }
+
+
+class DatasetManifest:
+    """Catalog of per-ticker bar objects stored in a single manifest object."""
+
+    def __init__(self, max_retries: int = 5):
+        """
+        Initialize the manifest.
+
+        Args:
+            max_retries: Attempts for a commit (conditional PUT or lock) before
+                giving up
+        """
+        self.max_retries = max_retries
+        self._lock = threading.RLock()
+        self._pending_writes: Dict[str, Dict] = {}
+        self._pending_appends: Dict[str, list] = {}
+        # object name -> (absolute check?, gap count, heal attempts or None to keep)
+        self._pending_gaps: Dict[str, Tuple[bool, int, Optional[int]]] = {}
+        # object name -> time its bars were last taken from the API
+        self._pending_syncs: Dict[str, pd.Timestamp] = {}
+        self._batch_depth = 0
+        self._snapshot: Optional[pd.DataFrame] = None
+        self._conditional_writes = True
+
+    @property
+    def object_name(self) -> str:
+        """Manifest object name for the storage format available."""
+        return MANIFEST_PARQUET_OBJECT if PARQUET_AVAILABLE else MANIFEST_CSV_OBJECT
+
+    def _empty_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(columns=MANIFEST_COLUMNS)
+
+    def _fetch(self) -> Tuple[pd.DataFrame, Optional[str]]:
+        """GET the manifest object; returns (DataFrame, ETag or None if absent)."""
+        client = get_spaces_client()
+        if not client:
+            return self._empty_frame(), None
+
+        object_name = self.object_name
+        try:
+            response = client.get_object(Bucket=SPACES_BUCKET_NAME, Key=object_name)
+            content = response["Body"].read()
+        except ClientError as e:
+            error_code = str(e.response.get("Error", {}).get("Code", ""))
+            if error_code not in {"NoSuchKey", "404", "NotFound"}:
+                logger.warning(f"⚠️ Could not read manifest {object_name}: {e}")
+            return self._empty_frame(), None
+
+        if object_name.endswith(".parquet"):
+            df = pd.read_parquet(io.BytesIO(content))
+        else:
+            df = pd.read_csv(io.BytesIO(content))
+            for column in TIMESTAMP_FIELDS:
+                if column in df:
+                    df[column] = pd.to_datetime(df[column], utc=True, errors="coerce")
+        return df, response.get("ETag")
+
+    def load(self, refresh: bool = False) -> pd.DataFrame:
+        """
+        Load the manifest with a single GET (cached until refresh).
+
+        Args:
+            refresh: Force a new GET even if a snapshot is cached
+
+        Returns:
+            Manifest DataFrame with one row per bar object
+        """
+        with self._lock:
+            if self._snapshot is None or refresh:
+                self._snapshot, _ = self._fetch()
+            return self._snapshot
+
+    def query(
+        self,
+        ticker: Optional[str] = None,
+        interval: Optional[str] = None,
+        prefix: Optional[str] = None,
+        refresh: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Query manifest entries.
+
+        Args:
+            ticker: Filter by ticker symbol
+            interval: Filter by interval ('daily', '30min', '1min')
+            prefix: Filter by object name prefix (e.g. 'data/daily/')
+            refresh: Force a new GET of the manifest
+
+        Returns:
+            Matching manifest rows
+        """
+        df = self.load(refresh=refresh)
+        if df.empty:
+            return df
+        mask = pd.Series(True, index=df.index)
+        if ticker is not None:
+            mask &= df["ticker"] == ticker
+        if interval is not None:
+            mask &= df["interval"] == interval
+        if prefix is not None:
+            mask &= df["object_name"].str.startswith(prefix)
+        return df[mask]
+
+    def get_entry(self, object_name: str, refresh: bool = False) -> Optional[Dict]:
+        """
+        Get the manifest entry for a single object.
+
+        Args:
+            object_name: Logical (csv) or parquet object name
+            refresh: Force a new GET of the manifest
+
+        Returns:
+            Entry dict, or None if the object is not in the manifest
+        """
+        df = self.load(refresh=refresh)
+        if df.empty:
+            return None
+        match = df[df["object_name"] == csv_object_name(object_name)]
+        if match.empty:
+            return None
+        return match.iloc[-1].to_dict()
+
+    def record_write(
+        self,
+        object_name: str,
+        df: pd.DataFrame,
+        byte_size: int,
+        schema_version: int = BAR_SCHEMA_VERSION,
+    ) -> bool:
+        """
+        Record a full write of a bar object (replaces its entry).
+
+        Delta segments are folded into their base object's entry instead.
+
+        Args:
+            object_name: Object name written
+            df: DataFrame that was written
+            byte_size: Stored payload size in bytes
+            schema_version: Storage schema version
+
+        Returns:
+            bool: True if recorded (and committed, outside a batch)
+        """
+        base_object = base_object_for_segment(object_name)
+        if base_object is not None:
+            return self.record_append(base_object, df, byte_size, schema_version)
+
+        entry = build_manifest_entry(object_name, df, byte_size, schema_version)
+        if entry is None:
+            return True
+
+        with self._lock:
+            self._pending_writes[entry["object_name"]] = entry
+            self._pending_appends.pop(entry["object_name"], None)
+            if self._batch_depth:
+                return True
+        return self.commit()
+
+    def record_append(
+        self,
+        base_object: str,
+        df: pd.DataFrame,
+        byte_size: int,
+        schema_version: int = BAR_SCHEMA_VERSION,
+    ) -> bool:
+        """
+        Record rows appended to a base object as a delta segment.
+
+        Args:
+            base_object: Base object the rows were appended to
+            df: Appended rows
+            byte_size: Size of the segment payload
+            schema_version: Storage schema version
+
+        Returns:
+            bool: True if recorded (and committed, outside a batch)
+        """
+        entry = build_manifest_entry(base_object, df, byte_size, schema_version)
+        if entry is None:
+            return True
+
+        with self._lock:
+            self._pending_appends.setdefault(entry["object_name"], []).append(entry)
+            if self._batch_depth:
+                return True
+        return self.commit()
+
+    def record_gap_check(
+        self, object_name: str, gap_count: int, heal_attempts: Optional[int] = 0
+    ) -> bool:
+        """
+        Record the result of a full gap check of a bar object's series.
+
+        Args:
+            object_name: Base object that was checked
+            gap_count: Gaps still open after the check (0 = complete)
+            heal_attempts: Heals so far that left those gaps open (None keeps
+                the recorded count)
+
+        Returns:
+            bool: True if recorded (and committed, outside a batch)
+        """
+        return self._record_gaps(
+            object_name, absolute=True, count=gap_count, attempts=heal_attempts
+        )
+
+    def record_new_gaps(self, object_name: str, gap_count: int) -> bool:
+        """
+        Record gaps introduced by an append (e.g. a compact fetch that skipped bars).
+
+        Args:
+            object_name: Base object the rows were appended to
+            gap_count: Gaps between the stored series and the appended rows
+
+        Returns:
+            bool: True if recorded (and committed, outside a batch)
+        """
+        if gap_count <= 0:
+            return True
+        return self._record_gaps(object_name, absolute=False, count=gap_count)
+
+    def _record_gaps(
+        self,
+        object_name: str,
+        absolute: bool,
+        count: int,
+        attempts: Optional[int] = None,
+    ) -> bool:
+        object_name = csv_object_name(object_name)
+        with self._lock:
+            previous = self._pending_gaps.get(object_name)
+            if not absolute and previous is not None:
+                absolute, count, attempts = (
+                    previous[0],
+                    previous[1] + count,
+                    previous[2],
+                )
+            self._pending_gaps[object_name] = (absolute, int(count), attempts)
+            if self._batch_depth:
+                return True
+        return self.commit()
+
+    def record_api_sync(
+        self, object_name: str, synced_at: Optional[pd.Timestamp] = None
+    ) -> bool:
+        """
+        Record that a bar object's latest bars were taken from the API.
+
+        Kept across full writes and appends of the object, so locally derived
+        bars can be reconciled against the API per object on elapsed time.
+
+        Args:
+            object_name: Base object that was written
+            synced_at: Time of the API fetch (defaults to now)
+
+        Returns:
+            bool: True if recorded (and committed, outside a batch)
+        """
+        synced_at = (
+            pd.Timestamp.now(tz="UTC") if synced_at is None else pd.Timestamp(synced_at)
+        )
+        with self._lock:
+            self._pending_syncs[csv_object_name(object_name)] = synced_at
+            if self._batch_depth:
+                return True
+        return self.commit()
+
+    @contextmanager
+    def batch(self):
+        """
+        Group many record_* calls into a single manifest commit.
+
+        Usage:
+            with get_manifest().batch():
+                ... many bar writes ...
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                should_commit = self._batch_depth == 0
+            if should_commit:
+                self.commit()
+
+    def _apply_pending(
+        self,
+        current: pd.DataFrame,
+        writes: Dict,
+        appends: Dict,
+        gaps: Optional[Dict] = None,
+        syncs: Optional[Dict] = None,
+    ):
+        """Merge pending writes, appends, gap checks and API syncs into a manifest."""
+        rows = {
+            row["object_name"]: row
+            for row in current.to_dict("records")
+            if isinstance(row.get("object_name"), str)
+        }
+        for object_name, entry in writes.items():
+            previous = rows.get(object_name)
+            if previous is not None and pd.isna(entry.get("api_synced_at")):
+                # A rewrite does not say where the bars came from
+                entry = dict(entry, api_synced_at=previous.get("api_synced_at"))
+            rows[object_name] = entry
+
+        for object_name, deltas in appends.items():
+            for delta in deltas:
+                existing = rows.get(object_name)
+                if existing is None:
+                    rows[object_name] = dict(delta)
+                    continue
+                merged = dict(existing)
+                merged["min_timestamp"] = min(
+                    (
+                        t
+                        for t in (existing["min_timestamp"], delta["min_timestamp"])
+                        if pd.notna(t)
+                    ),
+                    default=pd.NaT,
+                )
+                merged["max_timestamp"] = max(
+                    (
+                        t
+                        for t in (existing["max_timestamp"], delta["max_timestamp"])
+                        if pd.notna(t)
+                    ),
+                    default=pd.NaT,
+                )
+                merged["row_count"] = int(existing["row_count"]) + delta["row_count"]
+                merged["byte_size"] = int(existing["byte_size"]) + delta["byte_size"]
+                merged["content_hash"] = hashlib.sha256(
+                    f"{existing['content_hash']}{delta['content_hash']}".encode()
+                ).hexdigest()[:32]
+                merged["updated_at"] = delta["updated_at"]
+                rows[object_name] = merged
+
+        for object_name, (absolute, count, attempts) in (gaps or {}).items():
+            row = rows.get(object_name)
+            if row is None:
+                continue
+            known = pd.notna(row.get("gap_count")) and int(row.get("gap_count")) >= 0
+            if absolute:
+                row["gap_count"] = count
+            elif known:
+                row["gap_count"] = int(row["gap_count"]) + count
+            if attempts is not None:
+                row["heal_attempts"] = attempts
+
+        for object_name, synced_at in (syncs or {}).items():
+            row = rows.get(object_name)
+            if row is not None:
+                row["api_synced_at"] = synced_at
+
+        df = pd.DataFrame(list(rows.values()), columns=MANIFEST_COLUMNS)
+        for column in TIMESTAMP_FIELDS:
+            df[column] = pd.to_datetime(df[column], utc=True, errors="coerce")
+        for column in ("row_count", "byte_size", "schema_version", "heal_attempts"):
+            df[column] = df[column].fillna(0).astype("int64")
+        df["gap_count"] = df["gap_count"].fillna(GAPS_UNKNOWN).astype("int64")
+        return df.sort_values("object_name").reset_index(drop=True)
+
+    def _put(self, payload: bytes, etag: Optional[str]) -> str:
+        """
+        Write the manifest, conditionally on the ETag that was read.
+
+        Without conditional write support the PUT is unconditional; callers
+        must hold the lock object (see _acquire_lock) in that case.
+
+        Returns:
+            'ok', 'conflict', 'unsupported' or 'error'
+        """
+        client = get_spaces_client()
+        if not client:
+            return "error"
+
+        kwargs = {
+            "Bucket": SPACES_BUCKET_NAME,
+            "Key": self.object_name,
+            "Body": payload,
+        }
+        if self._conditional_writes:
+            if etag:
+                kwargs["IfMatch"] = etag
+            else:
+                kwargs["IfNoneMatch"] = "*"
+
+        try:
+            client.put_object(**kwargs)
+            return "ok"
+        except ParamValidationError:
+            logger.warning(
+                "⚠️ Conditional PUT not supported by botocore - using a lock object"
+            )
+            self._conditional_writes = False
+            return "unsupported"
+        except ClientError as e:
+            error_code = str(e.response.get("Error", {}).get("Code", ""))
+            if error_code in _CONFLICT_ERROR_CODES:
+                return "conflict"
+            if error_code in _UNSUPPORTED_ERROR_CODES and self._conditional_writes:
+                logger.warning(
+                    "⚠️ Storage backend rejected conditional PUT - using a lock object"
+                )
+                self._conditional_writes = False
+                return "unsupported"
+            logger.error(f"❌ Failed to write manifest: {e}")
+            return "error"
+
+    def _read_lock(self, client) -> Optional[Dict]:
+        """Current holder of the lock object ({'token', 'expires_at'}), or None."""
+        try:
+            response = client.get_object(
+                Bucket=SPACES_BUCKET_NAME, Key=MANIFEST_LOCK_OBJECT
+            )
+            return json.loads(response["Body"].read())
+        except ClientError as e:
+            error_code = str(e.response.get("Error", {}).get("Code", ""))
+            if error_code in {"NoSuchKey", "404", "NotFound"}:
+                return None
+            raise
+
+    def _acquire_lock(self, token: str) -> bool:
+        """
+        Take the manifest lock object for a read-modify-write.
+
+        Used when the backend cannot do conditional PUTs, so the lock itself is
+        last-writer-wins: it is written, then re-read after a settle delay to
+        check that no racing writer replaced it.
+
+        Returns:
+            True if this token holds the lock
+        """
+        client = get_spaces_client()
+        if not client:
+            return False
+        try:
+            holder = self._read_lock(client)
+            if holder is not None and holder["expires_at"] > time.time():
+                return False
+            lease = {
+                "token": token,
+                "expires_at": time.time() + MANIFEST_LOCK_LEASE_SECONDS,
+            }
+            client.put_object(
+                Bucket=SPACES_BUCKET_NAME,
+                Key=MANIFEST_LOCK_OBJECT,
+                Body=json.dumps(lease).encode(),
+            )
+            time.sleep(MANIFEST_LOCK_SETTLE_SECONDS)
+            holder = self._read_lock(client)
+            return holder is not None and holder["token"] == token
+        except (ClientError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️ Could not take manifest lock: {e}")
+            return False
+
+    def _release_lock(self, token: str):
+        """Delete the lock object if this token still holds it."""
+        client = get_spaces_client()
+        if not client:
+            return
+        try:
+            holder = self._read_lock(client)
+            if holder is not None and holder["token"] == token:
+                client.delete_object(
+                    Bucket=SPACES_BUCKET_NAME, Key=MANIFEST_LOCK_OBJECT
+                )
+        except (ClientError, ValueError, KeyError) as e:
+            # The lease expires on its own
+            logger.warning(f"⚠️ Could not release manifest lock: {e}")
+
+    def _merge_and_put(
+        self, writes: Dict, appends: Dict, gaps: Dict, syncs: Dict
+    ) -> Tuple[str, pd.DataFrame]:
+        """Re-read the manifest, merge pending entries and write it back once."""
+        current, etag = self._fetch()
+        merged = self._apply_pending(current, writes, appends, gaps, syncs)
+        payload = serialize_dataframe(merged, "parquet" if PARQUET_AVAILABLE else "csv")
+        return self._put(payload, etag), merged
+
+    def commit(self) -> bool:
+        """
+        Commit pending entries with optimistic concurrency.
+
+        Returns:
+            bool: True if the manifest was written (or nothing was pending)
+        """
+        with self._lock:
+            if not (
+                self._pending_writes
+                or self._pending_appends
+                or self._pending_gaps
+                or self._pending_syncs
+            ):
+                return True
+            writes = dict(self._pending_writes)
+            appends = {k: list(v) for k, v in self._pending_appends.items()}
+            gaps = dict(self._pending_gaps)
+            syncs = dict(self._pending_syncs)
+            self._pending_writes.clear()
+            self._pending_appends.clear()
+            self._pending_gaps.clear()
+            self._pending_syncs.clear()
+
+        attempt = 0
+        while attempt < self.max_retries:
+            if self._conditional_writes:
+                result, merged = self._merge_and_put(writes, appends, gaps, syncs)
+            else:
+                # No conditional PUTs: hold the lock object across the read-modify-write
+                token = uuid4().hex
+                result, merged = "conflict", None
+                if self._acquire_lock(token):
+                    try:
+                        result, merged = self._merge_and_put(
+                            writes, appends, gaps, syncs
+                        )
+                    finally:
+                        self._release_lock(token)
+
+            if result == "ok":
+                with self._lock:
+                    self._snapshot = merged
+                logger.debug(
+                    f"📒 Manifest committed: {len(writes)} writes, "
+                    f"{sum(len(v) for v in appends.values())} appends"
+                )
+                return True
+            if result == "error":
+                break
+            if result == "unsupported":
+                # Nothing was written; retry at once under the lock object
+                continue
+            # Conflict: another writer got in first - back off and re-merge
+            time.sleep(0.05 * (2**attempt))
+            attempt += 1
+
+        # Put the entries back so a later commit can retry them
+        with self._lock:
+            for object_name, entry in writes.items():
+                self._pending_writes.setdefault(object_name, entry)
+            for object_name, deltas in appends.items():
+                self._pending_appends.setdefault(object_name, [])[:0] = deltas
+            for object_name, gap in gaps.items():
+                self._pending_gaps.setdefault(object_name, gap)
+            for object_name, synced_at in syncs.items():
+                self._pending_syncs.setdefault(object_name, synced_at)
+        logger.error("❌ Manifest commit failed - entries kept for the next commit")
+        return False
+
+
+# Global manifest instance
+_global_manifest: Optional[DatasetManifest] = None
+
+
+def get_manifest() -> DatasetManifest:
+    """Get or create the global dataset manifest."""
+    global _global_manifest
+    if _global_manifest is None:
+        _global_manifest = DatasetManifest()
+    return _global_manifest
@@ -14,8 +14,14 @@ from typing import Dict, List, Optional, Tuple
 import pandas as pd
 
 from .async_client import AsyncAlphaVantageClient, fetch_multiple_tickers_sync
-from .cache import cache_key_for_ticker_data, cached_fetch_wrapper, get_cache
+from .cache import (
+    bar_interval_for,
+    cache_key_for_ticker_data,
+    cached_fetch_wrapper,
+    get_cache,
+)
 from .data_storage import save_df_to_s3
+from .manifest import get_manifest
 from .ticker_manager import clean_ticker_list, read_master_tickerlist
 
 logger = logging.getLogger(__name__)
@@ -58,60 +64,54 @@ class DataPipeline:
         """
         start_time = time.time()
 
-        # Check cache first if enabled
-        if self.use_cache:
-            cached_results = {}
-            uncached_tickers = []
-
-            for ticker in tickers:
-                cache_key = cache_key_for_ticker_data(
-                    ticker, data_type, interval, outputsize
-                )
-                cached_data = self.cache.get(cache_key)
-                if cached_data is not None:
-                    cached_results[ticker] = cached_data
-                else:
-                    uncached_tickers.append(ticker)
-
-            logger.info(
-                f"Cache check: {len(cached_results)} hits, "
-                f"{len(uncached_tickers)} misses"
-            )
-        else:
-            cached_results = {}
-            uncached_tickers = tickers
-
-        # Fetch uncached data
-        if uncached_tickers:
+        async def fetch(
+            batch: List[str],
+        ) -> Dict[str, Tuple[Optional[pd.DataFrame], bool]]:
             async with AsyncAlphaVantageClient() as client:
-                fresh_results = await client.fetch_multiple_tickers(
-                    tickers=uncached_tickers,
+                return await client.fetch_multiple_tickers(
+                    tickers=batch,
                     data_type=data_type,
                     interval=interval,
                     outputsize=outputsize,
                     max_concurrent=self.max_concurrent_api,
                 )
 
-            # Cache successful results
-            if self.use_cache:
-                for ticker, (df, success) in fresh_results.items():
-                    if success and df is not None:
-                        cache_key = cache_key_for_ticker_data(
-                            ticker, data_type, interval, outputsize
-                        )
-                        self.cache.set(cache_key, (df, success), self.cache_ttl)
+        if self.use_cache:
+            # Stale tickers are served and refreshed in the background; only
+            # misses are fetched here, and only once across concurrent batches
+            keys = {
+                ticker: cache_key_for_ticker_data(
+                    ticker, data_type, interval, outputsize
+                )
+                for ticker in tickers
+            }
+            states = {}
+            all_results = await self.cache.get_or_refresh_many_async(
+                keys,
+                fetch,
+                ttl_seconds=self.cache_ttl,
+                interval=bar_interval_for(data_type, interval),
+                cacheable=lambda result: result is not None
+                and result[1]
+                and result[0] is not None,
+                states=states,
+            )
+            cached = sum(state != "miss" for state in states.values())
+            stale = sum(state == "stale" for state in states.values())
+            logger.info(
+                f"Cache check: {cached} hits ({stale} stale), "
+                f"{len(tickers) - cached} misses"
+            )
         else:
-            fresh_results = {}
-
-        # Combine cached and fresh results
-        all_results = {**cached_results, **fresh_results}
+            cached = 0
+            all_results = await fetch(tickers) if tickers else {}
 
         elapsed = time.time() - start_time
         successful = sum(1 for _, success in all_results.values() if success)
 
         logger.info(
             f"Fetched {len(tickers)} tickers in {elapsed:.2f}s "
-            f"({successful} successful, {len(cached_results)} from cache)"
+            f"({successful} successful, {cached} from cache)"
         )
 
         return all_results
@@ -165,8 +165,11 @@ class DataPipeline:
             logger.warning("No valid data to save")
             return save_results
 
-        # Use ThreadPoolExecutor for concurrent I/O operations
-        with ThreadPoolExecutor(max_workers=self.max_concurrent_storage) as executor:
+        # Use ThreadPoolExecutor for concurrent I/O operations; the saves share
+        # one manifest commit
+        with get_manifest().batch(), ThreadPoolExecutor(
+            max_workers=self.max_concurrent_storage
+        ) as executor:
             # Submit save tasks
             future_to_ticker = {
                 executor.submit(
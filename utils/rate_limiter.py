@@ -0,0 +1,293 @@
+"""
+Shared token-bucket rate limiter for Alpha Vantage calls.
+
+Every fetch path used to pace itself: RateLimiter in utils.async_client,
+UnifiedDataFetcher._apply_rate_limiting, and fixed time.sleep() calls in the
+fetch jobs. The orchestrator runs jobs as separate, possibly overlapping
+processes, so the real request rate was the sum of independent limiters and
+one job could burn the quota while another idled.
+
+TokenBucket keeps its state (tokens, last refill time, AIMD rate scale) in a
+32-byte file that every process on the host maps to the same bucket. Each
+acquire is a read-modify-write of that record under a short fcntl lock; nobody
+sleeps while holding it. Requests pay a per-endpoint cost, the bucket holds up
+to `burst` tokens, and throttling responses ("Note" payloads or HTTP 429)
+halve the refill rate (multiplicative decrease) while successful calls raise
+it back by a small step (additive increase).
+
+Without a state path the bucket is private to the process (e.g. tests, or
+platforms without fcntl).
+"""
+
+import asyncio
+import logging
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .config import (
+    ALPHA_VANTAGE_BURST,
+    ALPHA_VANTAGE_CALLS_PER_MINUTE,
+    RATE_LIMIT_STATE_FILE,
+)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# tokens, updated_at, rate_scale, throttled_at
+_STATE = struct.Struct("<dddd")
+
+# Tokens charged per Alpha Vantage function; unknown functions cost DEFAULT_COST
+DEFAULT_COST = 1.0
+ENDPOINT_COSTS: Dict[str, float] = {
+    "TIME_SERIES_INTRADAY": 1.0,
+    "TIME_SERIES_DAILY": 1.0,
+    "TIME_SERIES_DAILY_ADJUSTED": 1.0,
+    "GLOBAL_QUOTE": 1.0,
+    "OVERVIEW": 1.0,
+}
+
+
+def request_cost(params: Optional[Dict[str, Any]]) -> float:
+    """
+    Token cost of one Alpha Vantage request.
+
+    Args:
+        params: Request parameters (the "function" entry selects the cost)
+
+    Returns:
+        Number of tokens to acquire
+    """
+    function = (params or {}).get("function")
+    return ENDPOINT_COSTS.get(function, DEFAULT_COST)
+
+
+def is_throttled(payload: Any = None, status_code: Optional[int] = None) -> bool:
+    """
+    Whether a response is Alpha Vantage telling us to slow down.
+
+    Args:
+        payload: Parsed JSON body, if any
+        status_code: HTTP status code, if known
+
+    Returns:
+        True for HTTP 429, a "Note" payload or a rate-limit "Information" payload
+    """
+    if status_code == 429:
+        return True
+    if not isinstance(payload, dict):
+        return False
+    if "Note" in payload:
+        return True
+    return "rate limit" in str(payload.get("Information", "")).lower()
+
+
+def is_throttled_response(response) -> bool:
+    """
+    Whether a requests.Response is a throttling response.
+
+    CSV requests still get a JSON body when throttled, so only bodies that look
+    like a JSON object are parsed.
+
+    Args:
+        response: requests.Response
+
+    Returns:
+        True if the response signals rate limiting
+    """
+    if response.status_code == 429:
+        return True
+    if not response.text.lstrip().startswith("{"):
+        return False
+    try:
+        return is_throttled(response.json())
+    except ValueError:
+        return False
+
+
+class TokenBucket:
+    """Token bucket with AIMD backoff, optionally shared through a state file."""
+
+    def __init__(
+        self,
+        calls_per_minute: float = ALPHA_VANTAGE_CALLS_PER_MINUTE,
+        burst: float = ALPHA_VANTAGE_BURST,
+        state_path: Optional[str] = None,
+        min_rate_scale: float = 0.05,
+        increase_step: float = 0.05,
+    ):
+        """
+        Create or attach to a bucket.
+
+        Args:
+            calls_per_minute: Sustained request budget at full rate
+            burst: Bucket capacity (requests allowed back to back)
+            state_path: File shared by all processes; None keeps state in memory
+            min_rate_scale: Floor of the AIMD rate multiplier
+            increase_step: Rate multiplier recovered per successful call
+        """
+        self.rate = calls_per_minute / 60.0
+        self.capacity = max(1.0, float(burst))
+        self.min_rate_scale = min_rate_scale
+        self.increase_step = increase_step
+        self.state_path = state_path if fcntl is not None else None
+        self._lock = threading.Lock()
+        self._memory = (self.capacity, time.time(), 1.0, 0.0)
+        self._fd = None
+
+        if self.state_path:
+            os.makedirs(
+                os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True
+            )
+            self._fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    def _read(self):
+        if self._fd is None:
+            return self._memory
+        raw = os.pread(self._fd, _STATE.size, 0)
+        if len(raw) < _STATE.size:
+            return (self.capacity, time.time(), 1.0, 0.0)
+        return _STATE.unpack(raw)
+
+    def _write(self, state):
+        if self._fd is None:
+            self._memory = state
+        else:
+            os.pwrite(self._fd, _STATE.pack(*state), 0)
+
+    def _update(self, change):
+        """Apply change(state, now) -> (new_state, result) atomically."""
+        with self._lock:
+            if self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                tokens, updated_at, scale, throttled_at = self._read()
+                elapsed = max(0.0, now - updated_at)
+                tokens = min(self.capacity, tokens + elapsed * self.rate * scale)
+                state, result = change((tokens, now, scale, throttled_at), now)
+                self._write(state)
+                return result
+            finally:
+                if self._fd is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def try_acquire(self, cost: float = DEFAULT_COST) -> float:
+        """
+        Take tokens if available.
+
+        Args:
+            cost: Tokens needed (capped at the bucket capacity)
+
+        Returns:
+            0.0 if the tokens were taken, otherwise seconds until they will be
+        """
+        cost = min(cost, self.capacity)
+
+        def take(state, now):
+            tokens, updated_at, scale, throttled_at = state
+            if tokens >= cost:
+                return (tokens - cost, updated_at, scale, throttled_at), 0.0
+            return state, (cost - tokens) / (self.rate * scale)
+
+        return self._update(take)
+
+    def acquire(self, cost: float = DEFAULT_COST) -> float:
+        """
+        Block until tokens are available and take them.
+
+        Args:
+            cost: Tokens needed
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(cost)
+            if wait <= 0:
+                if waited > 1:
+                    logger.debug(f"Rate limiting: waited {waited:.1f} seconds")
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, cost: float = DEFAULT_COST) -> float:
+        """Async variant of acquire() that yields to the event loop while waiting."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(cost)
+            if wait <= 0:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def on_success(self) -> None:
+        """Additive increase of the shared rate after a successful call."""
+
+        def increase(state, now):
+            tokens, updated_at, scale, throttled_at = state
+            return (
+                tokens,
+                updated_at,
+                min(1.0, scale + self.increase_step),
+                throttled_at,
+            ), None
+
+        self._update(increase)
+
+    def on_throttled(self) -> None:
+        """Multiplicative decrease of the shared rate and an empty bucket."""
+
+        def decrease(state, now):
+            tokens, updated_at, scale, throttled_at = state
+            # Several in-flight calls report the same throttle; halve once per second
+            if now - throttled_at >= 1.0:
+                scale = max(self.min_rate_scale, scale * 0.5)
+            return (0.0, updated_at, scale, now), scale
+
+        scale = self._update(decrease)
+        logger.warning(
+            f"⚠️ Alpha Vantage throttled - request rate reduced to "
+            f"{self.rate * scale * 60:.1f}/min"
+        )
+
+    @property
+    def rate_scale(self) -> float:
+        """Current AIMD multiplier of the refill rate (1.0 = full rate)."""
+        return self._update(lambda state, now: (state, state[2]))
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        return self._update(lambda state, now: (state, state[0]))
+
+    def close(self) -> None:
+        """Release the state file descriptor."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+_shared_bucket: Optional[TokenBucket] = None
+_shared_bucket_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucket:
+    """
+    The host-wide Alpha Vantage bucket used by every fetch path.
+
+    Returns:
+        TokenBucket backed by RATE_LIMIT_STATE_FILE
+    """
+    global _shared_bucket
+    with _shared_bucket_lock:
+        if _shared_bucket is None:
+            _shared_bucket = TokenBucket(state_path=RATE_LIMIT_STATE_FILE)
+        return _shared_bucket
@@ -0,0 +1,348 @@
+"""
+Local bar resampling from the stored 1-minute series.
+
+DataFetchManager used to request 1-min, 30-min and daily bars from Alpha
+Vantage separately for every ticker, although the coarser intraday bars are
+plain aggregations of the 1-min bars it already stores. This module derives
+them locally:
+
+- resample_bars() builds 5/15/30/60-minute bars for a whole universe at once
+- partial_daily_bars() builds today's regular-session bar so far
+
+Like utils.session_kernels, frames are stacked into flat arrays sorted by
+ticker, then time, converted to exchange wall-clock nanoseconds, and each bar
+is one run of equal (ticker, bucket) keys reduced with ufunc.reduceat:
+open = first, high = max, low = min, close = last, volume = sum.
+
+Bars are labelled with their start time (Alpha Vantage's convention) and
+bucketed from the session start, so 30-min bars start at 04:00, 04:30, ...
+for the extended session and at 09:30, 10:00, ... for the regular session.
+Session closes come from the NYSE calendar, so early-close days end at 13:00
+(17:00 extended) and holidays produce no bars.
+
+reconcile_bars() compares derived bars with API-delivered ones; the fetch
+manager runs it on its periodic 30-min reconciliation fetch.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import TIMEZONE
+from .session_kernels import (
+    DAY_NS,
+    MINUTE_NS,
+    PREMARKET_START,
+    REGULAR_CLOSE,
+    REGULAR_OPEN,
+    _time_ns,
+    stack_frames,
+    wall_clock,
+)
+
+logger = logging.getLogger(__name__)
+
+OHLCV = ("open", "high", "low", "close", "volume")
+
+INTERVAL_MINUTES = {"1min": 1, "5min": 5, "15min": 15, "30min": 30, "60min": 60}
+
+# After-hours trading runs four hours past the regular close (20:00, or 17:00
+# on early-close days)
+POST_MARKET_NS = 4 * 60 * MINUTE_NS
+
+
+def interval_minutes(interval) -> int:
+    """
+    Bar width in minutes.
+
+    Args:
+        interval: '5min', '15min', '30min', '60min' or a number of minutes
+
+    Returns:
+        Minutes per bar
+    """
+    if isinstance(interval, str):
+        if interval not in INTERVAL_MINUTES:
+            raise ValueError(f"Unsupported interval: {interval}")
+        return INTERVAL_MINUTES[interval]
+    return int(interval)
+
+
+@lru_cache(maxsize=32)
+def _calendar_sessions(
+    first_day: int, last_day: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    NYSE trading days between two epoch day numbers with their session times.
+
+    Returns:
+        Tuple of (day numbers, regular open, regular close) as wall-clock
+        nanoseconds since midnight; weekdays with default hours if the
+        calendar is unavailable
+    """
+    start = pd.Timestamp(first_day * DAY_NS)
+    end = pd.Timestamp(last_day * DAY_NS)
+    try:
+        from .market_time import _get_nyse_calendar
+
+        schedule = _get_nyse_calendar().schedule(
+            start_date=start.date(), end_date=end.date()
+        )
+        days = schedule.index.as_unit("ns").asi8 // DAY_NS
+        opens = wall_clock(
+            pd.DatetimeIndex(schedule["market_open"]).as_unit("ns").asi8, TIMEZONE
+        )
+        closes = wall_clock(
+            pd.DatetimeIndex(schedule["market_close"]).as_unit("ns").asi8, TIMEZONE
+        )
+        return days, opens - days * DAY_NS, closes - days * DAY_NS
+    except Exception as e:
+        logger.warning(f"⚠️ NYSE calendar unavailable, assuming weekday sessions: {e}")
+        dates = pd.bdate_range(start, end)
+        days = dates.as_unit("ns").asi8 // DAY_NS
+        return (
+            days,
+            np.full(len(days), _time_ns(REGULAR_OPEN), dtype=np.int64),
+            np.full(len(days), _time_ns(REGULAR_CLOSE), dtype=np.int64),
+        )
+
+
+def session_windows(
+    days: np.ndarray, session: str = "extended"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trading window of each day as wall-clock nanoseconds since midnight.
+
+    Args:
+        days: Epoch day numbers (wall_ns // DAY_NS)
+        session: 'extended' (04:00 to 4h after the close) or 'regular'
+
+    Returns:
+        Tuple of (start, end) arrays; non-trading days get an empty window
+    """
+    days = np.asarray(days, dtype=np.int64)
+    starts = np.zeros(len(days), dtype=np.int64)
+    ends = np.zeros(len(days), dtype=np.int64)
+    if not len(days):
+        return starts, ends
+
+    cal_days, opens, closes = _calendar_sessions(int(days.min()), int(days.max()))
+    pos = np.clip(np.searchsorted(cal_days, days), 0, max(len(cal_days) - 1, 0))
+    trading = (
+        (cal_days[pos] == days) if len(cal_days) else np.zeros(len(days), dtype=bool)
+    )
+
+    if session == "extended":
+        start, end = (
+            np.full(len(days), _time_ns(PREMARKET_START)),
+            closes[pos] + POST_MARKET_NS,
+        )
+    elif session == "regular":
+        start, end = opens[pos], closes[pos]
+    else:
+        raise ValueError(f"Unknown session: {session}")
+
+    starts[trading] = start[trading]
+    ends[trading] = end[trading]
+    return starts, ends
+
+
+def _aggregate(
+    ids: np.ndarray, labels: np.ndarray, fields: Dict[str, np.ndarray]
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Reduce runs of equal (ticker id, label) rows to one OHLCV bar each.
+
+    Returns:
+        Tuple of (first row index of each bar, field arrays)
+    """
+    if not len(labels):
+        return np.array([], dtype=np.int64), {field: np.array([]) for field in OHLCV}
+
+    starts = np.concatenate(
+        ([0], np.flatnonzero((np.diff(ids) != 0) | (np.diff(labels) != 0)) + 1)
+    )
+    ends = np.append(starts[1:], len(labels))
+    return starts, {
+        "open": fields["open"][starts],
+        "high": np.fmax.reduceat(fields["high"], starts),
+        "low": np.fmin.reduceat(fields["low"], starts),
+        "close": fields["close"][ends - 1],
+        "volume": np.add.reduceat(np.nan_to_num(fields["volume"]), starts),
+    }
+
+
+def _session_rows(frames: Dict[str, pd.DataFrame], session: str, timestamp_col: str):
+    """Stack frames and keep the rows inside their day's trading window."""
+    tickers, ids, utc, fields = stack_frames(frames, OHLCV, timestamp_col)
+    wall = wall_clock(utc)
+    days = wall // DAY_NS
+    tod = wall - days * DAY_NS
+    start, end = session_windows(days, session)
+    keep = (tod >= start) & (tod < end)
+    return (
+        tickers,
+        ids[keep],
+        wall[keep],
+        days[keep],
+        tod[keep] - start[keep],
+        {field: values[keep] for field, values in fields.items()},
+    )
+
+
+def _to_frames(tickers, ids, label_wall, bars) -> Dict[str, pd.DataFrame]:
+    """Split stacked bars back into per-ticker frames with UTC timestamps."""
+    timestamps = (
+        pd.DatetimeIndex(label_wall.astype("datetime64[ns]"))
+        .tz_localize(TIMEZONE, ambiguous="NaT", nonexistent="shift_forward")
+        .tz_convert("UTC")
+    )
+    bounds = np.searchsorted(ids, np.arange(len(tickers) + 1))
+    result = {}
+    for i, ticker in enumerate(tickers):
+        lo, hi = bounds[i], bounds[i + 1]
+        if lo == hi:
+            continue
+        df = pd.DataFrame({field: bars[field][lo:hi] for field in OHLCV})
+        df.insert(0, "timestamp", timestamps[lo:hi])
+        result[ticker] = df
+    return result
+
+
+def resample_bars(
+    frames: Dict[str, pd.DataFrame],
+    interval="30min",
+    session: str = "extended",
+    timestamp_col: str = "timestamp",
+) -> Dict[str, pd.DataFrame]:
+    """
+    Aggregate 1-minute bars into wider intraday bars for many tickers.
+
+    Args:
+        frames: Ticker -> 1-min OHLCV frame
+        interval: Target width ('5min', '15min', '30min', '60min' or minutes)
+        session: 'extended' keeps pre/post-market bars, 'regular' only 09:30-close
+        timestamp_col: Timestamp column (a DatetimeIndex takes precedence)
+
+    Returns:
+        Ticker -> frame with UTC timestamp (bar start), open, high, low, close
+        and volume columns; tickers without in-session bars are omitted
+    """
+    width = interval_minutes(interval) * MINUTE_NS
+    tickers, ids, wall, days, since_open, fields = _session_rows(
+        frames, session, timestamp_col
+    )
+
+    # Bucket start in wall-clock time; sorted by (ticker, time) so every bar
+    # is one run of equal (id, label) keys
+    labels = wall - since_open % width
+    starts, bars = _aggregate(ids, labels, fields)
+    return _to_frames(tickers, ids[starts], labels[starts], bars)
+
+
+def partial_daily_bars(
+    frames: Dict[str, pd.DataFrame],
+    day=None,
+    timestamp_col: str = "timestamp",
+) -> pd.DataFrame:
+    """
+    Regular-session daily bar so far for many tickers.
+
+    Args:
+        frames: Ticker -> 1-min OHLCV frame
+        day: Trading date (defaults to today in exchange time)
+        timestamp_col: Timestamp column (a DatetimeIndex takes precedence)
+
+    Returns:
+        DataFrame indexed by ticker with timestamp (the date), open, high,
+        low, close and volume; tickers without bars that day are omitted
+    """
+    if day is None:
+        day = pd.Timestamp.now(tz=TIMEZONE).tz_localize(None)
+    day_number = pd.Timestamp(day).normalize().as_unit("ns").value // DAY_NS
+
+    tickers, ids, wall, days, _, fields = _session_rows(
+        frames, "regular", timestamp_col
+    )
+    today = days == day_number
+    ids = ids[today]
+    starts, bars = _aggregate(
+        ids,
+        np.zeros(len(ids), dtype=np.int64),
+        {field: values[today] for field, values in fields.items()},
+    )
+
+    result = pd.DataFrame(
+        bars, index=pd.Index([tickers[i] for i in ids[starts]], name="ticker")
+    )
+    result.insert(0, "timestamp", pd.Timestamp(day_number * DAY_NS))
+    return result
+
+
+def reconcile_bars(
+    derived: pd.DataFrame,
+    api: pd.DataFrame,
+    rtol: float = 1e-6,
+    volume_rtol: float = 0.01,
+) -> Dict:
+    """
+    Compare locally derived bars with API-delivered bars of the same interval.
+
+    Only timestamps present in both frames are compared; the API frame's
+    latest bar is usually still forming and may legitimately differ.
+
+    Args:
+        derived: Derived bars (timestamp + OHLCV columns)
+        api: API bars
+        rtol: Relative tolerance for prices
+        volume_rtol: Relative tolerance for volume (late prints shift it slightly)
+
+    Returns:
+        Dict with compared/mismatched/missing counts and the mismatched timestamps
+    """
+    if derived is None or derived.empty or api is None or api.empty:
+        return {
+            "compared": 0,
+            "mismatched": 0,
+            "missing": 0,
+            "mismatched_timestamps": [],
+        }
+
+    left = derived.assign(timestamp=pd.to_datetime(derived["timestamp"], utc=True))
+    right = api.assign(timestamp=pd.to_datetime(api["timestamp"], utc=True))
+    latest = right["timestamp"].max()
+    right = right[right["timestamp"] < latest]
+    window = right["timestamp"] >= left["timestamp"].min()
+    merged = left.merge(right[window], on="timestamp", suffixes=("_derived", "_api"))
+
+    bad = np.zeros(len(merged), dtype=bool)
+    for field in OHLCV:
+        tolerance = volume_rtol if field == "volume" else rtol
+        bad |= ~np.isclose(
+            pd.to_numeric(merged[f"{field}_derived"], errors="coerce"),
+            pd.to_numeric(merged[f"{field}_api"], errors="coerce"),
+            rtol=tolerance,
+            equal_nan=True,
+        )
+
+    return {
+        "compared": len(merged),
+        "mismatched": int(bad.sum()),
+        "missing": int(window.sum()) - len(merged),
+        "mismatched_timestamps": merged.loc[bad, "timestamp"].tolist(),
+    }
+
+
+def resample_ticker(
+    df: pd.DataFrame, interval="30min", session: str = "extended"
+) -> Optional[pd.DataFrame]:
+    """
+    Single-ticker convenience wrapper around resample_bars.
+
+    Returns:
+        Resampled frame, or None if the frame has no in-session bars
+    """
+    return resample_bars({"_": df}, interval, session).get("_")
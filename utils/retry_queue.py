@@ -0,0 +1,235 @@
+"""
+Deferred retry queue for fetches that failed or came back stale.
+
+_make_api_request_with_retry used to retry a compact fetch that lacked
+today's bars up to 7 times, sleeping with exponential backoff between tries.
+In the sequential fetch loop that sleep blocked every ticker behind the stale
+one for up to minutes.
+
+A RetryQueue parks such a fetch in a time-ordered heap instead and the loop
+moves on; retry_due() re-runs whatever's backoff has expired between tickers,
+and drain() finishes the stragglers at the end of the cycle. RetryStats
+records how long parked fetches took to recover and after how many attempts,
+or why they were given up.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from .config import RETRY_BASE_DELAY, RETRY_MAX_ATTEMPTS, RETRY_MAX_DELAY
+
+logger = logging.getLogger(__name__)
+
+
+class RetryStats:
+    """Retry latency and outcome distributions for one fetch cycle."""
+
+    def __init__(self):
+        self.parked = Counter()  # reason -> parks
+        self.succeeded_after = Counter()  # attempts -> recoveries
+        self.gave_up = Counter()  # reason -> abandoned keys
+        self.latencies: List[float] = []  # first park -> recovery, seconds
+
+    def summary(self) -> Dict:
+        """
+        Summarize the cycle's retries.
+
+        Returns:
+            Dict with park/recovery/give-up counts and recovery latency percentiles
+        """
+        latencies = np.asarray(self.latencies, dtype=float)
+        percentiles = (
+            dict(
+                zip(
+                    ("p50", "p90", "max"),
+                    np.percentile(latencies, [50, 90, 100]).round(2),
+                )
+            )
+            if len(latencies)
+            else {}
+        )
+        return {
+            "parked": dict(self.parked),
+            "recovered": sum(self.succeeded_after.values()),
+            "recovered_after_attempts": dict(sorted(self.succeeded_after.items())),
+            "gave_up": dict(self.gave_up),
+            "latency_seconds": {
+                key: float(value) for key, value in percentiles.items()
+            },
+        }
+
+    def log_summary(self) -> None:
+        """Log the summary if anything was retried."""
+        if not self.parked:
+            return
+        summary = self.summary()
+        logger.info(
+            f"🔁 Deferred retries: parked={summary['parked']} "
+            f"recovered={summary['recovered']} "
+            f"by_attempt={summary['recovered_after_attempts']} "
+            f"gave_up={summary['gave_up']} "
+            f"latency_s={summary['latency_seconds']}"
+        )
+
+
+class RetryQueue:
+    """Time-ordered queue of keys waiting for their backoff to expire."""
+
+    def __init__(
+        self,
+        max_attempts: int = RETRY_MAX_ATTEMPTS,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_attempts: Retries allowed per key before it is given up
+            base_delay: Backoff before the first retry (doubles per attempt)
+            max_delay: Cap on a single backoff
+            clock: Monotonic time source
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.stats = RetryStats()
+        self._heap = []
+        self._sequence = 0
+        self._tracked: Dict[Hashable, Dict] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tracked
+
+    def park(self, key: Hashable, reason: str = "failed") -> bool:
+        """
+        Schedule a retry of key after its backoff.
+
+        Args:
+            key: Work item, e.g. (ticker, interval)
+            reason: Why it is parked ("stale", "failed", ...)
+
+        Returns:
+            False if the key has used all its retries and was given up
+        """
+        with self._lock:
+            now = self.clock()
+            state = self._tracked.setdefault(key, {"attempts": 0, "first_parked": now})
+            if state["attempts"] >= self.max_attempts:
+                del self._tracked[key]
+                self.stats.gave_up[reason] += 1
+                logger.warning(
+                    f"⚠️ {key}: giving up after {state['attempts']} deferred retries "
+                    f"({reason})"
+                )
+                return False
+
+            delay = min(self.max_delay, self.base_delay * (2 ** state["attempts"]))
+            state["attempts"] += 1
+            state["queued"] = True
+            self.stats.parked[reason] += 1
+            self._sequence += 1
+            heapq.heappush(self._heap, (now + delay, self._sequence, key))
+            logger.info(
+                f"⏳ {key}: {reason}, retry {state['attempts']}/{self.max_attempts} "
+                f"in {delay:.1f}s"
+            )
+            return True
+
+    def resolve(self, key: Hashable) -> None:
+        """Mark a parked key as recovered (no-op for keys that were never parked)."""
+        with self._lock:
+            state = self._tracked.pop(key, None)
+            if state is None:
+                return
+            self.stats.succeeded_after[state["attempts"]] += 1
+            self.stats.latencies.append(self.clock() - state["first_parked"])
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the earliest retry is due (None if the queue is empty)."""
+        with self._lock:
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - self.clock())
+
+    def pop_due(self) -> List[Hashable]:
+        """Remove and return every key whose backoff has expired, earliest first."""
+        due = []
+        with self._lock:
+            now = self.clock()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, key = heapq.heappop(self._heap)
+                if key in self._tracked:
+                    self._tracked[key]["queued"] = False
+                    due.append(key)
+        return due
+
+    def retry_due(self, attempt: Callable[[Hashable], object]) -> int:
+        """
+        Run attempt(key) for every due key.
+
+        attempt is expected to park() the key again or resolve() it; a key it
+        leaves in neither state (e.g. it raised) is given up.
+
+        Args:
+            attempt: Retry function
+
+        Returns:
+            Number of keys retried
+        """
+        keys = self.pop_due()
+        for key in keys:
+            try:
+                attempt(key)
+            except Exception as e:
+                logger.error(f"❌ {key}: deferred retry raised {e}")
+            with self._lock:
+                state = self._tracked.get(key)
+                if state is not None and not state["queued"]:
+                    del self._tracked[key]
+                    self.stats.gave_up["error"] += 1
+        return len(keys)
+
+    def drain(
+        self,
+        attempt: Callable[[Hashable], object],
+        max_wait: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Retry until every parked key has recovered or been given up.
+
+        Args:
+            attempt: Retry function (see retry_due)
+            max_wait: Give up keys still parked after this many seconds
+            sleep: Wait function used between due times
+        """
+        deadline = None if max_wait is None else self.clock() + max_wait
+        while True:
+            wait = self.next_due_in()
+            if wait is None:
+                return
+            if deadline is not None and self.clock() + wait > deadline:
+                self._abandon_all("deadline")
+                return
+            if wait > 0:
+                sleep(wait)
+            self.retry_due(attempt)
+
+    def _abandon_all(self, reason: str) -> None:
+        with self._lock:
+            for key in self._tracked:
+                logger.warning(f"⚠️ {key}: deferred retry abandoned ({reason})")
+            self.stats.gave_up[reason] += len(self._tracked)
+            self._tracked.clear()
+            self._heap.clear()
@@ -0,0 +1,339 @@
+"""
+Vectorized session analytics kernels for the intraday screeners.
+
+Bars are handled as sorted UTC epoch-nanosecond arrays. Each kernel converts
+them once to exchange wall-clock nanoseconds and then works with plain
+integer arithmetic:
+- session windows (pre-market, opening minutes) are minute-of-day masks
+- "before this day" cut-offs are np.searchsorted lookups
+- per-day reductions are np.add.reduceat over the run boundaries of the
+  sorted day keys
+
+Every kernel accepts an optional ticker_ids array, so the same call works on
+one ticker or on a whole universe stacked with stack_frames() (rows sorted by
+ticker, then time). Results are one value per ticker.
+
+The screener-facing wrappers live in utils.helpers (get_previous_day_close,
+get_premarket_data, calculate_avg_early_volume, calculate_avg_daily_volume,
+calculate_vwap).
+"""
+
+from datetime import date, time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import TIMEZONE
+
+MINUTE_NS = 60 * 1_000_000_000
+DAY_NS = 24 * 60 * MINUTE_NS
+
+PREMARKET_START = time(4, 0)
+REGULAR_OPEN = time(9, 30)
+REGULAR_CLOSE = time(16, 0)
+
+
+# --- Clock conversion ---
+
+
+def utc_nanos(timestamps, tz: str = TIMEZONE) -> np.ndarray:
+    """
+    Convert timestamps to UTC epoch nanoseconds.
+
+    Args:
+        timestamps: Strings, datetimes or a DatetimeIndex (naive values are
+            taken as exchange time)
+        tz: Exchange timezone
+
+    Returns:
+        int64 array
+    """
+    times = timestamps
+    if isinstance(times, pd.Series) and pd.api.types.is_datetime64_any_dtype(
+        times.dtype
+    ):
+        # Already parsed; to_datetime would iterate it to decide on caching
+        times = pd.DatetimeIndex(times)
+    elif not isinstance(times, pd.DatetimeIndex):
+        times = pd.DatetimeIndex(pd.to_datetime(timestamps))
+    if times.tz is None:
+        times = times.tz_localize(tz, ambiguous="NaT", nonexistent="shift_forward")
+    return times.tz_convert("UTC").as_unit("ns").asi8
+
+
+def wall_clock(utc_ns: np.ndarray, tz: str = TIMEZONE) -> np.ndarray:
+    """Exchange wall-clock nanoseconds (local time as if it were UTC)."""
+    times = pd.DatetimeIndex(np.asarray(utc_ns, dtype="datetime64[ns]"), tz="UTC")
+    return times.tz_convert(tz).tz_localize(None).as_unit("ns").asi8
+
+
+def timestamps_wall_clock(timestamps, tz: str = TIMEZONE) -> np.ndarray:
+    """
+    Exchange wall-clock nanoseconds straight from timestamps.
+
+    Equivalent to wall_clock(utc_nanos(timestamps)) without the UTC round trip;
+    naive values are already exchange time.
+    """
+    times = timestamps
+    if not isinstance(times, pd.DatetimeIndex):
+        times = pd.DatetimeIndex(pd.to_datetime(timestamps))
+    if times.tz is not None:
+        times = times.tz_convert(tz).tz_localize(None)
+    return times.as_unit("ns").asi8
+
+
+def day_start(day) -> int:
+    """Wall-clock nanoseconds of midnight on a date."""
+    return int(pd.Timestamp(day).normalize().as_unit("ns").value)
+
+
+def _time_ns(value: time) -> int:
+    return (value.hour * 60 + value.minute) * MINUTE_NS + value.second * 1_000_000_000
+
+
+def window_mask(
+    wall: np.ndarray, start: time, end: time, include_end: bool = False
+) -> np.ndarray:
+    """
+    Bars whose time of day falls in [start, end) (or [start, end]).
+
+    Args:
+        wall: Wall-clock nanoseconds
+        start: Window start time
+        end: Window end time
+        include_end: Include bars stamped exactly at end
+
+    Returns:
+        Boolean mask
+    """
+    tod = np.mod(wall, DAY_NS)
+    upper = tod <= _time_ns(end) if include_end else tod < _time_ns(end)
+    return (tod >= _time_ns(start)) & upper
+
+
+def day_bounds(wall: np.ndarray, day) -> Tuple[int, int]:
+    """Index range [lo, hi) of one day's bars in a sorted wall-clock array."""
+    start = day_start(day)
+    lo, hi = np.searchsorted(wall, [start, start + DAY_NS], side="left")
+    return int(lo), int(hi)
+
+
+# --- Panel plumbing ---
+
+
+def stack_frames(
+    frames: Dict[str, pd.DataFrame],
+    fields=("open", "high", "low", "close", "volume"),
+    timestamp_col: str = "timestamp",
+) -> Tuple[List[str], np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Stack per-ticker frames into flat arrays sorted by ticker, then time.
+
+    Args:
+        frames: Ticker -> OHLCV frame (empty frames are skipped)
+        fields: Columns to stack
+        timestamp_col: Timestamp column (a DatetimeIndex takes precedence)
+
+    Returns:
+        Tuple of (tickers, ticker_ids, utc_ns, field arrays)
+    """
+    tickers, ids, stamps, columns = [], [], [], {field: [] for field in fields}
+    for ticker, df in frames.items():
+        if df is None or df.empty:
+            continue
+        if isinstance(df.index, pd.DatetimeIndex) or timestamp_col not in df.columns:
+            utc = utc_nanos(df.index)
+        else:
+            utc = utc_nanos(df[timestamp_col])
+        order = np.argsort(utc, kind="stable")
+        ids.append(np.full(len(df), len(tickers), dtype=np.int64))
+        stamps.append(utc[order])
+        for field in fields:
+            values = pd.to_numeric(df[field], errors="coerce").to_numpy(
+                dtype=np.float64
+            )
+            columns[field].append(values[order])
+        tickers.append(ticker)
+
+    if not tickers:
+        empty = np.array([], dtype=np.int64)
+        return [], empty, empty, {field: np.array([]) for field in fields}
+    return (
+        tickers,
+        np.concatenate(ids),
+        np.concatenate(stamps),
+        {field: np.concatenate(values) for field, values in columns.items()},
+    )
+
+
+def _ids(ticker_ids: Optional[np.ndarray], size: int) -> np.ndarray:
+    if ticker_ids is None:
+        return np.zeros(size, dtype=np.int64)
+    return np.asarray(ticker_ids, dtype=np.int64)
+
+
+def _count(ticker_ids: np.ndarray, n_tickers: Optional[int]) -> int:
+    if n_tickers is not None:
+        return n_tickers
+    return int(ticker_ids.max()) + 1 if len(ticker_ids) else 1
+
+
+def _runs(keys: np.ndarray) -> np.ndarray:
+    """Start index of each run of equal values in a sorted key array."""
+    if len(keys) == 0:
+        return np.array([], dtype=np.int64)
+    return np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+
+
+def trailing_mean(
+    ticker_ids: np.ndarray, values: np.ndarray, n: int, n_tickers: int
+) -> np.ndarray:
+    """
+    Mean of each ticker's last n values (ids sorted, values in time order).
+
+    Returns:
+        One mean per ticker, NaN where a ticker has no values
+    """
+    keep = ~np.isnan(values)
+    ticker_ids, values = ticker_ids[keep], values[keep]
+    ends = np.cumsum(np.bincount(ticker_ids, minlength=n_tickers))
+    from_end = ends[ticker_ids] - 1 - np.arange(len(ticker_ids))
+    recent = from_end < n
+    sums = np.bincount(ticker_ids[recent], values[recent], minlength=n_tickers)
+    counts = np.bincount(ticker_ids[recent], minlength=n_tickers)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+# --- Session kernels ---
+
+
+def previous_close(
+    wall: np.ndarray,
+    close: np.ndarray,
+    before_day,
+    ticker_ids: Optional[np.ndarray] = None,
+    n_tickers: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Last close stamped before a given day, per ticker.
+
+    Args:
+        wall: Wall-clock nanoseconds of daily bars
+        close: Close prices
+        before_day: First day excluded (normally today)
+        ticker_ids: Ticker id of each bar (None for a single ticker)
+        n_tickers: Number of tickers
+
+    Returns:
+        One close per ticker, NaN where there is none
+    """
+    ticker_ids = _ids(ticker_ids, len(wall))
+    n_tickers = _count(ticker_ids, n_tickers)
+    last = np.full(n_tickers, -1, dtype=np.int64)
+    if len(close) == 0:
+        return np.full(n_tickers, np.nan)
+    rows = np.flatnonzero((wall < day_start(before_day)) & ~np.isnan(close))
+    np.maximum.at(last, ticker_ids[rows], rows)
+    return np.where(last >= 0, close[np.maximum(last, 0)], np.nan)
+
+
+def average_daily_volume(
+    wall: np.ndarray,
+    volume: np.ndarray,
+    days: int,
+    before_day=None,
+    ticker_ids: Optional[np.ndarray] = None,
+    n_tickers: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Mean daily volume over each ticker's last `days` completed days.
+
+    Args:
+        wall: Wall-clock nanoseconds of daily bars
+        volume: Daily volumes
+        days: Number of days averaged
+        before_day: First day excluded (None keeps every bar)
+        ticker_ids: Ticker id of each bar (None for a single ticker)
+        n_tickers: Number of tickers
+
+    Returns:
+        One average per ticker, NaN where there is no history
+    """
+    ticker_ids = _ids(ticker_ids, len(wall))
+    n_tickers = _count(ticker_ids, n_tickers)
+    if before_day is not None:
+        keep = wall < day_start(before_day)
+        ticker_ids, volume = ticker_ids[keep], volume[keep]
+    return trailing_mean(
+        ticker_ids, np.asarray(volume, dtype=np.float64), days, n_tickers
+    )
+
+
+def daily_window_volume(
+    wall: np.ndarray,
+    volume: np.ndarray,
+    start: time,
+    end: time,
+    ticker_ids: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per (ticker, day) volume sums and bar counts inside a time-of-day window.
+
+    Returns:
+        Tuple of (ticker id, day number, volume sum, bar count) per group
+    """
+    ticker_ids = _ids(ticker_ids, len(wall))
+    rows = window_mask(wall, start, end) & ~np.isnan(volume)
+    ids, day, vol = ticker_ids[rows], wall[rows] // DAY_NS, volume[rows]
+
+    # Rows are sorted by ticker then time, so (ticker, day) keys are too
+    starts = _runs(ids * (1 << 32) + day)
+    if len(starts) == 0:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, np.array([]), empty
+    sums = np.add.reduceat(vol, starts)
+    counts = np.diff(np.append(starts, len(vol)))
+    return ids[starts], day[starts], sums, counts
+
+
+def average_early_volume(
+    wall: np.ndarray,
+    volume: np.ndarray,
+    days: int,
+    minutes: int = 15,
+    ticker_ids: Optional[np.ndarray] = None,
+    n_tickers: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Average per-minute volume in the first minutes of the regular session.
+
+    Each day contributes the mean volume of its bars in [9:30, 9:30 + minutes),
+    so a partially elapsed window today is comparable with full past days.
+    The result averages each ticker's last `days` days that have such bars.
+
+    Args:
+        wall: Wall-clock nanoseconds of 1-minute bars
+        volume: Bar volumes
+        days: Number of days averaged
+        minutes: Length of the early window
+        ticker_ids: Ticker id of each bar (None for a single ticker)
+        n_tickers: Number of tickers
+
+    Returns:
+        One average per ticker, NaN where there are no early bars
+    """
+    ticker_ids = _ids(ticker_ids, len(wall))
+    n_tickers = _count(ticker_ids, n_tickers)
+    end_minute = REGULAR_OPEN.hour * 60 + REGULAR_OPEN.minute + minutes
+    end = time(end_minute // 60, end_minute % 60)
+    group_ids, _, sums, counts = daily_window_volume(
+        wall, np.asarray(volume, dtype=np.float64), REGULAR_OPEN, end, ticker_ids
+    )
+    return trailing_mean(group_ids, sums / np.maximum(counts, 1), days, n_tickers)
+
+
+def exchange_today(tz: str = TIMEZONE) -> date:
+    """Current date at the exchange."""
+    return pd.Timestamp.now(tz=tz).date()
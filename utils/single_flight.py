@@ -0,0 +1,263 @@
+"""
+Single-flight request coalescing for Alpha Vantage fetches.
+
+Screeners fetch their universe independently: BaseScreener.scan requests
+every ticker for each screener that runs, and GapGoScreener additionally
+requests daily bars one ticker at a time. When PluginManager runs several
+screeners together the same (function, ticker, interval) request goes out
+several times within seconds, each one spending rate-limit budget.
+
+SingleFlight sits in front of the fetchers:
+- concurrent identical requests share one in-flight call (an asyncio
+  future for coroutines, an event for threads)
+- a successful result is memoized until the next bar of its interval is
+  due (bar_expiry), so a screener starting a little later still reuses it
+  without ever serving a bar older than a fresh request could return
+
+SingleFlightStats counts the calls that were executed and the ones that
+were deduplicated (joined an in-flight call or hit the memo).
+get_single_flight() returns the process-wide instance shared by every
+client, like utils.rate_limiter.get_rate_limiter().
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .config import SINGLE_FLIGHT_DAILY_REFRESH_MINUTES, SINGLE_FLIGHT_ENABLED
+from .resample import interval_minutes
+
+logger = logging.getLogger(__name__)
+
+
+def bar_expiry(interval: str, now: Optional[float] = None) -> float:
+    """
+    Epoch seconds at which the next bar of an interval starts.
+
+    Intraday bars start on multiples of their width (Alpha Vantage's
+    convention, minute boundaries are the same in UTC and exchange time);
+    daily requests use SINGLE_FLIGHT_DAILY_REFRESH_MINUTES buckets.
+
+    Args:
+        interval: '1min', '30min', ... or 'daily'
+        now: Current epoch seconds (defaults to time.time())
+
+    Returns:
+        Epoch seconds of the next boundary (always after now)
+    """
+    now = time.time() if now is None else now
+    if interval == "daily":
+        width = SINGLE_FLIGHT_DAILY_REFRESH_MINUTES * 60
+    else:
+        width = interval_minutes(interval) * 60
+    return (math.floor(now / width) + 1) * width
+
+
+class SingleFlightStats:
+    """Executed vs. deduplicated request counts."""
+
+    def __init__(self):
+        self.executed = 0  # calls that reached the fetcher
+        self.coalesced = 0  # callers that joined an in-flight call
+        self.memo_hits = 0  # callers served from the memo
+        self._lock = threading.Lock()
+
+    def record(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    @property
+    def deduplicated(self) -> int:
+        return self.coalesced + self.memo_hits
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the counters.
+
+        Returns:
+            Dict with executed/coalesced/memo_hits/deduplicated counts and the
+            share of requests that never reached the fetcher
+        """
+        total = self.executed + self.deduplicated
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "memo_hits": self.memo_hits,
+            "deduplicated": self.deduplicated,
+            "dedup_ratio": round(self.deduplicated / total, 3) if total else 0.0,
+        }
+
+
+class SingleFlight:
+    """Shares in-flight calls and bar-aligned results between identical requests."""
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.time,
+        enabled: bool = SINGLE_FLIGHT_ENABLED,
+    ):
+        """
+        Args:
+            clock: Epoch-seconds time source (memo expiry is wall-clock aligned)
+            enabled: False passes every call straight through
+        """
+        self.clock = clock
+        self.enabled = enabled
+        self.stats = SingleFlightStats()
+        self._memo: Dict[Hashable, Tuple[float, Any]] = {}
+        self._async_inflight: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self._thread_inflight: Dict[Hashable, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _memoized(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._memo.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] <= self.clock():
+                del self._memo[key]
+                return False, None
+            return True, entry[1]
+
+    def _remember(
+        self,
+        key: Hashable,
+        result: Any,
+        expires_at: Optional[float],
+        cacheable: Callable[[Any], bool],
+    ) -> None:
+        if expires_at is None or not cacheable(result):
+            return
+        with self._lock:
+            self._memo[key] = (expires_at, result)
+
+    async def run(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        expires_at: Optional[float] = None,
+        cacheable: Callable[[Any], bool] = lambda result: result is not None,
+    ) -> Any:
+        """
+        Await fetch() once for all concurrent callers with the same key.
+
+        Args:
+            key: Request identity, e.g. (function, ticker, interval, outputsize)
+            fetch: Coroutine factory performing the request
+            expires_at: Epoch seconds until which the result may be reused
+                (None: coalesce only)
+            cacheable: Whether a result may be memoized (failures are not)
+
+        Returns:
+            The shared result
+        """
+        if not self.enabled:
+            return await fetch()
+
+        hit, result = self._memoized(key)
+        if hit:
+            self.stats.record("memo_hits")
+            return result
+
+        # Futures belong to one event loop
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        future = self._async_inflight.get(flight_key)
+        if future is not None:
+            self.stats.record("coalesced")
+            return await asyncio.shield(future)
+
+        future = loop.create_future()
+        self._async_inflight[flight_key] = future
+        self.stats.record("executed")
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unjoined failure is not reported as unhandled
+            future.exception()
+            raise
+        else:
+            self._remember(key, result, expires_at, cacheable)
+            future.set_result(result)
+            return result
+        finally:
+            self._async_inflight.pop(flight_key, None)
+
+    def call(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Any],
+        expires_at: Optional[float] = None,
+        cacheable: Callable[[Any], bool] = lambda result: result is not None,
+    ) -> Any:
+        """
+        Thread-safe counterpart of run() for blocking fetch functions.
+
+        Args:
+            key: Request identity
+            fetch: Function performing the request
+            expires_at: Epoch seconds until which the result may be reused
+            cacheable: Whether a result may be memoized
+
+        Returns:
+            The shared result
+        """
+        if not self.enabled:
+            return fetch()
+
+        hit, result = self._memoized(key)
+        if hit:
+            self.stats.record("memo_hits")
+            return result
+
+        with self._lock:
+            flight = self._thread_inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = {"done": threading.Event(), "result": None, "error": None}
+                self._thread_inflight[key] = flight
+
+        if not leader:
+            self.stats.record("coalesced")
+            flight["done"].wait()
+            if flight["error"] is not None:
+                raise flight["error"]
+            return flight["result"]
+
+        self.stats.record("executed")
+        try:
+            flight["result"] = fetch()
+            self._remember(key, flight["result"], expires_at, cacheable)
+            return flight["result"]
+        except BaseException as e:
+            flight["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._thread_inflight.pop(key, None)
+            flight["done"].set()
+
+    def clear(self) -> None:
+        """Drop memoized results (in-flight calls are unaffected)."""
+        with self._lock:
+            self._memo.clear()
+
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide SingleFlight shared by every Alpha Vantage client."""
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
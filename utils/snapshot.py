@@ -0,0 +1,334 @@
+"""
+Per-cycle market data snapshot shared by the screeners.
+
+Every screener walks the same universe and reads the same daily and 1-minute
+objects. A snapshot downloads each object once, concurrently, and serves
+every screener in the cycle its own copy of the frames:
+- In-process: build_snapshot() + activate_snapshot(), or prefetch_market_data()
+- Across processes: the orchestrator saves the snapshot as memory-mapped Arrow
+  IPC files and passes the directory to screener subprocesses through the
+  MARKET_DATA_SNAPSHOT_DIR environment variable
+
+read_market_data() is the single entry point for screeners: it serves from the
+active snapshot and falls back to the cross-process shared cache
+(read_df_cached) for anything not in it.
+"""
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .config import SNAPSHOT_MAX_WORKERS
+from .data_storage import read_df_cached
+from .storage_format import PARQUET_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR_ENV = "MARKET_DATA_SNAPSHOT_DIR"
+SNAPSHOT_INDEX_FILE = "index.json"
+SNAPSHOT_READS_FILE = "reads.log"
+
+
+def daily_object_name(ticker: str) -> str:
+    """Object name of a ticker's daily bars."""
+    return f"data/daily/{ticker}_daily.csv"
+
+
+def intraday_object_name(ticker: str) -> str:
+    """Object name of a ticker's 1-minute bars."""
+    return f"data/intraday/{ticker}_1min.csv"
+
+
+def ticker_object_names(
+    tickers: Iterable[str], include_intraday: bool = True
+) -> List[str]:
+    """
+    List the bar objects the screeners read for the given tickers.
+
+    Args:
+        tickers: Ticker symbols
+        include_intraday: Include the 1-minute objects as well as daily
+
+    Returns:
+        List of object names
+    """
+    names = []
+    for ticker in tickers:
+        names.append(daily_object_name(ticker))
+        if include_intraday:
+            names.append(intraday_object_name(ticker))
+    return names
+
+
+def _snapshot_file_name(object_name: str) -> str:
+    return object_name.replace("/", "__") + ".arrow"
+
+
+class MarketDataSnapshot:
+    """Immutable store of the frames loaded for one screener cycle."""
+
+    def __init__(
+        self, frames: Dict[str, pd.DataFrame], directory: Optional[str] = None
+    ):
+        """
+        Initialize the snapshot.
+
+        Args:
+            frames: Object name -> DataFrame (empty for missing objects)
+            directory: Directory the snapshot is persisted in, if shared
+        """
+        self._frames = MappingProxyType(dict(frames))
+        self.directory = directory
+        self.downloads = len(self._frames)
+        self._served = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, object_name: str) -> bool:
+        return object_name in self._frames
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def object_names(self) -> List[str]:
+        """Object names held in the snapshot."""
+        return list(self._frames)
+
+    def get(self, object_name: str) -> Optional[pd.DataFrame]:
+        """
+        Get a copy of a frame.
+
+        The copy is deep: pandas < 3 does not copy on write, so a shallow copy
+        would let one screener's in-place change reach every later reader.
+
+        Args:
+            object_name: Object name/path in S3
+
+        Returns:
+            DataFrame the caller may modify, or None if the object is not in the
+            snapshot
+        """
+        frame = self._frames.get(object_name)
+        if frame is None:
+            return None
+
+        with self._lock:
+            self._served += 1
+        if self.directory:
+            self._log_read(object_name)
+        return frame.copy()
+
+    def _log_read(self, object_name: str):
+        """Record a served read so the owning process can report savings."""
+        try:
+            with open(os.path.join(self.directory, SNAPSHOT_READS_FILE), "a") as f:
+                f.write(f"{object_name}\n")
+        except OSError:
+            pass
+
+    @property
+    def served(self) -> int:
+        """Reads served from the snapshot, across all processes sharing it."""
+        if self.directory:
+            try:
+                with open(os.path.join(self.directory, SNAPSHOT_READS_FILE)) as f:
+                    return sum(1 for _ in f)
+            except OSError:
+                return 0
+        return self._served
+
+    @property
+    def saved_downloads(self) -> int:
+        """Downloads avoided compared with every read going to Spaces."""
+        return max(self.served - self.downloads, 0)
+
+    def save(self, directory: str) -> Optional[str]:
+        """
+        Persist the snapshot as Arrow IPC files for other processes.
+
+        Args:
+            directory: Target directory (created if needed)
+
+        Returns:
+            The directory, or None if the snapshot could not be saved
+        """
+        if not PARQUET_AVAILABLE:
+            logger.warning("⚠️ pyarrow is not installed - snapshot stays in-process")
+            return None
+
+        import pyarrow.feather as feather
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            index = {}
+            for object_name, frame in self._frames.items():
+                file_name = _snapshot_file_name(object_name)
+                feather.write_feather(
+                    frame.reset_index(drop=True),
+                    os.path.join(directory, file_name),
+                    compression="uncompressed",
+                )
+                index[object_name] = file_name
+            with open(os.path.join(directory, SNAPSHOT_INDEX_FILE), "w") as f:
+                json.dump(index, f)
+        except Exception as e:
+            logger.error(f"❌ Failed to save market data snapshot to {directory}: {e}")
+            return None
+
+        self.directory = directory
+        return directory
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["MarketDataSnapshot"]:
+        """
+        Load a snapshot saved by another process.
+
+        Files are memory-mapped, so processes sharing a snapshot read the
+        same pages from the OS cache.
+
+        Args:
+            directory: Snapshot directory
+
+        Returns:
+            MarketDataSnapshot, or None if it cannot be loaded
+        """
+        if not PARQUET_AVAILABLE:
+            return None
+
+        import pyarrow.feather as feather
+
+        try:
+            with open(os.path.join(directory, SNAPSHOT_INDEX_FILE)) as f:
+                index = json.load(f)
+            frames = {
+                object_name: feather.read_feather(
+                    os.path.join(directory, file_name), memory_map=True
+                )
+                for object_name, file_name in index.items()
+            }
+        except Exception as e:
+            logger.warning(
+                f"⚠️ Could not load market data snapshot from {directory}: {e}"
+            )
+            return None
+
+        return cls(frames, directory=directory)
+
+
+def build_snapshot(
+    object_names: Iterable[str],
+    max_workers: int = SNAPSHOT_MAX_WORKERS,
+    base: Optional[MarketDataSnapshot] = None,
+) -> MarketDataSnapshot:
+    """
+    Download objects concurrently into a new snapshot.
+
+    Args:
+        object_names: Objects to load (duplicates are downloaded once)
+        max_workers: Concurrent downloads
+        base: Existing snapshot whose frames are reused instead of downloaded
+
+    Returns:
+        MarketDataSnapshot holding every requested object
+    """
+    frames = dict(base._frames) if base is not None else {}
+    unique_names = [name for name in dict.fromkeys(object_names) if name not in frames]
+
+    def _load(object_name: str) -> pd.DataFrame:
+        try:
+            return read_df_cached(object_name)
+        except Exception as e:
+            logger.warning(f"⚠️ Snapshot could not read {object_name}: {e}")
+            return pd.DataFrame()
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        loaded_frames = dict(zip(unique_names, executor.map(_load, unique_names)))
+
+    loaded = sum(1 for frame in loaded_frames.values() if not frame.empty)
+    logger.info(
+        f"📦 Market data snapshot built: {loaded}/{len(unique_names)} objects loaded"
+    )
+
+    frames.update(loaded_frames)
+    snapshot = MarketDataSnapshot(frames)
+    snapshot.downloads = len(unique_names) + (base.downloads if base is not None else 0)
+    return snapshot
+
+
+# Active snapshot for this process
+_active_snapshot: Optional[MarketDataSnapshot] = None
+_active_lock = threading.Lock()
+
+
+def activate_snapshot(snapshot: Optional[MarketDataSnapshot]):
+    """Make a snapshot the source for read_market_data (None deactivates)."""
+    global _active_snapshot
+    with _active_lock:
+        _active_snapshot = snapshot
+
+
+def get_active_snapshot() -> Optional[MarketDataSnapshot]:
+    """
+    Get the active snapshot, loading the shared one named in the environment.
+
+    Returns:
+        MarketDataSnapshot, or None if no snapshot is available
+    """
+    global _active_snapshot
+    with _active_lock:
+        if _active_snapshot is None and os.getenv(SNAPSHOT_DIR_ENV):
+            _active_snapshot = MarketDataSnapshot.load(os.environ[SNAPSHOT_DIR_ENV])
+            if _active_snapshot is not None:
+                logger.info(
+                    "📦 Using shared market data snapshot "
+                    f"({len(_active_snapshot)} objects)"
+                )
+        return _active_snapshot
+
+
+def prefetch_market_data(object_names: Iterable[str]) -> MarketDataSnapshot:
+    """
+    Ensure the given objects are served from a snapshot.
+
+    Uses the active snapshot when it already holds them; otherwise builds an
+    in-process snapshot on top of it, downloading only the missing objects
+    concurrently, and activates that.
+
+    Args:
+        object_names: Objects the caller is about to read
+
+    Returns:
+        The snapshot serving the objects
+    """
+    object_names = list(object_names)
+    snapshot = get_active_snapshot()
+    if snapshot is not None and all(name in snapshot for name in object_names):
+        return snapshot
+
+    snapshot = build_snapshot(object_names, base=snapshot)
+    activate_snapshot(snapshot)
+    return snapshot
+
+
+def read_market_data(object_name: str) -> pd.DataFrame:
+    """
+    Read a market data frame, preferring the active snapshot.
+
+    Args:
+        object_name: Object name/path in S3
+
+    Returns:
+        DataFrame (a private copy when served from the snapshot)
+    """
+    snapshot = get_active_snapshot()
+    if snapshot is not None:
+        frame = snapshot.get(object_name)
+        if frame is not None:
+            return frame
+    return read_df_cached(object_name)
@@ -1,9 +1,12 @@
 import io
 import logging
 import os
+import threading
+from datetime import datetime
 
 import boto3
 import pandas as pd
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from utils.config import (
@@ -11,12 +14,30 @@ from utils.config import (
     SPACES_ACCESS_KEY_ID,
     SPACES_BUCKET_NAME,
     SPACES_ENDPOINT_URL,
+    SPACES_MAX_POOL_CONNECTIONS,
     SPACES_REGION,
     SPACES_SECRET_ACCESS_KEY,
 )
 
 logger = logging.getLogger(__name__)
 
+# Error codes boto3 reports for a missing object (GET -> NoSuchKey, HEAD -> 404)
+MISSING_OBJECT_ERROR_CODES = {"NoSuchKey", "404", "NotFound"}
+
+# Append-only delta segments for a base object live under
+# "{directory}/_deltas/{stem}/" (e.g. intraday_1min/_deltas/AAPL/)
+DELTA_DIRECTORY = "_deltas"
+
+# Parquet codec; zstd gives markedly smaller bar files than the snappy default
+PARQUET_COMPRESSION = "zstd"
+
+# Process-wide client pool, keyed by (pid, credentials, endpoint, region).
+# boto3 clients are thread-safe and hold a urllib3 connection pool, so reusing
+# one avoids rebuilding a session and re-doing TLS handshakes on every call.
+# The pid is part of the key because clients must not be shared across forks.
+_client_pool = {}
+_client_pool_lock = threading.Lock()
+
 
 def get_spaces_credentials_status():
     """
@@ -50,9 +71,52 @@ def get_spaces_credentials_status():
     }
 
 
+def _build_client_config():
+    """
+    Build the botocore configuration used for the shared Spaces client.
+
+    Returns:
+        botocore.config.Config: Config with a sized connection pool and TCP keep-alive
+    """
+    return Config(
+        max_pool_connections=SPACES_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+        connect_timeout=5,
+        read_timeout=30,
+        retries={"max_attempts": 3, "mode": "standard"},
+    )
+
+
+def _is_missing_object_error(error):
+    """
+    Check whether a botocore ClientError means the object does not exist.
+
+    Args:
+        error (ClientError): Error raised by a HEAD or GET request
+
+    Returns:
+        bool: True if the error indicates a missing object
+    """
+    error_code = str(error.response.get("Error", {}).get("Code", ""))
+    return error_code in MISSING_OBJECT_ERROR_CODES
+
+
+def reset_spaces_client():
+    """
+    Drop all pooled Spaces clients so the next call builds a fresh one.
+
+    Useful after rotating credentials and for test isolation.
+    """
+    with _client_pool_lock:
+        _client_pool.clear()
+
+
 def get_spaces_client():
     """
-    Create and return a boto3 client for DigitalOcean Spaces.
+    Return the shared boto3 client for DigitalOcean Spaces.
+
+    The client is created once per process and credential set, then reused so
+    that repeated reads and writes share one keep-alive connection pool.
     """
     # Check credential status using helper function
     creds_status = get_spaces_credentials_status()
@@ -94,14 +158,28 @@ def get_spaces_client():
                 f"SPACES_REGION not set, using default fallback: {validated_region}"
             )
 
-        session = boto3.session.Session()
-        client = session.client(
-            "s3",
-            region_name=validated_region,
-            endpoint_url=SPACES_ENDPOINT_URL,
-            aws_access_key_id=SPACES_ACCESS_KEY_ID,
-            aws_secret_access_key=SPACES_SECRET_ACCESS_KEY,
+        pool_key = (
+            os.getpid(),
+            SPACES_ACCESS_KEY_ID,
+            SPACES_SECRET_ACCESS_KEY,
+            SPACES_ENDPOINT_URL,
+            validated_region,
         )
+
+        with _client_pool_lock:
+            client = _client_pool.get(pool_key)
+            if client is None:
+                session = boto3.session.Session()
+                client = session.client(
+                    "s3",
+                    region_name=validated_region,
+                    endpoint_url=SPACES_ENDPOINT_URL,
+                    aws_access_key_id=SPACES_ACCESS_KEY_ID,
+                    aws_secret_access_key=SPACES_SECRET_ACCESS_KEY,
+                    config=_build_client_config(),
+                )
+                _client_pool[pool_key] = client
+                logger.debug(f"Created pooled Spaces client for {validated_region}")
         return client
     except Exception as e:
         logger.error(f"Failed to create Spaces client: {e}")
@@ -131,8 +209,7 @@ def file_exists_in_spaces(object_name):
         logger.debug(f"File exists in Spaces: {object_name}")
         return True
     except ClientError as e:
-        error_code = e.response['Error']['Code']
-        if error_code == '404':
+        if _is_missing_object_error(e):
             logger.debug(f"File not found in Spaces: {object_name}")
             return False
         else:
@@ -143,14 +220,37 @@ def file_exists_in_spaces(object_name):
         return False
 
 
-def upload_dataframe(df, object_name, file_format="csv"):
+def serialize_dataframe(df, file_format="csv"):
     """
-    Upload a pandas DataFrame directly to DigitalOcean Spaces.
+    Serialize a DataFrame to the bytes that would be stored in Spaces.
 
     Args:
-        df (pandas.DataFrame): DataFrame to upload
+        df (pandas.DataFrame): DataFrame to serialize
+        file_format (str): 'csv' or 'parquet'
+
+    Returns:
+        bytes: Serialized payload, or None if the format is unsupported
+    """
+    buffer = io.BytesIO()
+
+    if file_format.lower() == "csv":
+        df.to_csv(buffer, index=False)
+    elif file_format.lower() == "parquet":
+        df.to_parquet(buffer, index=False, compression=PARQUET_COMPRESSION)
+    else:
+        logger.error(f"Unsupported file format: {file_format}")
+        return None
+
+    return buffer.getvalue()
+
+
+def upload_bytes(payload, object_name):
+    """
+    Upload an already-serialized payload to DigitalOcean Spaces.
+
+    Args:
+        payload (bytes): Serialized object content
         object_name (str): Object name in the Spaces bucket
-        file_format (str): Format to save the DataFrame ('csv' or 'parquet')
 
     Returns:
         bool: True if successful, False otherwise
@@ -161,18 +261,7 @@ def upload_dataframe(df, object_name, file_format="csv"):
         return False
 
     try:
-        buffer = io.BytesIO()
-
-        if file_format.lower() == "csv":
-            df.to_csv(buffer, index=False)
-        elif file_format.lower() == "parquet":
-            df.to_parquet(buffer, index=False)
-        else:
-            logger.error(f"Unsupported file format: {file_format}")
-            return False
-
-        buffer.seek(0)
-        client.upload_fileobj(buffer, SPACES_BUCKET_NAME, object_name)
+        client.upload_fileobj(io.BytesIO(payload), SPACES_BUCKET_NAME, object_name)
         logger.info(f"Uploaded DataFrame to {SPACES_BUCKET_NAME}/{object_name}")
         if DEBUG_MODE:
             print(
@@ -186,10 +275,40 @@ def upload_dataframe(df, object_name, file_format="csv"):
         return False
 
 
+def upload_dataframe(df, object_name, file_format="csv"):
+    """
+    Upload a pandas DataFrame directly to DigitalOcean Spaces.
+
+    Args:
+        df (pandas.DataFrame): DataFrame to upload
+        object_name (str): Object name in the Spaces bucket
+        file_format (str): Format to save the DataFrame ('csv' or 'parquet')
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if not get_spaces_client():
+        logger.warning("Cannot upload to Spaces - no client available")
+        return False
+
+    try:
+        payload = serialize_dataframe(df, file_format)
+    except Exception as e:
+        logger.error(f"Error uploading DataFrame to Spaces: {e}")
+        return False
+    if payload is None:
+        return False
+
+    return upload_bytes(payload, object_name)
+
+
 def download_dataframe(object_name, file_format="csv"):
     """
     Download a pandas DataFrame directly from DigitalOcean Spaces.
 
+    Issues a single GET; a missing object (NoSuchKey) is treated as "no data"
+    rather than probed for with a separate HEAD request.
+
     Args:
         object_name (str): Object name in the Spaces bucket
         file_format (str): Format of the file ('csv' or 'parquet')
@@ -202,13 +321,8 @@ def download_dataframe(object_name, file_format="csv"):
         logger.warning(f"Cannot download from Spaces - no client available")
         return pd.DataFrame()
 
-    # First check if file exists to avoid unnecessary download attempts
-    if not file_exists_in_spaces(object_name):
-        logger.debug(f"File does not exist in Spaces, skipping download: {object_name}")
-        return pd.DataFrame()
-
     try:
-        # Download the object
+        # Single round trip: a missing object surfaces as NoSuchKey
         response = client.get_object(Bucket=SPACES_BUCKET_NAME, Key=object_name)
         content = response["Body"].read()
 
@@ -228,6 +342,14 @@ def download_dataframe(object_name, file_format="csv"):
                 f"☁️ Successfully downloaded from Spaces: {SPACES_BUCKET_NAME}/{object_name} - {len(df)} rows"
             )
         return df
+    except ClientError as e:
+        if _is_missing_object_error(e):
+            logger.debug(f"File does not exist in Spaces: {object_name}")
+        else:
+            logger.warning(
+                f"Error downloading DataFrame from Spaces {object_name}: {e}"
+            )
+        return pd.DataFrame()
     except Exception as e:
         logger.warning(f"Error downloading DataFrame from Spaces {object_name}: {e}")
         if DEBUG_MODE:
@@ -257,8 +379,7 @@ def get_cloud_file_size_bytes(object_name):
         logger.debug(f"☁️ Cloud file size for {object_name}: {file_size} bytes")
         return file_size
     except ClientError as e:
-        error_code = e.response["Error"]["Code"]
-        if error_code == "404":
+        if _is_missing_object_error(e):
             logger.debug(f"☁️ Cloud file not found: {object_name}")
         else:
             logger.warning(f"☁️ Error checking cloud file size for {object_name}: {e}")
@@ -270,6 +391,153 @@ def get_cloud_file_size_bytes(object_name):
         return 0
 
 
+def delta_segment_prefix(base_object):
+    """
+    Get the prefix holding the delta segments for a base object.
+
+    Args:
+        base_object (str): Base object name, e.g. "intraday_1min/AAPL.csv"
+
+    Returns:
+        str: Segment prefix, e.g. "intraday_1min/_deltas/AAPL/"
+    """
+    directory, _, filename = base_object.rpartition("/")
+    stem = filename.split(".", 1)[0]
+    prefix = f"{directory}/{DELTA_DIRECTORY}" if directory else DELTA_DIRECTORY
+    return f"{prefix}/{stem}/"
+
+
+def list_delta_segments(base_object):
+    """
+    List the delta segment objects for a base object, oldest first.
+
+    Segment names embed a UTC timestamp, so lexical order is write order.
+
+    Args:
+        base_object (str): Base object name
+
+    Returns:
+        list: Segment object names, or empty list if none or on error
+    """
+    client = get_spaces_client()
+    if not client:
+        return []
+
+    try:
+        segments = []
+        paginator = client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(
+            Bucket=SPACES_BUCKET_NAME, Prefix=delta_segment_prefix(base_object)
+        ):
+            segments.extend(obj["Key"] for obj in page.get("Contents", []))
+        return sorted(segments)
+    except Exception as e:
+        logger.warning(f"Error listing delta segments for {base_object}: {e}")
+        return []
+
+
+def write_delta_segment(df, base_object):
+    """
+    Append new rows for a base object as a small, immutable delta segment.
+
+    Upload size scales with the number of new rows rather than the size of
+    the base object. Segments are folded into the base by compaction.
+
+    Args:
+        df (pandas.DataFrame): New rows only
+        base_object (str): Base object the rows belong to
+
+    Returns:
+        tuple: (segment object name or None, success boolean)
+    """
+    from utils.storage_format import write_bars
+
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    segment_name = f"{delta_segment_prefix(base_object)}{stamp}.csv"
+    return write_bars(df, segment_name)
+
+
+def read_segmented_dataframe(base_object, timestamp_col="timestamp", segments=None):
+    """
+    Read a base object merged with all of its delta segments.
+
+    Rows are ordered by timestamp and de-duplicated with the newest write
+    winning, so a reader racing with compaction still sees a consistent view.
+
+    Args:
+        base_object (str): Base object name
+        timestamp_col (str): Column used for ordering and de-duplication
+        segments (list): Segment names to merge; listed from Spaces if None
+
+    Returns:
+        pandas.DataFrame: Merged DataFrame, or empty DataFrame if nothing exists
+    """
+    from utils.storage_format import read_bars
+
+    if segments is None:
+        segments = list_delta_segments(base_object)
+
+    frames = [read_bars(base_object)]
+    for segment in segments:
+        file_format = "parquet" if segment.endswith(".parquet") else "csv"
+        frames.append(download_dataframe(segment, file_format))
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+
+    combined = pd.concat(frames, ignore_index=True)
+    if timestamp_col in combined.columns:
+        combined[timestamp_col] = pd.to_datetime(combined[timestamp_col], utc=True)
+        combined = combined.sort_values(timestamp_col, kind="stable")
+        combined = combined.drop_duplicates(subset=[timestamp_col], keep="last")
+        combined = combined.reset_index(drop=True)
+
+    logger.debug(
+        f"Merged {base_object} with {len(segments)} delta segments: {len(combined)} rows"
+    )
+    return combined
+
+
+def delete_objects(object_names):
+    """
+    Delete objects from the Spaces bucket in batches.
+
+    Args:
+        object_names (list): Object names to delete
+
+    Returns:
+        bool: True if every delete succeeded, False otherwise
+    """
+    if not object_names:
+        return True
+
+    client = get_spaces_client()
+    if not client:
+        logger.warning("Cannot delete from Spaces - no client available")
+        return False
+
+    success = True
+    # DeleteObjects accepts at most 1000 keys per request
+    for start in range(0, len(object_names), 1000):
+        batch = object_names[start : start + 1000]
+        try:
+            response = client.delete_objects(
+                Bucket=SPACES_BUCKET_NAME,
+                Delete={"Objects": [{"Key": name} for name in batch], "Quiet": True},
+            )
+            errors = response.get("Errors", [])
+            if errors:
+                logger.warning(f"Failed to delete {len(errors)} objects: {errors[:3]}")
+                success = False
+        except Exception as e:
+            logger.error(f"Error deleting objects from Spaces: {e}")
+            success = False
+    return success
+
+
 def spaces_manager():
     """
     Initialize and return a spaces manager client for backwards compatibility.
@@ -0,0 +1,293 @@
+"""
+Columnar storage format layer for per-ticker bar files.
+
+This module decides how OHLCV bar objects are encoded in DigitalOcean Spaces:
+- Typed Parquet for bar data (UTC int64 timestamps, float32 prices, uint64 volume)
+- CSV for everything else and as a fallback when pyarrow is not installed
+- Dual read: the Parquet object is tried first, then the legacy CSV object
+
+Object names keep their logical ``.csv`` form throughout the codebase; the
+Parquet object lives beside it with a ``.parquet`` suffix.
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import BAR_STORAGE_FORMAT, TIMEZONE
+from .spaces_manager import (
+    delete_objects,
+    download_dataframe,
+    serialize_dataframe,
+    upload_bytes,
+)
+
+try:
+    import pyarrow  # noqa: F401
+
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Bump when the typed layout written by encode_bar_frame changes
+# (2: naive timestamps are exchange time, not UTC)
+BAR_SCHEMA_VERSION = 2
+
+# Object prefixes that hold per-ticker OHLCV bars
+BAR_PREFIXES = (
+    "data/daily/",
+    "data/intraday/",
+    "data/intraday_30min/",
+    "daily/",
+    "intraday_1min/",
+    "intraday_30min/",
+)
+
+TIMESTAMP_COLUMNS = ("timestamp", "datetime", "Date", "date")
+PRICE_COLUMNS = ("open", "high", "low", "close", "Open", "High", "Low", "Close")
+VOLUME_COLUMNS = ("volume", "Volume")
+
+
+def is_bar_object(object_name: str) -> bool:
+    """
+    Check whether an object name refers to a per-ticker bar file.
+
+    Args:
+        object_name: Object name/path in the Spaces bucket
+
+    Returns:
+        True if the object lives under one of the bar prefixes
+    """
+    return object_name.startswith(BAR_PREFIXES)
+
+
+def parquet_object_name(object_name: str) -> str:
+    """
+    Map a logical (CSV) object name to its Parquet sibling.
+
+    Args:
+        object_name: Object name ending in .csv or .parquet
+
+    Returns:
+        Object name with a .parquet suffix
+    """
+    if object_name.endswith(".parquet"):
+        return object_name
+    if object_name.endswith(".csv"):
+        return object_name[: -len(".csv")] + ".parquet"
+    return f"{object_name}.parquet"
+
+
+def csv_object_name(object_name: str) -> str:
+    """
+    Map a Parquet object name back to its logical CSV name.
+
+    Args:
+        object_name: Object name ending in .parquet or .csv
+
+    Returns:
+        Object name with a .csv suffix
+    """
+    if object_name.endswith(".parquet"):
+        return object_name[: -len(".parquet")] + ".csv"
+    return object_name
+
+
+def get_bar_storage_format() -> str:
+    """
+    Get the effective storage format for bar objects.
+
+    Returns:
+        'parquet' when configured and pyarrow is installed, otherwise 'csv'
+    """
+    if BAR_STORAGE_FORMAT == "parquet" and PARQUET_AVAILABLE:
+        return "parquet"
+    return "csv"
+
+
+def storage_candidates(object_name: str) -> List[Tuple[str, str]]:
+    """
+    List the (object name, format) pairs to try when reading an object.
+
+    Bar objects are read in the configured format first and the other format
+    second, so files not yet migrated (or rolled back) stay readable. Other
+    objects are read as CSV only.
+
+    Args:
+        object_name: Logical object name
+
+    Returns:
+        Ordered list of (object_name, file_format) tuples
+    """
+    if not PARQUET_AVAILABLE or not (
+        is_bar_object(object_name) or object_name.endswith(".parquet")
+    ):
+        return [(object_name, "csv")]
+
+    candidates = [
+        (parquet_object_name(object_name), "parquet"),
+        (csv_object_name(object_name), "csv"),
+    ]
+    if get_bar_storage_format() == "csv":
+        candidates.reverse()
+    return candidates
+
+
+def _find_column(df: pd.DataFrame, candidates) -> Optional[str]:
+    """Return the first candidate column present in the DataFrame."""
+    for column in candidates:
+        if column in df.columns:
+            return column
+    return None
+
+
+def _timestamps_to_utc(values: pd.Series, tz: str = TIMEZONE) -> pd.Series:
+    """
+    Parse timestamps to UTC; values without an offset are exchange time.
+
+    Naive values (e.g. daily 'YYYY-MM-DD' rows) are localized to the
+    exchange timezone first, as the session kernels read them, so a date
+    stays that exchange day instead of becoming UTC midnight. Values that
+    cannot be parsed (or fall into a DST gap or overlap that cannot be
+    resolved) become NaT.
+    """
+    parsed = pd.to_datetime(values, errors="coerce")
+    if not pd.api.types.is_datetime64_any_dtype(parsed):
+        # Mixed UTC offsets: every value carries its own
+        return pd.to_datetime(values, utc=True, errors="coerce")
+    if parsed.dt.tz is not None:
+        return parsed.dt.tz_convert("UTC")
+    try:
+        localized = parsed.dt.tz_localize(
+            tz, ambiguous="infer", nonexistent="shift_forward"
+        )
+    except ValueError:
+        localized = parsed.dt.tz_localize(
+            tz, ambiguous="NaT", nonexistent="shift_forward"
+        )
+    return localized.dt.tz_convert("UTC")
+
+
+def encode_bar_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a bar DataFrame to the typed on-disk layout.
+
+    The timestamp column becomes timezone-aware UTC (stored by Parquet as an
+    int64 timestamp; naive values are read as exchange time, see
+    _timestamps_to_utc), price columns become float32 and volume becomes uint64.
+    Columns that cannot be converted losslessly keep their original dtype.
+
+    Args:
+        df: Bar DataFrame as produced by the fetchers
+
+    Returns:
+        New DataFrame with typed columns
+    """
+    typed = df.copy()
+
+    ts_col = _find_column(typed, TIMESTAMP_COLUMNS)
+    if ts_col is not None and not isinstance(typed[ts_col].dtype, pd.DatetimeTZDtype):
+        parsed = _timestamps_to_utc(typed[ts_col])
+        if parsed.notna().sum() == typed[ts_col].notna().sum():
+            typed[ts_col] = parsed
+        else:
+            logger.warning(
+                f"⚠️ Could not parse every value in '{ts_col}' - keeping original dtype"
+            )
+    elif ts_col is not None:
+        typed[ts_col] = typed[ts_col].dt.tz_convert("UTC")
+
+    for column in PRICE_COLUMNS:
+        if column in typed.columns:
+            typed[column] = pd.to_numeric(typed[column], errors="coerce").astype(
+                np.float32
+            )
+
+    for column in VOLUME_COLUMNS:
+        if column in typed.columns:
+            volume = pd.to_numeric(typed[column], errors="coerce")
+            if volume.notna().all() and (volume >= 0).all():
+                typed[column] = volume.astype(np.uint64)
+            else:
+                typed[column] = volume
+
+    return typed
+
+
+def _record_in_manifest(object_name: str, df: pd.DataFrame, byte_size: int):
+    """Record a successful bar write in the dataset manifest."""
+    # Imported lazily: the manifest module builds on this one
+    from .manifest import get_manifest
+
+    try:
+        get_manifest().record_write(object_name, df, byte_size)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not record {object_name} in manifest: {e}")
+
+
+def write_bars(df: pd.DataFrame, object_name: str) -> Tuple[Optional[str], bool]:
+    """
+    Upload a bar DataFrame using the configured storage format.
+
+    Successful bar writes are recorded in the dataset manifest (see
+    utils/manifest.py) so readers can check existence, freshness and row
+    counts without touching the object itself.
+
+    If the Parquet upload fails the frame is written as CSV and the older
+    Parquet sibling is deleted, since readers try Parquet first. The write
+    fails if that sibling cannot be deleted.
+
+    Args:
+        df: DataFrame to upload
+        object_name: Logical object name (normally ending in .csv)
+
+    Returns:
+        Tuple of (object name actually written or None, success boolean)
+    """
+    bar_object = is_bar_object(object_name)
+    stale_parquet = None
+
+    if bar_object and get_bar_storage_format() == "parquet":
+        target = parquet_object_name(object_name)
+        try:
+            payload = serialize_dataframe(encode_bar_frame(df), "parquet")
+        except Exception as e:
+            logger.error(f"Error encoding {object_name} as Parquet: {e}")
+            payload = None
+        if payload is not None and upload_bytes(payload, target):
+            _record_in_manifest(target, df, len(payload))
+            return target, True
+        logger.warning(f"⚠️ Parquet upload failed for {target} - falling back to CSV")
+        stale_parquet = target
+
+    target = csv_object_name(object_name)
+    payload = serialize_dataframe(df, "csv")
+    success = payload is not None and upload_bytes(payload, target)
+    if success and stale_parquet is not None and not delete_objects([stale_parquet]):
+        # Readers would keep getting the old Parquet frame instead of this one
+        logger.error(f"❌ Could not delete stale {stale_parquet} after CSV fallback")
+        success = False
+    if success and bar_object:
+        _record_in_manifest(target, df, len(payload))
+    return (target if success else None), success
+
+
+def read_bars(object_name: str) -> pd.DataFrame:
+    """
+    Download a bar DataFrame, preferring Parquet and falling back to CSV.
+
+    Args:
+        object_name: Logical object name (normally ending in .csv)
+
+    Returns:
+        DataFrame from the first readable candidate, or empty DataFrame
+    """
+    for candidate, file_format in storage_candidates(object_name):
+        df = download_dataframe(candidate, file_format)
+        if not df.empty:
+            return df
+    return pd.DataFrame()
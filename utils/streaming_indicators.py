@@ -0,0 +1,579 @@
+"""
+Incremental (streaming) indicator state per ticker.
+
+The minute screeners used to recompute every indicator from the full 1-minute
+history on each run even though only one new bar had arrived. This module
+keeps per-ticker state that is updated in O(1) per new bar:
+- EMA values of the close
+- Wilder ATR (seed buffer, then smoothed value)
+- Session VWAP (cumulative price x volume and volume for the regular session)
+- Rolling volume over a ring buffer
+
+State is persisted between runs as one small JSON file per ticker, so a
+screener only feeds the bars after the last timestamp it has already seen.
+The state also records how many bars each recent session contributed; if a
+later frame holds a different number of bars before that timestamp (a gap
+was back-filled), the state is rebuilt instead of resumed.
+Values match the full-recompute kernels in utils.indicators (ema, wilder_atr,
+vwap, rolling_mean).
+"""
+
+import json
+import logging
+import math
+import os
+from datetime import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import INDICATOR_STATE_DIR, TIMEZONE
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 2
+DEFAULT_EMA_SPANS = (9, 20)
+DEFAULT_ATR_PERIOD = 14
+DEFAULT_VOLUME_WINDOW = 20
+# Sessions whose applied bar counts are kept to detect back-filled history
+HISTORY_SESSIONS = 30
+DAY_NS = 86_400_000_000_000
+
+REGULAR_SESSION_START = time(9, 30)
+REGULAR_SESSION_END = time(16, 0)
+
+
+def _is_missing(*values: float) -> bool:
+    return any(value is None or math.isnan(value) for value in values)
+
+
+def _float_or_none(value: float) -> Optional[float]:
+    return None if _is_missing(value) else float(value)
+
+
+def _float_or_nan(value: Optional[float]) -> float:
+    return float("nan") if value is None else float(value)
+
+
+class StreamingEMA:
+    """EMA updated one value at a time, equivalent to ewm(span, adjust=False)."""
+
+    def __init__(self, span: int, value: float = float("nan")):
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = value
+
+    def update(self, x: float) -> float:
+        """Add a value and return the current EMA (missing values carry forward)."""
+        if _is_missing(x):
+            return self.value
+        if math.isnan(self.value):
+            self.value = float(x)
+        else:
+            self.value = self.alpha * x + (1 - self.alpha) * self.value
+        return self.value
+
+    def to_dict(self) -> Dict:
+        return {"span": self.span, "value": _float_or_none(self.value)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StreamingEMA":
+        return cls(data["span"], _float_or_nan(data["value"]))
+
+
+class StreamingWilderATR:
+    """Wilder ATR updated one bar at a time, equivalent to indicators.wilder_atr."""
+
+    def __init__(self, period: int = DEFAULT_ATR_PERIOD):
+        self.period = period
+        self.prev_close = float("nan")
+        self.count = 0
+        self.seed_total = 0.0
+        self.value = float("nan")
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """Add a bar and return the current ATR."""
+        # Same NaN handling as indicators.true_range (fmax ignores a missing side)
+        tr = np.fmax(high - low, abs(high - self.prev_close))
+        tr = float(np.fmax(tr, abs(low - self.prev_close)))
+        self.prev_close = float(close)
+        if math.isnan(tr):
+            return self.value
+
+        if self.count < self.period:
+            self.seed_total += tr
+            self.count += 1
+            if self.count == self.period:
+                self.value = self.seed_total / self.period
+        else:
+            self.value = (self.value * (self.period - 1) + tr) / self.period
+        return self.value
+
+    def to_dict(self) -> Dict:
+        return {
+            "period": self.period,
+            "prev_close": _float_or_none(self.prev_close),
+            "count": self.count,
+            "seed_total": self.seed_total,
+            "value": _float_or_none(self.value),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StreamingWilderATR":
+        atr = cls(data["period"])
+        atr.prev_close = _float_or_nan(data["prev_close"])
+        atr.count = data["count"]
+        atr.seed_total = data["seed_total"]
+        atr.value = _float_or_nan(data["value"])
+        return atr
+
+
+class RollingWindow:
+    """
+    Fixed-size ring buffer with a running sum.
+
+    The sum is refreshed from the buffer each time the ring wraps, which keeps
+    floating-point drift bounded at O(1) amortized cost per update.
+    """
+
+    def __init__(self, window: int = DEFAULT_VOLUME_WINDOW):
+        self.window = window
+        self.buffer = np.zeros(window)
+        self.position = 0
+        self.count = 0
+        self.total = 0.0
+
+    def update(self, x: float) -> float:
+        """Add a value and return the rolling mean (NaN until the window is full)."""
+        if _is_missing(x):
+            return self.mean
+        self.total += x - self.buffer[self.position]
+        self.buffer[self.position] = x
+        self.position = (self.position + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+        if self.position == 0:
+            self.total = float(self.buffer.sum())
+        return self.mean
+
+    @property
+    def sum(self) -> float:
+        """Rolling sum (NaN until the window is full)."""
+        return self.total if self.count == self.window else float("nan")
+
+    @property
+    def mean(self) -> float:
+        """Rolling mean (NaN until the window is full)."""
+        return self.total / self.window if self.count == self.window else float("nan")
+
+    def to_dict(self) -> Dict:
+        return {
+            "window": self.window,
+            "buffer": self.buffer.tolist(),
+            "position": self.position,
+            "count": self.count,
+            "total": self.total,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RollingWindow":
+        rolling = cls(data["window"])
+        rolling.buffer = np.asarray(data["buffer"], dtype=np.float64)
+        rolling.position = data["position"]
+        rolling.count = data["count"]
+        rolling.total = data["total"]
+        return rolling
+
+
+class SessionVWAP:
+    """Regular-session VWAP from cumulative typical price x volume and volume."""
+
+    def __init__(self):
+        self.session_date: Optional[str] = None
+        self.cum_pv = 0.0
+        self.cum_volume = 0.0
+
+    def update(
+        self,
+        timestamp: pd.Timestamp,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> float:
+        """
+        Add a bar; bars outside 9:30-16:00 are ignored and a new date resets the
+        session.
+
+        Args:
+            timestamp: Bar timestamp in New York time
+
+        Returns:
+            Current session VWAP
+        """
+        if not REGULAR_SESSION_START <= timestamp.time() <= REGULAR_SESSION_END:
+            return self.value
+
+        session_date = timestamp.date().isoformat()
+        if session_date != self.session_date:
+            self.session_date = session_date
+            self.cum_pv = 0.0
+            self.cum_volume = 0.0
+
+        if not _is_missing(high, low, close, volume):
+            self.cum_pv += (high + low + close) / 3.0 * volume
+            self.cum_volume += volume
+        return self.value
+
+    @property
+    def value(self) -> float:
+        """Current session VWAP (NaN before any volume)."""
+        return self.cum_pv / self.cum_volume if self.cum_volume > 0 else float("nan")
+
+    def value_for(self, session_date) -> float:
+        """VWAP if the state belongs to the given session date, else NaN."""
+        if self.session_date != pd.Timestamp(session_date).date().isoformat():
+            return float("nan")
+        return self.value
+
+    def to_dict(self) -> Dict:
+        return {
+            "session_date": self.session_date,
+            "cum_pv": self.cum_pv,
+            "cum_volume": self.cum_volume,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SessionVWAP":
+        session = cls()
+        session.session_date = data["session_date"]
+        session.cum_pv = data["cum_pv"]
+        session.cum_volume = data["cum_volume"]
+        return session
+
+
+class TickerIndicatorState:
+    """All streaming indicators for one ticker's 1-minute bars."""
+
+    def __init__(
+        self,
+        ticker: str,
+        ema_spans: Iterable[int] = DEFAULT_EMA_SPANS,
+        atr_period: int = DEFAULT_ATR_PERIOD,
+        volume_window: int = DEFAULT_VOLUME_WINDOW,
+    ):
+        """
+        Initialize empty state.
+
+        Args:
+            ticker: Ticker symbol
+            ema_spans: EMA spans tracked on the close
+            atr_period: Wilder ATR period
+            volume_window: Rolling volume window in bars
+        """
+        self.ticker = ticker
+        self.emas = {int(span): StreamingEMA(int(span)) for span in ema_spans}
+        self.atr = StreamingWilderATR(atr_period)
+        self.volume = RollingWindow(volume_window)
+        self.vwap = SessionVWAP()
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.bars = 0
+        # Session date -> [first applied bar time, bars applied], recent sessions only
+        self.sessions: Dict[str, list] = {}
+
+    def matches(
+        self, ema_spans: Iterable[int], atr_period: int, volume_window: int
+    ) -> bool:
+        """Whether the state was built with the given settings."""
+        return (
+            sorted(self.emas) == sorted(int(span) for span in ema_spans)
+            and self.atr.period == atr_period
+            and self.volume.window == volume_window
+        )
+
+    def update_bar(
+        self,
+        timestamp: pd.Timestamp,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ):
+        """Apply one bar (timestamp in New York time) to every indicator."""
+        for ema in self.emas.values():
+            ema.update(close)
+        self.atr.update(high, low, close)
+        self.volume.update(volume)
+        self.vwap.update(timestamp, high, low, close, volume)
+        self.last_timestamp = timestamp
+        self.bars += 1
+
+        session = timestamp.date().isoformat()
+        if session not in self.sessions:
+            self.sessions[session] = [timestamp.isoformat(), 0]
+            for expired in sorted(self.sessions)[:-HISTORY_SESSIONS]:
+                del self.sessions[expired]
+        self.sessions[session][1] += 1
+
+    def history_matches(self, times: pd.DatetimeIndex) -> bool:
+        """
+        Whether a frame holds the same bars up to last_timestamp as were applied.
+
+        Per-session bar counts are compared for the tracked sessions the frame
+        covers from their first applied bar, so a rolling window that starts
+        mid-history is not a mismatch but a back-filled gap is.
+
+        Args:
+            times: Sorted bar times in New York time (see _sorted_bars)
+
+        Returns:
+            True if the applied history is unchanged (or nothing was applied)
+        """
+        if self.last_timestamp is None or not self.sessions:
+            return True
+        seen = times[: int(times.searchsorted(self.last_timestamp, side="right"))]
+        if len(seen) == 0:
+            return True
+
+        days = seen.tz_localize(None).as_unit("ns").asi8 // DAY_NS
+        unique_days, first_rows, counts = np.unique(
+            days, return_index=True, return_counts=True
+        )
+        oldest_tracked = min(self.sessions)
+        for day, first_row, count in zip(unique_days, first_rows, counts):
+            session = pd.Timestamp(int(day) * DAY_NS).date().isoformat()
+            recorded = self.sessions.get(session)
+            if recorded is None:
+                if session > oldest_tracked:
+                    return False  # a whole session appeared inside applied history
+                continue
+            first_applied, applied = recorded
+            if seen[first_row] > pd.Timestamp(first_applied):
+                continue  # the frame starts after this session's first applied bar
+            if count != applied:
+                return False
+        return True
+
+    def update(self, df: pd.DataFrame) -> int:
+        """
+        Apply the bars newer than the last one seen.
+
+        Args:
+            df: 1-minute OHLCV frame with a DatetimeIndex or a timestamp column
+
+        Returns:
+            Number of bars applied
+        """
+        df, times = _sorted_bars(df)
+        if times is None or len(times) == 0:
+            return 0
+
+        start = 0
+        if self.last_timestamp is not None:
+            start = int(times.searchsorted(self.last_timestamp, side="right"))
+        if start >= len(times):
+            return 0
+
+        highs = pd.to_numeric(df["high"], errors="coerce").to_numpy(dtype=np.float64)
+        lows = pd.to_numeric(df["low"], errors="coerce").to_numpy(dtype=np.float64)
+        closes = pd.to_numeric(df["close"], errors="coerce").to_numpy(dtype=np.float64)
+        volumes = pd.to_numeric(df["volume"], errors="coerce").to_numpy(
+            dtype=np.float64
+        )
+        for i in range(start, len(times)):
+            self.update_bar(times[i], highs[i], lows[i], closes[i], volumes[i])
+        return len(times) - start
+
+    def values(self) -> Dict[str, float]:
+        """Current indicator values keyed by name."""
+        values = {f"ema_{span}": ema.value for span, ema in self.emas.items()}
+        values.update(
+            {
+                "atr": self.atr.value,
+                "vwap": self.vwap.value,
+                "volume_sum": self.volume.sum,
+                "volume_mean": self.volume.mean,
+            }
+        )
+        return values
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": STATE_VERSION,
+            "ticker": self.ticker,
+            "last_timestamp": (
+                self.last_timestamp.isoformat()
+                if self.last_timestamp is not None
+                else None
+            ),
+            "bars": self.bars,
+            "sessions": self.sessions,
+            "emas": [ema.to_dict() for ema in self.emas.values()],
+            "atr": self.atr.to_dict(),
+            "volume": self.volume.to_dict(),
+            "vwap": self.vwap.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TickerIndicatorState":
+        state = cls(data["ticker"], ema_spans=())
+        state.emas = {
+            item["span"]: StreamingEMA.from_dict(item) for item in data["emas"]
+        }
+        state.atr = StreamingWilderATR.from_dict(data["atr"])
+        state.volume = RollingWindow.from_dict(data["volume"])
+        state.vwap = SessionVWAP.from_dict(data["vwap"])
+        if data["last_timestamp"]:
+            state.last_timestamp = pd.Timestamp(data["last_timestamp"]).tz_convert(
+                TIMEZONE
+            )
+        state.bars = data["bars"]
+        state.sessions = {
+            session: list(entry) for session, entry in data["sessions"].items()
+        }
+        return state
+
+
+def _sorted_bars(
+    df: pd.DataFrame,
+) -> Tuple[Optional[pd.DataFrame], Optional[pd.DatetimeIndex]]:
+    """
+    A frame's bars in time order with their New York times.
+
+    Naive times are assumed to be New York time. Rows whose time cannot be
+    resolved are dropped, and out-of-order bars are sorted (stably) rather
+    than rejected.
+
+    Returns:
+        Tuple of (sorted frame, bar times), or (None, None) if there are no times
+    """
+    if df is None or df.empty:
+        return None, None
+    if isinstance(df.index, pd.DatetimeIndex):
+        times = df.index
+    elif "timestamp" in df.columns:
+        times = pd.DatetimeIndex(pd.to_datetime(df["timestamp"]))
+    else:
+        return None, None
+
+    if times.tz is None:
+        times = times.tz_localize(TIMEZONE, ambiguous="NaT", nonexistent="NaT")
+    else:
+        times = times.tz_convert(TIMEZONE)
+    if times.hasnans:
+        valid = ~times.isna()
+        df, times = df[valid], times[valid]
+    if not times.is_monotonic_increasing:
+        order = np.argsort(times.asi8, kind="stable")
+        df, times = df.iloc[order], times[order]
+    return df, times
+
+
+class IndicatorStateStore:
+    """Loads, updates and persists per-ticker indicator state on local disk."""
+
+    def __init__(
+        self,
+        directory: str = INDICATOR_STATE_DIR,
+        ema_spans: Iterable[int] = DEFAULT_EMA_SPANS,
+        atr_period: int = DEFAULT_ATR_PERIOD,
+        volume_window: int = DEFAULT_VOLUME_WINDOW,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory holding one JSON file per ticker
+            ema_spans: EMA spans tracked on the close
+            atr_period: Wilder ATR period
+            volume_window: Rolling volume window in bars
+        """
+        self.directory = directory
+        self.ema_spans = tuple(ema_spans)
+        self.atr_period = atr_period
+        self.volume_window = volume_window
+        self.bars_applied = 0
+        self.rebuilt = 0
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.directory, f"{ticker}.json")
+
+    def _new_state(self, ticker: str) -> TickerIndicatorState:
+        return TickerIndicatorState(
+            ticker, self.ema_spans, self.atr_period, self.volume_window
+        )
+
+    def load(self, ticker: str) -> TickerIndicatorState:
+        """
+        Load a ticker's persisted state.
+
+        Returns:
+            TickerIndicatorState (empty if none is stored or it is unusable)
+        """
+        try:
+            with open(self._path(ticker)) as f:
+                data = json.load(f)
+            if data.get("version") == STATE_VERSION:
+                state = TickerIndicatorState.from_dict(data)
+                if state.matches(self.ema_spans, self.atr_period, self.volume_window):
+                    return state
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(
+                f"⚠️ Discarding unreadable indicator state for {ticker}: {e}"
+            )
+        return self._new_state(ticker)
+
+    def save(self, state: TickerIndicatorState) -> bool:
+        """
+        Persist a ticker's state atomically.
+
+        Returns:
+            True if saved
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(state.ticker)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(state.to_dict(), f)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save indicator state for {state.ticker}: {e}")
+            return False
+
+    def update(self, ticker: str, df: pd.DataFrame) -> TickerIndicatorState:
+        """
+        Bring a ticker's state up to date with its 1-minute bars and persist it.
+
+        Only bars after the stored last timestamp are applied. If the stored
+        state is older than the first bar in the frame, bars have been missed,
+        and if the frame's bars up to that timestamp differ from the ones
+        applied, history was back-filled; either way the state is rebuilt from
+        the whole frame.
+
+        Args:
+            ticker: Ticker symbol
+            df: 1-minute OHLCV frame (DatetimeIndex or timestamp column)
+
+        Returns:
+            Up-to-date TickerIndicatorState
+        """
+        state = self.load(ticker)
+        df, times = _sorted_bars(df)
+        if times is None or len(times) == 0:
+            return state
+
+        if state.last_timestamp is not None and (
+            state.last_timestamp < times[0] or not state.history_matches(times)
+        ):
+            self.rebuilt += 1
+            state = self._new_state(ticker)
+
+        applied = state.update(df)
+        self.bars_applied += applied
+        if applied:
+            self.save(state)
+        return state